@@ -1,9 +1,18 @@
+import os
 import math
+import pickle
 import random
+import collections
+import numpy
+from trajectory import compute_trajectory, compute_trajectories
 
 
 class BattedBall(object):
 
+    # An optional TrajectoryCache (installed by Cosmos, as configured) from which
+    # batted balls adopt precomputed trajectories
+    trajectory_cache = None
+
     def __init__(self, swing, exit_speed, horizontal_launch_angle,
                  vertical_launch_angle):
         # Note: swing may be a Bunt
@@ -62,11 +71,11 @@ class BattedBall(object):
         self.ground_rule_incurred = False
         # This attribute is dynamic, and used so that multiple fly outs aren't awarded by umpire.officiate()
         self.fly_out_call_given = False
-        # Prepare a dictionary that will map timesteps to batted ball
-        # x-, y-, and z-coordinates; modified by compute_full_trajectory()
+        # Prepare a mapping of timesteps to batted ball x-, y-, and
+        # z-coordinates; set by compute_full_trajectory()
         self.position_at_timestep = {}
         # And one that will map timesteps to batted ball velocity, in
-        # mph; modified by compute_full_trajectory()
+        # mph; set by compute_full_trajectory()
         self.x_velocity_at_timestep = {}
         # This dictionary is used by players to call off other players
         # whose positions have less fielding priority
@@ -79,157 +88,48 @@ class BattedBall(object):
         self.classify_self()
 
     def compute_full_trajectory(self):
-        # Enact a timestep-by-timestep physics simulation of the ball's
-        # full course, recording its x-, y-, and z-coordinates at each
-        # timestep; first, set initial values at point of contact
-        x, y = 0, 1.0668  # Coordinates at point of contact, in meters
-        time_since_contact = 0.0  # Time at point of contact
-        v = self.exit_speed * 0.44704  # Convert mph to m/s
-        g = 9.81  # Standard gravitational acceleration in m/s
-        th = math.radians(self.vertical_launch_angle)
-        vx = v * math.cos(th)  # Initial horizontal component of velocity
-        vy = v * math.sin(th)  # Initial vertical component of velocity
-        m = self.ball.weight * 0.0283495  # Convert ounces to kg
-        rho = 1.2  # Air density -- TODO change depending on weather, altitude
-        C = 0.3  # Drag coefficient  -- TODO change depending on certain things
-        A = 0.004208351855042743  # Cross-sectional area of ball in meters
-        D = (rho * C * A) / 2  # Drag
-        COR = 0.48  # Coefficient of restitution TODO should be self.field.COR[(x, y)]
-        COF = 0.31  # Coefficient of friction TODO should be self.field.COF[(x, y)]
-        ax = -(D/m)*v*vx  # Initial horizontal component of acceleration
-        ay = -g-(D/m)*v*vy  # Initial vertical component of acceleration
-        timestep = 0.1
-        # Record position at the initial timestep -- [NOTE: While it is
-        # convenient for the physics computation to call the the horizontal
-        # axis 'x' and the vertical axis 'y', in the baseball simulation it
-        # makes more sense to call the vertical axis 'z', the axis moving
-        # from home plate to center field 'y', and the axis moving from
-        # third base to first base 'x'. As such, we convert the physics-
-        # sim 'y' values to coordinate 'z' values, and then consider the
-        # swing's horizontal launch angle to compute the additional
-        # coordinate 'x' and 'y' values.]
-        coordinate_x = 0.0
-        coordinate_y = 0.0  # Right over home plate still
-        coordinate_z = 3.5
-        self.position_at_timestep[0.0] = coordinate_x, coordinate_y, coordinate_z
-        self.x_velocity_at_timestep[0.0] = v * 2.23694  # Convert to mph
-        # Simulate movement of the ball up to the point that it "stops" -- to
-        # avoid computational overkill, we say that a ball has stopped once
-        # its horizontal component of velocity falls below 1 m/s and it is not
-        # six or more inches in the air -- or contacts the foul pole, in which
-        # case we know a home run will be called and the rest of the trajectory
-        # is irrelevant and thus not worth computing
-        while (vx >= 1 or y > 0.1524 or time_since_contact < 0.6) and not self.foul_pole_contact_timestep:
-            # Increment time
-            last_timestep = time_since_contact
-            time_since_contact += timestep
-            # If ball hit the ground on the last timestep, make
-            # it bounce
-            if y <= 0:
-                # If this was the first time the ball hit the ground,
-                # record distance in feet
-                if self.true_distance is None:
-                    self.true_distance = int(x * 3.28084)
-                    self.true_landing_point = int(coordinate_x), int(coordinate_y)
-                    self.hang_time = time_since_contact
-                if not self.landing_timestep:
-                    self.landing_timestep = time_since_contact-timestep  # The landing actually happened last timestep
-                elif not self.second_landing_timestep:
-                    self.second_landing_timestep = time_since_contact-timestep
-                vy *= -1  # Reverse vertical component of velocity
-                vy *= COR  # Adjust for coefficient of restitution of the turf
-                vx *= COF  # Adjust for friction of the turf
-                v = math.sqrt(vx**2 + vy**2)
-            # If a ball hit the foul pole on last timestep, make note of it -- this will be called
-            # a home run on this timestep by umpire.officiate()
-            if abs(coordinate_x) >= 226 and int(coordinate_x) == int(coordinate_y):
-                self.foul_pole_contact_timestep = last_timestep
-            else:
-                # If ball hit an outfield fence or foul fence on last timestep, make it bounce off that
-                if (abs(coordinate_x) < 227 and not
-                        (self.foul_fence_contact_timestep or self.outfield_fence_contact_timestep)):
-                    # If the absolute value of the batted ball's coordinate x is greater than 226,
-                    # we know that the ball left the playing field above the fence (I think -- otherwise,
-                    # it's a reasonable approximation anyway, I think)
-                    if coordinate_x > coordinate_y or coordinate_y < 0:
-                        # Ball is heading foul -- check for whether the ball contacted a foul fence between
-                        # the last timestep and now
-                        if coordinate_y <= self.field.playing_field_lower_bound[int(coordinate_x)]:
-                            if coordinate_z <= self.field.foul_fence_height[int(coordinate_x)]:
-                                # Rewrite the coordinates of the last timestep so that coordinate-y is the exact
-                                # coordinate of the wall -- otherwise it would be that a ball passed the
-                                # wall and was then sucked back through it to simulate hitting it
-                                self.position_at_timestep[last_timestep] = (
-                                    coordinate_x, self.field.playing_field_lower_bound[int(coordinate_x)], coordinate_z
-                                )
-                                self.foul_fence_contact_timestep = last_timestep
-                                vx *= -1  # Reverse horizontal component of velocity
-                                # TODO should be self.field.outfield_fence_COR[x] or self.field.foul_fence_COR[x]
-                                vx *= 0.6  # Adjust for coefficient of restitution of the fence
-                                # TODO should be self.field.outfield_fence_COF[x] or self.field.foul_fence_COF[x]
-                                vy *= 0.15  # Adjust for friction of the fence
-                                v = math.sqrt(vx**2 + vy**2)
-                    else:
-                        # Ball is heading fair -- check for whether the ball contacted the outfield fence
-                        # between the last timestep and now
-                        if coordinate_y >= self.field.playing_field_upper_bound[int(coordinate_x)]:
-                            if coordinate_z <= self.field.outfield_fence_height[int(coordinate_x)]:
-                                # Rewrite the coordinates of the last timestep so that coordinate-y is the exact
-                                # coordinate of the wall -- otherwise it would be that a ball passed the
-                                # wall and was then sucked back through it to simulate hitting it
-                                self.position_at_timestep[last_timestep] = (
-                                    coordinate_x, self.field.playing_field_upper_bound[int(coordinate_x)], coordinate_z
-                                )
-                                self.outfield_fence_contact_timestep = last_timestep
-                                vx *= -1  # Reverse horizontal component of velocity
-                                # TODO should be self.field.outfield_fence_COR[x] or self.field.foul_fence_COR[x]
-                                vx *= 0.6  # Adjust for coefficient of restitution of the fence
-                                # TODO should be self.field.outfield_fence_COF[x] or self.field.foul_fence_COF[x]
-                                vy *= 0.15  # Adjust for friction of the fence
-                                v = math.sqrt(vx**2 + vy**2)
-                # Calculate new physics x and y coordinates
-                x += (vx*timestep) + (ax * timestep**2) / 2
-                y += (vy*timestep) + (ay * timestep**2) / 2
-                if y < 0:
-                    y = 0  # A necessary approximation
-                # Calculate new acceleration components
-                ax = -(D/m)*v*vx
-                ay = -g-(D/m)*v*vy
-                # Calculate new velocity components
-                vx += ax*timestep
-                vy += ay*timestep
-                v = math.sqrt(vx**2 + vy**2)
-                # Calculate, convert, and record new actual ball x-, y-, z-coordinates
-                coordinate_x = x * math.sin(math.radians(self.horizontal_launch_angle))
-                coordinate_x *= 3.28084  # Convert meters to feet
-                coordinate_y = x * math.cos(math.radians(self.horizontal_launch_angle))
-                coordinate_y *= 3.28084
-                coordinate_z = y * 3.28084
-                self.position_at_timestep[time_since_contact] = (
-                    coordinate_x, coordinate_y, coordinate_z
-                )
-                self.x_velocity_at_timestep[time_since_contact] = v * 2.23694  # Convert to mph
-                if coordinate_z > self.apex:
-                    self.apex = coordinate_z
-        # Baseball has now stopped moving (to avoid computational overkill, we
-        # say that a ball has stopped once its horizontal component of velocity
-        # falls below 1 m/s and it is not six or more inches in the air) --
-        # record resting data for a final timestep
-        time_since_contact += timestep
-        self.position_at_timestep[time_since_contact] = (
-            coordinate_x, coordinate_y, 0.0
+        """Simulate the ball's full course, recording its x-, y-, and z-coordinates at each timestep."""
+        if BattedBall.trajectory_cache is not None:
+            trajectories = BattedBall.trajectory_cache.trajectory(
+                exit_speed=self.exit_speed, horizontal_launch_angle=self.horizontal_launch_angle,
+                vertical_launch_angle=self.vertical_launch_angle, ball_weight=self.ball.weight,
+                geometry=self.field.geometry
+            )
+        else:
+            trajectories = compute_trajectory(
+                exit_speed=self.exit_speed, horizontal_launch_angle=self.horizontal_launch_angle,
+                vertical_launch_angle=self.vertical_launch_angle, ball_weight=self.ball.weight,
+                geometry=self.field.geometry
+            )
+        self.adopt_trajectory(trajectories=trajectories, i=0)
+
+    def adopt_trajectory(self, trajectories, i):
+        """Adopt the ith trajectory of a batch computed by compute_trajectory() or compute_trajectories().
+
+        [NOTE: While it is convenient for the physics computation to call the horizontal
+        axis 'x' and the vertical axis 'y', in the baseball simulation it makes more sense to
+        call the vertical axis 'z', the axis moving from home plate to center field 'y', and
+        the axis moving from third base to first base 'x'. See baseball.trajectory for the
+        physics simulation itself.]
+        """
+        # These map timesteps to batted ball x-, y-, and z-coordinates and to batted ball
+        # velocity, in mph, and they are read just like dictionaries
+        self.position_at_timestep = trajectories.position_table(i)
+        self.x_velocity_at_timestep = trajectories.speed_table(i)
+        self.true_distance = int(trajectories.true_distance[i])
+        self.true_landing_point = (
+            int(trajectories.true_landing_point[i][0]), int(trajectories.true_landing_point[i][1])
         )
-        self.x_velocity_at_timestep[time_since_contact] = 0.0
-        # If the ball just landed for the first time on the last timestep, the
-        # true landing point, etc., may not have been recorded (pesky bug, but
-        # I believe this, though inelegant, should fix it)
-        if self.true_distance is None:
-            self.true_distance = int(x * 3.28084)
-            self.true_landing_point = int(coordinate_x), int(coordinate_y)
-            self.hang_time = time_since_contact
-        if not self.landing_timestep:
-            self.landing_timestep = time_since_contact-timestep
-        self.final_location = [coordinate_x, coordinate_y]
+        self.hang_time = float(trajectories.hang_time[i])
+        self.landing_timestep = trajectories.timestep_or_none(trajectories.landing_timestep[i])
+        self.second_landing_timestep = trajectories.timestep_or_none(trajectories.second_landing_timestep[i])
+        self.foul_pole_contact_timestep = trajectories.contact_timestep(trajectories.foul_pole_contact_index, i)
+        self.foul_fence_contact_timestep = trajectories.contact_timestep(trajectories.foul_fence_contact_index, i)
+        self.outfield_fence_contact_timestep = trajectories.contact_timestep(
+            trajectories.outfield_fence_contact_index, i
+        )
+        self.apex = float(trajectories.apex[i])
+        self.final_location = [float(trajectories.final_location[i][0]), float(trajectories.final_location[i][1])]
 
     def classify_self(self):
         """Determine batted-ball type and destination."""
@@ -350,12 +250,53 @@ class BattedBall(object):
             self.hit_to_infield = False
             self.hit_to_outfield = True
 
-    def get_read_by_fielders(self):
-        """Obligate fielders to their defensive responsibilities."""
-        timesteps = self.position_at_timestep.keys()
-        timesteps.sort()
-        for fielder in self.at_bat.fielders:
-            for timestep in timesteps[6:]:  # Fielders take 0.5s to react
+    def get_read_by_fielders(self, iteratively=False):
+        """Obligate fielders to their defensive responsibilities.
+
+        @param iteratively: Whether to walk each fielder through each timestep one at a time,
+                            rather than considering all fielders and timesteps at once; both
+                            produce the same reads, and the former is kept as a reference.
+        """
+        timesteps = sorted(self.position_at_timestep.keys())[6:]  # Fielders take 0.5s to react
+        if iteratively:
+            self._read_iteratively(fielders=self.at_bat.fielders, timesteps=timesteps)
+        elif timesteps:
+            self._read(fielders=self.at_bat.fielders, timesteps=timesteps)
+        self.obligated_fielder = (
+            min(self.at_bat.fielders, key=lambda f: f.time_needed_to_field_ball)
+        )
+        self.obligated_fielder.playing_the_ball = True
+
+    def _read(self, fielders, timesteps):
+        """Have fielders read the batted ball by considering every fielder and every timestep at once.
+
+        For each fielder, the earliest timestep at which they could get to the ball location in
+        time to potentially field it is found with a single argmax over a fielders-by-timesteps
+        matrix of arrival times; see BattedBall._read_iteratively() for the reasoning behind each
+        step of the computation.
+        """
+        distances, max_rates_of_speed, eligible, _ = self._approach_matrices(
+            fielders=fielders, timesteps=timesteps, origins=[f.location for f in fielders]
+        )
+        full_speed_seconds_per_foot = numpy.array([f.person.body.full_speed_seconds_per_foot for f in fielders])
+        times_to_ball_locations = distances * (full_speed_seconds_per_foot[:, numpy.newaxis] * max_rates_of_speed)
+        times_to_ball_locations += 0.5
+        feasible = eligible & (times_to_ball_locations <= numpy.array(timesteps))
+        earliest_feasible = numpy.argmax(feasible, axis=1)
+        for i, fielder in enumerate(fielders):
+            j = earliest_feasible[i] if feasible[i, earliest_feasible[i]] else -1
+            if j == -1 and not eligible[i, -1]:
+                continue
+            self._plan_fielding_attempt(
+                fielder=fielder, timestep=timesteps[j], dist_from_fielder_origin=float(distances[i, j]),
+                max_rate_of_speed=float(max_rates_of_speed[i, j]),
+                time_to_ball_location=float(times_to_ball_locations[i, j]), feasible=j != -1
+            )
+
+    def _read_iteratively(self, fielders, timesteps):
+        """Have fielders read the batted ball by walking each of them through each timestep."""
+        for fielder in fielders:
+            for timestep in timesteps:
                 height_of_ball_at_timestep = (
                     self.position_at_timestep[timestep][2]
                 )
@@ -365,49 +306,12 @@ class BattedBall(object):
                     x1, y1 = fielder.location
                     x2, y2 = self.position_at_timestep[timestep][:2]
                     dist_from_fielder_origin_at_timestep = math.hypot(x1-x2, y1-y2)
-                    # Determine slope between fielder origin location and
-                    # ball location at that timestep
-                    x_change = x2-x1
-                    y_change = y2-y1
-                    slope = y_change/float(x_change)
                     # Determine the maximum rate of speed with which the fielder could
                     # make his approach to the ball location at this timestep while
-                    # still tracking the ball properly -- the more you are moving toward
-                    # home plate, the faster you can move; the more you are moving toward
-                    # the center field wall, the less quickly you can move
-                    if x_change < 0:
-                        # You are moving left, so invert the slope so that it
-                        # becomes intuitive for our computation here
-                        temp_slope = slope * -1
-                    else:
-                        temp_slope = slope
-                    if temp_slope <= 0:
-                        # You are moving toward home plate, so you can run much
-                        # faster -- the maximum speed will be 90% of your full speed
-                        # multiplied by your ball-tracking ability (this allows
-                        # ball-tracking wizards like Willie Mays to run faster while
-                        # fielding), and the minimum speed (for when you are running
-                        # laterally) will be that percentage less ~20%
-                        temp_slope = abs(temp_slope)
-                        if temp_slope > 15:
-                            temp_slope = 15
-                        diff = 15-temp_slope
-                        max_speed = 0.9 * fielder.ball_tracking_ability
-                        max_rate_of_speed_to_this_location = max_speed - (0.013333333333333333 * diff)
-                        if max_rate_of_speed_to_this_location > 0.97:
-                            # Enforce a 0.97 ceiling to account for time spent accelerating
-                            max_rate_of_speed_to_this_location = 0.97
-                    elif temp_slope > 0:
-                        # You are moving toward the outfield fence -- here, max speed
-                        # represents lateral movement, which was minimum speed in above
-                        # block; now, minimum speed is lateral speed less ~20%
-                        if temp_slope > 15:
-                            temp_slope = 15
-                        diff = abs(0-temp_slope)
-                        max_speed = (0.7 * fielder.ball_tracking_ability)
-                        max_rate_of_speed_to_this_location = max_speed - (0.013333333333333333 * diff)
-                        if max_rate_of_speed_to_this_location > 0.97:
-                            max_rate_of_speed_to_this_location = 0.97
+                    # still tracking the ball properly
+                    max_rate_of_speed_to_this_location = self._max_rate_of_speed(
+                        fielder=fielder, x_change=x2-x1, y_change=y2-y1
+                    )
                     # Determine how long it would take fielder to get to the ball
                     # location at that timestep -- here we consider the direction of
                     # movement in the fielder's approach to the ball location at that
@@ -423,86 +327,298 @@ class BattedBall(object):
                     # Check if fielder could make it to that ball location in time
                     # to potentially field it
                     if time_to_ball_location_at_timestep <= timestep:
-                        # Note whether the fielder would be attempting to record a fly out if
-                        # they do end up playing the ball in the manner decided here -- here we
-                        # allow for a two-timestep buffer, so that baserunners don't have perfect
-                        # knowledge that, e.g., an actual close one-hopper wasn't going to be fly-out attempt
-                        if timestep < self.landing_timestep+0.21:
-                            fielder.attempting_fly_out = True
-                        elif self.second_landing_timestep and timestep < self.second_landing_timestep:
-                            # Depending on the rules enforced for this game, bounding balls
-                            # could also represent fly-out opportunities
-                            ball_in_foul_territory_at_this_timestep = bool(y2 < 0 or abs(x2) > y2)
-                            if ball_in_foul_territory_at_this_timestep:
-                                if self.at_bat.game.rules.foul_ball_on_first_bounce_is_out:
-                                    fielder.attempting_fly_out = True
-                            else:
-                                if self.at_bat.game.rules.fair_ball_on_first_bounce_is_out:
-                                    fielder.attempting_fly_out = True
-                        # Note how long it would take the fielder to reach the location of
-                        # the fielding chance, which is used below to determine the obligated
-                        # fielder (though this person may be called off)
-                        fielder.time_needed_to_field_ball = time_to_ball_location_at_timestep
-                        fielder.timestep_of_planned_fielding_attempt = timestep
-                        # Set location where fielding attempt will occur, if this
-                        # fielder ends up playing the ball
-                        fielder.immediate_goal = self.position_at_timestep[timestep]
-                        # Set speed, in feet per timestep, that fielder will act
-                        # at in his approach to the immediate goal location (again,
-                        # should he end up fielding the ball)
-                        fielder.dist_per_timestep = (
-                            (dist_from_fielder_origin_at_timestep/(timestep-0.5)) * 0.1
-                        )
-                        fielder.relative_rate_of_speed = (
-                            1000 * fielder.dist_per_timestep *
-                            (fielder.person.body.full_speed_seconds_per_foot * max_rate_of_speed_to_this_location)
+                        self._plan_fielding_attempt(
+                            fielder=fielder, timestep=timestep,
+                            dist_from_fielder_origin=dist_from_fielder_origin_at_timestep,
+                            max_rate_of_speed=max_rate_of_speed_to_this_location,
+                            time_to_ball_location=time_to_ball_location_at_timestep, feasible=True
                         )
                         break
                     elif timestep == timesteps[-1]:
-                        # Fielder can only make it to the ball after it has stopped
-                        # moving, so the time needed to field it is simply the time
-                        # it would take the fielder to run full speed to the point
-                        # where the ball will come to a stop
-                        fielder.time_needed_to_field_ball = max(timestep, time_to_ball_location_at_timestep)
-                        actual_timestep_it_will_happen = timestep
-                        while actual_timestep_it_will_happen < fielder.time_needed_to_field_ball:
-                            actual_timestep_it_will_happen += 0.1
-                        fielder.timestep_of_planned_fielding_attempt = actual_timestep_it_will_happen
-                        # Set location where fielding attempt will occur, if this
-                        # fielder ends up playing the ball
-                        fielder.immediate_goal = self.position_at_timestep[timestep]
-                        # This fielder will act at full speed in his approach to the
-                        # immediate goal location (again, should he end up fielding
-                        # the ball)
-                        fielder.dist_per_timestep = (
-                            (0.1/fielder.person.body.full_speed_seconds_per_foot) * max_rate_of_speed_to_this_location
+                        self._plan_fielding_attempt(
+                            fielder=fielder, timestep=timestep,
+                            dist_from_fielder_origin=dist_from_fielder_origin_at_timestep,
+                            max_rate_of_speed=max_rate_of_speed_to_this_location,
+                            time_to_ball_location=time_to_ball_location_at_timestep, feasible=False
                         )
-                        fielder.relative_rate_of_speed = 90
-        self.obligated_fielder = (
-            min(self.at_bat.fielders, key=lambda f: f.time_needed_to_field_ball)
+
+    def _plan_fielding_attempt(self, fielder, timestep, dist_from_fielder_origin, max_rate_of_speed,
+                               time_to_ball_location, feasible):
+        """Set a fielder's plan for fielding the ball, should they end up playing it.
+
+        @param feasible: Whether the fielder could make it to the ball location at the given timestep
+                         in time to potentially field it there; if not, the given timestep is the
+                         last one, and the fielder can only make it to the ball after it has stopped.
+        """
+        if feasible:
+            # Note whether the fielder would be attempting to record a fly out if
+            # they do end up playing the ball in the manner decided here -- here we
+            # allow for a two-timestep buffer, so that baserunners don't have perfect
+            # knowledge that, e.g., an actual close one-hopper wasn't going to be fly-out attempt
+            if timestep < self.landing_timestep+0.21:
+                fielder.attempting_fly_out = True
+            elif self.second_landing_timestep and timestep < self.second_landing_timestep:
+                self._potentially_attempt_bounding_fly_out(fielder=fielder, timestep=timestep)
+            # Note how long it would take the fielder to reach the location of
+            # the fielding chance, which is used below to determine the obligated
+            # fielder (though this person may be called off)
+            fielder.time_needed_to_field_ball = time_to_ball_location
+            fielder.timestep_of_planned_fielding_attempt = timestep
+            # Set location where fielding attempt will occur, if this
+            # fielder ends up playing the ball
+            fielder.immediate_goal = self.position_at_timestep[timestep]
+            # Set speed, in feet per timestep, that fielder will act
+            # at in his approach to the immediate goal location (again,
+            # should he end up fielding the ball)
+            fielder.dist_per_timestep = (
+                (dist_from_fielder_origin/(timestep-0.5)) * 0.1
+            )
+            fielder.relative_rate_of_speed = (
+                1000 * fielder.dist_per_timestep *
+                (fielder.person.body.full_speed_seconds_per_foot * max_rate_of_speed)
+            )
+        else:
+            # Fielder can only make it to the ball after it has stopped
+            # moving, so the time needed to field it is simply the time
+            # it would take the fielder to run full speed to the point
+            # where the ball will come to a stop
+            fielder.time_needed_to_field_ball = max(timestep, time_to_ball_location)
+            actual_timestep_it_will_happen = timestep
+            while actual_timestep_it_will_happen < fielder.time_needed_to_field_ball:
+                actual_timestep_it_will_happen += 0.1
+            fielder.timestep_of_planned_fielding_attempt = actual_timestep_it_will_happen
+            # Set location where fielding attempt will occur, if this
+            # fielder ends up playing the ball
+            fielder.immediate_goal = self.position_at_timestep[timestep]
+            # This fielder will act at full speed in his approach to the
+            # immediate goal location (again, should he end up fielding
+            # the ball)
+            fielder.dist_per_timestep = (
+                (0.1/fielder.person.body.full_speed_seconds_per_foot) * max_rate_of_speed
+            )
+            fielder.relative_rate_of_speed = 90
+
+    def _potentially_attempt_bounding_fly_out(self, fielder, timestep):
+        """Note whether a fielder planning to field a bounding ball would be attempting a fly out."""
+        # Depending on the rules enforced for this game, bounding balls
+        # could also represent fly-out opportunities
+        x, y = self.position_at_timestep[timestep][:2]
+        ball_in_foul_territory_at_this_timestep = self.field.geometry.is_foul(x, y)
+        if ball_in_foul_territory_at_this_timestep:
+            if self.at_bat.game.rules.foul_ball_on_first_bounce_is_out:
+                fielder.attempting_fly_out = True
+        else:
+            if self.at_bat.game.rules.fair_ball_on_first_bounce_is_out:
+                fielder.attempting_fly_out = True
+
+    @staticmethod
+    def _max_rate_of_speed(fielder, x_change, y_change):
+        """Return the maximum rate of speed with which a fielder could make an approach while tracking the ball.
+
+        The more you are moving toward home plate, the faster you can move; the more you are
+        moving toward the center field wall, the less quickly you can move. An approach with
+        no lateral component takes the limit of the slope as the lateral component vanishes.
+        """
+        # Determine slope between fielder location and ball location
+        if x_change == 0:
+            # You are moving straight toward home plate or the center field wall, or
+            # you are already there, in which case treat the approach as lateral
+            temp_slope = math.copysign(float('inf'), y_change) if y_change else 0.0
+        else:
+            slope = y_change/float(x_change)
+            if x_change < 0:
+                # You are moving left, so invert the slope so that it
+                # becomes intuitive for our computation here
+                temp_slope = slope * -1
+            else:
+                temp_slope = slope
+        if temp_slope <= 0:
+            # You are moving toward home plate, so you can run much
+            # faster -- the maximum speed will be 90% of your full speed
+            # multiplied by your ball-tracking ability (this allows
+            # ball-tracking wizards like Willie Mays to run faster while
+            # fielding), and the minimum speed (for when you are running
+            # laterally) will be that percentage less ~20%
+            temp_slope = abs(temp_slope)
+            if temp_slope > 15:
+                temp_slope = 15
+            diff = 15-temp_slope
+            max_speed = 0.9 * fielder.ball_tracking_ability
+            max_rate_of_speed_to_this_location = max_speed - (0.013333333333333333 * diff)
+        else:
+            # You are moving toward the outfield fence -- here, max speed
+            # represents lateral movement, which was minimum speed in above
+            # block; now, minimum speed is lateral speed less ~20%
+            if temp_slope > 15:
+                temp_slope = 15
+            diff = abs(0-temp_slope)
+            max_speed = (0.7 * fielder.ball_tracking_ability)
+            max_rate_of_speed_to_this_location = max_speed - (0.013333333333333333 * diff)
+        if max_rate_of_speed_to_this_location > 0.97:
+            # Enforce a 0.97 ceiling to account for time spent accelerating
+            max_rate_of_speed_to_this_location = 0.97
+        return max_rate_of_speed_to_this_location
+
+    def _approach_matrices(self, fielders, timesteps, origins):
+        """Return fielders-by-timesteps matrices describing each fielder's approach to the ball at each timestep.
+
+        @return: A tuple (distances, max_rates_of_speed, eligible, degenerate), where eligible marks
+                 the timesteps at which the ball would be low enough for each fielder to field it,
+                 and degenerate marks the ones at which a fielder would be approaching the ball
+                 exactly horizontally or vertically (for which the slope is undefined or zero).
+        """
+        positions = numpy.array([self.position_at_timestep[timestep] for timestep in timesteps])
+        origins = numpy.array(origins, dtype=float)
+        x_changes = positions[:, 0] - origins[:, 0, numpy.newaxis]
+        y_changes = positions[:, 1] - origins[:, 1, numpy.newaxis]
+        distances = numpy.hypot(x_changes, y_changes)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            slopes = y_changes/x_changes
+        # See BattedBall._max_rate_of_speed() for the reasoning here, including for the cells
+        # with no lateral component, whose slopes would otherwise be infinite or NaN
+        temp_slopes = numpy.where(x_changes < 0, -slopes, slopes)
+        vertical = x_changes == 0
+        temp_slopes[vertical] = numpy.where(
+            y_changes[vertical] == 0, 0.0, numpy.copysign(numpy.inf, y_changes[vertical])
         )
-        self.obligated_fielder.playing_the_ball = True
+        ball_tracking_abilities = numpy.array([f.ball_tracking_ability for f in fielders])[:, numpy.newaxis]
+        max_rates_of_speed = numpy.where(
+            temp_slopes <= 0,
+            (0.9 * ball_tracking_abilities) - (0.013333333333333333 * (15-numpy.minimum(numpy.abs(temp_slopes), 15))),
+            (0.7 * ball_tracking_abilities) - (0.013333333333333333 * numpy.minimum(temp_slopes, 15))
+        )
+        max_rates_of_speed = numpy.minimum(max_rates_of_speed, 0.97)
+        fieldable_ball_max_heights = numpy.array([f.fieldable_ball_max_height for f in fielders])
+        eligible = positions[:, 2] < fieldable_ball_max_heights[:, numpy.newaxis]
+        degenerate = (x_changes == 0) | (y_changes == 0)
+        return distances, max_rates_of_speed, eligible, degenerate
+
+    def get_reread_by_fielders(self, iteratively=False):
+        """Obligate a new fielder to field the ball after it was not cleanly fielded.
 
-    def get_reread_by_fielders(self):
-        """Obligate a new fielder to field the ball after it was not cleanly fielded."""
+        @param iteratively: Whether to walk each fielder through each timestep one at a time,
+                            rather than considering all fielders and timesteps at once; both
+                            produce the same reads, and the former is kept as a reference.
+        """
         self.fielder_with_chance = None
         self.obligated_fielder = None
-        timesteps = self.position_at_timestep.keys()
-        timesteps.sort()
+        timesteps = sorted(self.position_at_timestep.keys())
         index_of_current_timestep = timesteps.index(self.time_since_contact)
+        # 'index_of_current_timestep+1' because the fielder won't begin moving until
+        # the while-loop iteration representing the *next* timestep -- sort of like how
+        # we had to add 0.5s to all considerations in batted_ball.get_read_by_fielders to
+        # simulate their delayed reaction time, here we have to add 0.1s to all considerations
+        # to accommodate the control sequence of playing_action._transpire()
+        timesteps = timesteps[index_of_current_timestep+1:]
         available_fielders = [f for f in self.at_bat.fielders if f not in (
             self.at_bat.playing_action.covering_first, self.at_bat.playing_action.covering_second,
             self.at_bat.playing_action.covering_third, self.at_bat.playing_action.covering_home
         )]
+        fielder_max_rates_of_speed = None
+        if not iteratively:
+            fielder_max_rates_of_speed = self._reread(fielders=available_fielders, timesteps=timesteps)
+        if fielder_max_rates_of_speed is None:
+            fielder_max_rates_of_speed = self._reread_iteratively(fielders=available_fielders, timesteps=timesteps)
+        self.obligated_fielder = min(available_fielders, key=lambda f: f.time_needed_to_field_ball)
+        if self.obligated_fielder.playing_the_ball:
+            if self.at_bat.game.trace:
+                print "-- {} ({}) will try again to field the ball [{}]".format(
+                    self.obligated_fielder.person.last_name, self.obligated_fielder.position, self.time_since_contact
+                )
+        else:
+            if self.at_bat.game.trace:
+                print "-- {} ({}) will now attempt to field the ball [{}]".format(
+                    self.obligated_fielder.person.last_name, self.obligated_fielder.position, self.time_since_contact
+                )
+        self.obligated_fielder.making_goal_revision = True
+        self.obligated_fielder.playing_the_ball = True
+        # Set these attributes here, because, unlike with batted_ball.get_read_by_fielders(), any
+        # available fielders who don't end up playing the ball will not then decide their actual
+        # goals, thereby writing over the temporary .immediate_goal, etc., set during the above
+        # computation -- rather, we want them to retain their goals and only the one who now
+        # will play the ball to set the goal decided in the above computation
+        if self.obligated_fielder.timestep_of_planned_fielding_attempt in self.position_at_timestep:
+            self.obligated_fielder.immediate_goal = (
+                self.position_at_timestep[self.obligated_fielder.timestep_of_planned_fielding_attempt]
+            )
+        else:
+            # Fielder is planning to field the ball after it has stopped, thus his planned timestep
+            # for the fielding attempt in not in batted_ball.position_at_timestep
+            self.obligated_fielder.immediate_goal = self.final_location
+        fielder_full_speed_dist_per_timestep = 0.1/self.obligated_fielder.person.body.full_speed_seconds_per_foot
+        fielder_full_speed_dist_per_timestep *= fielder_max_rates_of_speed[self.obligated_fielder]
+        self.obligated_fielder.dist_per_timestep = fielder_full_speed_dist_per_timestep
+        # Assume flat-rate relative rate of speed, because there will always be a rush
+        # to get to a missed ball, but the ball won't be flying through the air in a way
+        # that would allow any fielder to reach full speed before attempting to field it
+        self.obligated_fielder.relative_rate_of_speed = fielder_max_rates_of_speed[self.obligated_fielder] * 100
+        # Make it so that our new obligated fielder is calling the ball and the
+        # guy who was just playing the ball and missed is no longer playing it
+        self.obligated_fielder.playing_the_ball = True
+        for fielder in self.at_bat.fielders:
+            if fielder is not self.obligated_fielder:
+                fielder.playing_the_ball = False
+                fielder.attempting_fly_out = False
+        self.obligated_fielder.decide_immediate_goal(playing_action=self.at_bat.playing_action)
+
+    def _reread(self, fielders, timesteps):
+        """Have available fielders reread the ball by considering every fielder and every timestep at once.
+
+        See BattedBall._reread_iteratively() for the reasoning behind each step of the computation.
+
+        @return: A dictionary mapping each fielder to the maximum rate of speed with which they could
+                 approach the ball location they settled on, or None if some fielder would approach
+                 a ball location exactly horizontally or vertically -- in that case, the reread is
+                 left to BattedBall._reread_iteratively(), which randomly nudges such approaches.
+        """
+        if not timesteps:
+            for fielder in fielders:
+                fielder.attempting_fly_out = False
+            return {}
+        distances, max_rates_of_speed, eligible, degenerate = self._approach_matrices(
+            fielders=fielders, timesteps=timesteps, origins=[f.location for f in fielders]
+        )
+        if (eligible & degenerate).any():
+            return None
+        full_speed_dists_per_timestep = (
+            0.1/numpy.array([f.person.body.full_speed_seconds_per_foot for f in fielders])[:, numpy.newaxis]
+        )
+        full_speed_dists_per_timestep = full_speed_dists_per_timestep * max_rates_of_speed
+        times_to_ball_locations = distances / full_speed_dists_per_timestep
+        times_to_ball_locations += numpy.array([f.reorienting_after_fielding_miss for f in fielders])[:, numpy.newaxis]
+        times_to_ball_locations += 0.1
+        feasible = eligible & (times_to_ball_locations <= numpy.array(timesteps)-self.time_since_contact)
+        earliest_feasible = numpy.argmax(feasible, axis=1)
+        fielder_max_rates_of_speed = {}
+        for i, fielder in enumerate(fielders):
+            fielder.attempting_fly_out = False
+            if feasible[i, earliest_feasible[i]]:
+                j = earliest_feasible[i]
+                self._plan_fielding_reattempt(fielder=fielder, timestep=timesteps[j], time_to_ball_location=None)
+            elif eligible[i].any():
+                # The last timestep at which the ball was fieldable is the last one this fielder
+                # considered, and thus the one whose max rate of speed is retained
+                j = len(timesteps) - 1 - numpy.argmax(eligible[i, ::-1])
+                if j == len(timesteps) - 1:
+                    self._plan_fielding_reattempt(
+                        fielder=fielder, timestep=timesteps[j],
+                        time_to_ball_location=float(times_to_ball_locations[i, j])
+                    )
+            else:
+                continue
+            fielder_max_rates_of_speed[fielder] = float(max_rates_of_speed[i, j])
+        return fielder_max_rates_of_speed
+
+    def _reread_iteratively(self, fielders, timesteps):
+        """Have available fielders reread the ball by walking each of them through each timestep.
+
+        @return: A dictionary mapping each fielder to the maximum rate of speed with which they could
+                 approach the ball location they settled on.
+        """
         fielder_max_rates_of_speed = {}
-        for fielder in available_fielders:
+        for fielder in fielders:
             fielder.attempting_fly_out = False
-            for timestep in timesteps[index_of_current_timestep+1:]:
-                # 'index_of_current_timestep+1' because the fielder won't begin moving until
-                # the while-loop iteration representing the *next* timestep -- sort of like how
-                # we had to add 0.5s to all considerations in batted_ball.get_read_by_fielders to
-                # simulate their delayed reaction time, here we have to add 0.1s to all considerations
-                # to accommodate the control sequence of playing_action._transpire()
+            for timestep in timesteps:
                 height_of_ball_at_timestep = (
                     self.position_at_timestep[timestep][2]
                 )
@@ -526,45 +642,9 @@ class BattedBall(object):
                             y_change = 0.001
                         else:
                             y_change = -0.001
-                    slope = y_change/float(x_change)
-                    # Determine the maximum rate of speed with which the fielder could
-                    # make his approach to the ball location at this timestep while
-                    # still tracking the ball properly -- the more you are moving toward
-                    # home plate, the faster you can move; the more you are moving toward
-                    # the center field wall, the less quickly you can move
-                    if x_change < 0:
-                        # You are moving left, so invert the slope so that it
-                        # becomes intuitive for our computation here
-                        temp_slope = slope * -1
-                    else:
-                        temp_slope = slope
-                    if temp_slope <= 0:
-                        # You are moving toward home plate, so you can run much
-                        # faster -- the maximum speed will be 90% of your full speed
-                        # multiplied by your ball-tracking ability (this allows
-                        # ball-tracking wizards like Willie Mays to run faster while
-                        # fielding), and the minimum speed (for when you are running
-                        # laterally) will be that percentage less ~20%
-                        temp_slope = abs(temp_slope)
-                        if temp_slope > 15:
-                            temp_slope = 15
-                        diff = 15-temp_slope
-                        max_speed = 0.9 * fielder.ball_tracking_ability
-                        max_rate_of_speed_to_this_location = max_speed - (0.013333333333333333 * diff)
-                        if max_rate_of_speed_to_this_location > 0.97:
-                            # Enforce a 0.97 ceiling to account for time spent accelerating
-                            max_rate_of_speed_to_this_location = 0.97
-                    elif temp_slope > 0:
-                        # You are moving toward the outfield fence -- here, max speed
-                        # represents lateral movement, which was minimum speed in above
-                        # block; now, minimum speed is lateral speed less ~20%
-                        if temp_slope > 15:
-                            temp_slope = 15
-                        diff = abs(0-temp_slope)
-                        max_speed = (0.7 * fielder.ball_tracking_ability)
-                        max_rate_of_speed_to_this_location = max_speed - (0.013333333333333333 * diff)
-                        if max_rate_of_speed_to_this_location > 0.97:
-                            max_rate_of_speed_to_this_location = 0.97
+                    max_rate_of_speed_to_this_location = self._max_rate_of_speed(
+                        fielder=fielder, x_change=x_change, y_change=y_change
+                    )
                     fielder_max_rates_of_speed[fielder] = max_rate_of_speed_to_this_location
                     # Determine how long it would take fielder to get to the ball
                     # location at that timestep -- here we consider the direction of
@@ -577,83 +657,46 @@ class BattedBall(object):
                         dist_from_current_fielder_location_at_timestep / full_speed_dist_per_timestep
                     )
                     time_to_ball_location_at_timestep += fielder.reorienting_after_fielding_miss
-                    time_to_ball_location_at_timestep += 0.1  # For reason stated at beginning of for loop
+                    time_to_ball_location_at_timestep += 0.1  # For reason stated in get_reread_by_fielders()
                     # Check if fielder could make it to that ball location in time
                     # to potentially field it
                     if time_to_ball_location_at_timestep <= timestep-self.time_since_contact:
-                        # Note whether the fielder would be attempting to record a fly out if
-                        # they do end up playing the ball in the manner decided here
-                        if timestep < self.landing_timestep:
-                            fielder.attempting_fly_out = True
-                        elif self.second_landing_timestep and timestep < self.second_landing_timestep:
-                            # Depending on the rules enforced for this game, bounding balls
-                            # could also represent fly-out opportunities
-                            ball_in_foul_territory_at_this_timestep = (
-                                bool(y2 < 0 or abs(x2) > y2)
-                            )
-                            if ball_in_foul_territory_at_this_timestep:
-                                if self.at_bat.game.rules.foul_ball_on_first_bounce_is_out:
-                                    fielder.attempting_fly_out = True
-                            else:
-                                if self.at_bat.game.rules.fair_ball_on_first_bounce_is_out:
-                                    fielder.attempting_fly_out = True
-                        # Note how long it would take the fielder to reach the location of
-                        # the fielding chance, which is used below to determine the obligated
-                        # fielder (though this person may be called off)
-                        fielder.time_needed_to_field_ball = timestep-self.time_since_contact
-                        fielder.timestep_of_planned_fielding_attempt = timestep
+                        self._plan_fielding_reattempt(fielder=fielder, timestep=timestep, time_to_ball_location=None)
                         break
                     elif timestep == timesteps[-1]:
-                        # Fielder can only make it to the ball after it has stopped
-                        # moving, so the time needed to field it is simply the time
-                        # it would take the fielder to run full speed to the point
-                        # where the ball will come to a stop
-                        fielder.time_needed_to_field_ball = time_to_ball_location_at_timestep+self.time_since_contact
-                        actual_timestep_it_will_happen = timestep
-                        while actual_timestep_it_will_happen < fielder.time_needed_to_field_ball:
-                            actual_timestep_it_will_happen += 0.1
-                        fielder.timestep_of_planned_fielding_attempt = actual_timestep_it_will_happen
-        self.obligated_fielder = min(available_fielders, key=lambda f: f.time_needed_to_field_ball)
-        if self.obligated_fielder.playing_the_ball:
-            if self.at_bat.game.trace:
-                print "-- {} ({}) will try again to field the ball [{}]".format(
-                    self.obligated_fielder.person.last_name, self.obligated_fielder.position, self.time_since_contact
-                )
-        else:
-            if self.at_bat.game.trace:
-                print "-- {} ({}) will now attempt to field the ball [{}]".format(
-                    self.obligated_fielder.person.last_name, self.obligated_fielder.position, self.time_since_contact
-                )
-        self.obligated_fielder.making_goal_revision = True
-        self.obligated_fielder.playing_the_ball = True
-        # Set these attributes here, because, unlike with batted_ball.get_read_by_fielders(), any
-        # available fielders who don't end up playing the ball will not then decide their actual
-        # goals, thereby writing over the temporary .immediate_goal, etc., set during the above
-        # computation -- rather, we want them to retain their goals and only the one who now
-        # will play the ball to set the goal decided in the above computation
-        if self.obligated_fielder.timestep_of_planned_fielding_attempt in self.position_at_timestep:
-            self.obligated_fielder.immediate_goal = (
-                self.position_at_timestep[self.obligated_fielder.timestep_of_planned_fielding_attempt]
-            )
+                        self._plan_fielding_reattempt(
+                            fielder=fielder, timestep=timestep, time_to_ball_location=time_to_ball_location_at_timestep
+                        )
+        return fielder_max_rates_of_speed
+
+    def _plan_fielding_reattempt(self, fielder, timestep, time_to_ball_location):
+        """Set a fielder's plan for fielding the ball after it was not cleanly fielded.
+
+        @param time_to_ball_location: If the fielder can only make it to the ball after it has
+                                      stopped, the time it would take them to get there; else None.
+        """
+        if time_to_ball_location is None:
+            # Note whether the fielder would be attempting to record a fly out if
+            # they do end up playing the ball in the manner decided here
+            if timestep < self.landing_timestep:
+                fielder.attempting_fly_out = True
+            elif self.second_landing_timestep and timestep < self.second_landing_timestep:
+                self._potentially_attempt_bounding_fly_out(fielder=fielder, timestep=timestep)
+            # Note how long it would take the fielder to reach the location of
+            # the fielding chance, which is used below to determine the obligated
+            # fielder (though this person may be called off)
+            fielder.time_needed_to_field_ball = timestep-self.time_since_contact
+            fielder.timestep_of_planned_fielding_attempt = timestep
         else:
-            # Fielder is planning to field the ball after it has stopped, thus his planned timestep
-            # for the fielding attempt in not in batted_ball.position_at_timestep
-            self.obligated_fielder.immediate_goal = self.final_location
-        fielder_full_speed_dist_per_timestep = 0.1/self.obligated_fielder.person.body.full_speed_seconds_per_foot
-        fielder_full_speed_dist_per_timestep *= fielder_max_rates_of_speed[self.obligated_fielder]
-        self.obligated_fielder.dist_per_timestep = fielder_full_speed_dist_per_timestep
-        # Assume flat-rate relative rate of speed, because there will always be a rush
-        # to get to a missed ball, but the ball won't be flying through the air in a way
-        # that would allow any fielder to reach full speed before attempting to field it
-        self.obligated_fielder.relative_rate_of_speed = fielder_max_rates_of_speed[self.obligated_fielder] * 100
-        # Make it so that our new obligated fielder is calling the ball and the
-        # guy who was just playing the ball and missed is no longer playing it
-        self.obligated_fielder.playing_the_ball = True
-        for fielder in self.at_bat.fielders:
-            if fielder is not self.obligated_fielder:
-                fielder.playing_the_ball = False
-                fielder.attempting_fly_out = False
-        self.obligated_fielder.decide_immediate_goal(playing_action=self.at_bat.playing_action)
+            # Fielder can only make it to the ball after it has stopped
+            # moving, so the time needed to field it is simply the time
+            # it would take the fielder to run full speed to the point
+            # where the ball will come to a stop
+            fielder.time_needed_to_field_ball = time_to_ball_location+self.time_since_contact
+            actual_timestep_it_will_happen = timestep
+            while actual_timestep_it_will_happen < fielder.time_needed_to_field_ball:
+                actual_timestep_it_will_happen += 0.1
+            fielder.timestep_of_planned_fielding_attempt = actual_timestep_it_will_happen
 
     def move(self):
         """Move the batted ball along its course for one timestep."""
@@ -713,11 +756,7 @@ class BattedBall(object):
                     self.contacted_foul_pole = True
                     if self.at_bat.game.trace:
                         print "-- Ball bounces off a foul pole [{}]".format(self.time_since_contact)
-                if (self.location[1] < 0 or
-                        abs(self.location[0]) > self.location[1]):
-                    self.in_foul_territory = True
-                else:
-                    self.in_foul_territory = False
+                self.in_foul_territory = self.field.geometry.is_foul(*self.location)
                 if self.height <= 0:
                     if not self.landed:
                         if self.at_bat.game.trace:
@@ -735,35 +774,14 @@ class BattedBall(object):
                 # it may potentially have left the playing field at this timestep, so
                 # check for that
                 if not (self.contacted_foul_pole or self.contacted_foul_fence or self.contacted_outfield_wall):
-                    if self.location[0] < -226:
-                        # Ball crossed the plane of the playing field
-                        # sometime during the last timestep, right at the
-                        # junction of the foul and outfield walls -- we will
-                        # have to approximate where it crossed the plane, which
-                        # due to the control sequence of elifs below will
-                        # favor home runs ever so slightly
-                        playing_field_lower_bound_at_this_x = (
-                            self.field.playing_field_lower_bound[-226]
-                        )
-                        playing_field_upper_bound_at_this_x = (
-                            self.field.playing_field_upper_bound[-226]
-                        )
-                    elif self.location[0] > 226:
-                        # We will have to approximate where it crossed the plane
-                        # (see above comment block for explanation)
-                        playing_field_lower_bound_at_this_x = (
-                            self.field.playing_field_lower_bound[-226]
-                        )
-                        playing_field_upper_bound_at_this_x = (
-                            self.field.playing_field_upper_bound[-226]
-                        )
-                    else:
-                        playing_field_lower_bound_at_this_x = (
-                            self.field.playing_field_lower_bound[int(self.location[0])]
-                        )
-                        playing_field_upper_bound_at_this_x = (
-                            self.field.playing_field_upper_bound[int(self.location[0])]
-                        )
+                    # If the ball is beyond either foul pole, it crossed the plane of the
+                    # playing field sometime during the last timestep, right at the junction
+                    # of the foul and outfield walls -- we approximate where it crossed the
+                    # plane by the boundaries at the foul pole, which due to the control sequence
+                    # of elifs below will favor home runs ever so slightly
+                    playing_field_lower_bound_at_this_x, playing_field_upper_bound_at_this_x = (
+                        self.field.geometry.boundaries_at(self.location[0])
+                    )
                     if 0 <= abs(playing_field_lower_bound_at_this_x-self.location[1]) < 1.5:
                         self.at_the_foul_wall = True
                         self.crossed_plane_foul = True
@@ -829,4 +847,153 @@ class FoulTip(object):
         # Result will either be a Strike object or FoulBall object,
         # depending on whether the catcher receives the foul tip
         # cleanly
-        self.result = None
\ No newline at end of file
+        self.result = None
+
+
+class TrajectoryCache(object):
+    """A bounded cache of batted-ball trajectories keyed by quantized launch parameters.
+
+    Batted balls mostly fall into a small space of (exit speed, vertical launch angle,
+    horizontal launch angle) values, so rather than simulating every ball's full
+    trajectory from scratch, a batted ball may adopt the trajectory of the nearest
+    point on a grid of launch parameters. Trajectories are further keyed by the
+    fingerprint of the field geometry they were simulated against, so that a single table
+    can serve every ballpark sharing the same geometry, and the table may be saved
+    to disk and prebuilt for the stock playing field. Least-recently used entries
+    are evicted once the cache is full.
+    """
+
+    def __init__(self, max_entries, exit_speed_quantum, launch_angle_quantum, ball_weight_quantum, path=None):
+        """Initialize a TrajectoryCache object.
+
+        @param max_entries: The number of trajectories this cache may hold.
+        @param exit_speed_quantum: The grid spacing for exit speed, in mph.
+        @param launch_angle_quantum: The grid spacing for both launch angles, in degrees.
+        @param ball_weight_quantum: The grid spacing for ball weight, in ounces.
+        @param path: A path to a table of trajectories saved by TrajectoryCache.save(), which
+                     will be loaded if it exists.
+        """
+        self.max_entries = max_entries
+        self.exit_speed_quantum = exit_speed_quantum
+        self.launch_angle_quantum = launch_angle_quantum
+        self.ball_weight_quantum = ball_weight_quantum
+        self.entries = collections.OrderedDict()  # Ordered from least to most recently used
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        """Return the number of trajectories in this cache."""
+        return len(self.entries)
+
+    @property
+    def hit_rate(self):
+        """Return the share of lookups that were served from this cache."""
+        lookups = self.hits + self.misses
+        return self.hits/float(lookups) if lookups else 0.0
+
+    def key(self, exit_speed, horizontal_launch_angle, vertical_launch_angle, ball_weight, geometry):
+        """Return the cache key for the given launch parameters and field geometry."""
+        return (
+            int(round(exit_speed/self.exit_speed_quantum)),
+            int(round(horizontal_launch_angle/self.launch_angle_quantum)),
+            int(round(vertical_launch_angle/self.launch_angle_quantum)),
+            int(round(ball_weight/self.ball_weight_quantum)),
+            geometry.fingerprint
+        )
+
+    def trajectory(self, exit_speed, horizontal_launch_angle, vertical_launch_angle, ball_weight, geometry):
+        """Return the trajectory for the nearest grid point to the given launch parameters."""
+        key = self.key(exit_speed, horizontal_launch_angle, vertical_launch_angle, ball_weight, geometry)
+        if key in self.entries:
+            self.hits += 1
+            trajectories = self.entries.pop(key)
+            self.entries[key] = trajectories  # Mark as most recently used
+            return trajectories
+        self.misses += 1
+        trajectories = compute_trajectory(
+            exit_speed=key[0]*self.exit_speed_quantum, horizontal_launch_angle=key[1]*self.launch_angle_quantum,
+            vertical_launch_angle=key[2]*self.launch_angle_quantum, ball_weight=key[3]*self.ball_weight_quantum,
+            geometry=geometry
+        )
+        self._insert(key=key, trajectories=trajectories)
+        return trajectories
+
+    def prebuild(self, geometry, exit_speeds, horizontal_launch_angles, vertical_launch_angles, ball_weight=5.125,
+                 batch_size=5000):
+        """Fill this cache with trajectories for every combination of the given launch parameters.
+
+        The trajectories are simulated in batches by compute_trajectories(); e.g., passing
+        FieldGeometry.stock() prebuilds a table for the stock playing field. Each given value
+        is snapped to the grid of this cache first.
+        """
+        keys = set()
+        for exit_speed in exit_speeds:
+            for horizontal_launch_angle in horizontal_launch_angles:
+                for vertical_launch_angle in vertical_launch_angles:
+                    key = self.key(exit_speed, horizontal_launch_angle, vertical_launch_angle, ball_weight, geometry)
+                    if key not in self.entries:
+                        keys.add(key)
+        keys = sorted(keys)
+        for i in xrange(0, len(keys), batch_size):
+            batch = keys[i:i+batch_size]
+            trajectories = compute_trajectories(
+                exit_speeds=[key[0]*self.exit_speed_quantum for key in batch],
+                horizontal_launch_angles=[key[1]*self.launch_angle_quantum for key in batch],
+                vertical_launch_angles=[key[2]*self.launch_angle_quantum for key in batch],
+                ball_weights=[key[3]*self.ball_weight_quantum for key in batch],
+                geometry=geometry
+            )
+            for j, key in enumerate(batch):
+                self._insert(key=key, trajectories=trajectories.select(j))
+
+    def measure_error(self, launches, geometry):
+        """Return the greatest in-flight position error, in feet, of this cache against the exact integrator.
+
+        Errors are measured over the timesteps before the ball first lands or contacts a fence or
+        foul pole: beyond that, the trajectory is discontinuous in its launch parameters (e.g., a ball
+        either clears the fence or it doesn't), even for the exact integrator itself.
+
+        @param launches: An iterable of (exit_speed, horizontal_launch_angle, vertical_launch_angle,
+                         ball_weight) tuples.
+        """
+        greatest_error = 0.0
+        for exit_speed, horizontal_launch_angle, vertical_launch_angle, ball_weight in launches:
+            cached = self.trajectory(exit_speed, horizontal_launch_angle, vertical_launch_angle, ball_weight, geometry)
+            exact = compute_trajectory(exit_speed, horizontal_launch_angle, vertical_launch_angle, ball_weight, geometry)
+            end = min(int(round(t.landing_timestep[0]/0.1)) for t in (cached, exact)) + 1
+            for t in (cached, exact):
+                for contact_index in (
+                    t.foul_pole_contact_index[0], t.foul_fence_contact_index[0], t.outfield_fence_contact_index[0]
+                ):
+                    if contact_index != -1:
+                        end = min(end, contact_index)
+            for i in xrange(end):
+                error = math.sqrt(sum((cached.positions[0][i]-exact.positions[0][i])**2))
+                greatest_error = max(greatest_error, error)
+        return greatest_error
+
+    def save(self, path):
+        """Write this cache's trajectories to disk."""
+        with open(path, 'wb') as f:
+            pickle.dump(
+                (self.exit_speed_quantum, self.launch_angle_quantum, self.ball_weight_quantum, self.entries.items()),
+                f, pickle.HIGHEST_PROTOCOL
+            )
+
+    def load(self, path):
+        """Load trajectories that were written to disk by TrajectoryCache.save()."""
+        with open(path, 'rb') as f:
+            exit_speed_quantum, launch_angle_quantum, ball_weight_quantum, entries = pickle.load(f)
+        if (exit_speed_quantum, launch_angle_quantum, ball_weight_quantum) != (
+                self.exit_speed_quantum, self.launch_angle_quantum, self.ball_weight_quantum):
+            raise Exception("Trajectory table at {} was built on a different grid.".format(path))
+        for key, trajectories in entries:
+            self._insert(key=key, trajectories=trajectories)
+
+    def _insert(self, key, trajectories):
+        """Insert a trajectory into this cache, evicting the least recently used one if it's full."""
+        self.entries[key] = trajectories
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
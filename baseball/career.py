@@ -53,6 +53,7 @@ class PlayerCareer(Career):
         self.planning_to_retire = False
         self.retired = True
         self.team.process_a_retirement(player=self.player)
+        self.player.person.cosmos.registry.record_change_in_free_agency(player=self.player)
 
 
 class ManagerCareer(Career):
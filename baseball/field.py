@@ -12,6 +12,9 @@
 # - weather and altitude stuff
 # - dampness of grass
 
+import hashlib
+import numpy
+
 
 class Field(object):
     """A baseball playing field in a baseball cosmos.
@@ -43,27 +46,21 @@ class Field(object):
         self.structural_engineer = None
         self.general_contractor = None
 
-        # Get playing field boundaries, which represent the boundaries of
-        # the entire playing field, including fieldable foul territory,
-        # and thus can be used to determine whether a ball is fieldable
-        self.playing_field_lower_bound, self.playing_field_upper_bound = (
-            self.get_playing_field_boundaries()
-        )
-        # Get outfield and foul fence heights, which are necessary to
-        # determine whether a ball hits a fence or flies over it
-        self.outfield_fence_height = self.get_outfield_fence_height()
-        self.foul_fence_height = self.get_foul_fence_height()
-        # Get foul pole locations and heights
+        # Get the geometry of the playing field, which holds its boundaries (these represent
+        # the boundaries of the entire playing field, including fieldable foul territory,
+        # and thus can be used to determine whether a ball is fieldable) and its outfield and
+        # foul fence heights (which are necessary to determine whether a ball hits a fence or
+        # flies over it); TODO custom park geometries via FieldGeometry.shared()
+        self.geometry = FieldGeometry.stock()
+        # Get foul pole locations and heights (the arrays begin at the leftmost x-coordinate)
         self.left_foul_pole_location = (
-            min(self.playing_field_upper_bound.keys()),
-            self.playing_field_upper_bound[min(self.playing_field_upper_bound.keys())]
+            FieldGeometry.min_x, self.geometry.upper_bound[0]
         )
         self.right_foul_pole_location = (
-            min(self.playing_field_upper_bound.keys()),
-            self.playing_field_upper_bound[min(self.playing_field_upper_bound.keys())]
+            FieldGeometry.min_x, self.geometry.upper_bound[0]
         )
-        self.left_foul_pole_height = self.outfield_fence_height[self.left_foul_pole_location[0]]
-        self.right_foul_pole_height = self.outfield_fence_height[self.right_foul_pole_location[0]]
+        self.left_foul_pole_height = self.geometry.outfield_fence_height[0]
+        self.right_foul_pole_height = self.geometry.outfield_fence_height[0]
         # Set ground-rule coordinates TODO
         self.ground_rule_coords = set()
 
@@ -135,4 +132,133 @@ class Field(object):
         foul_fence_height = {}
         for i in xrange(-226, 227):
             foul_fence_height[i] = 7.0
-        return foul_fence_height
\ No newline at end of file
+        return foul_fence_height
+
+
+class FieldGeometry(object):
+    """The geometry of a playing field, held in arrays indexed by (integer) x-coordinate.
+
+    Objects of this class are immutable and are shared by all the fields that have the
+    same boundaries and fence heights, so that the geometry of a park only needs to be
+    surveyed once. Queries accept either scalars or arrays of coordinates.
+    """
+
+    # The x-coordinates spanned by the arrays, i.e., foul pole to foul pole
+    min_x, max_x = -226, 226
+    # Codes for fence contact, as returned by FieldGeometry.fence_contact()
+    NO_CONTACT, FOUL_FENCE, OUTFIELD_FENCE = 0, 1, 2
+    # Geometries that have been surveyed so far, keyed by fingerprint
+    registry = {}
+    # The geometry of the initial generic playing field; see FieldGeometry.stock()
+    stock_geometry = None
+
+    def __init__(self, playing_field_lower_bound, playing_field_upper_bound, outfield_fence_height,
+                 foul_fence_height):
+        """Initialize a FieldGeometry object.
+
+        @param playing_field_lower_bound: A dictionary mapping each integer x-coordinate to the
+                                          y-coordinate of the backstop or foul fence there.
+        @param playing_field_upper_bound: A dictionary mapping each integer x-coordinate to the
+                                          y-coordinate of the outfield fence there.
+        @param outfield_fence_height: A dictionary mapping each integer x-coordinate to the height of
+                                      the outfield fence there.
+        @param foul_fence_height: A dictionary mapping each integer x-coordinate to the height of the
+                                  foul fence there.
+        """
+        self.lower_bound, self.upper_bound, self.outfield_fence_height, self.foul_fence_height = self.tabulate(
+            playing_field_lower_bound, playing_field_upper_bound, outfield_fence_height, foul_fence_height
+        )
+        for array in (self.lower_bound, self.upper_bound, self.outfield_fence_height, self.foul_fence_height):
+            array.flags.writeable = False
+        # A digest of the above arrays, which identifies this geometry (e.g., for the
+        # purpose of sharing precomputed batted-ball trajectories across ballparks)
+        self.fingerprint = self.compute_fingerprint(
+            self.lower_bound, self.upper_bound, self.outfield_fence_height, self.foul_fence_height
+        )
+
+    @classmethod
+    def stock(cls):
+        """Return the geometry of the initial generic playing field, which is surveyed only once."""
+        if cls.stock_geometry is None:
+            playing_field_lower_bound, playing_field_upper_bound = Field.get_playing_field_boundaries()
+            cls.stock_geometry = cls.shared(
+                playing_field_lower_bound=playing_field_lower_bound,
+                playing_field_upper_bound=playing_field_upper_bound,
+                outfield_fence_height=Field.get_outfield_fence_height(),
+                foul_fence_height=Field.get_foul_fence_height()
+            )
+        return cls.stock_geometry
+
+    @classmethod
+    def shared(cls, playing_field_lower_bound, playing_field_upper_bound, outfield_fence_height, foul_fence_height):
+        """Return the geometry with the given boundaries and fence heights, surveying it only if it's new."""
+        fingerprint = cls.compute_fingerprint(*cls.tabulate(
+            playing_field_lower_bound, playing_field_upper_bound, outfield_fence_height, foul_fence_height
+        ))
+        if fingerprint not in cls.registry:
+            cls.registry[fingerprint] = cls(
+                playing_field_lower_bound=playing_field_lower_bound,
+                playing_field_upper_bound=playing_field_upper_bound,
+                outfield_fence_height=outfield_fence_height, foul_fence_height=foul_fence_height
+            )
+        return cls.registry[fingerprint]
+
+    @classmethod
+    def tabulate(cls, *dictionaries):
+        """Return an array for each of the given dictionaries, holding its value at each integer x-coordinate."""
+        xs = xrange(cls.min_x, cls.max_x+1)
+        return [numpy.array([dictionary[x] for x in xs], dtype=float) for dictionary in dictionaries]
+
+    @staticmethod
+    def compute_fingerprint(*arrays):
+        """Return a digest of the given arrays."""
+        return hashlib.sha1(''.join(array.tostring() for array in arrays)).hexdigest()
+
+    def column(self, x):
+        """Return the array index for the given x-coordinate(s), clamped to the foul poles."""
+        if isinstance(x, numpy.ndarray):
+            return numpy.clip(numpy.trunc(x).astype(int), self.min_x, self.max_x) - self.min_x
+        return min(max(int(x), self.min_x), self.max_x) - self.min_x
+
+    def boundaries_at(self, x):
+        """Return the lower and upper playing-field boundaries at the given x-coordinate(s)."""
+        column = self.column(x)
+        return self.lower_bound[column], self.upper_bound[column]
+
+    @staticmethod
+    def is_foul(x, y):
+        """Return whether the given coordinates are in foul territory."""
+        return (y < 0) | (abs(x) > y)
+
+    def fence_contact(self, x, y, z):
+        """Return whether a ball at the given coordinates is in contact with a fence, and that fence's y.
+
+        A ball heading foul (i.e., toward the first-base side of the diagonal, or behind home
+        plate) can only contact a foul fence, and a ball heading fair only the outfield fence;
+        balls beyond the foul poles are taken to have left the playing field above the fences.
+
+        @return: A tuple (contact, wall_y), where contact is NO_CONTACT, FOUL_FENCE, or OUTFIELD_FENCE.
+        """
+        if isinstance(x, numpy.ndarray):
+            column = self.column(x)
+            lower_bound, upper_bound = self.lower_bound[column], self.upper_bound[column]
+            within_foul_poles = numpy.abs(x) < self.max_x+1
+            heading_foul = (x > y) | (y < 0)
+            at_foul_fence = within_foul_poles & heading_foul & (
+                (y <= lower_bound) & (z <= self.foul_fence_height[column])
+            )
+            at_outfield_fence = within_foul_poles & ~heading_foul & (
+                (y >= upper_bound) & (z <= self.outfield_fence_height[column])
+            )
+            contact = numpy.where(
+                at_foul_fence, self.FOUL_FENCE, numpy.where(at_outfield_fence, self.OUTFIELD_FENCE, self.NO_CONTACT)
+            )
+            return contact, numpy.where(at_foul_fence, lower_bound, upper_bound)
+        if abs(x) < self.max_x+1:
+            column = int(x) - self.min_x
+            if x > y or y < 0:
+                if y <= self.lower_bound.item(column) and z <= self.foul_fence_height.item(column):
+                    return self.FOUL_FENCE, self.lower_bound.item(column)
+            elif y >= self.upper_bound.item(column) and z <= self.outfield_fence_height.item(column):
+                return self.OUTFIELD_FENCE, self.upper_bound.item(column)
+        return self.NO_CONTACT, None
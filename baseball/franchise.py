@@ -179,6 +179,7 @@ class Team(object):
         """Sign the given player to play at the given position."""
         print "\t\tsigning {}...".format(player.person.name)
         player.career.team = self
+        self.cosmos.registry.record_change_in_free_agency(player=player)
         player.position = position
         self.players.add(player)
         # Actually hire the player as an employee in the organization
@@ -222,6 +223,7 @@ class Team(object):
         """Terminate the contract of a player."""
         self.players.remove(player)
         player.career.team = None
+        self.cosmos.registry.record_change_in_free_agency(player=player)
         # If this is during a season, potentially sign a replacement
         if self.season:
             self._sign_players()
@@ -287,6 +289,8 @@ class Team(object):
         """Sever ties with your players and personnel."""
         for stakeholder in self.players | self.personnel:
             stakeholder.career.team = None
+        for player in self.players:
+            self.cosmos.registry.record_change_in_free_agency(player=player)
 
     def _potentially_relocate(self):
         """Potentially _relocate this franchise to a new city."""
@@ -3,14 +3,20 @@ from events import Event
 from outcome import Strike, Ball, FoulBall, Single, Double, Triple, HomeRun, Run, DoublePlay, TriplePlay, FieldersChoice
 from playing_action import PitchInterim, PlayingAction
 from printout import compose_box_score as COMPOSE_BOX_SCORE
+from printout import compile_box_score_lines as COMPILE_BOX_SCORE_LINES
 
 
 class Game(Event):
     """A baseball game played in a baseball cosmos."""
 
     def __init__(self, series, home_team=None, away_team=None, ballpark=None, league=None, rules=None,
-                 radio=False, trace=False, debug=False):
-        """Initialize a Game object."""
+                 radio=False, trace=False, debug=False, headless=False):
+        """Initialize a Game object.
+
+        @param headless: Whether to play this game in fast-sim mode, which resolves the same at-bats and
+                         records the same statistics, but attracts no audience, broadcasts no radio
+                         call, and prints nothing (trace and debug are ignored).
+        """
         # Save metadata
         self.series = series
         self.home_team = series.home_team if series else home_team
@@ -19,63 +25,72 @@ class Game(Event):
         self.cosmos = self.home_team.city.cosmos
         # This will collect metadata about the date, etc.
         super(Game, self).__init__(cosmos=self.cosmos)
-        # If it's a league game, record the game
-        if self.home_team.league is self.away_team.league:
-            self.home_team.season.games.append(self)
-            self.away_team.season.games.append(self)
-        # Update schedule
-        if series:
-            series.record_game(game=self)
-        # Turn debug or trace parameters on or off
-        self.debug = debug
-        self.trace = trace
-        # Determine ballpark, league, rules of play, and umpire
-        self.ballpark = self.home_team.ballpark if not ballpark else ballpark  # In case of neutral field
-        self.field = self.ballpark.field
-        self.league = self.home_team.league if not league else league  # In case of non-league play
-        self.rules = self.league.classification.rules if not rules else rules  # In case of weird rules jazz
-        self.umpire = self.league.assign_umpire()
-        # Determine the salience of this game
-        self.salience = self._init_determine_salience()
-        # Attract an audience of people to come to the ballpark for the game
-        self._init_attract_audience()
-        # Record that audience (include stadium workers, but not players/members of the
-        # teams themselves, who can be recognized by their routine.occasion being set
-        # to 'baseball')
-        self.audience = {
-            p.fan for p in self.ballpark.people_here_now if p.routine.occasion != 'baseball'
-        }
-        for fan in self.audience:
-            fan.attend_game(game=self)
-        # Prepare for game
-        self.score = [0, 0]  # [away_team_score, home_team_score]
-        self.winner = None
-        self.loser = None
-        self.innings = []
-        self.left_on_base = {self.home_team: [], self.away_team: []}
-        self.player_composures_before = {}
-        for player in self.away_team.players | self.home_team.players:
-            self.player_composures_before[player] = player.person.mood.composure
-        # Prepare the radio broadcast, if applicable (this is my testbed for situated
-        # procedural sports commentary)
-        if radio:
-            self.radio_announcer = random.choice(list(self.ballpark.city.residents))
-        else:
-            self.radio_announcer = None
-        if self.radio_announcer:
-            self.radio_announcer.call_pregame(game=self)
+        # Everything up to the first pitch is timed apart from the play itself
+        with self.cosmos.instrumentation.timer('game: construct'):
+            # Record the game in the teams' seasons and in the schedule
+            self.record()
+            # Turn debug or trace parameters on or off
+            self.headless = headless
+            self.debug = debug and not headless
+            self.trace = trace and not headless
+            # Determine ballpark, league, rules of play, and umpire
+            self.ballpark = self.home_team.ballpark if not ballpark else ballpark  # In case of neutral field
+            self.field = self.ballpark.field
+            self.league = self.home_team.league if not league else league  # In case of non-league play
+            self.rules = self.league.classification.rules if not rules else rules  # In case of weird rules jazz
+            self.umpire = self.league.assign_umpire()
+            # The minds of the people at the ballpark wander during the game (see PitchInterim), but
+            # they draw from a stream of their own, so that the play doesn't depend on the audience
+            self.wandering_minds_stream = self.cosmos.random_streams.stream(
+                'wandering-minds:{}'.format(self.event_number), retain=False
+            )
+            # Determine the salience of this game
+            self.salience = self._init_determine_salience()
+            if headless:
+                # Games played in fast-sim mode are played to an empty ballpark
+                self.audience = set()
+            else:
+                # Attract an audience of people to come to the ballpark for the game
+                self._init_attract_audience()
+                # Record that audience (include stadium workers, but not players/members of the
+                # teams themselves, who can be recognized by their routine.occasion being set
+                # to 'baseball')
+                self.audience = {
+                    p.fan for p in self.ballpark.people_here_now if p.routine.occasion != 'baseball'
+                }
+            for fan in self.audience:
+                fan.attend_game(game=self)
+            # Prepare for game
+            self.score = [0, 0]  # [away_team_score, home_team_score]
+            self.winner = None
+            self.loser = None
+            self.innings = []
+            self.left_on_base = {self.home_team: [], self.away_team: []}
+            self.player_composures_before = {}
+            if not headless:
+                for player in self.away_team.players | self.home_team.players:
+                    self.player_composures_before[player] = player.person.mood.composure
+            # Prepare the radio broadcast, if applicable (this is my testbed for situated
+            # procedural sports commentary)
+            if radio and not headless:
+                self.radio_announcer = random.choice(list(self.ballpark.city.residents))
+            else:
+                self.radio_announcer = None
+            if self.radio_announcer:
+                self.radio_announcer.call_pregame(game=self)
         # Play the game
         self.transpire()
+        self.wandering_minds_stream = None  # Games are held onto for good, but their streams needn't be
         # TODO THIS WILL HAVE TO BE UPDATED WHEN SUBSTITUTION A THING
         for team in (self.away_team, self.home_team):
             for player in team.roster.lineup:
                 player.career.statistics.games_played.append(self)
-        # Save the box score
-        self.box_score = COMPOSE_BOX_SCORE(game=self)
+        # Save the lines of the box score; the box score itself is only composed on demand
+        self.box_score_lines = COMPILE_BOX_SCORE_LINES(game=self)
         # Potentially print the box score
         if self.trace:
             print self.box_score
-        if self.cosmos.debug:
+        if self.cosmos.debug and not headless:
             print "{winner} defeated {loser} {winner_score}-{loser_score} (att. {attendance})".format(
                 winner=self.winner.name,
                 loser=self.loser.name,
@@ -84,6 +99,19 @@ class Game(Event):
                 attendance=len(self.audience)
             )
 
+    def record(self):
+        """Record this game in its teams' seasons (if it's a league game) and in its series (if any).
+
+        This is also called when a game that was played in a worker process is merged back into
+        the simulation process (see game_pool.py).
+        """
+        if self.home_team.league is self.away_team.league:
+            self.home_team.season.games.append(self)
+            self.away_team.season.games.append(self)
+        # Update schedule
+        if self.series:
+            self.series.record_game(game=self)
+
     def __str__(self):
         """Return string representation."""
         return "{away_team} at {home_team}, {date}".format(
@@ -92,6 +120,11 @@ class Game(Event):
             date=self.date
         )
 
+    @property
+    def box_score(self):
+        """Return the box score for this game."""
+        return COMPOSE_BOX_SCORE(game=self)
+
     def _init_determine_salience(self):
         """Determine the salience of this game.
 
@@ -101,15 +134,20 @@ class Game(Event):
         return 1.0
 
     def _init_attract_audience(self):
-        """Attract an audience of people to come to the ballpark for the game."""
+        """Attract an audience of people to come to the ballpark for the game.
+
+        The audience is drawn from its own random stream, so that the game itself plays out the same
+        whether or not an audience is attracted to it (i.e., whether or not it is played headless).
+        """
         # TODO USE SALIENCE HERE
         config = self.cosmos.config
         cities_near_the_ballpark = {self.ballpark.city} | set(self.ballpark.city.nearest_cities)
-        for city in cities_near_the_ballpark:
-            for person in city.residents:
-                if person.location.city in cities_near_the_ballpark:
-                    if random.random() < config.chance_someone_goes_to_a_local_game:
-                        person.go_to(destination=self.ballpark, occasion="leisure")
+        with self.cosmos.random_streams.drawing_from('audience:{}'.format(self.event_number), retain=False):
+            for city in cities_near_the_ballpark:
+                for person in city.residents:
+                    if person.location.city in cities_near_the_ballpark:
+                        if random.random() < config.chance_someone_goes_to_a_local_game:
+                            person.go_to(destination=self.ballpark, occasion="leisure")
 
     def transpire(self):
         """Have this game be played."""
@@ -363,7 +401,8 @@ class AtBat(object):
                     elif swing.contact:
                         # ...the ball is hit!
                         self.playing_action = PlayingAction(batted_ball=swing.result)
-                        self.playing_action.enact()
+                        with self.game.cosmos.instrumentation.timer('game: playing action'):
+                            self.playing_action.enact()
                         if self.batter.safely_on_base:
                             self.resolved = True
         if self.playing_action:
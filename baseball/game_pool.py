@@ -0,0 +1,173 @@
+"""Playing a day's league games across a pool of worker processes (see League._operate_during_season()).
+
+The worker processes are forked once the day's games are due, and so each starts from a
+snapshot of the cosmos as it stands. Each worker plays the games of a single series, and
+sends back a log of the games and what they did to the world, which the simulation process
+applies one series at a time, in the order in which the series would have been played
+serially. No two of the day's series share a team, and each game draws from its own random
+stream (see League._play_game()), so the result is the same as if the games had been played
+serially. Headless games only, since an audience draws people from all over.
+
+A log holds the events that the games brought about, in order (the games among them), which
+are numbered anew as they are applied; the stat events that each participant (a player on
+either team, or an umpire) accrued, by statistic, in order; and each participant's composure
+and confidence once the games were over; and the state of play that the games left each
+participant and each team's roster in (i.e., whichever of their attributes the games set, such
+as a player's location on the field or a roster's current batter, which persist until the
+next game). The schedule is updated in
+the simulation process itself, by recording each game anew (see Game.record()).
+
+Within a log, the games refer to things that already existed before they were played (the
+teams, the players, the ballpark, and so forth) by their positions in a listing that the
+worker and the simulation process derive in the same way (see _shared_objects()); should a
+game refer to any other such thing, the worker fails loudly, rather than sending back a copy.
+"""
+
+import types
+import cPickle
+import cStringIO
+import multiprocessing
+from itertools import izip
+from utils.utilities import call_with_deep_recursion
+from game import Game
+
+# The modules whose classes make up the stuff of play (games, at-bats, pitches, outcomes, the
+# baseballs put into play, and so forth), which are created by the games themselves; every other
+# object that a log refers to must be one of the objects shared with the worker (save for classes
+# and functions, which are pickled by name), as must the equipment that players bring to a game
+# (see _shared_objects())
+PLAY_MODULES = frozenset((
+    'game', 'playing_action', 'outcome', 'call', 'play', 'batted_ball', 'trajectory', 'equipment',
+    'baseball.game', 'baseball.playing_action', 'baseball.outcome', 'baseball.call', 'baseball.play',
+    'baseball.batted_ball', 'baseball.trajectory', 'baseball.equipment',
+))
+
+# The state of the day's games that the worker processes inherit upon being forked; this
+# is a tuple (league, series being played today)
+_day = None
+
+
+def play_series_in_parallel(league, series_being_played_today, processes):
+    """Play the games in each of the given series that are scheduled for this timestep, across a pool of processes.
+
+    @param series_being_played_today: The series, in the order in which they would have been played serially.
+    @param processes: The maximum number of worker processes to play the games in.
+    """
+    global _day
+    # These are derived before any log is applied, so that they match what the workers derive
+    shared_objects = [_shared_objects(series=series) for series in series_being_played_today]
+    _day = (league, series_being_played_today)
+    pool = multiprocessing.Pool(processes=min(processes, len(series_being_played_today)))
+    try:
+        logs = pool.map(_play_series, range(len(series_being_played_today)), chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+        _day = None
+    for log, shared in izip(logs, shared_objects):
+        _apply_log(log=log, cosmos=league.cosmos, shared=shared)
+
+
+def _play_series(i):
+    """Play the games in the given series that are scheduled for this timestep, and return a log of what they did.
+
+    This is called in a worker process.
+    """
+    league, series_being_played_today = _day
+    series = series_being_played_today[i]
+    cosmos = league.cosmos
+    shared = _shared_objects(series=series)
+    participants = _participants(series=series)
+    # Participants and rosters alike keep track of the state of play (e.g., Roster.batter)
+    bearers_of_state_of_play = participants + [series.home_team.roster, series.away_team.roster]
+    states_before = [dict(bearer.__dict__) for bearer in bearers_of_state_of_play]
+    statistics_before = [
+        {name: len(value) for name, value in participant.career.statistics.__dict__.iteritems() if type(value) is list}
+        for participant in participants
+    ]
+    number_of_events_before = len(cosmos.events)
+    league.play_todays_games_in_series(series=series)
+    stat_events = []
+    for participant, lengths_before in izip(participants, statistics_before):
+        for name, number_before in sorted(lengths_before.iteritems()):
+            new_entries = getattr(participant.career.statistics, name)[number_before:]
+            if new_entries:
+                stat_events.append((participant, name, new_entries))
+    moods = [
+        (participant.person, participant.person.mood.composure, participant.person.personality.confidence)
+        for participant in participants
+    ]
+    states_of_play = []
+    for bearer, state_before in izip(bearers_of_state_of_play, states_before):
+        changes = {
+            name: value for name, value in bearer.__dict__.iteritems()
+            if name not in state_before or value is not state_before[name]
+        }
+        if changes:
+            states_of_play.append((bearer, changes))
+    log = (cosmos.events[number_of_events_before:], stat_events, moods, states_of_play)
+    return _write_log(log=log, shared=shared)
+
+
+def _write_log(log, shared):
+    """Return the given log, pickled, with every reference to a shared object replaced by its position in the listing."""
+    positions = {id(obj): position for position, obj in enumerate(shared)}
+    buffer = cStringIO.StringIO()
+    pickler = cPickle.Pickler(buffer, cPickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = lambda obj: positions.get(id(obj))
+    call_with_deep_recursion(lambda: pickler.dump(log))
+    for _, obj in pickler.memo.itervalues():
+        if isinstance(obj, (type, types.ClassType, types.FunctionType)) or not hasattr(obj, '__dict__'):
+            continue
+        if type(obj).__module__ not in PLAY_MODULES:
+            raise Exception(
+                "A game referred to {}, which is not shared with the simulation process (see "
+                "_shared_objects()), and so would be copied rather than merged.".format(obj)
+            )
+    return buffer.getvalue()
+
+
+def _apply_log(log, cosmos, shared):
+    """Apply a log of what a series' games did, which was sent back by a worker process."""
+    unpickler = cPickle.Unpickler(cStringIO.StringIO(log))
+    unpickler.persistent_load = shared.__getitem__
+    events, stat_events, moods, states_of_play = call_with_deep_recursion(unpickler.load)
+    for event in events:
+        event.event_number = cosmos.assign_event_number(new_event=event)
+        if isinstance(event, Game):
+            event.record()
+    for participant, name, new_entries in stat_events:
+        getattr(participant.career.statistics, name).extend(new_entries)
+    for person, composure, confidence in moods:
+        person.mood.composure = composure
+        person.personality.confidence = confidence
+    for bearer, state_of_play in states_of_play:
+        bearer.__dict__.update(state_of_play)
+
+
+def _participants(series):
+    """Return a list of the umpires of the league and the players on either team in the given series, in a fixed order."""
+    league = series.home_team.league
+    participants = sorted(league.umpires, key=lambda umpire: umpire.person.id)
+    for team in (series.home_team, series.away_team):
+        participants += sorted(team.players, key=lambda player: player.person.id)
+    return participants
+
+
+def _shared_objects(series):
+    """Return a list of the objects, already in existence, that the games in the given series may refer to.
+
+    The order of the list depends only on the state of the world before the games are played.
+    """
+    league = series.home_team.league
+    cosmos = league.cosmos
+    ballpark = series.home_team.ballpark
+    objects = [cosmos, league, league.season, league.classification, league.classification.rules, series]
+    objects += [ballpark, ballpark.field, ballpark.city]
+    for team in (series.home_team, series.away_team):
+        objects += [team, team.season, team.season.schedule, team.roster, team.city]
+    for participant in _participants(series=series):
+        objects += [participant, participant.person, participant.career, participant.career.statistics]
+        # Players bring their own equipment, and are named in the box score
+        objects += [getattr(participant, 'bat', None), getattr(participant, 'glove', None), participant.person.last_name]
+    return [obj for obj in objects if obj is not None]
@@ -1,6 +1,7 @@
 import random
 import math
 from random import normalvariate as normal
+from places.city_index import CityIndex
 from people.business import BaseballLeagueOffices
 from people.occupation import BaseballCommissioner, BaseballUmpire
 from history import LeagueHistory
@@ -9,6 +10,7 @@ from season import LeagueSeason
 from commissioner import Commissioner
 from umpire import Umpire
 from game import Game
+from game_pool import play_series_in_parallel
 
 # TODO  Make league activity bottom-up once the postal system is implemented -- I'm
 # TODO  thinking something like the commissioner sending a letter to city
@@ -129,13 +131,17 @@ class League(object):
         """Evaluate prospective cities for their utility to this league as a team base."""
         config = self.cosmos.config
         city_evaluations = {}
-        for prospective_city in self.country.cities:
+        prospective_cities = self.country.cities
+        distances_from_league_headquarters = CityIndex.distances_from(
+            self.headquarters.coordinates, prospective_cities
+        )
+        for i, prospective_city in enumerate(prospective_cities):
             # Calculate a base score for all cities in the cosmos
             city_evaluations[prospective_city] = config.city_utility_to_a_league(city=prospective_city)
             # If air travel is not yet prominent, penalize cities for their distance from
             # league headquarters
             if self.cosmos.year < self.cosmos.config.year_air_travel_becomes_prominent:
-                distance_between_this_city_and_league_headquarters = self.headquarters.distance_to(prospective_city)
+                distance_between_this_city_and_league_headquarters = distances_from_league_headquarters[i]
                 if distance_between_this_city_and_league_headquarters > 1:
                     city_evaluations[prospective_city] /= distance_between_this_city_and_league_headquarters
             # Also penalize the city if is already has a team (or multiple teams) in this league
@@ -247,7 +253,8 @@ class League(object):
 
     def assign_umpire(self):
         """Assign an umpire to a game."""
-        return random.choice(list(self.umpires))
+        # Umpires hash by memory address, so choose from them in a fixed order
+        return random.choice(sorted(self.umpires, key=lambda umpire: umpire.person.id))
 
     def add_to_game_queue(self, series):
         """Add a game to the queue of games that are scheduled to be played today."""
@@ -274,16 +281,52 @@ class League(object):
         """Conduct the regular in-season operations of this league."""
         if self.cosmos.ordinal_date == self.season.schedule.regular_season_terminus:
             self.season.review()  # Will kick into offseason mode by setting League.season to None
-        # Instantiate Game objects, which will cause the games to transpire
-        while self.games_scheduled_for_today:
-            series = self.games_scheduled_for_today.pop()
-            # Because of doubleheaders, this series may have multiple games that
-            # need to be played today
-            while (
-                    series.dates_scheduled and
-                    series.dates_scheduled[0] == (self.cosmos.ordinal_date, self.cosmos.time_of_day)
-            ):
-                Game(series=series)
+        # Instantiate Game objects, which will cause the games to transpire; we play the
+        # day's games in a fixed order, so that a given world will always play out the same way
+        series_being_played_today = sorted(
+            self.games_scheduled_for_today, key=lambda s: (s.home_team.name, s.away_team.name)
+        )
+        self.games_scheduled_for_today = set()
+        config = self.cosmos.config
+        if (config.league_game_processes > 1 and config.play_league_games_headless and
+                len(series_being_played_today) > 1):
+            # No two of the day's series share a team, and each game draws from its own random
+            # stream, so the series can be played in separate processes (see game_pool.py)
+            with self.cosmos.instrumentation.timer('league: parallel games', entities=len(series_being_played_today)):
+                play_series_in_parallel(
+                    league=self, series_being_played_today=series_being_played_today,
+                    processes=config.league_game_processes
+                )
+        else:
+            for series in series_being_played_today:
+                self.play_todays_games_in_series(series=series)
+
+    def play_todays_games_in_series(self, series):
+        """Play the games in the given series that are scheduled for this timestep."""
+        # Because of doubleheaders, this series may have multiple games that
+        # need to be played today
+        while (
+                series.dates_scheduled and
+                series.dates_scheduled[0] == (self.cosmos.ordinal_date, self.cosmos.time_of_day)
+        ):
+            self._play_game(series=series)
+
+    def _play_game(self, series):
+        """Play the next scheduled game in the given series.
+
+        The game is played with its own random stream, named for the game's place in the
+        schedule, so that its outcome doesn't depend on which games were played before it.
+        """
+        game_stream_name = "game:{date}:{time_of_day}:{home_team}:{away_team}:{game_number}".format(
+            date=self.cosmos.ordinal_date,
+            time_of_day=self.cosmos.time_of_day,
+            home_team=series.home_team.name,
+            away_team=series.away_team.name,
+            game_number=len(series.games)
+        )
+        with self.cosmos.random_streams.drawing_from(game_stream_name, retain=False):
+            with self.cosmos.instrumentation.timer('league: game', entities=1):
+                Game(series=series, headless=self.cosmos.config.play_league_games_headless)
 
     def process_a_retirement(self, player):
         """Handle the retirement of a player."""
@@ -86,6 +86,8 @@ class Player(object):
         self._moving_right = False
         # Set inherent baseball attributes
         self._init_baseball_attributes()
+        # Every player starts out as a free agent
+        person.cosmos.registry.record_change_in_free_agency(player=self)
 
     @property  # TODO STOPGAP
     def team(self):
@@ -924,7 +926,7 @@ class Player(object):
                 elif batted_ball.hit_to_outfield and batted_ball.horizontal_launch_angle >= 0.0:
                     # Cut off the coming throw as a potential relay man -- go to about 60% of the
                     # distance from home plate to where the ball will be fielded
-                    player_fielding_the_ball = next(f for f in self.team.players if f.playing_the_ball)
+                    player_fielding_the_ball = next(f for f in batted_ball.at_bat.fielders if f.playing_the_ball)
                     self.immediate_goal = [player_fielding_the_ball.immediate_goal[0]*0.6,
                                            player_fielding_the_ball.immediate_goal[1]*0.6]
                     playing_action.cut_off_man = self
@@ -966,7 +968,7 @@ class Player(object):
                 elif batted_ball.hit_to_outfield and batted_ball.horizontal_launch_angle < 0.0:
                     # Cut off the coming throw as a potential relay man -- go to about 60% of the
                     # distance from home plate to where the ball will be fielded
-                    player_fielding_the_ball = next(f for f in self.team.players if f.playing_the_ball)
+                    player_fielding_the_ball = next(f for f in batted_ball.at_bat.fielders if f.playing_the_ball)
                     self.immediate_goal = [player_fielding_the_ball.immediate_goal[0]*0.6,
                                            player_fielding_the_ball.immediate_goal[1]*0.6]
                     playing_action.cut_off_man = self
@@ -1003,7 +1005,7 @@ class Player(object):
                         # Back up the catch -- do this by making a goal to go to where the batted ball
                         # will be four-six timesteps later on its trajectory if it were to continue
                         # on it uninterrupted by the fielder playing the ball's fielding attempt
-                        fielder_playing_the_ball = next(f for f in self.team.players if f.playing_the_ball)
+                        fielder_playing_the_ball = next(f for f in batted_ball.at_bat.fielders if f.playing_the_ball)
                         timestep_i_will_shoot_for = fielder_playing_the_ball.timestep_of_planned_fielding_attempt
                         for i in xrange(5):
                             timestep_i_will_shoot_for += 0.1
@@ -1045,7 +1047,7 @@ class Player(object):
                         # Back up the catch -- do this by making a goal to go to where the batted ball
                         # will be four-six timesteps later on its trajectory if it were to continue
                         # on it uninterrupted by the fielder playing the ball's fielding attempt
-                        fielder_playing_the_ball = next(f for f in self.team.players if f.playing_the_ball)
+                        fielder_playing_the_ball = next(f for f in batted_ball.at_bat.fielders if f.playing_the_ball)
                         timestep_i_will_shoot_for = fielder_playing_the_ball.timestep_of_planned_fielding_attempt
                         for i in xrange(5):
                             timestep_i_will_shoot_for += 0.1
@@ -1088,7 +1090,7 @@ class Player(object):
                         # Back up the catch -- do this by making a goal to go to where the batted ball
                         # will be four-six timesteps later on its trajectory if it were to continue
                         # on it uninterrupted by the fielder playing the ball's fielding attempt
-                        fielder_playing_the_ball = next(f for f in self.team.players if f.playing_the_ball)
+                        fielder_playing_the_ball = next(f for f in batted_ball.at_bat.fielders if f.playing_the_ball)
                         timestep_i_will_shoot_for = fielder_playing_the_ball.timestep_of_planned_fielding_attempt
                         for i in xrange(5):
                             timestep_i_will_shoot_for += 0.1
@@ -1,4 +1,5 @@
 from outcome import Run
+from utils.utilities import drawing_from_stream
 
 
 # IDEA: HAVE EVERY UNIT OF ACTION THAT OCCURS IN THIS SIMULATION BE ASSOCIATED WITH
@@ -57,15 +58,18 @@ class PlayingAction(object):
     def enact(self):
         batted_ball = self.batted_ball
         self.throw = None
+        # Look these up once, rather than at every timestep of the playing action
+        trace = self.at_bat.game.trace
+        debug = self.at_bat.game.debug
         # Fielders read the batted ball and decide immediate goals
         batted_ball.get_read_by_fielders()
-        if self.at_bat.game.trace:
+        if trace:
             print "-- {}; Oblig: {} [0.0]".format(batted_ball, batted_ball.obligated_fielder.position)
         if self.at_bat.game.radio_announcer:
             self.at_bat.game.radio_announcer.call_batted_ball(batted_ball=batted_ball)
         for fielder in self.fielder_control_sequence:
             fielder.decide_immediate_goal(playing_action=self)
-        if self.at_bat.game.trace:
+        if trace:
             self.enumerate_defensive_responsibilities()
         for _ in xrange(4):
             batted_ball.time_since_contact += 0.1
@@ -82,7 +86,7 @@ class PlayingAction(object):
                     baserunner.baserun(playing_action=self)
         while not self.resolved:
             assert batted_ball.time_since_contact < 100, "Playing action has fallen into infinite loop."
-            if self.at_bat.game.debug:
+            if debug:
                 self.report_baserunner_progress()
             batted_ball.time_since_contact += 0.1
             if not batted_ball.fielded_by:
@@ -130,7 +134,7 @@ class PlayingAction(object):
                                     else:
                                         # Don't retreat already or stay on base -- keep tentatively
                                         # advancing in case there is another fielding gaffe
-                                        if self.at_bat.game.trace:
+                                        if trace:
                                             print (
                                                 "-- {} still doesn't believe he can beat the throw, but "
                                                 "will tentatively advance to the next base in case of "
@@ -172,7 +176,7 @@ class PlayingAction(object):
             # If the throw was in anticipation of an advancing runner and it has
             # reached its target, resolve the play at the plate
             elif self.throw and self.throw.reached_target and not self.throw.resolved:
-                if self.at_bat.game.trace:
+                if trace:
                     print "-- Throw has reached {} ({}) [{}]".format(
                         self.throw.thrown_to.person.last_name, self.throw.thrown_to.position,
                         batted_ball.time_since_contact
@@ -186,7 +190,7 @@ class PlayingAction(object):
                     if self.throw.thrown_to is not self.cut_off_man:
                         self.resolved = True
             elif self.fielder_afoot_for_putout and self.fielder_afoot_for_putout[0].at_goal:
-                if self.at_bat.game.trace:
+                if trace:
                     print "-- {} has reached {} [{}]".format(
                         self.fielder_afoot_for_putout[0].person.last_name, self.fielder_afoot_for_putout[-1],
                         batted_ball.time_since_contact
@@ -321,8 +325,11 @@ class PitchInterim(object):
         # Fielders and baserunners get in position
         for player in at_bat.fielders + at_bat.frame.baserunners + [at_bat.batter]:
             player.get_in_position(at_bat=at_bat)
-        # Minds wander
-        for person in at_bat.game.ballpark.people_here_now:
-            person.mind.wander()
+        # Minds wander; this draws from the game's stream for wandering minds, rather than from
+        # the stream that the play draws from, since whether there's an audience to do any
+        # wandering depends on whether the game is being played headless
+        with drawing_from_stream(stream=at_bat.game.wandering_minds_stream):
+            for person in at_bat.game.ballpark.people_here_now:
+                person.mind.wander()
         # Pitcher prepares delivery
         at_bat.pitcher.decide_pitch(at_bat=at_bat)
\ No newline at end of file
@@ -1,3 +1,24 @@
+def compile_box_score_lines(game):
+    """Return the lines of a game's box score as structured data.
+
+    @return: A dictionary mapping each team to a list of (last name, position, AB, R, H, 2B,
+             3B, HR, RBI, BB, SO, SB) tuples, one per player.
+    """
+    box_score_lines = {}
+    for team in (game.away_team, game.home_team):
+        box_score_lines[team] = []
+        for p in team.players:  # TODO Did I screw this up by checking the career stats?
+            box_score_lines[team].append((
+                p.person.last_name, p.position, len(p.career.statistics.at_bats),
+                len(p.career.statistics.runs), len(p.career.statistics.hits),
+                len(p.career.statistics.doubles), len(p.career.statistics.triples),
+                len(p.career.statistics.home_runs), len(p.career.statistics.rbi),
+                len(p.career.statistics.batting_walks), len(p.career.statistics.batting_strikeouts),
+                len(p.career.statistics.stolen_bases)
+            ))
+    return box_score_lines
+
+
 def compose_box_score(game):
     box_score = ''
     box_score += '\n\n'
@@ -23,57 +44,28 @@ def compose_box_score(game):
         box_score += ('\n' + game.home_team.city.name + tabs_needed +
                '   '.join(str(inning.bottom.runs) for inning in game.innings[:-1]) +
                '   -\t' + str(game.score[1]))
-    box_score += '\n\n\n\t {}\n'.format(game.away_team.name)
-    box_score += '\n\t\t\tAB\tR\tH\t2B\t3B\tHR\tRBI\tBB\tSO\tSB\tAVG'
-    for p in game.away_team.players:
-        if len(p.career.statistics.at_bats) > 0:
-            batting_avg = round(len(p.career.statistics.hits)/float(len(p.career.statistics.at_bats)), 3)
-            if batting_avg == 1.0:
-                batting_avg = '1.000'
+    for team in (game.away_team, game.home_team):
+        box_score += '\n\n\n\t {}\n'.format(team.name)
+        box_score += '\n\t\t\tAB\tR\tH\t2B\t3B\tHR\tRBI\tBB\tSO\tSB\tAVG'
+        for line in game.box_score_lines[team]:
+            last_name, at_bats, hits = line[0], line[2], line[4]
+            if at_bats > 0:
+                batting_avg = round(hits/float(at_bats), 3)
+                if batting_avg == 1.0:
+                    batting_avg = '1.000'
+                else:
+                    batting_avg = str(batting_avg)[1:]
             else:
-                batting_avg = str(batting_avg)[1:]
-        else:
-            batting_avg = '.000'
-        while len(batting_avg) < 4:
-            batting_avg += '0'
-        if len(p.person.last_name) >= 8:
-            tabs_needed = '\t'
-        else:
-            tabs_needed = '\t\t'
-        box_score += "\n{}{}{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}".format(
-            p.person.last_name, tabs_needed, p.position, len(p.career.statistics.at_bats), 
-            len(p.career.statistics.runs),
-            len(p.career.statistics.hits),
-            len(p.career.statistics.doubles), 
-            len(p.career.statistics.triples), len(p.career.statistics.home_runs), len(p.career.statistics.rbi),
-            len(p.career.statistics.batting_walks), len(p.career.statistics.batting_strikeouts), len(p.career.statistics.stolen_bases), batting_avg
-        )
-    box_score += '\n\n\n\t {}\n'.format(game.home_team.name)
-    box_score += '\n\t\t\tAB\tR\tH\t2B\t3B\tHR\tRBI\tBB\tSO\tSB\tAVG'
-    for p in game.home_team.players:
-        if len(p.career.statistics.at_bats) > 0:  # TODO Did I screw this up by checking the career stats?
-            batting_avg = round(len(p.career.statistics.hits)/float(len(p.career.statistics.at_bats)), 3)
-            if batting_avg == 1.0:
-                batting_avg = '1.000'
+                batting_avg = '.000'
+            while len(batting_avg) < 4:
+                batting_avg += '0'
+            if len(last_name) >= 8:
+                tabs_needed = '\t'
             else:
-                batting_avg = str(batting_avg)[1:]
-        else:
-            batting_avg = '.000'
-        while len(batting_avg) < 4:
-            batting_avg += '0'
-        if len(p.person.last_name) >= 8:
-            tabs_needed = '\t'
-        else:
-            tabs_needed = '\t\t'
-        box_score += "\n{}{}{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}".format(
-            p.person.last_name, tabs_needed, p.position, len(p.career.statistics.at_bats), len(p.career.statistics.runs),
-            len(p.career.statistics.hits),
-            len(p.career.statistics.doubles), len(p.career.statistics.triples), 
-            len(p.career.statistics.home_runs), len(p.career.statistics.rbi),
-            len(p.career.statistics.batting_walks), 
-            len(p.career.statistics.batting_strikeouts), 
-            len(p.career.statistics.stolen_bases), batting_avg
-        )
+                tabs_needed = '\t\t'
+            box_score += "\n{}{}{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}".format(
+                last_name, tabs_needed, *(line[1:] + (batting_avg,))
+            )
     return box_score
 
 
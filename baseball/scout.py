@@ -17,8 +17,16 @@ class Scout(object):
         city = self.team.city
         state = city.state
         country = city.country
-        free_agents = state.free_agents | set(random.sample(country.free_agents, min(1000, len(country.free_agents))))
-        free_agents = {p for p in free_agents if 16 < p.person.age < 41}
+        registry = self.person.cosmos.registry
+        free_agents_in_the_state = registry.free_agents_in(place=state)
+        free_agents_in_the_country = registry.free_agents_in(place=country)
+        # Consider every free agent of playing age in the state, along with a sample of those in the country
+        prospects = [
+            person.player for person in registry.people_aged(min_age=17, max_age=40)
+            if person.player in free_agents_in_the_country
+        ]
+        free_agents = {p for p in prospects if p in free_agents_in_the_state}
+        free_agents |= set(random.sample(prospects, min(1000, len(prospects))))
         return max(free_agents, key=lambda fa: self.grade(prospect=fa, position=position))
 
     @staticmethod
@@ -0,0 +1,444 @@
+import math
+import numpy
+
+
+# These physical parameters are the ones that BattedBall.compute_full_trajectory()
+# has always used; they are pulled out here so that a whole batch of batted balls
+# can be integrated at once
+TIMESTEP = 0.1  # Seconds of simulated time per timestep
+GRAVITY = 9.81  # Standard gravitational acceleration in m/s
+AIR_DENSITY = 1.2  # TODO change depending on weather, altitude
+DRAG_COEFFICIENT = 0.3  # TODO change depending on certain things
+BALL_CROSS_SECTIONAL_AREA = 0.004208351855042743  # In meters
+DRAG = (AIR_DENSITY * DRAG_COEFFICIENT * BALL_CROSS_SECTIONAL_AREA) / 2
+TURF_COR = 0.48  # Coefficient of restitution TODO should be field.COR[(x, y)]
+TURF_COF = 0.31  # Coefficient of friction TODO should be field.COF[(x, y)]
+FENCE_COR = 0.6  # TODO should be field.outfield_fence_COR[x] or field.foul_fence_COR[x]
+FENCE_COF = 0.15  # TODO should be field.outfield_fence_COF[x] or field.foul_fence_COF[x]
+HEIGHT_AT_CONTACT = 1.0668  # Height of the ball at point of contact, in meters
+MPH_TO_METERS_PER_SECOND = 0.44704
+METERS_PER_SECOND_TO_MPH = 2.23694
+OUNCES_TO_KILOGRAMS = 0.0283495
+METERS_TO_FEET = 3.28084
+FOUL_POLE_X = 226  # Absolute x-coordinate of each foul pole, in feet
+
+
+def compute_trajectories(exit_speeds, horizontal_launch_angles, vertical_launch_angles, ball_weights, geometry):
+    """Simulate the full trajectories of a batch of batted balls at once.
+
+    This is a vectorized form of the timestep-by-timestep physics simulation that
+    BattedBall.compute_full_trajectory() used to carry out one ball at a time: all
+    the balls in the batch are stepped forward together, each one dropping out of
+    the computation once it has stopped moving or contacted a foul pole, including
+    ground bounces and contact with the foul fences and outfield fence of the given
+    field geometry.
+
+    @param exit_speeds: Exit speeds, in mph.
+    @param horizontal_launch_angles: Horizontal launch angles, in degrees.
+    @param vertical_launch_angles: Vertical launch angles, in degrees.
+    @param ball_weights: Ball weights, in ounces.
+    @param geometry: The FieldGeometry against whose boundaries the balls will be simulated.
+    @return: A BattedBallTrajectories object.
+    """
+    exit_speeds = numpy.asarray(exit_speeds, dtype=float)
+    horizontal_launch_angles = numpy.asarray(horizontal_launch_angles, dtype=float)
+    vertical_launch_angles = numpy.asarray(vertical_launch_angles, dtype=float)
+    ball_weights = numpy.asarray(ball_weights, dtype=float)
+    n = len(exit_speeds)
+    # Set initial values at point of contact (see the note in BattedBall.compute_full_trajectory()
+    # on the difference between the physics axes and the coordinate axes)
+    x = numpy.zeros(n)
+    y = numpy.full(n, HEIGHT_AT_CONTACT)
+    v = exit_speeds * MPH_TO_METERS_PER_SECOND
+    th = numpy.radians(vertical_launch_angles)
+    vx = v * numpy.cos(th)
+    vy = v * numpy.sin(th)
+    drag_over_mass = DRAG / (ball_weights * OUNCES_TO_KILOGRAMS)
+    ax = -drag_over_mass*v*vx
+    ay = -GRAVITY-drag_over_mass*v*vy
+    # The horizontal launch angle never changes, so we only need its sine and cosine once
+    sin_horizontal_launch_angle = numpy.sin(numpy.radians(horizontal_launch_angles))
+    cos_horizontal_launch_angle = numpy.cos(numpy.radians(horizontal_launch_angles))
+    coordinate_x = numpy.zeros(n)
+    coordinate_y = numpy.zeros(n)  # Right over home plate still
+    coordinate_z = numpy.full(n, 3.5)
+    apex = numpy.zeros(n)
+    # Prepare annotations; timesteps that haven't happened (yet) are represented as
+    # NaN, and timestep indices that haven't happened (yet) as -1
+    true_distance = numpy.full(n, numpy.nan)
+    true_landing_point = numpy.zeros((n, 2))
+    hang_time = numpy.full(n, numpy.nan)
+    landing_timestep = numpy.full(n, numpy.nan)
+    second_landing_timestep = numpy.full(n, numpy.nan)
+    foul_pole_contact_index = numpy.full(n, -1, dtype=int)
+    foul_fence_contact_index = numpy.full(n, -1, dtype=int)
+    outfield_fence_contact_index = numpy.full(n, -1, dtype=int)
+    final_index = numpy.full(n, -1, dtype=int)
+    final_location = numpy.zeros((n, 2))
+    # Timesteps are accumulated in the exact same way that PlayingAction.enact() accumulates
+    # batted_ball.time_since_contact, so that they can be used as lookup keys
+    timesteps = [0.0]
+    positions = [numpy.column_stack((coordinate_x, coordinate_y, coordinate_z))]
+    speeds = [v * METERS_PER_SECOND_TO_MPH]
+    recorded = [numpy.ones(n, dtype=bool)]
+    in_flight = numpy.ones(n, dtype=bool)
+    k = 0
+    while in_flight.any():
+        # Increment time
+        last_timestep = timesteps[-1]
+        time_since_contact = last_timestep + TIMESTEP
+        timesteps.append(time_since_contact)
+        k += 1
+        # If ball hit the ground on the last timestep, make it bounce
+        grounded = in_flight & (y <= 0)
+        first_landing = grounded & numpy.isnan(true_distance)
+        true_distance[first_landing] = numpy.trunc(x[first_landing] * METERS_TO_FEET)
+        true_landing_point[first_landing, 0] = numpy.trunc(coordinate_x[first_landing])
+        true_landing_point[first_landing, 1] = numpy.trunc(coordinate_y[first_landing])
+        hang_time[first_landing] = time_since_contact
+        already_landed = ~numpy.isnan(landing_timestep)
+        landing_timestep[grounded & ~already_landed] = time_since_contact-TIMESTEP
+        second_landing_timestep[grounded & already_landed & numpy.isnan(second_landing_timestep)] = (
+            time_since_contact-TIMESTEP
+        )
+        vy = numpy.where(grounded, -vy * TURF_COR, vy)
+        vx = numpy.where(grounded, vx * TURF_COF, vx)
+        v = numpy.where(grounded, numpy.sqrt(vx**2 + vy**2), v)
+        # If a ball hit the foul pole on last timestep, make note of it -- this will be called
+        # a home run on this timestep by umpire.officiate()
+        at_foul_pole = in_flight & (
+            (numpy.abs(coordinate_x) >= FOUL_POLE_X) & (numpy.trunc(coordinate_x) == numpy.trunc(coordinate_y))
+        )
+        foul_pole_contact_index[at_foul_pole] = k-1
+        moving = in_flight & ~at_foul_pole
+        # If ball hit an outfield fence or foul fence on last timestep, make it bounce off that; as
+        # in the scalar simulation, only a ball's first contact with a fence is considered
+        checking_fences = moving & (foul_fence_contact_index == -1) & (outfield_fence_contact_index == -1)
+        contact, wall_y = geometry.fence_contact(coordinate_x, coordinate_y, coordinate_z)
+        hit_foul_fence = checking_fences & (contact == geometry.FOUL_FENCE)
+        hit_outfield_fence = checking_fences & (contact == geometry.OUTFIELD_FENCE)
+        hit_fence = hit_foul_fence | hit_outfield_fence
+        # Rewrite the coordinates of the last timestep so that coordinate-y is the exact
+        # coordinate of the wall -- otherwise it would be that a ball passed the wall and
+        # was then sucked back through it to simulate hitting it
+        positions[k-1][hit_fence, 1] = wall_y[hit_fence]
+        foul_fence_contact_index[hit_foul_fence] = k-1
+        outfield_fence_contact_index[hit_outfield_fence] = k-1
+        vx = numpy.where(hit_fence, -vx * FENCE_COR, vx)
+        vy = numpy.where(hit_fence, vy * FENCE_COF, vy)
+        v = numpy.where(hit_fence, numpy.sqrt(vx**2 + vy**2), v)
+        # Calculate new physics x and y coordinates
+        new_x = x + (vx*TIMESTEP) + (ax * TIMESTEP**2) / 2
+        new_y = y + (vy*TIMESTEP) + (ay * TIMESTEP**2) / 2
+        new_y = numpy.where(new_y < 0, 0.0, new_y)  # A necessary approximation
+        # Calculate new acceleration components
+        new_ax = -drag_over_mass*v*vx
+        new_ay = -GRAVITY-drag_over_mass*v*vy
+        # Calculate new velocity components
+        new_vx = vx + new_ax*TIMESTEP
+        new_vy = vy + new_ay*TIMESTEP
+        new_v = numpy.sqrt(new_vx**2 + new_vy**2)
+        x = numpy.where(moving, new_x, x)
+        y = numpy.where(moving, new_y, y)
+        ax = numpy.where(moving, new_ax, ax)
+        ay = numpy.where(moving, new_ay, ay)
+        vx = numpy.where(moving, new_vx, vx)
+        vy = numpy.where(moving, new_vy, vy)
+        v = numpy.where(moving, new_v, v)
+        # Calculate, convert, and record new actual ball x-, y-, z-coordinates
+        coordinate_x = numpy.where(moving, (x * sin_horizontal_launch_angle) * METERS_TO_FEET, coordinate_x)
+        coordinate_y = numpy.where(moving, (x * cos_horizontal_launch_angle) * METERS_TO_FEET, coordinate_y)
+        coordinate_z = numpy.where(moving, y * METERS_TO_FEET, coordinate_z)
+        positions.append(numpy.column_stack((coordinate_x, coordinate_y, coordinate_z)))
+        speeds.append(v * METERS_PER_SECOND_TO_MPH)
+        recorded.append(moving.copy())
+        apex = numpy.where(moving & (coordinate_z > apex), coordinate_z, apex)
+        # Balls that have now stopped (see BattedBall.compute_full_trajectory() for what that
+        # means) or that contacted a foul pole drop out of the computation; their resting data
+        # will be recorded for the following timestep
+        still_moving = (vx >= 1) | (y > 0.1524) | (time_since_contact < 0.6)
+        stopped = in_flight & (at_foul_pole | ~still_moving)
+        final_index[stopped] = k+1
+        final_location[stopped, 0] = coordinate_x[stopped]
+        final_location[stopped, 1] = coordinate_y[stopped]
+        # If the ball just landed for the first time on the last timestep, the true
+        # landing point, etc., may not have been recorded
+        never_landed = stopped & numpy.isnan(true_distance)
+        true_distance[never_landed] = numpy.trunc(x[never_landed] * METERS_TO_FEET)
+        true_landing_point[never_landed, 0] = numpy.trunc(coordinate_x[never_landed])
+        true_landing_point[never_landed, 1] = numpy.trunc(coordinate_y[never_landed])
+        hang_time[never_landed] = time_since_contact+TIMESTEP
+        landing_timestep[stopped & numpy.isnan(landing_timestep)] = (time_since_contact+TIMESTEP)-TIMESTEP
+        in_flight &= ~stopped
+    # Record resting data for the final timestep of each ball
+    timesteps.append(timesteps[-1] + TIMESTEP)
+    positions.append(numpy.zeros((n, 3)))
+    speeds.append(numpy.zeros(n))
+    recorded.append(numpy.zeros(n, dtype=bool))
+    positions = numpy.stack(positions, axis=1)
+    speeds = numpy.stack(speeds, axis=1)
+    recorded = numpy.stack(recorded, axis=1)
+    balls = numpy.arange(n)
+    positions[balls, final_index, 0] = final_location[:, 0]
+    positions[balls, final_index, 1] = final_location[:, 1]
+    positions[balls, final_index, 2] = 0.0
+    speeds[balls, final_index] = 0.0
+    recorded[balls, final_index] = True
+    return BattedBallTrajectories(
+        timesteps=timesteps, positions=positions, speeds=speeds, recorded=recorded, final_index=final_index,
+        true_distance=true_distance, true_landing_point=true_landing_point, hang_time=hang_time,
+        landing_timestep=landing_timestep, second_landing_timestep=second_landing_timestep,
+        foul_pole_contact_index=foul_pole_contact_index, foul_fence_contact_index=foul_fence_contact_index,
+        outfield_fence_contact_index=outfield_fence_contact_index, apex=apex, final_location=final_location
+    )
+
+
+def compute_trajectory(exit_speed, horizontal_launch_angle, vertical_launch_angle, ball_weight, geometry):
+    """Simulate the full trajectory of a single batted ball.
+
+    This carries out the same physics simulation as compute_trajectories(), but with
+    plain floats, since the per-timestep overhead of array operations would dominate
+    for a batch of one (as is the case when a ball is put into play during a game);
+    the result is a BattedBallTrajectories object holding just this one ball.
+    """
+    x, y = 0.0, HEIGHT_AT_CONTACT
+    v = exit_speed * MPH_TO_METERS_PER_SECOND
+    th = math.radians(vertical_launch_angle)
+    vx = v * math.cos(th)
+    vy = v * math.sin(th)
+    drag_over_mass = DRAG / (ball_weight * OUNCES_TO_KILOGRAMS)
+    ax = -drag_over_mass*v*vx
+    ay = -GRAVITY-drag_over_mass*v*vy
+    sin_horizontal_launch_angle = math.sin(math.radians(horizontal_launch_angle))
+    cos_horizontal_launch_angle = math.cos(math.radians(horizontal_launch_angle))
+    coordinate_x, coordinate_y, coordinate_z = 0.0, 0.0, 3.5
+    apex = 0.0
+    true_distance = true_landing_point = hang_time = None
+    landing_timestep = second_landing_timestep = None
+    foul_pole_contact_index = foul_fence_contact_index = outfield_fence_contact_index = -1
+    time_since_contact = 0.0
+    timesteps = [time_since_contact]
+    positions = [[coordinate_x, coordinate_y, coordinate_z]]
+    speeds = [v * METERS_PER_SECOND_TO_MPH]
+    recorded = [True]
+    while (vx >= 1 or y > 0.1524 or time_since_contact < 0.6) and foul_pole_contact_index == -1:
+        k = len(timesteps)
+        time_since_contact += TIMESTEP
+        timesteps.append(time_since_contact)
+        # If ball hit the ground on the last timestep, make it bounce
+        if y <= 0:
+            if true_distance is None:
+                true_distance = int(x * METERS_TO_FEET)
+                true_landing_point = int(coordinate_x), int(coordinate_y)
+                hang_time = time_since_contact
+            if not landing_timestep:
+                landing_timestep = time_since_contact-TIMESTEP
+            elif not second_landing_timestep:
+                second_landing_timestep = time_since_contact-TIMESTEP
+            vy = -vy * TURF_COR
+            vx *= TURF_COF
+            v = math.sqrt(vx**2 + vy**2)
+        # If a ball hit the foul pole on last timestep, make note of it
+        if abs(coordinate_x) >= FOUL_POLE_X and int(coordinate_x) == int(coordinate_y):
+            foul_pole_contact_index = k-1
+            positions.append(None)
+            speeds.append(None)
+            recorded.append(False)
+            continue
+        # If ball hit an outfield fence or foul fence on last timestep, make it bounce off that
+        if foul_fence_contact_index == outfield_fence_contact_index == -1:
+            contact, wall_y = geometry.fence_contact(coordinate_x, coordinate_y, coordinate_z)
+            if contact != geometry.NO_CONTACT:
+                positions[k-1][1] = wall_y
+                if contact == geometry.FOUL_FENCE:
+                    foul_fence_contact_index = k-1
+                else:
+                    outfield_fence_contact_index = k-1
+                vx = -vx * FENCE_COR
+                vy *= FENCE_COF
+                v = math.sqrt(vx**2 + vy**2)
+        # Calculate new physics x and y coordinates, acceleration, and velocity
+        x += (vx*TIMESTEP) + (ax * TIMESTEP**2) / 2
+        y += (vy*TIMESTEP) + (ay * TIMESTEP**2) / 2
+        if y < 0:
+            y = 0  # A necessary approximation
+        ax = -drag_over_mass*v*vx
+        ay = -GRAVITY-drag_over_mass*v*vy
+        vx += ax*TIMESTEP
+        vy += ay*TIMESTEP
+        v = math.sqrt(vx**2 + vy**2)
+        # Calculate, convert, and record new actual ball x-, y-, z-coordinates
+        coordinate_x = (x * sin_horizontal_launch_angle) * METERS_TO_FEET
+        coordinate_y = (x * cos_horizontal_launch_angle) * METERS_TO_FEET
+        coordinate_z = y * METERS_TO_FEET
+        positions.append([coordinate_x, coordinate_y, coordinate_z])
+        speeds.append(v * METERS_PER_SECOND_TO_MPH)
+        recorded.append(True)
+        if coordinate_z > apex:
+            apex = coordinate_z
+    # Record resting data for a final timestep
+    time_since_contact += TIMESTEP
+    timesteps.append(time_since_contact)
+    positions.append([coordinate_x, coordinate_y, 0.0])
+    speeds.append(0.0)
+    recorded.append(True)
+    if true_distance is None:
+        true_distance = int(x * METERS_TO_FEET)
+        true_landing_point = int(coordinate_x), int(coordinate_y)
+        hang_time = time_since_contact
+    if not landing_timestep:
+        landing_timestep = time_since_contact-TIMESTEP
+    if foul_pole_contact_index != -1:
+        # Fill in the timestep that was skipped due to foul-pole contact
+        positions[-2], speeds[-2] = positions[-3], speeds[-3]
+    return BattedBallTrajectories(
+        timesteps=timesteps, positions=numpy.array([positions]), speeds=numpy.array([speeds]),
+        recorded=numpy.array([recorded]), final_index=numpy.array([len(timesteps)-1]),
+        true_distance=numpy.array([true_distance], dtype=float),
+        true_landing_point=numpy.array([true_landing_point], dtype=float),
+        hang_time=numpy.array([hang_time]),
+        landing_timestep=numpy.array([landing_timestep]),
+        second_landing_timestep=numpy.array([numpy.nan if second_landing_timestep is None else second_landing_timestep]),
+        foul_pole_contact_index=numpy.array([foul_pole_contact_index]),
+        foul_fence_contact_index=numpy.array([foul_fence_contact_index]),
+        outfield_fence_contact_index=numpy.array([outfield_fence_contact_index]),
+        apex=numpy.array([apex]), final_location=numpy.array([[coordinate_x, coordinate_y]])
+    )
+
+
+class BattedBallTrajectories(object):
+    """The full trajectories of a batch of batted balls, as computed by compute_trajectories().
+
+    All per-timestep data is held in arrays with one row per ball and one column per
+    timestep; columns at which a ball had no recorded position (because it had already
+    stopped or, in the case of foul-pole contact, because its trajectory was cut
+    short) are masked out by self.recorded.
+    """
+
+    def __init__(self, timesteps, positions, speeds, recorded, final_index, true_distance, true_landing_point,
+                 hang_time, landing_timestep, second_landing_timestep, foul_pole_contact_index,
+                 foul_fence_contact_index, outfield_fence_contact_index, apex, final_location):
+        """Initialize a BattedBallTrajectories object."""
+        self.timesteps = timesteps  # List of timesteps shared by all the balls
+        self.positions = positions  # (n_balls, n_timesteps, 3) array of x-, y-, z-coordinates in feet
+        self.speeds = speeds  # (n_balls, n_timesteps) array of speeds in mph
+        self.recorded = recorded  # (n_balls, n_timesteps) mask of timesteps each ball has data for
+        self.final_index = final_index  # Index of the timestep at which each ball came to rest
+        self.true_distance = true_distance
+        self.true_landing_point = true_landing_point
+        self.hang_time = hang_time
+        self.landing_timestep = landing_timestep
+        self.second_landing_timestep = second_landing_timestep
+        self.foul_pole_contact_index = foul_pole_contact_index
+        self.foul_fence_contact_index = foul_fence_contact_index
+        self.outfield_fence_contact_index = outfield_fence_contact_index
+        self.apex = apex
+        self.final_location = final_location
+
+    def __len__(self):
+        """Return the number of balls in this batch."""
+        return len(self.final_index)
+
+    def select(self, i):
+        """Return a BattedBallTrajectories object holding only the ith ball in this batch."""
+        end = self.final_index[i]+1
+        return BattedBallTrajectories(
+            timesteps=self.timesteps[:end], positions=self.positions[i:i+1, :end].copy(),
+            speeds=self.speeds[i:i+1, :end].copy(), recorded=self.recorded[i:i+1, :end].copy(),
+            final_index=self.final_index[i:i+1].copy(), true_distance=self.true_distance[i:i+1].copy(),
+            true_landing_point=self.true_landing_point[i:i+1].copy(), hang_time=self.hang_time[i:i+1].copy(),
+            landing_timestep=self.landing_timestep[i:i+1].copy(),
+            second_landing_timestep=self.second_landing_timestep[i:i+1].copy(),
+            foul_pole_contact_index=self.foul_pole_contact_index[i:i+1].copy(),
+            foul_fence_contact_index=self.foul_fence_contact_index[i:i+1].copy(),
+            outfield_fence_contact_index=self.outfield_fence_contact_index[i:i+1].copy(),
+            apex=self.apex[i:i+1].copy(), final_location=self.final_location[i:i+1].copy()
+        )
+
+    def position_table(self, i):
+        """Return a TimestepTable of the positions of the ith ball in this batch."""
+        end = self.final_index[i]+1
+        return TimestepTable(
+            timesteps=self.timesteps, values=self.positions[i, :end], recorded=self.recorded[i, :end]
+        )
+
+    def speed_table(self, i):
+        """Return a TimestepTable of the speeds of the ith ball in this batch."""
+        end = self.final_index[i]+1
+        return TimestepTable(
+            timesteps=self.timesteps, values=self.speeds[i, :end], recorded=self.recorded[i, :end]
+        )
+
+    def contact_timestep(self, contact_indices, i):
+        """Return the timestep at which the ith ball made some contact, or None if it never did."""
+        index = contact_indices[i]
+        return self.timesteps[index] if index != -1 else None
+
+    @staticmethod
+    def timestep_or_none(value):
+        """Return the given array value as a float, or None if it is NaN."""
+        return None if math.isnan(value) else float(value)
+
+
+class TimestepTable(object):
+    """A read-mostly mapping of a batted ball's timesteps to its data at those timesteps.
+
+    This stands in for the dictionaries that BattedBall used to populate at every
+    timestep of its trajectory (e.g., batted_ball.position_at_timestep): lookups
+    are served directly from a row of a BattedBallTrajectories array, and writes
+    (made by BattedBall.move() once a fielder has touched the ball or the ball has
+    come to rest) are kept in a small overlay. As with the dictionaries, a timestep
+    is only found if it exactly matches one that was accumulated during the
+    simulation.
+    """
+
+    def __init__(self, timesteps, values, recorded):
+        """Initialize a TimestepTable object."""
+        self.timesteps = timesteps
+        self.values = values
+        self.recorded = recorded
+        self.overwritten = {}
+
+    def __contains__(self, timestep):
+        """Return whether there is data for the given timestep."""
+        return timestep in self.overwritten or self._index(timestep) is not None
+
+    def __getitem__(self, timestep):
+        """Return the data for the given timestep."""
+        if timestep in self.overwritten:
+            return self.overwritten[timestep]
+        index = self._index(timestep)
+        if index is None:
+            raise KeyError(timestep)
+        if self.values.ndim == 1:
+            return float(self.values[index])
+        return tuple(self.values[index].tolist())
+
+    def __setitem__(self, timestep, value):
+        """Overwrite the data for the given timestep."""
+        self.overwritten[timestep] = value
+
+    def __iter__(self):
+        """Iterate over the timesteps for which there is data."""
+        return iter(self.keys())
+
+    def __len__(self):
+        """Return the number of timesteps for which there is data."""
+        return len(self.keys())
+
+    def get(self, timestep, default=None):
+        """Return the data for the given timestep, or the default if there is none."""
+        return self[timestep] if timestep in self else default
+
+    def keys(self):
+        """Return a list of the timesteps for which there is data."""
+        keys = [self.timesteps[i] for i in numpy.flatnonzero(self.recorded)]
+        keys += [timestep for timestep in self.overwritten if self._index(timestep) is None]
+        return keys
+
+    def _index(self, timestep):
+        """Return the array index for the given timestep, or None if there is no data for it."""
+        index = int(round(timestep/TIMESTEP))
+        if 0 <= index < len(self.recorded) and self.timesteps[index] == timestep and self.recorded[index]:
+            return index
+        return None
@@ -0,0 +1,73 @@
+"""Benchmark the memory that a cosmos takes up, century by century, with and without the person archive.
+
+Usage: python benchmark_archive.py [number of centuries] [years between reports]
+
+Each mode is simulated in a process of its own, so that their peak memory use may be compared;
+the two cosmoses share a cosmos ID, but aren't guaranteed to turn out the same. Should the
+simulation crash along the way, the memory it took up until then is reported. The memory of
+any belief facets held by archived people is not reclaimed (see PersonArchive).
+"""
+
+import gc
+import sys
+import time
+import resource
+import subprocess
+from cosmos import Cosmos
+
+# The number of centuries that are simulated, if none is given
+DEFAULT_NUMBER_OF_CENTURIES = 3
+
+
+def resident_memory():
+    """Return the resident memory of this process, in megabytes."""
+    with open('/proc/self/statm') as f:
+        pages_resident = int(f.read().split()[1])
+    return pages_resident * resource.getpagesize() / float(1 << 20)
+
+
+def simulate(number_of_centuries, years_between_reports, archive):
+    """Simulate a cosmos for the given number of centuries, and print the memory it takes up as it goes."""
+    cosmos = Cosmos(debug=False, cosmos_id='3')
+    cosmos.config.archive_deceased_and_departed_people = archive
+    cosmos.archive.enabled = archive
+    start = time.time()
+    until = cosmos.year + 100*number_of_centuries
+    while cosmos.year < until:
+        try:
+            cosmos.progress(until=min(cosmos.year+years_between_reports, until))
+        except Exception as error:
+            print "archive={}, {}: the simulation crashed ({!r})".format(archive, cosmos.date, error)
+            report(cosmos=cosmos, archive=archive, start=start)
+            return
+        report(cosmos=cosmos, archive=archive, start=start)
+
+
+def report(cosmos, archive, start):
+    """Print the memory that this process takes up, along with the size of the cosmos and its archive."""
+    gc.collect()
+    print "archive={}, {}: {}s; {} people ever; {} archived ({} MB on disk); {} MB resident, {} MB peak".format(
+        archive, cosmos.year, int(time.time()-start), len(cosmos.registry.people), len(cosmos.archive),
+        round(cosmos.archive.size / float(1 << 20), 1), round(resident_memory(), 1),
+        round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+    )
+    sys.stdout.flush()
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) > 3:
+        # This is a child process simulating a single mode
+        simulate(
+            number_of_centuries=int(sys.argv[1]), years_between_reports=int(sys.argv[2]),
+            archive=sys.argv[3] == 'archive'
+        )
+        return
+    number_of_centuries = sys.argv[1] if len(sys.argv) > 1 else str(DEFAULT_NUMBER_OF_CENTURIES)
+    years_between_reports = sys.argv[2] if len(sys.argv) > 2 else '100'
+    for mode in ('no-archive', 'archive'):
+        subprocess.check_call([sys.executable, __file__, number_of_centuries, years_between_reports, mode])
+
+
+if __name__ == '__main__':
+    main()
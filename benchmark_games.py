@@ -0,0 +1,64 @@
+"""Benchmark games/second with and without fast-sim (headless) mode.
+
+Usage: python benchmark_games.py [snapshot path] [number of games]
+
+The snapshot must hold a cosmos with a league that is in season; if none is given, a young
+cosmos is simulated and a league is founded in it, which takes a little while. Both modes
+play the same games, starting from the same snapshot, and so the play itself is the same
+(see Game._init_attract_audience() and PitchInterim); only the work that surrounds it differs.
+"""
+
+import os
+import sys
+import time
+import tempfile
+from cosmos import Cosmos
+from baseball.game import Game
+from baseball.league import League
+from baseball.season import LeagueSeason
+
+
+def snapshot_a_cosmos_with_a_league(path):
+    """Simulate a young cosmos, found a league in it, schedule its first season, and save a snapshot of it."""
+    cosmos = Cosmos(cosmos_id='3')
+    cosmos.progress(until=1628)
+    # Found the league in the biggest city that can field an even number of teams
+    for city in sorted(cosmos.cities, key=lambda c: -len(c.residents)):
+        league = League(city, cosmos.baseball_classifications[0])
+        if len(league.teams) >= 4 and len(league.teams) % 2 == 0:
+            break
+        cosmos.leagues.remove(league)
+    LeagueSeason(league=league)
+    cosmos.save(path)
+
+
+def games_per_second(snapshot_path, number_of_games, headless):
+    """Return how many games per second are played, in the given mode, in the cosmos in the given snapshot."""
+    cosmos = Cosmos.load(snapshot_path)
+    cosmos.debug = False
+    teams = sorted(cosmos.leagues[0].teams, key=lambda team: team.name)
+    start = time.time()
+    for i in xrange(number_of_games):
+        # Every pairing of teams plays in turn, each game drawing from its own stream
+        home_team, away_team = teams[i % len(teams)], teams[(i+1) % len(teams)]
+        with cosmos.random_streams.drawing_from('benchmark-game:{}'.format(i), retain=False):
+            Game(series=None, home_team=home_team, away_team=away_team, headless=headless)
+    return number_of_games / (time.time()-start)
+
+
+def main():
+    """Run the benchmark."""
+    number_of_games = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    if len(sys.argv) > 1:
+        snapshot_path = sys.argv[1]
+    else:
+        snapshot_path = os.path.join(tempfile.mkdtemp(), 'league.snapshot')
+        snapshot_a_cosmos_with_a_league(path=snapshot_path)
+    for headless in (False, True):
+        print "headless={}: {} games/second".format(
+            headless, round(games_per_second(snapshot_path, number_of_games, headless), 2)
+        )
+
+
+if __name__ == '__main__':
+    main()
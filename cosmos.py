@@ -1,34 +1,50 @@
+import os
+import time
+import hashlib
 import random
 import datetime
 from utils.config import Config
+from utils.utilities import RandomStreams, Calendar, timesteps_until_next_occurrence
+from utils.instrumentation import Instrumentation
 from data import CityData
 from places.city import City
+from places.city_index import CityIndex
 from places.country import Country
 from people.business import *
 from people.productionist import Productionist
+from people.registry import PopulationRegistry
+from people.archive import PersonArchive
+from people.relationship import InteractionBatch
+from people.social_interaction import SocialInteractionEngine
 from people.thought import Thoughts, ThoughtPrototype
 from baseball.classification import Class, InformalPlay
-
-CHANCE_OF_A_DAY_BEING_SIMULATED = 0.005
+from baseball.batted_ball import BattedBall, TrajectoryCache
+from snapshot import write_snapshot, read_snapshot, write_checkpoint, read_checkpoint, snapshot_chunks
 
 
 class Cosmos(object):
     """A baseball cosmos."""
 
-    def __init__(self, debug=True):
-        """Initialize a Cosmos object."""
+    def __init__(self, debug=True, cosmos_id=None):
+        """Initialize a Cosmos object.
+
+        @param cosmos_id: An eight-digit cosmos ID, which seeds all randomness in the cosmos; passing
+                          the ID of an earlier cosmos will reproduce it. If None, one is drawn at random.
+        """
         self.debug = debug
         # Determine and display an official Baseball Cosmos ID :)
-        self.id = self._init_cosmos_id()
+        self.id = cosmos_id if cosmos_id is not None else self._init_cosmos_id()
         if debug:
             print "Preparing {self}...".format(self=self)
-        # Load the config parameters
-        self.config = Config()
-        # Prepare Thoughts class
-        Thoughts.thought_prototypes = [
-            ThoughtPrototype(tag=spec[0], likelihood=spec[1], preconditions=spec[2], effects=spec[3])
-            for spec in self.config.thought_prototype_specifications
-        ]
+        # Prepare the random streams that each subsystem draws from; the global random
+        # module is the world-generation stream, and the others are swapped in as needed
+        # by RandomStreams.drawing_from()
+        self.random_streams = RandomStreams(root_seed=self.id)
+        random.seed(self.random_streams.seed_for('world'))
+        # Load the config parameters and prepare class-level resources
+        self._init_load_config()
+        # Prepare the timers and counters that record where the simulation spends its time
+        self.instrumentation = Instrumentation(cosmos=self, enabled=self.config.instrument_simulation)
         # Load the city data (specifies data about all cities that will eventually
         # be established in this simulation)
         self.city_data = CityData()
@@ -40,6 +56,16 @@ class Cosmos(object):
         # which affords a persistent ID for each person
         self.current_person_id = 0
         self.current_place_id = 0
+        # Prepare the registry of everyone who has ever lived in the cosmos, which maintains
+        # indexes over residents and workers so that they need not be rebuilt from scratch
+        self.registry = PopulationRegistry()
+        # Prepare the disk-backed archive to which long-deceased and long-departed people are evicted
+        self.archive = PersonArchive(
+            cosmos=self, enabled=self.config.archive_deceased_and_departed_people,
+            years_before_archiving=self.config.years_before_archiving_deceased_and_departed_people,
+            directory=self.config.person_archive_directory,
+            max_dead_space_fraction=self.config.person_archive_max_dead_space_fraction
+        )
         # Determine whether baseball curses are real in this baseball cosmos
         self.curses_are_real = random.random() < self.config.chance_baseball_curses_are_real
         # Prepare attributes relating to time
@@ -52,6 +78,9 @@ class Cosmos(object):
         self.day = datetime.date(*self.config.date_worldgen_begins).day
         self.time_of_day = 'day'
         self.date = self.get_date()
+        # Prepare a calendar of future work, with which subsystems register the timesteps at
+        # which they will next need attention (see Cosmos.timestep for how these are keyed)
+        self.calendar = Calendar()
         # Prepare a listing of all in-game events, which will facilitate debugging later
         self.events = []
         # A game's event number allows the precise ordering of events that
@@ -74,6 +103,7 @@ class Cosmos(object):
         self.countries = []
         self.states = []
         self.cities = []
+        self.city_index = CityIndex()  # Supports queries for nearest cities, etc.
         # Instantiate a first country
         Country(name='United States of America', cosmos=self)
         # Prepare baseball-centric attributes
@@ -84,6 +114,26 @@ class Cosmos(object):
         ]
         self.leagues = []  # Leagues based here
 
+    def _init_load_config(self):
+        """Load the config parameters and prepare the class-level resources that they specify."""
+        self.config = Config()
+        # Prepare Thoughts class
+        Thoughts.thought_prototypes = [
+            ThoughtPrototype(tag=spec[0], likelihood=spec[1], preconditions=spec[2], effects=spec[3])
+            for spec in self.config.thought_prototype_specifications
+        ]
+        # Prepare the batted-ball trajectory cache, if one is to be used
+        if self.config.use_trajectory_cache:
+            BattedBall.trajectory_cache = TrajectoryCache(
+                max_entries=self.config.trajectory_cache_max_entries,
+                exit_speed_quantum=self.config.trajectory_cache_exit_speed_quantum,
+                launch_angle_quantum=self.config.trajectory_cache_launch_angle_quantum,
+                ball_weight_quantum=self.config.trajectory_cache_ball_weight_quantum,
+                path=self.config.path_to_trajectory_table
+            )
+        else:
+            BattedBall.trajectory_cache = None
+
     @staticmethod
     def _init_cosmos_id():
         """Randomly determine an eight-digit cosmos ID."""
@@ -93,24 +143,89 @@ class Cosmos(object):
         """Return string representation."""
         return "Baseball Cosmos {cosmos_id}".format(cosmos_id=self.id)
 
+    def __getstate__(self):
+        """Return the state of this cosmos to be pickled.
+
+        The config and the NLG module are left out, since they hold functions that can't be
+        pickled (and since a loaded cosmos should run with the current config and grammar anyway);
+        the state of the global random module, which is the world-generation stream, is pickled
+        along with the cosmos.
+        """
+        state = dict(self.__dict__)
+        del state['config']
+        del state['productionist']
+        state['world_random_state'] = random.getstate()
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state of a pickled cosmos."""
+        random.setstate(state.pop('world_random_state'))
+        self.__dict__.update(state)
+        self._init_load_config()
+        self.productionist = Productionist(game=self)
+
+    def save(self, path):
+        """Save a snapshot of this cosmos to the given path, from which it may be loaded by Cosmos.load().
+
+        Mental models are saved as they are, without first being settled (see MentalModel.settle()),
+        since settling draws random numbers, and saving must not change how the cosmos unfolds;
+        any deterioration that has accrued is carried out once they are consulted after loading.
+        To save a snapshot that holds the beliefs that people hold as of now, call
+        settle_all_beliefs() first.
+        """
+        with open(path, 'wb') as snapshot_file:
+            write_snapshot(cosmos=self, snapshot_file=snapshot_file)
+
+    def settle_all_beliefs(self):
+        """Carry out all the belief deterioration that has accrued in the mental models of everyone in the cosmos.
+
+        Deterioration is otherwise only carried out for a mental model when it is about to be
+        read or to receive new evidence (see MentalModel.settle()). The draws are made from a
+        stream of their own, so that settling everything does not perturb the draws made by the
+        rest of the simulation. People who have been archived are skipped, as their mental models
+        get settled once they are rehydrated and consulted.
+        """
+        with self.random_streams.drawing_from('belief settling'):
+            for person_id in sorted(self.registry.people):
+                person = self.registry.people[person_id]
+                if not person.archived:
+                    mental_models = sorted(
+                        person.mind.mental_models.itervalues(),
+                        key=lambda mental_model: (type(mental_model).__name__, mental_model.subject.id)
+                    )
+                    for mental_model in mental_models:
+                        mental_model.settle()
+
+    @staticmethod
+    def load(path):
+        """Load and return a cosmos from a snapshot that was saved by Cosmos.save()."""
+        with open(path, 'rb') as snapshot_file:
+            return read_snapshot(snapshot_file=snapshot_file, path=path)
+
     @property
     def people(self):
         """Return a list of all people living in the game world."""
         return list(self.residents)
 
+    @property
+    def timestep(self):
+        """Return the current timestep, which counts up by one for each day and each night."""
+        return self.ordinal_date*2 + (0 if self.time_of_day == 'day' else 1)
+
     @property
     def residents(self):
         """Return a list of all people living in the game world."""
-        residents = []
-        for country in self.countries:
-            residents += list(country.residents)
-        return residents
+        return list(self.registry.residents())
 
     @property
     def random_person(self):
         """Return a random person living in this game world."""
         random_country = random.choice(self.countries)
-        return random.choice(list(random_country.residents))
+        return random_country.random_person
+
+    def find_by_id(self, person_id):
+        """Return the person with the given ID, whether living, deceased, or departed, or None if there is none."""
+        return self.registry.people.get(person_id)
 
     @property
     def major_league_team_nicknames(self):
@@ -140,10 +255,12 @@ class Cosmos(object):
         month, day = datetime_object.month, datetime_object.day
         return month, day, ordinal_date
 
-    def get_date(self, ordinal_date=None):
+    def get_date(self, ordinal_date=None, time_of_day=None):
         """Return a pretty-printed date for ordinal date."""
         if not ordinal_date:
             ordinal_date = self.ordinal_date
+        if not time_of_day:
+            time_of_day = self.time_of_day
         year = datetime.date.fromordinal(ordinal_date).year
         month = datetime.date.fromordinal(ordinal_date).month
         day = datetime.date.fromordinal(ordinal_date).day
@@ -154,12 +271,21 @@ class Cosmos(object):
         date = "{} of {} {}, {}".format(
             # Note: for retconning, the time of day will always be whatever the actual time of day
             # is at the beginning of the true simulation ("day", I assume), but this shouldn't matter
-            self.time_of_day.title(), month_ordinals_to_names[month], day, year
+            time_of_day.title(), month_ordinals_to_names[month], day, year
         )
         return date
 
-    def progress(self, until=None):
-        """Progress the cosmos until the specified date."""
+    @staticmethod
+    def resume(checkpoint_directory):
+        """Load and return the cosmos saved in the latest checkpoint in the given directory."""
+        return read_checkpoint(path=Checkpointer.latest_checkpoint(directory=checkpoint_directory))
+
+    def progress(self, until=None, checkpointer=None):
+        """Progress the cosmos until the specified date.
+
+        @param checkpointer: A Checkpointer that will periodically save snapshots of the cosmos
+                             as it progresses, from which it can be resumed by Cosmos.resume().
+        """
         if not until:  # Progress one day
             until = self.ordinal_date + 1
         else:
@@ -170,21 +296,45 @@ class Cosmos(object):
         number_of_timesteps_until_then = max(1, (until-self.ordinal_date)*2)
         # JOR: TRYING WEIRD MEMORY TRICK HERE
         while number_of_timesteps_until_then > 1000:
-            self._advance_n_timesteps(n_timesteps=1000)
+            self._advance_n_timesteps(n_timesteps=1000, checkpointer=checkpointer)
             number_of_timesteps_until_then -= 1000
-        self._advance_n_timesteps(number_of_timesteps_until_then)
+        self._advance_n_timesteps(number_of_timesteps_until_then, checkpointer=checkpointer)
+
+    def _advance_n_timesteps(self, n_timesteps=1, checkpointer=None):
+        """Simulate the passing of a chunk of time at a lower fidelity than normal.
 
-    def _advance_n_timesteps(self, n_timesteps=1):
-        """Simulate the passing of a chunk of time at a lower fidelity than normal."""
+        Only the work on cities is driven by the calendar; the comment on the corresponding
+        chances in Config lists what is still done on every timestep.
+        """
+        instruments = self.instrumentation
         for i in xrange(n_timesteps):
-            self._advance_time()
+            year_before = self.year
+            with instruments.timer('tick: advance time'):
+                self._advance_time()
+            leagues_in_season = [l for l in self.leagues if l.season]
             for l in self.leagues:
-                l.operate()
-            for city in self.cities:
-                if random.random() < 0.03:
-                    city.manipulate_population()
-                if random.random() < CHANCE_OF_A_DAY_BEING_SIMULATED:
-                    self._simulate_a_timestep_in_a_city(city)
+                with self.random_streams.drawing_from('league:{}'.format(l.name)):
+                    with instruments.timer('tick: league operations', entities=1):
+                        l.operate()
+            # Only cities with work due this timestep are touched
+            for task, city in self.calendar.due(timestep=self.timestep):
+                with self.random_streams.drawing_from('city:{}'.format(city.full_name)):
+                    if task == 'manipulate population':
+                        with instruments.timer('tick: manipulate population', entities=1):
+                            city.manipulate_population()
+                    elif task == 'simulate a city day':
+                        with instruments.timer('tick: simulate a city day', entities=1):
+                            self._simulate_a_timestep_in_a_city(city)
+                    self._schedule_city_task(task=task, city=city, earliest_timestep=self.timestep+1)
+            with instruments.timer('tick: archive deceased and departed people'):
+                n_archived = self.archive.archive_anyone_due()
+            if n_archived:
+                instruments.count('tick: people archived', entities=n_archived)
+            if checkpointer:
+                checkpointer.potentially_checkpoint(
+                    cosmos=self, new_year=self.year != year_before,
+                    league_season_ended=any(not l.season for l in leagues_in_season)
+                )
 
     def _advance_time(self):
         """Advance time of day and date, if it's a new day."""
@@ -195,12 +345,12 @@ class Cosmos(object):
             new_date_tuple = datetime.date.fromordinal(self.ordinal_date)
             if new_date_tuple.year != self.year:
                 # Happy New Year
+                if self.instrumentation.enabled:
+                    self.instrumentation.write_report(year=self.year)
+                    if self.debug:
+                        print self.instrumentation.report_table(year=self.year)
                 self.true_year = new_date_tuple.year
                 self.year = new_date_tuple.year
-                if self.debug:
-                    print "Updating each city's nearest cities..."
-                for city in self.cities:
-                    city.set_nearest_cities()
             self.month = new_date_tuple.month
             self.day = new_date_tuple.day
             self.date = self.get_date()
@@ -219,91 +369,206 @@ class Cosmos(object):
             self.birthdays[(self.month, self.day)] = set()
         else:
             for person in self.birthdays[(self.month, self.day)]:
-                if person.alive:
+                # Departed people who have been archived are aged upon being rehydrated instead
+                if person.alive and not person.archived:
                     person.grow_older()
             # Don't forget leap-year babies
             if (self.month, self.day) == (3, 1):
                 for person in self.birthdays[(2, 29)]:
-                    if person.present:
+                    # Check this first, since archived people don't retain their 'present' attribute
+                    if not person.archived and person.present:
                         person.grow_older()
 
     def _handle_any_city_establishments_today(self):
         """Establish any cities that have been prescribed to be established today."""
         if self.ordinal_date in self.city_data.ordinal_dates_of_city_establishment:
             for city_specification in self.city_data.ordinal_dates_of_city_establishment.get(self.ordinal_date, set()):
-                City(cosmos=self, specification=city_specification)
+                city = City(cosmos=self, specification=city_specification)
+                with self.random_streams.drawing_from('city:{}'.format(city.full_name)):
+                    self._schedule_city_task(task='manipulate population', city=city, earliest_timestep=self.timestep)
+                    self._schedule_city_task(task='simulate a city day', city=city, earliest_timestep=self.timestep)
+
+    def _schedule_city_task(self, task, city, earliest_timestep):
+        """Schedule the next occurrence of the given recurring task for the given city.
+
+        Each of these tasks has a fixed chance of happening on any given timestep, so rather than
+        rolling for each city on every timestep, we sample how many timesteps will pass until
+        the task next happens, and put it on the calendar.
+        """
+        chance_per_timestep = (
+            self.config.chance_of_a_city_population_manipulation_on_a_timestep if task == 'manipulate population'
+            else self.config.chance_of_a_day_being_simulated_in_a_city
+        )
+        timestep = earliest_timestep + timesteps_until_next_occurrence(chance_per_timestep=chance_per_timestep)
+        self.calendar.schedule(timestep=timestep, task=task, subject=city)
 
     def _simulate_a_timestep_in_a_city(self, city):
         """Simulate a timestep in the given city."""
+        instruments = self.instrumentation
         if city.cosmos.debug:
             print "Simulating a {} in {}...".format(self.time_of_day, city.full_name)
         # Simulate birth, death, retirement, college, and moving out of parents
-        for person in list(city.residents):
-            if city.cosmos.debug:
-                print "\t...simulating birth..."
-            if person.pregnant and self.ordinal_date >= person.due_date:
-                person.give_birth()
-            if city.cosmos.debug:
-                print "\t...simulating death..."
-            if person.age > max(65, random.random() * 100):
-                person.die(cause_of_death="Natural causes")
-            if city.cosmos.debug:
-                print "\t...simulating retirement and degree conferment..."
-            elif person.occupation and person.age > max(65, random.random() * 100):
-                person.retire()
-            elif person.adult and not person.occupation:
-                if person.age > 22:
-                    person.college_graduate = True
-            if city.cosmos.debug:
-                print "\t...simulating new adults moving out..."
-            elif person.age > 18 and person not in person.home.owners:
-                person.move_out_of_parents_home()
+        with instruments.timer('city day: life events', entities=len(city.residents)):
+            for person in list(city.residents):
+                if city.cosmos.debug:
+                    print "\t...simulating birth..."
+                if person.pregnant and self.ordinal_date >= person.due_date:
+                    person.give_birth()
+                if city.cosmos.debug:
+                    print "\t...simulating death..."
+                if person.age > max(65, random.random() * 100):
+                    person.die(cause_of_death="Natural causes")
+                if city.cosmos.debug:
+                    print "\t...simulating retirement and degree conferment..."
+                elif person.occupation and person.age > max(65, random.random() * 100):
+                    person.retire()
+                elif person.adult and not person.occupation:
+                    if person.age > 22:
+                        person.college_graduate = True
+                if city.cosmos.debug:
+                    print "\t...simulating new adults moving out..."
+                elif person.age > 18 and person not in person.home.owners:
+                    person.move_out_of_parents_home()
         days_since_last_simulated_day = self.ordinal_date-city.last_simulated_day
-        # Reset all Relationship interacted_this_timestep attributes
-        for person in list(city.residents):
-            for other_person in person.relationships:
-                person.relationships[other_person].interacted_this_timestep = False
         # Have people go to the location they will be at this timestep
         if city.cosmos.debug:
                 print "\t...enacting NPC routines..."
-        for person in list(city.residents):
-            person.routine.enact()
+        with instruments.timer('city day: routines', entities=len(city.residents)):
+            for person in list(city.residents):
+                person.routine.enact()
         # Simulate sex  TODO sex outside out marriage
         if city.cosmos.debug:
                 print "\t...simulating sex..."
-        for person in list(city.residents):
-            if person.marriage and person.spouse.home is person.home:
-                chance_they_are_trying_to_conceive_this_year = (
-                    self.config.function_to_determine_chance_married_couple_are_trying_to_conceive(
-                        n_kids=len(person.marriage.children_produced)
+        with instruments.timer('city day: sex', entities=len(city.residents)):
+            for person in list(city.residents):
+                if person.marriage and person.spouse.home is person.home:
+                    chance_they_are_trying_to_conceive_this_year = (
+                        self.config.function_to_determine_chance_married_couple_are_trying_to_conceive(
+                            n_kids=len(person.marriage.children_produced)
+                        )
                     )
-                )
-                chance_they_are_trying_to_conceive_this_year /= CHANCE_OF_A_DAY_BEING_SIMULATED*365
-                if random.random() < chance_they_are_trying_to_conceive_this_year:
-                    person.have_sex(partner=person.spouse, protection=False)
+                    chance_they_are_trying_to_conceive_this_year /= (
+                        self.config.chance_of_a_day_being_simulated_in_a_city*365
+                    )
+                    if random.random() < chance_they_are_trying_to_conceive_this_year:
+                        person.have_sex(partner=person.spouse, protection=False)
         # Have people observe their surroundings, which will cause knowledge to
         # build up, and have them socialize with other people also at that location --
         # this will cause relationships to form/progress and knowledge to propagate
         if city.cosmos.debug:
                 print "\t...simulating social interactions..."
-        for person in list(city.residents):
-            if person.age > 3:
+        socializers = [person for person in city.residents if person.age > 3]
+        interactions = InteractionBatch(missing_days_to_account_for=days_since_last_simulated_day*2)
+        engine = SocialInteractionEngine(config=self.config)
+        with instruments.timer('city day: socialize', entities=len(socializers)):
+            for person in socializers:
                 # person.observe()
                 person.socialize(
                     missing_timesteps_to_account_for=days_since_last_simulated_day*2,
-                    propagate_knowledge=False
+                    propagate_knowledge=False, interactions=interactions, engine=engine
                 )
+        with instruments.timer('city day: progress relationships', entities=len(interactions)):
+            interactions.progress()
         city.last_simulated_day = self.ordinal_date
 
     def find_by_hex(self, hex_value):
-        """Return person whose ID in memory has the given hex value."""
-        int_of_hex = int(hex_value, 16)
-        try:
-            person = next(
-                # p for p in self.city.residents | self.city.deceased | self.city.departed if
-                p for p in self.people if
-                id(p) == int_of_hex
+        """Return the person (living or otherwise) whose ID in memory has the given hex value."""
+        person = self.registry.people_at_address.get(int(hex_value, 16))
+        if person is None:
+            raise Exception('There is no one with that hex ID')
+        return person
+
+
+class Checkpointer(object):
+    """An object that periodically saves checkpoints of a cosmos as it progresses.
+
+    Every so often a checkpoint is a base, which holds a full snapshot of the cosmos; every other
+    checkpoint is a delta, which only holds the chunks of the snapshot (i.e., the entities) that
+    have changed since the checkpoint before it, and otherwise refers back to earlier checkpoints
+    (see snapshot.py). Checkpointing draws no random numbers, and so doesn't change how the
+    cosmos unfolds.
+    """
+
+    def __init__(self, directory, years_between_checkpoints=1, at_league_season_ends=False,
+                 checkpoints_between_bases=10):
+        """Initialize a Checkpointer object.
+
+        @param directory: The directory that checkpoints will be saved to; it will be created if need be.
+        @param years_between_checkpoints: How many new years will be rung in between checkpoints; if
+                                          None, checkpoints are not saved on a yearly basis.
+        @param at_league_season_ends: Whether to also save a checkpoint whenever a league season ends.
+        @param checkpoints_between_bases: How many delta checkpoints will be saved between base
+                                          checkpoints, which bounds how many files a checkpoint
+                                          may depend on.
+        """
+        self.directory = directory
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.years_between_checkpoints = years_between_checkpoints
+        self.at_league_season_ends = at_league_season_ends
+        self.checkpoints_between_bases = checkpoints_between_bases
+        self.year_of_last_checkpoint = None
+        self.deltas_since_base = None  # None until the first (base) checkpoint is saved
+        # Maps the key of each chunk in the last checkpoint to a digest of that chunk and the
+        # name of the checkpoint file that holds it
+        self.chunks_on_disk = {}
+        # A record of (path, size in bytes, write latency in seconds, whether it's a base) for
+        # each checkpoint that this checkpointer has saved
+        self.log = []
+
+    @staticmethod
+    def latest_checkpoint(directory):
+        """Return the path to the latest checkpoint in the given directory."""
+        checkpoints = [f for f in os.listdir(directory) if f.startswith('checkpoint-') and f.endswith('.checkpoint')]
+        assert checkpoints, "There are no checkpoints in {}.".format(directory)
+        # Checkpoint filenames sort chronologically (see Checkpointer.checkpoint())
+        return os.path.join(directory, max(checkpoints))
+
+    def potentially_checkpoint(self, cosmos, new_year, league_season_ended):
+        """Save a checkpoint of the cosmos, if one is due."""
+        if self.year_of_last_checkpoint is None:
+            self.year_of_last_checkpoint = cosmos.year
+        checkpoint_is_due = (
+            (new_year and self.years_between_checkpoints and
+             cosmos.year - self.year_of_last_checkpoint >= self.years_between_checkpoints) or
+            (league_season_ended and self.at_league_season_ends)
+        )
+        if checkpoint_is_due:
+            self.checkpoint(cosmos=cosmos)
+
+    def checkpoint(self, cosmos):
+        """Save a checkpoint of the cosmos, and record its size and how long it took to write."""
+        # Name the file such that checkpoints sort chronologically (nights come after days)
+        filename = 'checkpoint-{ordinal_date}-{n}-{time_of_day}.checkpoint'.format(
+            ordinal_date=cosmos.ordinal_date, n=0 if cosmos.time_of_day == 'day' else 1,
+            time_of_day=cosmos.time_of_day
+        )
+        path = os.path.join(self.directory, filename)
+        start_time = time.time()
+        base = self.deltas_since_base is None or self.deltas_since_base >= self.checkpoints_between_bases
+        if base:
+            self.chunks_on_disk = {}
+        manifest = []
+        chunks_to_write = []
+        chunks_on_disk = {}
+        for key, chunk in snapshot_chunks(cosmos=cosmos):
+            digest = hashlib.md5(chunk).digest()
+            if key in self.chunks_on_disk and self.chunks_on_disk[key][0] == digest:
+                chunks_on_disk[key] = self.chunks_on_disk[key]
+            else:
+                chunks_on_disk[key] = (digest, filename)
+                chunks_to_write.append((key, chunk))
+            manifest.append((key, chunks_on_disk[key][1]))
+        with open(path, 'wb') as checkpoint_file:
+            write_checkpoint(checkpoint_file=checkpoint_file, manifest=manifest, chunks=chunks_to_write)
+        self.chunks_on_disk = chunks_on_disk
+        self.deltas_since_base = 0 if base else self.deltas_since_base + 1
+        write_latency = time.time() - start_time
+        size = os.path.getsize(path)
+        self.year_of_last_checkpoint = cosmos.year
+        self.log.append((path, size, write_latency, base))
+        if cosmos.debug:
+            print "Saved a {kind} checkpoint of {cosmos} ({megabytes} MB in {seconds}s)".format(
+                kind='base' if base else 'delta', cosmos=cosmos, megabytes=round(size/1048576., 1),
+                seconds=round(write_latency, 2)
             )
-            return person
-        except StopIteration:
-            raise Exception('There is no one with that hex ID')
\ No newline at end of file
@@ -86,9 +86,6 @@ class CitySpecification(object):
 
     def __init__(self, city_data_object, raw_specification):
         """Initialize a CitySpecification object."""
-        # This will be set to hold the actual city object for this city, once it
-        # has been established in the simulation
-        self.city = None
         # For now, we're only including U.S. cities, though of course this may
         # change (in which case, this whole module will need to be modified)
         self.country_name = "United States of America"
@@ -362,6 +362,7 @@ class BusinessClosure(Event):
             LayOff(subject=employee.person, company=business, occupation=employee)
         self.city.companies.remove(business)
         self.city.former_companies.add(business)
+        self.city.business_directory.remove(business)
         # Demolish the building -- TODO reify buildings separately from companies
         if self.city.businesses_of_type('ConstructionFirm'):
             demolition_company = random.choice(self.city.businesses_of_type('ConstructionFirm'))
@@ -405,7 +406,10 @@ class Death(Event):
         self.cemetery = self.subject.city.cemetery
         self.next_of_kin = subject.next_of_kin
         subject.city.residents.remove(subject)
+        subject.cosmos.registry.remove_resident(person=subject, city=subject.city)
+        subject.cosmos.registry.record_death(person=subject)
         subject.city.deceased.add(subject)
+        subject.cosmos.archive.schedule(person=subject)
         self._update_attributes_of_deceased_and_spouse()  # Must come before self.subject.go_to()
         self._have_widow_take_off_wedding_ring()
         self._vacate_job_position_of_the_deceased()
@@ -428,6 +432,8 @@ class Death(Event):
         # Update attributes of this person's home
         subject.home.residents.remove(subject)
         subject.home.former_residents.add(subject)
+        subject.home.city.lot_neighborhoods.note_change_in_population(subject.home.lot)
+        subject.home.city.note_change_in_occupancy_of_home(subject.home)
         if subject in subject.home.owners:
             subject.home.owners.remove(subject)
             if subject.home.residents and not subject.home.owners:
@@ -509,14 +515,18 @@ class Demolition(Event):
         building.demolition = self
         building.lot.building = None
         building.lot.former_buildings.append(building)
+        self.city.lot_neighborhoods.note_change_in_population(building.lot)
+        self.city.note_change_in_occupancy_of_lot(building.lot)
         # If this is a dwelling place, have its now-displaced residents find new housing
         if building.__class__.__name__ is 'House':
             self.city.dwelling_places.remove(building)
+            self.city.note_change_in_occupancy_of_home(building)
             if building.residents:
                 self._have_the_now_displaced_residents_move(house_or_apartment_unit=building)
         if building.__class__.__name__ is 'ApartmentComplex':
             for unit in building.units:
                 self.city.dwelling_places.remove(unit)
+                self.city.note_change_in_occupancy_of_home(unit)
                 if unit.residents:
                     self._have_the_now_displaced_residents_move(house_or_apartment_unit=unit)
 
@@ -574,7 +584,10 @@ class Departure(Event):
         for person in self.subjects:
             person.departures.append(self)
             person.city.residents.remove(person)
+            person.cosmos.registry.remove_resident(person=person, city=person.city)
+            person.cosmos.registry.record_departure(person=person)
             person.city.departed.add(person)
+            person.cosmos.archive.schedule(person=person)
             self._vacate_job_positions_of_the_departed()
 
     def __str__(self):
@@ -1172,6 +1185,7 @@ class Move(Event):
         if self.old_home:
             self.old_home.move_outs.append(self)
         self.new_home.move_ins.append(self)
+        new_home.city.lot_neighborhoods.note_change_in_population(new_home.lot)
         self.reason = reason  # Will (likely) point to an Occupation object, or else a Marriage or Divorce object
         # Actually move the person(s)
         for person in self.subjects:
@@ -1179,13 +1193,18 @@ class Move(Event):
             if person.home:
                 person.home.residents.remove(person)
                 person.home.former_residents.add(person)
+                person.home.city.lot_neighborhoods.note_change_in_population(person.home.lot)
+                person.home.city.note_change_in_occupancy_of_home(person.home)
             # Move into new home
             person.home = new_home
             new_home.residents.add(person)
+            new_home.city.note_change_in_occupancy_of_home(new_home)
             person.moves.append(self)
             # Update resident listing for the new city, if applicable
             if person.city is not new_home.city:
                 person.city = new_home.city
+                if person not in new_home.city.residents:
+                    person.cosmos.registry.add_resident(person=person, city=new_home.city)
                 new_home.city.residents.add(person)
             # Go to your new home
             person.go_to(destination=new_home, occasion='home')
@@ -0,0 +1,241 @@
+import zlib
+import array
+import calendar
+import datetime
+import tempfile
+import cPickle
+import cStringIO
+from utils.utilities import Calendar
+from mind import Mind
+from mood import Mood
+from routine import Routine
+from thought import Thought
+from whereabouts import Whereabouts, Whereabout
+from relationship import Relationship
+from belief import (
+    MentalModel, Belief, SkinBelief, HeadBelief, HairBelief, EyebrowsBelief, MouthBelief,
+    EarsBelief, NoseBelief, EyesBelief, FacialHairBelief, DistinctiveFeaturesBelief
+)
+
+
+# The classes of objects that belong to a single person, and so are written out along with
+# that person's record; any other object that is referenced by a record (other people, places,
+# events, names, and so forth) stays in memory and is referred to by the record, which
+# ensures that everyone who refers to such an object still refers to the very same one
+# once an archived person has been rehydrated
+CLASSES_ARCHIVED_WITH_THEIR_OWNER = (
+    Mind, Mood, Routine, Thought, Whereabouts, Whereabout, Relationship, MentalModel, Belief,
+    SkinBelief, HeadBelief, HairBelief, EyebrowsBelief, MouthBelief, EarsBelief, NoseBelief,
+    EyesBelief, FacialHairBelief, DistinctiveFeaturesBelief
+)
+# The types of values that are written out directly, rather than being referred to
+PLAIN_TYPES = (
+    int, long, float, str, unicode, bool, type(None), dict, list, set, frozenset, tuple, array.array
+)
+# The attributes that an archived person retains in memory, because they are checked routinely
+# for everyone who has ever lived (e.g., whether a person is alive, on each of their birthdays)
+ATTRIBUTES_RETAINED_BY_ARCHIVED_PEOPLE = ('id', 'cosmos', 'type', 'alive')
+
+
+class PersonArchive(object):
+    """A disk-backed store to which the records of long-deceased and long-departed people are evicted.
+
+    Once a person has been dead (or gone from the simulation) for some number of years, their record (their whereabouts,
+    relationships, mind, and everything else) is written to an append-only segment file, and
+    the person object itself is stripped down to a handful of attributes. Because the object
+    itself persists, everyone and everything that refers to the person continues to do so;
+    the first time any other attribute is accessed, Person.__getattr__() rehydrates the person
+    from this archive, after which they may again be archived once enough time has passed.
+    The record of a rehydrated person is left in the segment file as dead space, and the file
+    is compacted whenever too much of it has become dead space.
+
+    The belief facets that an archived person holds are not archived: their rows, and the Facet
+    objects that are handles onto them, are held by their city's BeliefTable, which can't give
+    up rows, and each facet refers back to the mental model that holds it, which thus stays in
+    memory too (and isn't the copy that is restored upon rehydration). People only come to hold
+    beliefs when they observe or exchange information, which the low-fidelity simulation doesn't
+    have them do, so this only matters for cosmoses that are played at full fidelity.
+    """
+
+    # Segment files smaller than this are never compacted, since there would be little to reclaim
+    MINIMUM_SIZE_FOR_COMPACTION = 1 << 20
+
+    def __init__(self, cosmos, enabled=False, years_before_archiving=1, directory=None, max_dead_space_fraction=0.5):
+        """Initialize a PersonArchive object.
+
+        @param cosmos: The cosmos whose people are to be archived.
+        @param enabled: Whether anyone will be archived at all.
+        @param years_before_archiving: How long after dying or departing that a person will be archived.
+        @param directory: The directory in which to place the segment file, or None to use
+                          the system's default location for temporary files.
+        @param max_dead_space_fraction: The fraction of the segment file that may be taken up by the
+                                        records of rehydrated people before the file is compacted.
+        """
+        self.cosmos = cosmos
+        self.enabled = enabled
+        self.years_before_archiving = years_before_archiving
+        self.directory = directory
+        self.max_dead_space_fraction = max_dead_space_fraction
+        # The segment file is deleted automatically as soon as it is closed
+        self.segment = tempfile.TemporaryFile(prefix='person-archive-', dir=directory)
+        self.index = {}  # Maps person ID to the (offset, length) of their record in the segment file
+        # Maps person ID to the list of objects in memory that their record refers to
+        self.references = {}
+        self.dates_archived = {}  # Maps person ID to the ordinal date on which they were archived
+        self.calendar = Calendar()  # Keeps track of when people will be due for archiving
+        # Running totals, for reporting
+        self.n_archivals = 0
+        self.n_rehydrations = 0
+        self.n_bytes_written = 0
+        self.n_compactions = 0
+        self.n_dead_bytes = 0  # Taken up in the segment file by the records of rehydrated people
+
+    def __getstate__(self):
+        """Return the state of this archive to be pickled, which includes every record in its segment file."""
+        state = dict(self.__dict__)
+        del state['segment']
+        state['records'] = {person_id: self._read(person_id=person_id) for person_id in self.index}
+        del state['index']
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state of a pickled archive, writing its records into a new segment file."""
+        records = state.pop('records')
+        self.__dict__.update(state)
+        self.segment = tempfile.TemporaryFile(prefix='person-archive-', dir=self.directory)
+        self.index = {}
+        for person_id, record in records.iteritems():
+            self._write(person_id=person_id, record=record)
+        self.n_dead_bytes = 0
+
+    def __len__(self):
+        """Return the number of people who are currently archived."""
+        return len(self.index)
+
+    @property
+    def size(self):
+        """Return the size of the segment file, in bytes."""
+        self.segment.seek(0, 2)
+        return self.segment.tell()
+
+    def schedule(self, person):
+        """Schedule the given person to be archived, once enough time has passed."""
+        if self.enabled:
+            timestep = self.cosmos.timestep + max(1, self.years_before_archiving*365*2)
+            self.calendar.schedule(timestep=timestep, task='archive', subject=person)
+
+    def archive_anyone_due(self):
+        """Archive everyone who is due for archiving by the current timestep, and return how many were."""
+        n_archived = 0
+        for _, person in self.calendar.due(timestep=self.cosmos.timestep):
+            if person.archived:
+                continue
+            # Someone who moved away from a city is still listed among its residents, and so will
+            # still be touched daily there, even after they die or depart from their new city
+            if self.cosmos.registry.resides_anywhere(person=person):
+                self.schedule(person=person)
+            else:
+                self.archive(person=person)
+                n_archived += 1
+        self.compact_if_needed()
+        return n_archived
+
+    def archive(self, person):
+        """Write the given person's record to the segment file and strip them down in memory."""
+        references = []
+        reference_numbers = {}  # Maps the memory address of each referenced object to its reference number
+
+        def refer_to(obj):
+            """Return a reference number for the given object, or None if it is to be written out directly."""
+            if type(obj) in PLAIN_TYPES or isinstance(obj, CLASSES_ARCHIVED_WITH_THEIR_OWNER):
+                return None
+            if id(obj) not in reference_numbers:
+                reference_numbers[id(obj)] = len(references)
+                references.append(obj)
+            return reference_numbers[id(obj)]
+
+        buffer = cStringIO.StringIO()
+        pickler = cPickle.Pickler(buffer, cPickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = refer_to
+        pickler.dump(person.__dict__)
+        record = zlib.compress(buffer.getvalue())
+        self._write(person_id=person.id, record=record)
+        self.references[person.id] = references
+        self.dates_archived[person.id] = self.cosmos.ordinal_date
+        retained_attributes = {
+            attribute: person.__dict__[attribute] for attribute in ATTRIBUTES_RETAINED_BY_ARCHIVED_PEOPLE
+        }
+        person.__dict__.clear()
+        person.__dict__.update(retained_attributes)
+        person.archived = True
+        self.n_archivals += 1
+        self.n_bytes_written += len(record)
+
+    def rehydrate(self, person):
+        """Restore the given person's record from the segment file."""
+        references = self.references.pop(person.id)
+        date_archived = self.dates_archived.pop(person.id)
+        unpickler = cPickle.Unpickler(cStringIO.StringIO(zlib.decompress(self._read(person_id=person.id))))
+        unpickler.persistent_load = lambda reference_number: references[reference_number]
+        person.__dict__.update(unpickler.load())
+        person.archived = False
+        # The record remains in the segment file, but is now dead space (until the next compaction)
+        _, length = self.index.pop(person.id)
+        self.n_dead_bytes += length
+        self.n_rehydrations += 1
+        if person.alive:
+            # Departed people are not aged while they are archived (see Cosmos._handle_any_birthdays_today()),
+            # so age them for any birthdays they missed
+            person.age += self._birthdays_between(
+                birthday=person.birthday, ordinal_date=date_archived, later_ordinal_date=self.cosmos.ordinal_date
+            )
+        # Since someone needed this person, they may well be needed again soon, so hold
+        # off on archiving them until the usual amount of time has passed again
+        self.schedule(person=person)
+
+    def compact_if_needed(self):
+        """Compact the segment file, if enough of it has become dead space."""
+        size = self.size
+        if size >= self.MINIMUM_SIZE_FOR_COMPACTION and self.n_dead_bytes > self.max_dead_space_fraction*size:
+            self.compact()
+
+    def compact(self):
+        """Copy every live record into a fresh segment file, discarding the dead space in the old one."""
+        old_segment, old_index = self.segment, self.index
+        self.segment = tempfile.TemporaryFile(prefix='person-archive-', dir=self.directory)
+        self.index = {}
+        # Copy the records in the order they were written, which keeps the new file's layout the same
+        for person_id, (offset, length) in sorted(old_index.iteritems(), key=lambda item: item[1][0]):
+            old_segment.seek(offset)
+            self._write(person_id=person_id, record=old_segment.read(length))
+        old_segment.close()
+        self.n_dead_bytes = 0
+        self.n_compactions += 1
+
+    @staticmethod
+    def _birthdays_between(birthday, ordinal_date, later_ordinal_date):
+        """Return how many times the given birthday fell after the given date, up to and including the later one."""
+        n_birthdays = 0
+        month, day = birthday
+        for year in xrange(datetime.date.fromordinal(ordinal_date).year,
+                           datetime.date.fromordinal(later_ordinal_date).year+1):
+            # Leap-year babies are aged on March 1 in non-leap years (see Cosmos._handle_any_birthdays_today())
+            if (month, day) == (2, 29) and not calendar.isleap(year):
+                month_this_year, day_this_year = 3, 1
+            else:
+                month_this_year, day_this_year = month, day
+            if ordinal_date < datetime.date(year, month_this_year, day_this_year).toordinal() <= later_ordinal_date:
+                n_birthdays += 1
+        return n_birthdays
+
+    def _write(self, person_id, record):
+        """Append a record to the segment file."""
+        self.segment.seek(0, 2)
+        self.index[person_id] = (self.segment.tell(), len(record))
+        self.segment.write(record)
+
+    def _read(self, person_id):
+        """Read a record from the segment file."""
+        offset, length = self.index[person_id]
+        self.segment.seek(offset)
+        return self.segment.read(length)
@@ -1,7 +1,15 @@
+import math
 import random
+import array
+import operator
+import numpy
 from evidence import *
 from corpora import Names
 
+# The challengers of a belief facet that has none; facets share this, rather than each holding an
+# empty set of its own (adopt_belief() always assigns facets new sets, rather than mutating these)
+NO_CHALLENGERS = frozenset()
+
 
 # TODO StreetMentalModel, BlockMentalModel, CityMentalModel?
 
@@ -11,8 +19,61 @@ from corpora import Names
 # TODO IF PEOPLE ARE WORKING ARE PEOPLE OBSERVING THEIR JOB?
 
 
+def compile_belief_facet_accessors(feature_type_to_attribute_path):
+    """Return a dictionary mapping feature types to (getter, setter) pairs for belief facets.
+
+    Each attribute path is relative to a mental model (e.g., 'face.hair.color'); the getter
+    takes a mental model and returns its belief facet at that path, and the setter takes a
+    mental model and a belief facet and puts the facet there. These are compiled once, when
+    each mental-model class is defined, so that belief facets can be accessed by feature type
+    without having to build up and evaluate a command string each time.
+    """
+    accessors = {}
+    for feature_type, attribute_path in feature_type_to_attribute_path.iteritems():
+        accessors[feature_type] = (
+            operator.attrgetter(attribute_path), _compile_belief_facet_setter(attribute_path=attribute_path)
+        )
+    return accessors
+
+
+def _compile_belief_facet_setter(attribute_path):
+    """Return a function that sets the belief facet at the given attribute path of a mental model."""
+    if '.' not in attribute_path:
+        def set_belief_facet(mental_model, belief_facet):
+            setattr(mental_model, attribute_path, belief_facet)
+    else:
+        path_to_belief_holding_the_facet, attribute = attribute_path.rsplit('.', 1)
+        get_belief_holding_the_facet = operator.attrgetter(path_to_belief_holding_the_facet)
+
+        def set_belief_facet(mental_model, belief_facet):
+            setattr(get_belief_holding_the_facet(mental_model), attribute, belief_facet)
+    return set_belief_facet
+
+
+def sample_timesteps_until_deterioration(chance_of_deterioration):
+    """Return the number of timesteps that will pass until a belief facet deteriorates, given its
+    chance of deteriorating on any given timestep.
+
+    The number is sampled from a geometric distribution, which makes this equivalent to rolling
+    against the chance on every timestep and counting the rolls up to and including the first one
+    that succeeds.
+    """
+    if chance_of_deterioration >= 1.0:
+        return 1
+    elif chance_of_deterioration <= 0.0:
+        return float('inf')
+    # Using 1 - random.random() draws from (0, 1], which keeps the logarithm finite
+    return max(1, int(math.ceil(math.log(1.0-random.random()) / math.log(1.0-chance_of_deterioration))))
+
+
 class MentalModel(object):
     """A person's mental model of a person or place."""
+    # Maps feature types to (getter, setter) pairs for the belief facets of this kind of
+    # mental model; this gets overridden by the subclasses to this base class
+    belief_facet_accessors = {}
+    # The feature types whose belief facets deteriorate as time passes (see settle()); this
+    # gets overridden by the subclasses to this base class
+    deteriorating_feature_types = ()
 
     def __init__(self, owner, subject):
         """Initialize a MentalModel object."""
@@ -25,6 +86,8 @@ class MentalModel(object):
         # that they were overtaken and then subsequently were reinstated; this attribute gets
         # modified every time a new Facet object initializes or takes over
         self.belief_trajectories = {}
+        # The timestep through which the deterioration of this mental model has been carried out (see settle())
+        self.last_settled_timestep = owner.cosmos.timestep
 
     def __str__(self):
         """Return string representation."""
@@ -37,7 +100,7 @@ class MentalModel(object):
         low-fidelity simulation but realistically would have (had it been the high-fidelity
         simulation).
         """
-        config = self.owner.game.config
+        config = self.owner.cosmos.config
         for feature_type in config.salience_of_features_with_regard_to_implants:
             if (random.random() <
                     config.salience_of_features_with_regard_to_implants[feature_type] * implant.base_strength):
@@ -60,8 +123,9 @@ class MentalModel(object):
         This base method currently gets used by BusinessMentalModel and DwellingPlaceMentalModel,
         which have their own 'attribute_to_feature_type' methods.
         """
+        self.settle()
         for feature in self.__dict__:  # Iterates over all attributes defined in __init__()
-            if feature not in ("subject", "owner", "belief_trajectories"):
+            if feature not in ("subject", "owner", "belief_trajectories", "last_settled_timestep"):
                 current_belief_facet = self.__dict__[feature]
                 if current_belief_facet is None or not current_belief_facet.accurate:
                     feature_type = self.attribute_to_feature_type(attribute=feature)
@@ -101,10 +165,8 @@ class MentalModel(object):
                                       e.g., a belief of what dwelling place a person lives in.
         @param new_evidence: A Statement or Lie object that reifies this new evidence.
         """
-        command_to_access_my_current_belief = self.get_command_to_access_a_belief_facet(
-            feature_type=feature_type
-        )
-        current_belief_facet = eval(command_to_access_my_current_belief)
+        self.settle()
+        current_belief_facet = self.get_belief_facet(feature_type=feature_type)
         if current_belief_facet == feature_value:
             # This new evidence supports an existing belief, so attribute it accordingly
             current_belief_facet.attribute_new_evidence(new_evidence=new_evidence)
@@ -128,10 +190,7 @@ class MentalModel(object):
     def _consider_contradictory_evidence(self, feature_type, feature_value, feature_object_itself, new_evidence):
         """Consider new evidence that contradicts the currently held belief facet."""
         # Access the currently held belief facet
-        command_to_access_my_current_belief = self.get_command_to_access_a_belief_facet(
-            feature_type=feature_type
-        )
-        current_belief_facet = eval(command_to_access_my_current_belief)
+        current_belief_facet = self.get_belief_facet(feature_type=feature_type)
         # Check if this evidence supports any challenger to the currently held belief facet
         if any(challenger for challenger in current_belief_facet.challengers if challenger == feature_value):
             # It does, so attribute this new evidence, which may cause this challenger to overtake
@@ -151,11 +210,7 @@ class MentalModel(object):
 
     def adopt_belief(self, new_belief_facet, old_belief_facet=None):
         """Adopt a new belief facet; if an old facet is being overtaken, update it accordingly."""
-        command_to_access_my_current_belief = self.get_command_to_access_a_belief_facet(
-            feature_type=new_belief_facet.feature_type
-        )
-        command_to_instantiate_new_belief_facet = command_to_access_my_current_belief + ' = new_belief_facet'
-        exec command_to_instantiate_new_belief_facet
+        self.set_belief_facet(feature_type=new_belief_facet.feature_type, belief_facet=new_belief_facet)
         # Update your belief trajectory
         self._update_belief_trajectory(new_belief_facet=new_belief_facet)
         # Attribute a predecessor (or lack thereof) to the new belief facet
@@ -173,10 +228,10 @@ class MentalModel(object):
             if old_belief_facet == '':
                 new_belief_facet.challengers.remove(old_belief_facet)
         else:
-            new_belief_facet.challengers = set()
+            new_belief_facet.challengers = NO_CHALLENGERS
         # Remove all challengers to the old facet (if it's reinstated, it will inherit in this same way)
         if old_belief_facet is not None:
-            old_belief_facet.challengers = set()
+            old_belief_facet.challengers = NO_CHALLENGERS
 
     def _update_belief_trajectory(self, new_belief_facet):
         """Update the belief trajectory for feature_type by appending new_belief_facet to it."""
@@ -204,9 +259,61 @@ class MentalModel(object):
             )
             return belief_facet_obj
 
+    def settle(self):
+        """Carry out the deterioration that this mental model has accrued since it was last settled.
+
+        Rather than each belief facet being rolled against for deterioration (by mutation,
+        transference, forgetting, or confabulation) on every timestep, deterioration is carried
+        out lazily, whenever this mental model is about to be read or to receive new evidence,
+        for all the timesteps that have passed since it was last settled. A facet's chance of
+        deteriorating on a given timestep stays the same until the facet itself changes, so the
+        number of timesteps until it next deteriorates can be sampled directly, which is
+        statistically the same as rolling against that chance on every timestep. This is the
+        only path by which beliefs deteriorate, and it is only taken if the config says that
+        beliefs deteriorate at all (see Config.beliefs_deteriorate), since, in the simulation
+        as originally written, they did not.
+        """
+        timesteps_elapsed = self.owner.cosmos.timestep - self.last_settled_timestep
+        if timesteps_elapsed <= 0:
+            return
+        # Update this first, since the facets instantiated by any deterioration will check
+        # whether this mental model needs to be settled
+        self.last_settled_timestep += timesteps_elapsed
+        if not self.owner.cosmos.config.beliefs_deteriorate:
+            return
+        for feature_type in self.deteriorating_feature_types:
+            timesteps_remaining = timesteps_elapsed
+            while True:
+                current_belief_facet = self.get_belief_facet(feature_type=feature_type)
+                timesteps_until_deterioration = sample_timesteps_until_deterioration(
+                    chance_of_deterioration=self._get_chance_of_deterioration_on_a_given_timestep(
+                        feature_type=feature_type, current_belief_facet=current_belief_facet
+                    )
+                )
+                if timesteps_until_deterioration > timesteps_remaining:
+                    break
+                timesteps_remaining -= timesteps_until_deterioration
+                self.deteriorate_belief_facet(feature_type=feature_type, current_belief_facet=current_belief_facet)
+
+    def _get_chance_of_deterioration_on_a_given_timestep(self, feature_type, current_belief_facet):
+        """Return the chance that the belief facet for the given feature type deteriorates on a given timestep.
+
+        The chance starts from a base value for the feature type, which is affected by the
+        owner's memory and the strength of the belief facet.
+        """
+        config = self.owner.cosmos.config
+        belief_facet_strength = 1 if current_belief_facet is None else current_belief_facet.strength
+        if belief_facet_strength <= 0:
+            return 1.0
+        return (
+            config.chance_of_memory_deterioration_on_a_given_timestep[feature_type] /
+            self.owner.mind.memory /
+            belief_facet_strength
+        )
+
     def deteriorate_belief_facet(self, feature_type, current_belief_facet):
         """Deteriorate a belief facet, either by mutation, transference, or forgetting."""
-        config = self.owner.game.config
+        config = self.owner.cosmos.config
         if current_belief_facet != '' and current_belief_facet is not None:
             result = self._decide_how_knowledge_will_pollute_or_be_forgotten(config=config)
             entity_to_transfer_belief_facet_from = (
@@ -300,7 +407,7 @@ class MentalModel(object):
 
     def _calculate_chance_feature_gets_remembered_perfectly(self, feature_type):
         """Calculate the chance that owner perfectly remembers a feature about subject."""
-        config = self.owner.game.config
+        config = self.owner.cosmos.config
         salience_of_the_feature = config.person_feature_salience[feature_type][0]
         chance_it_gets_remembered_perfectly = self.owner.mind.memory * salience_of_the_feature
         chance_floor = config.person_feature_salience[feature_type][1]
@@ -311,14 +418,25 @@ class MentalModel(object):
             chance_it_gets_remembered_perfectly = chance_cap
         return chance_it_gets_remembered_perfectly
 
-    @staticmethod
-    def get_command_to_access_a_belief_facet(feature_type):
-        """This method gets overridden by the subclasses to this base class."""
-        return ''
+    def get_belief_facet(self, feature_type):
+        """Return the belief facet that is currently held for the given feature type."""
+        get_belief_facet = self.belief_facet_accessors[feature_type][0]
+        return get_belief_facet(self)
+
+    def set_belief_facet(self, feature_type, belief_facet):
+        """Make the given belief facet the one that is currently held for the given feature type."""
+        set_belief_facet = self.belief_facet_accessors[feature_type][1]
+        set_belief_facet(self, belief_facet)
 
 
 class BusinessMentalModel(MentalModel):
     """A person's mental model of a business."""
+    belief_facet_accessors = compile_belief_facet_accessors({
+        "business name": "name",
+        "business block": "block",
+        "business address": "address",
+    })
+    deteriorating_feature_types = ("business address", "business block", "business name")
 
     def __init__(self, owner, subject, observation):
         """Initialize a BusinessMentalModel object.
@@ -382,38 +500,20 @@ class BusinessMentalModel(MentalModel):
             )
         return business_facet
 
-    def deteriorate(self):
-        """Deteriorate the components of this belief (potentially) by mutation, transference, and/or forgetting."""
-        config = self.owner.game.config
-        for feature in self.__dict__:  # Iterates over all attributes defined in __init__()
-            if feature not in ("owner", "subject", "employees", "belief_trajectories"):
-                current_belief_facet = self.__dict__[feature]
-                if current_belief_facet is not None:
-                    feature_type_str = current_belief_facet.feature_type
-                    belief_facet_strength = current_belief_facet.strength
-                    # Determine the chance of memory deterioration, which starts from a base value
-                    # that gets affected by the person's memory and the strength of the belief facet
-                    chance_of_memory_deterioration = (
-                        config.chance_of_memory_deterioration_on_a_given_timestep[feature_type_str] /
-                        self.owner.mind.memory /
-                        belief_facet_strength
-                    )
-                else:  # Could still confabulate
-                    feature_type_str = self.attribute_to_feature_type(attribute=feature)
-                    chance_of_memory_deterioration = config.chance_of_confabulation_on_a_given_timestep
-                if random.random() < chance_of_memory_deterioration:
-                    # Instantiate a new belief facet that represents a deterioration of
-                    # the existing one (which itself may be a deterioration already) --
-                    # when the facet object's init() method is called, it will call
-                    # attribute_new_evidence(), which will automatically call adopt_belief()
-                    # because its initial evidence will be of a deterioration type
-                    self.deteriorate_belief_facet(
-                        feature_type=feature_type_str, current_belief_facet=current_belief_facet
-                    )
+    def _get_chance_of_deterioration_on_a_given_timestep(self, feature_type, current_belief_facet):
+        """Return the chance that the belief facet for the given feature type deteriorates on a given timestep.
+
+        If there is no facet for this feature type, this is the chance of confabulating one.
+        """
+        if current_belief_facet is None:
+            return self.owner.cosmos.config.chance_of_confabulation_on_a_given_timestep
+        return super(BusinessMentalModel, self)._get_chance_of_deterioration_on_a_given_timestep(
+            feature_type=feature_type, current_belief_facet=current_belief_facet
+        )
 
     def _confabulate_belief_facet(self, feature_type, current_belief_facet):
         """Confabulate a facet to a belief about a dwelling place."""
-        config = self.owner.game.config
+        config = self.owner.cosmos.config
         confabulation = Confabulation(subject=self.subject, source=self.owner)
         if feature_type == "business name":
             # TODO author confabulation procedure for this
@@ -491,7 +591,7 @@ class BusinessMentalModel(MentalModel):
 
     def _mutate_business_address_facet(self, facet_being_mutated):
         """Mutate a belief facet pertaining to a person's home address."""
-        config = self.owner.game.config
+        config = self.owner.cosmos.config
         # Change the house number
         digits_of_house_number = list(str(facet_being_mutated)[:3])
         for i in xrange(3):
@@ -581,19 +681,16 @@ class BusinessMentalModel(MentalModel):
         elif feature_type == "business address":
             return self.address
 
-    @staticmethod
-    def get_command_to_access_a_belief_facet(feature_type):
-        """Return a command that will allow the belief facet for this feature type to be directly modified."""
-        feature_type_to_command = {
-            "business name": "self.name",
-            "business block": "self.block",
-            "business address": "self.address",
-        }
-        return feature_type_to_command[feature_type]
 
 
 class DwellingPlaceModel(MentalModel):
     """A person's mental model of a business."""
+    belief_facet_accessors = compile_belief_facet_accessors({
+        "home is apartment": "apartment",
+        "home block": "block",
+        "home address": "address",
+    })
+    deteriorating_feature_types = ("home address", "home block", "home is apartment")
 
     def __init__(self, owner, subject, observation):
         """Initialize a DwellingPlaceMentalModel object.
@@ -657,38 +754,9 @@ class DwellingPlaceModel(MentalModel):
             )
         return home_facet
 
-    def deteriorate(self):
-        """Deteriorate the components of this belief (potentially) by mutation, transference, and/or forgetting."""
-        config = self.owner.game.config
-        for feature in self.__dict__:  # Iterates over all attributes defined in __init__()
-            if feature not in ("owner", "subject", "residents", "belief_trajectories"):
-                current_belief_facet = self.__dict__[feature]
-                if current_belief_facet is not None:
-                    feature_type_str = current_belief_facet.feature_type
-                    belief_facet_strength = current_belief_facet.strength
-                else:
-                    feature_type_str = self.attribute_to_feature_type(attribute=feature)
-                    belief_facet_strength = 1
-                # Determine the chance of memory deterioration, which starts from a base value
-                # that gets affected by the person's memory and the strength of the belief facet
-                chance_of_memory_deterioration = (
-                    config.chance_of_memory_deterioration_on_a_given_timestep[feature_type_str] /
-                    self.owner.mind.memory /
-                    belief_facet_strength
-                )
-                if random.random() < chance_of_memory_deterioration:
-                    # Instantiate a new belief facet that represents a deterioration of
-                    # the existing one (which itself may be a deterioration already) --
-                    # when the facet object's init() method is called, it will call
-                    # attribute_new_evidence(), which will automatically call adopt_belief()
-                    # because its initial evidence will be of a deterioration type
-                    self.deteriorate_belief_facet(
-                        feature_type=feature_type_str, current_belief_facet=current_belief_facet
-                    )
-
     def _confabulate_belief_facet(self, feature_type, current_belief_facet):
         """Confabulate a facet to a belief about a dwelling place."""
-        config = self.owner.game.config
+        config = self.owner.cosmos.config
         confabulation = Confabulation(subject=self.subject, source=self.owner)
         if feature_type == "home is apartment":
             confabulated_feature_str = random.choice(["yes", "no"])
@@ -772,7 +840,7 @@ class DwellingPlaceModel(MentalModel):
 
     def _mutate_home_address_facet(self, facet_being_mutated):
         """Mutate a belief facet pertaining to a person's home address."""
-        config = self.owner.game.config
+        config = self.owner.cosmos.config
         # Change the house number
         digits_of_house_number = list(str(facet_being_mutated)[:3])
         for i in xrange(3):
@@ -861,19 +929,65 @@ class DwellingPlaceModel(MentalModel):
         elif feature_type == "home address":
             return self.address
 
-    @staticmethod
-    def get_command_to_access_a_belief_facet(feature_type):
-        """Return a command that will allow the belief facet for this feature type to be directly modified."""
-        feature_type_to_command = {
-            "home is apartment": "self.apartment",
-            "home block": "self.block",
-            "home address": "self.address",
-        }
-        return feature_type_to_command[feature_type]
 
 
 class PersonMentalModel(MentalModel):
     """A person's mental model of a person, representing everything she believes about her."""
+    belief_facet_attribute_paths = {
+        # Status
+        "status": "status.status",
+        "marital status": "status.marital_status",
+        "departure year": "status.departure_year",
+        # Age
+        "birth year": "age.birth_year",
+        "death year": "age.death_year",
+        "approximate age": "age.approximate",
+        # Name
+        "first name": "name.first_name",
+        "middle name": "name.middle_name",
+        "last name": "name.last_name",
+        "suffix": "name.suffix",
+        "surname ethnicity": "name.surname_ethnicity",
+        "hyphenated surname": "name.hyphenated_surname",
+        # Occupation
+        "workplace": "occupation.company",
+        "job title": "occupation.job_title",
+        "job shift": "occupation.shift",
+        "job status": "occupation.status",
+        # Home
+        "home": "home",
+        # Appearance
+        "skin color": "face.skin.color",
+        "head size": "face.head.size",
+        "head shape": "face.head.shape",
+        "hair length": "face.hair.length",
+        "hair color": "face.hair.color",
+        "eyebrow size": "face.eyebrows.size",
+        "eyebrow color": "face.eyebrows.color",
+        "mouth size": "face.mouth.size",
+        "ear size": "face.ears.size",
+        "ear angle": "face.ears.angle",
+        "nose size": "face.nose.size",
+        "nose shape": "face.nose.shape",
+        "eye size": "face.eyes.size",
+        "eye shape": "face.eyes.shape",
+        "eye color": "face.eyes.color",
+        "eye horizontal settedness": "face.eyes.horizontal_settedness",
+        "eye vertical settedness": "face.eyes.vertical_settedness",
+        "facial hair style": "face.facial_hair.style",
+        "freckles": "face.distinctive_features.freckles",
+        "birthmark": "face.distinctive_features.birthmark",
+        "scar": "face.distinctive_features.scar",
+        "tattoo": "face.distinctive_features.tattoo",
+        "glasses": "face.distinctive_features.glasses",
+        "sunglasses": "face.distinctive_features.sunglasses",
+    }
+    belief_facet_accessors = compile_belief_facet_accessors(belief_facet_attribute_paths)
+    # Facets of a person's status and age do not deteriorate, nor do their whereabouts
+    deteriorating_feature_types = tuple(sorted(
+        feature_type for feature_type, attribute_path in belief_facet_attribute_paths.iteritems() if
+        attribute_path.split('.')[0] in ('name', 'occupation', 'face', 'home')
+    ))
 
     def __init__(self, owner, subject, observation_or_reflection, implant=None):
         """Initialize a PersonMentalModel object.
@@ -922,19 +1036,24 @@ class PersonMentalModel(MentalModel):
 
     def build_up(self, new_observation_or_reflection):
         """Build up a mental model from a new observation or reflection."""
+        self.settle()
         self.name.build_up(new_observation_or_reflection=new_observation_or_reflection)
         self.occupation.build_up(new_observation_or_reflection=new_observation_or_reflection)
         self.face.build_up(new_observation_or_reflection=new_observation_or_reflection)
         self.whereabouts.build_up(new_observation_or_reflection=new_observation_or_reflection)
         self._build_up_other_belief_facets(new_observation_or_reflection=new_observation_or_reflection)
 
-    def deteriorate(self):
-        """Deteriorate a mental model from time passing."""
-        self.name.deteriorate()
-        self.occupation.deteriorate()
-        self.face.deteriorate()
-        # Manually deteriorate the home one (and other stragglers that may be defined later)
-        self._deteriorate_other_belief_facets()
+    def _get_chance_of_deterioration_on_a_given_timestep(self, feature_type, current_belief_facet):
+        """Return the chance that the belief facet for the given feature type deteriorates on a given timestep.
+
+        Facets of the face have their strength floored at 1.
+        """
+        if (self.belief_facet_attribute_paths[feature_type].startswith('face.') and
+                current_belief_facet is not None and current_belief_facet.strength < 1):
+            current_belief_facet = None  # Which is treated as having strength 1
+        return super(PersonMentalModel, self)._get_chance_of_deterioration_on_a_given_timestep(
+            feature_type=feature_type, current_belief_facet=current_belief_facet
+        )
 
     def _build_up_other_belief_facets(self, new_observation_or_reflection):
         """Build up other beliefs facets that are components of this mental model.
@@ -942,7 +1061,7 @@ class PersonMentalModel(MentalModel):
         facets to WorkBeliefs do."""
         for feature in ("home",):
             feature_type = self.attribute_to_feature_type(attribute=feature)
-            if self.owner.game.config.feature_is_observable[feature_type](subject=self.subject):
+            if self.owner.cosmos.config.feature_is_observable[feature_type](subject=self.subject):
                 current_belief_facet = self.__dict__[feature]
                 if current_belief_facet is None or not current_belief_facet.accurate:
                     # Adopt a new, accurate belief facet (unless init_belief_facet returns None) --
@@ -960,43 +1079,12 @@ class PersonMentalModel(MentalModel):
                     # likely to deteriorate in this future
                     current_belief_facet.attribute_new_evidence(new_evidence=new_observation_or_reflection)
 
-    def _deteriorate_other_belief_facets(self):
-        """Deteriorate other beliefs facets that are components of this mental model.
-        By other facets, I mean ones that don't get deteriorated elsewhere, as, e.g.,
-        facets to WorkBeliefs do.
-        """
-        config = self.owner.game.config
-        for feature in ("home",):
-            current_belief_facet = self.__dict__[feature]
-            if current_belief_facet is not None:
-                feature_type_str = current_belief_facet.feature_type
-                belief_facet_strength = current_belief_facet.strength
-            else:
-                feature_type_str = self.attribute_to_feature_type(attribute=feature)
-                belief_facet_strength = 1
-            # Determine the chance of memory deterioration, which starts from a base value
-            # that gets affected by the person's memory and the strength of the belief facet
-            chance_of_memory_deterioration = (
-                config.chance_of_memory_deterioration_on_a_given_timestep[feature_type_str] /
-                self.owner.mind.memory /
-                belief_facet_strength
-            )
-            if random.random() < chance_of_memory_deterioration:
-                # Instantiate a new belief facet that represents a deterioration of
-                # the existing one (which itself may be a deterioration already) --
-                # when the facet object's init() method is called, it will call
-                # attribute_new_evidence(), which will automatically call adopt_belief()
-                # because its initial evidence will be of a deterioration type
-                self.deteriorate_belief_facet(
-                    feature_type=feature_type_str, current_belief_facet=current_belief_facet
-                )
-
     def _confabulate_belief_facet(self, feature_type, current_belief_facet):
         """Confabulate a new belief facet of the given type.
         This is done using the feature distributions that are used to generate the features
         themselves for people that don't have parents.
         """
-        config = self.owner.game.config
+        config = self.owner.cosmos.config
         confabulation = Confabulation(subject=self.subject, source=self.owner)
         if feature_type in config.status_feature_types:
             confabulated_feature_str = self._confabulate_status_facet(feature_type=feature_type)
@@ -1056,14 +1144,14 @@ class PersonMentalModel(MentalModel):
             if self.subject.departure:
                 base_year = self.subject.departure.year
             else:  # You are confabulating that they recently departed when they didn't
-                base_year = self.subject.game.year
-            max_offset = self.owner.game.config.age_confabulation_max_offset(subject=self.subject)
+                base_year = self.subject.cosmos.year
+            max_offset = self.owner.cosmos.config.age_confabulation_max_offset(subject=self.subject)
             offset = min(1, int(random.random() * max_offset))
             if random.random() < 0.5:
                 offset *= -1
             confabulated_year = base_year + offset
-            if confabulated_year > self.subject.game.year-1:
-                confabulated_year = self.subject.game.year-1
+            if confabulated_year > self.subject.cosmos.year-1:
+                confabulated_year = self.subject.cosmos.year-1
             confabulated_feature_str = str(confabulated_year)
         return confabulated_feature_str
 
@@ -1078,14 +1166,14 @@ class PersonMentalModel(MentalModel):
             elif self.subject.death_year:
                 birth_or_death_year = self.subject.death_year
             else:  # You are confabulating that they recently died when they didn't
-                birth_or_death_year = self.subject.game.year
-            max_offset = self.owner.game.config.age_confabulation_max_offset(subject=self.subject)
+                birth_or_death_year = self.subject.cosmos.year
+            max_offset = self.owner.cosmos.config.age_confabulation_max_offset(subject=self.subject)
             offset = min(1, int(random.random() * max_offset))
             if random.random() < 0.5:
                 offset *= -1
             confabulated_year = birth_or_death_year + offset
-            if confabulated_year > self.subject.game.year-1:
-                confabulated_year = self.subject.game.year-1
+            if confabulated_year > self.subject.cosmos.year-1:
+                confabulated_year = self.subject.cosmos.year-1
             confabulated_feature_str = str(confabulated_year)
         else:  # approximate
             subject_age_decade = self.subject.age / 10  # Don't use float here
@@ -1105,7 +1193,7 @@ class PersonMentalModel(MentalModel):
             else:
                 confabulated_feature_str = Names.a_feminine_name(year=self.subject.birth_year)
         elif feature_type == "suffix":
-            if self.subject.male and random.random() < self.owner.game.config.chance_someone_confabulates_a_suffix:
+            if self.subject.male and random.random() < self.owner.cosmos.config.chance_someone_confabulates_a_suffix:
                 confabulated_feature_str = random.choice(['II', 'III'])
             else:
                 confabulated_feature_str = 'None'
@@ -1160,7 +1248,7 @@ class PersonMentalModel(MentalModel):
 
     def _mutate_belief_facet(self, feature_type, facet_being_mutated):
         """Mutate a belief facet."""
-        config = self.subject.game.config
+        config = self.subject.cosmos.config
         if feature_type in config.status_feature_types:
             mutated_feature_str = self._mutate_status_belief_facet(
                 feature_type=feature_type, feature_being_mutated_from_str=str(facet_being_mutated)
@@ -1209,14 +1297,14 @@ class PersonMentalModel(MentalModel):
         if self.subject.departure:
             base_year = self.subject.departure.year
         else:  # You are confabulating that they recently departed when they didn't
-            base_year = self.subject.game.year
-        max_offset = self.owner.game.config.age_confabulation_max_offset(subject=self.subject)
+            base_year = self.subject.cosmos.year
+        max_offset = self.owner.cosmos.config.age_confabulation_max_offset(subject=self.subject)
         offset = min(1, int(random.random() * max_offset))
         if random.random() < 0.5:
             offset *= -1
         mutated_year = base_year + offset
-        if mutated_year > self.subject.game.year-1:
-            mutated_year = self.subject.game.year-1
+        if mutated_year > self.subject.cosmos.year-1:
+            mutated_year = self.subject.cosmos.year-1
         mutated_feature_str = str(mutated_year)
         return mutated_feature_str
 
@@ -1230,14 +1318,14 @@ class PersonMentalModel(MentalModel):
         elif self.subject.death_year:
             birth_or_death_year = self.subject.death_year
         else:  # You are confabulating that they recently died when they didn't
-            birth_or_death_year = self.subject.game.year
-        max_offset = self.owner.game.config.age_confabulation_max_offset(subject=self.subject)
+            birth_or_death_year = self.subject.cosmos.year
+        max_offset = self.owner.cosmos.config.age_confabulation_max_offset(subject=self.subject)
         offset = min(1, int(random.random() * max_offset))
-        if random.random() < 0.5 or self.subject.game:
+        if random.random() < 0.5 or self.subject.cosmos:
             offset *= -1
         mutated_year = birth_or_death_year + offset
-        if mutated_year > self.subject.game.year-1:
-            mutated_year = self.subject.game.year-1
+        if mutated_year > self.subject.cosmos.year-1:
+            mutated_year = self.subject.cosmos.year-1
         mutated_feature_str = str(mutated_year)
         return mutated_feature_str
 
@@ -1547,68 +1635,31 @@ class PersonMentalModel(MentalModel):
         }
         return attribute_to_belief_type[attribute]
 
-    @staticmethod
-    def get_command_to_access_a_belief_facet(feature_type):
-        """Return a command that will allow the belief facet for this feature type to be directly modified."""
-        feature_type_to_command = {
-            # Status
-            "status": "self.status.status",
-            "marital status": "self.status.marital_status",
-            "departure year": "self.status.departure_year",
-            # Age
-            "birth year": "self.age.birth_year",
-            "death year": "self.age.death_year",
-            "approximate age": "self.age.approximate",
-            # Name
-            "first name": "self.name.first_name",
-            "middle name": "self.name.middle_name",
-            "last name": "self.name.last_name",
-            "suffix": "self.name.suffix",
-            "surname ethnicity": "self.name.surname_ethnicity",
-            "hyphenated surname": "self.name.hyphenated_surname",
-            # Occupation
-            "workplace": "self.occupation.company",
-            "job title": "self.occupation.job_title",
-            "job shift": "self.occupation.shift",
-            "job status": "self.occupation.status",
-            # Home
-            "home": "self.home",
-            # Appearance
-            "skin color": "self.face.skin.color",
-            "head size": "self.face.head.size",
-            "head shape": "self.face.head.shape",
-            "hair length": "self.face.hair.length",
-            "hair color": "self.face.hair.color",
-            "eyebrow size": "self.face.eyebrows.size",
-            "eyebrow color": "self.face.eyebrows.color",
-            "mouth size": "self.face.mouth.size",
-            "ear size": "self.face.ears.size",
-            "ear angle": "self.face.ears.angle",
-            "nose size": "self.face.nose.size",
-            "nose shape": "self.face.nose.shape",
-            "eye size": "self.face.eyes.size",
-            "eye shape": "self.face.eyes.shape",
-            "eye color": "self.face.eyes.color",
-            "eye horizontal settedness": "self.face.eyes.horizontal_settedness",
-            "eye vertical settedness": "self.face.eyes.vertical_settedness",
-            "facial hair style": "self.face.facial_hair.style",
-            "freckles": "self.face.distinctive_features.freckles",
-            "birthmark": "self.face.distinctive_features.birthmark",
-            "scar": "self.face.distinctive_features.scar",
-            "tattoo": "self.face.distinctive_features.tattoo",
-            "glasses": "self.face.distinctive_features.glasses",
-            "sunglasses": "self.face.distinctive_features.sunglasses",
-        }
-        # Have to do special thing for whereabouts, because they are indexed by date;
-        # specifically, we parse the feature type, which will look something like
-        # 'whereabouts 723099-1'
-        if 'whereabouts' in feature_type:
-            timestep = feature_type[12:]
-            ordinal_date, day_or_night_bit = timestep.split('-')
-            tuple_string = '({}, {})'.format(ordinal_date, day_or_night_bit)
-            return 'self.whereabouts.date[{}]'.format(tuple_string)
+    def get_belief_facet(self, feature_type):
+        """Return the belief facet that is currently held for the given feature type.
+
+        Whereabouts beliefs are indexed by timestep, so for a feature type like
+        'whereabouts 723099-1', a KeyError will be raised if owner holds no belief about
+        subject's whereabouts on that timestep.
+        """
+        if feature_type.startswith('whereabouts '):
+            return self.whereabouts.date[self._parse_whereabouts_feature_type(feature_type=feature_type)]
+        get_belief_facet = self.belief_facet_accessors[feature_type][0]
+        return get_belief_facet(self)
+
+    def set_belief_facet(self, feature_type, belief_facet):
+        """Make the given belief facet the one that is currently held for the given feature type."""
+        if feature_type.startswith('whereabouts '):
+            self.whereabouts.date[self._parse_whereabouts_feature_type(feature_type=feature_type)] = belief_facet
         else:
-            return feature_type_to_command[feature_type]
+            set_belief_facet = self.belief_facet_accessors[feature_type][1]
+            set_belief_facet(self, belief_facet)
+
+    @staticmethod
+    def _parse_whereabouts_feature_type(feature_type):
+        """Return the timestep key (ordinal date, day-or-night bit) for a feature type like 'whereabouts 723099-1'."""
+        ordinal_date, day_or_night_bit = feature_type[len('whereabouts '):].split('-')
+        return int(ordinal_date), int(day_or_night_bit)
 
     @property
     def basic_description(self):
@@ -1639,6 +1690,7 @@ class PersonMentalModel(MentalModel):
 
     def outline(self):
         """Print a description of subject grounded in owner's knowledge of them."""
+        self.settle()
         print '\n'
         for feature_type in (
             'first name', 'last name', 'status', 'death year', 'departure year',
@@ -1661,7 +1713,7 @@ class PersonMentalModel(MentalModel):
             elif feature_type == 'skin color':
                 self._outline_skin_tone()
             else:
-                facet = eval(self.get_command_to_access_a_belief_facet(feature_type=feature_type))
+                facet = self.get_belief_facet(feature_type=feature_type)
                 if facet == '':
                     facet = '[forgot]'
                 print "{feature_type}: {value} ({confidence})".format(
@@ -1774,7 +1826,7 @@ class Belief(object):
             facet = self.person_model.init_belief_facet(
                 feature_type=feature_type, observation_or_reflection=observation_or_reflection
             )
-        elif self.person_model.owner.game.config.feature_is_observable[feature_type](
+        elif self.person_model.owner.cosmos.config.feature_is_observable[feature_type](
             subject=self.person_model.subject
         ):
             facet = self.person_model.init_belief_facet(
@@ -1802,7 +1854,7 @@ class Belief(object):
         for feature in self.__dict__:  # Iterates over all attributes defined in __init__()
             if feature != 'person_model':  # This should be the only one that doesn't resolve to a belief type
                 feature_type = self.attribute_to_feature_type(feature)
-                if self.person_model.owner.game.config.feature_is_observable[feature_type](
+                if self.person_model.owner.cosmos.config.feature_is_observable[feature_type](
                         subject=self.person_model.subject
                 ):
                     current_belief_facet = self.__dict__[feature]
@@ -1823,35 +1875,6 @@ class Belief(object):
                         # likely to deteriorate in this future
                         current_belief_facet.attribute_new_evidence(new_evidence=new_observation_or_reflection)
 
-    def deteriorate(self):
-        """Deteriorate the components of this belief (potentially) by mutation, transference, and/or forgetting."""
-        config = self.person_model.owner.game.config
-        for feature in self.__dict__:  # Iterates over all attributes defined in __init__()
-            if feature != 'person_model':  # This should be the only one that doesn't resolve to a belief type
-                current_belief_facet = self.__dict__[feature]
-                if current_belief_facet is not None:
-                    feature_type_str = current_belief_facet.feature_type
-                    belief_facet_strength = current_belief_facet.strength
-                else:
-                    feature_type_str = self.attribute_to_feature_type(attribute=feature)
-                    belief_facet_strength = 1
-                # Determine the chance of memory deterioration, which starts from a base value
-                # that gets affected by the person's memory and the strength of the belief facet
-                chance_of_memory_deterioration = (
-                    config.chance_of_memory_deterioration_on_a_given_timestep[feature_type_str] /
-                    self.person_model.owner.mind.memory /
-                    belief_facet_strength
-                )
-                if random.random() < chance_of_memory_deterioration:
-                    # Instantiate a new belief facet that represents a deterioration of
-                    # the existing one (which itself may be a deterioration already) --
-                    # when the facet object's init() method is called, it will call
-                    # attribute_new_evidence(), which will automatically call adopt_belief()
-                    # because its initial evidence will be of a deterioration type
-                    self.person_model.deteriorate_belief_facet(
-                        feature_type=feature_type_str, current_belief_facet=current_belief_facet
-                    )
-
     @staticmethod
     def attribute_to_feature_type(attribute):
         """This method gets overridden by the subclasses to this base class."""
@@ -1908,7 +1931,7 @@ class AgeBelief(Belief):
             if self.death_year and self.death_year != 'None':
                 return int(self.death_year)-int(self.birth_year)
             else:
-                return self.person_model.owner.game.year-int(self.birth_year)
+                return self.person_model.owner.cosmos.year-int(self.birth_year)
         else:
             return None
 
@@ -2007,10 +2030,10 @@ class WhereaboutsBelief(Belief):
         # person was at this time
         location_str = self.person_model.owner.location.name
         location_obj = self.person_model.owner.location
-        day_or_night_id = 0 if self.person_model.owner.game.time_of_day == "day" else 1
+        day_or_night_id = 0 if self.person_model.owner.cosmos.time_of_day == "day" else 1
         # Generate a unique key so that we can maintain a trajectory for this belief
-        feature_type = "whereabouts {}-{}".format(self.person_model.owner.game.ordinal_date, day_or_night_id)
-        self.date[(self.person_model.owner.game.ordinal_date, day_or_night_id)] = Facet(
+        feature_type = "whereabouts {}-{}".format(self.person_model.owner.cosmos.ordinal_date, day_or_night_id)
+        self.date[(self.person_model.owner.cosmos.ordinal_date, day_or_night_id)] = Facet(
             value=location_str, owner=self.person_model.owner, subject=self.person_model.subject,
             feature_type=feature_type, initial_evidence=observation_or_reflection,
             object_itself=location_obj
@@ -2021,10 +2044,10 @@ class WhereaboutsBelief(Belief):
         if new_observation_or_reflection:
             location_str = self.person_model.owner.location.name
             location_obj = self.person_model.owner.location
-            day_or_night_id = 0 if self.person_model.owner.game.time_of_day == "day" else 1
+            day_or_night_id = 0 if self.person_model.owner.cosmos.time_of_day == "day" else 1
             # Generate a unique hash so that we can maintain a trajectory for this belief
-            feature_type = "whereabouts {}-{}".format(self.person_model.owner.game.ordinal_date, day_or_night_id)
-            self.date[(self.person_model.owner.game.ordinal_date, day_or_night_id)] = Facet(
+            feature_type = "whereabouts {}-{}".format(self.person_model.owner.cosmos.ordinal_date, day_or_night_id)
+            self.date[(self.person_model.owner.cosmos.ordinal_date, day_or_night_id)] = Facet(
                 value=location_str, owner=self.person_model.owner, subject=self.person_model.subject,
                 feature_type=feature_type, initial_evidence=new_observation_or_reflection,
                 object_itself=location_obj
@@ -2070,7 +2093,7 @@ class FaceBelief(Belief):
                 for feature in belief.__dict__:
                     if feature != 'face_belief':  # This should be the only one that doesn't resolve to a belief facet
                         feature_type = belief.attribute_to_feature_type(attribute=feature)
-                        if self.person_model.owner.game.config.feature_is_observable[feature_type](
+                        if self.person_model.owner.cosmos.config.feature_is_observable[feature_type](
                                 subject=self.person_model.subject
                         ):
                             belief_facet = belief.__dict__[feature]
@@ -2090,38 +2113,6 @@ class FaceBelief(Belief):
                                 # likely to deteriorate in this future
                                 belief_facet.attribute_new_evidence(new_evidence=new_observation_or_reflection)
 
-    def deteriorate(self):
-        """Deteriorate the components of this belief (potentially) by mutation, transference, and/or forgetting."""
-        config = self.person_model.owner.game.config
-        for belief_type in self.__dict__:  # Iterates over all attributes defined in __init__()
-            if belief_type != 'person_model':  # This should be the only one that doesn't resolve to a belief type
-                belief = self.__dict__[belief_type]
-                for feature in belief.__dict__:
-                    if feature != 'face_belief':  # This should be the only one that doesn't resolve to a belief facet
-                        belief_facet = belief.__dict__[feature]
-                        if belief_facet is not None:
-                            feature_type_str = belief_facet.feature_type
-                            belief_facet_strength = belief_facet.strength
-                        else:
-                            feature_type_str = belief.attribute_to_feature_type(attribute=feature)
-                            belief_facet_strength = 1
-                        if belief_facet_strength < 1:
-                            belief_facet_strength = 1
-                        # Determine the chance of memory deterioration, which starts from a base value
-                        # that gets affected by the person's memory and the strength of the belief facet
-                        chance_of_memory_deterioration = (
-                            config.chance_of_memory_deterioration_on_a_given_timestep[feature_type_str] /
-                            self.person_model.owner.mind.memory /
-                            belief_facet_strength
-                        )
-                        if random.random() < chance_of_memory_deterioration:
-                            # Instantiate a new belief facet that represents a deterioration of
-                            # the existing one (which itself may be a deterioration already)
-                            deteriorated_belief_facet = self.person_model.deteriorate_belief_facet(
-                                feature_type=feature_type_str, current_belief_facet=belief_facet
-                            )
-                            belief.__dict__[feature] = deteriorated_belief_facet
-
 
 class SkinBelief(object):
     """A person's mental model of a person's skin."""
@@ -2443,8 +2434,42 @@ class DistinctiveFeaturesBelief(object):
         return attribute_to_feature_type[attribute]
 
 
-class Facet(str):
-    """A facet of one person's mental model of a person (pertaining to a specific attribute)."""
+class BeliefColumn(object):
+    """An attribute of a Facet whose value is stored in a (NumPy) column of its BeliefTable."""
+
+    def __init__(self, name):
+        """Initialize a BeliefColumn object."""
+        self.name = name
+
+    def __get__(self, facet, facet_class):
+        """Return the value in the facet's row of this column."""
+        if facet is None:
+            return self
+        # Using item() gets a plain Python number, which is much faster to work with than a NumPy scalar
+        return getattr(facet.table, self.name).item(facet.row)
+
+    def __set__(self, facet, value):
+        """Set the value in the facet's row of this column."""
+        getattr(facet.table, self.name).itemset(facet.row, value)
+
+
+class Facet(object):
+    """A facet of one person's mental model of a person (pertaining to a specific attribute).
+
+    A facet holds its value (e.g., 'brown' as the Hair.color attribute it represents) and the
+    objects it relates, in slots; its numeric state, along with the evidence that gets attributed
+    to it, is stored in its row of a BeliefTable, and the remaining attributes are views onto
+    that row. Facets compare and hash as their values do, and otherwise behave like them.
+    """
+    __slots__ = (
+        'value', 'table', 'row', 'owner', 'subject', 'feature_type', 'predecessor', 'challengers',
+        'object_itself', 'mental_model'
+    )
+    challenger = BeliefColumn('challenger')
+    # The strength of a belief will increment commensurately to the strength of each
+    # new piece of evidence that gets attributed (by attribute_new_evidence) and will
+    # decay as time passes (by decay_strength)
+    strength = BeliefColumn('strength')
 
     def __init__(self, value, owner, subject, feature_type, initial_evidence, object_itself=None):
         """Initialize a Facet object.
@@ -2462,11 +2487,15 @@ class Facet(str):
                               mental models that points to a BusinessBelief, and so keeping
                               track of the object itself here affords an ontological network.
         """
-        super(Facet, self).__init__()
         self.owner = owner
-        self.owner.all_belief_facets.add(self)  # Used to make batch calls to decay_strength()
         self.subject = subject
-        self.feature_type = feature_type
+        # The numeric state of this facet, along with the evidence that gets attributed to it, is
+        # stored in the belief table of the owner's city; its strength starts at 0.0
+        self.table = owner.city.belief_table
+        self.value = self.table.intern(value)
+        self.feature_type = self.table.intern(feature_type)
+        self.row = self.table.add_row(facet=self, owner=owner, subject=subject)
+        owner.belief_tables.add(self.table)
         # Only currently held belief facets are attributed a predecessor -- if you are merely
         # challenging some held facet, the latter is not your predecessor; the default value
         # for .predecessor is None; this value gets changed by MentalModel.adopt_belief()
@@ -2481,7 +2510,7 @@ class Facet(str):
         if not self.challenger:
             # This is the character's first belief facet regarding this attribute -- have
             # it be adopted immediately
-            mental_model = self.owner.mind.mental_models[self.subject]
+            mental_model = owner.mind.mental_models[subject]
             mental_model.adopt_belief(
                 new_belief_facet=self, old_belief_facet=None
             )
@@ -2492,36 +2521,128 @@ class Facet(str):
         # belief accordingly (by .attribute_new_evidence) and relegate this belief to challenger
         # status. Upon adoption, a Facet that was a challenger inherits the challengers of
         # its predecessor, excluding itself
-        self.challengers = set()  # Default value; may get changed by MentalModel.adopt_belief()
-        self.evidence = set()
+        self.challengers = NO_CHALLENGERS  # Default value; may get changed by MentalModel.adopt_belief()
         self.object_itself = object_itself
         if object_itself:
             # If owner hasn't yet formed a mental model of the subject, form one
-            if object_itself not in self.owner.mind.mental_models:
+            if object_itself not in owner.mind.mental_models:
                 if object_itself.type == "residence":
-                    DwellingPlaceModel(owner=self.owner, subject=object_itself, observation=None)
+                    DwellingPlaceModel(owner=owner, subject=object_itself, observation=None)
                 elif object_itself.type == "business":
-                    BusinessMentalModel(owner=self.owner, subject=object_itself, observation=None)
+                    BusinessMentalModel(owner=owner, subject=object_itself, observation=None)
             # Link directly to owner's mental model of the object that this belief facet
             # resolves to -- this affords an ontological structure in the sense that
             # entities across a person's network of mental models may be linked according
             # to semantic relations like believing a person for whom you've developed a
             # mental model lives in a home for which you've developed a mental model
-            self.mental_model = self.owner.mind.mental_models[object_itself]
+            self.mental_model = owner.mind.mental_models[object_itself]
         else:
             self.mental_model = None
-        # The strength of a belief will increment commensurately to the strength of each
-        # new piece of evidence that gets attributed (by attribute_new_evidence) and will
-        # decay as time passes (by decay_strength)
-        self.strength = 0.0
         # Finally, attribute the initial evidence to this new belief facet, which may cause a
         # currently held belief to shift to challenger status, and this new belief to the
         # character's actual current belief
         self.attribute_new_evidence(new_evidence=initial_evidence)
 
-    def __new__(cls, value, owner, subject, feature_type, initial_evidence, object_itself):
-        """Do str stuff."""
-        return str.__new__(cls, value)
+    def __new__(cls, value, *args, **kwargs):
+        """Return a new facet that already holds its value, so that it may be hashed right away."""
+        facet = super(Facet, cls).__new__(cls)
+        facet.value = value
+        return facet
+
+    def __getnewargs__(self):
+        """Return the arguments that __new__() needs when this facet is unpickled."""
+        return self.value,
+
+    def __getstate__(self):
+        """Return the state of this facet to be pickled."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        """Restore the state of this facet upon unpickling."""
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __str__(self):
+        """Return the value of this facet."""
+        return self.value
+
+    def __repr__(self):
+        """Return a representation of the value of this facet."""
+        return repr(self.value)
+
+    def __format__(self, format_spec):
+        """Return the value of this facet, formatted according to the given spec."""
+        return format(self.value, format_spec)
+
+    def __eq__(self, other):
+        """Return whether this facet has the same value as the given string (or facet)."""
+        return self.value == other
+
+    def __ne__(self, other):
+        """Return whether this facet has a different value than the given string (or facet)."""
+        return not self == other
+
+    def __lt__(self, other):
+        """Return whether the value of this facet sorts before the given string (or facet)."""
+        return self.value < other
+
+    def __le__(self, other):
+        """Return whether the value of this facet sorts before, or is equal to, the given string (or facet)."""
+        return self.value <= other
+
+    def __gt__(self, other):
+        """Return whether the value of this facet sorts after the given string (or facet)."""
+        return self.value > other
+
+    def __ge__(self, other):
+        """Return whether the value of this facet sorts after, or is equal to, the given string (or facet)."""
+        return self.value >= other
+
+    def __hash__(self):
+        """Return the hash of the value of this facet."""
+        return hash(self.value)
+
+    def __nonzero__(self):
+        """Return whether this facet has a value, i.e., whether it isn't a forgotten belief ('')."""
+        return bool(self.value)
+
+    def __int__(self):
+        """Return the value of this facet as an integer, e.g., for a belief about someone's birth year."""
+        return int(self.value)
+
+    def __float__(self):
+        """Return the value of this facet as a float."""
+        return float(self.value)
+
+    def __len__(self):
+        """Return the length of the value of this facet."""
+        return len(self.value)
+
+    def __iter__(self):
+        """Iterate over the characters in the value of this facet."""
+        return iter(self.value)
+
+    def __getitem__(self, index):
+        """Return the given character(s) of the value of this facet."""
+        return self.value[index]
+
+    def __contains__(self, substring):
+        """Return whether the given string occurs in the value of this facet."""
+        return substring in self.value
+
+    def __add__(self, other):
+        """Return the value of this facet concatenated with the given string."""
+        return self.value + other
+
+    def __radd__(self, other):
+        """Return the given string concatenated with the value of this facet."""
+        return other + self.value
+
+    def __getattr__(self, name):
+        """Delegate string methods (e.g., title()) to the value of this facet."""
+        if name.startswith('_') or name in Facet.__slots__:
+            raise AttributeError(name)
+        return getattr(self.value, name)
 
     @property
     def accurate(self):
@@ -2532,6 +2653,11 @@ class Facet(str):
         else:
             return False
 
+    @property
+    def evidence(self):
+        """Return the set of all the pieces of evidence that have been attributed to this belief facet."""
+        return set(self.table.evidence_of(row=self.row))
+
     @property
     def strength_str(self):
         """Return a short description of the strength of this belief."""
@@ -2550,14 +2676,17 @@ class Facet(str):
 
     def decay_strength(self):
         """Decay the strength of this belief due to time passing."""
-        self.strength *= self.owner.game.config.decay_rate_of_belief_strength_per_day
+        self.strength *= self.owner.cosmos.config.decay_rate_of_belief_strength_per_day
 
     def attribute_new_evidence(self, new_evidence):
         """Attribute new evidence that supports this belief facet."""
-        self.evidence.add(new_evidence)
         new_evidence.beliefs_evidenced.add(self)
         # Adjust the strength of this belief commensurately to the strength of this new evidence
-        self.strength += new_evidence.determine_strength(feature_type=self.feature_type)
+        # (this is done by way of the table directly, since this gets called a great deal)
+        table, row = self.table, self.row
+        table.attribute_evidence(
+            row=row, evidence=new_evidence, strength=new_evidence.determine_strength(feature_type=self.feature_type)
+        )
         # If this is a challenger belief facet, check for whether this belief is now stronger
         # than the character's currently held belief, in which case it will lose its challenger
         # status and the old belief will be attributed as merely a challenger to this belief
@@ -2566,7 +2695,7 @@ class Facet(str):
         # deterioration/observation always wins (and indeed the chance of deterioration
         # occurring is determined probabilistically according to the strength of the previously
         # held belief, so in a sense it has already been determined to be 'stronger')
-        if self.challenger:
+        if table.challenger.item(row):
             currently_held_belief = self._get_currently_held_belief()
             assert currently_held_belief is not None, (
                 "{}'s belief facet '{}' for {}'s {} has been wrongly attributed challenger status, i.e, "
@@ -2600,17 +2729,8 @@ class Facet(str):
     def _get_currently_held_belief(self):
         """Return the belief facet that is currently held for this feature type; if none, return None."""
         mental_model = self.owner.mind.mental_models[self.subject]
-        command_to_access_currently_held_belief = mental_model.get_command_to_access_a_belief_facet(
-            feature_type=self.feature_type
-        )
-        # Have to swap out 'self' in this command, because the return value for
-        # mental_model.get_command_to_access_a_belief_facet() is relative to mental model
-        # being referenceable by 'self'
-        command_to_access_currently_held_belief = (
-            command_to_access_currently_held_belief.replace('self', 'mental_model')
-        )
         try:
-            currently_held_belief = eval(command_to_access_currently_held_belief)
+            currently_held_belief = mental_model.get_belief_facet(feature_type=self.feature_type)
         except AttributeError:
             # This error gets raised when the mental model has not even been fully constructed
             # yet -- i.e., this is one of the initial belief facets that will make up the initial
@@ -2619,13 +2739,13 @@ class Facet(str):
             # there is no currently held belief for this attribute
             currently_held_belief = None
         except KeyError:
-            # This error gets raised when an attempt is made (by evaluating command_to_access_
-            # currently_held_belief) to access a non-existent whereabouts belief; i.e., the
-            # command will specify accessing a WhereaboutsBelief.date dictionary with a key for
-            # the timestep in question, but if this person did not already hold some belief about
-            # subject's whereabouts on that timestep, then a KeyError will be raised, since there
-            # will be no entry in the dictionary associated with that key;  in this case, we can
-            # safely assert that there is no currently held belief for this attribute
+            # This error gets raised when an attempt is made to access a non-existent whereabouts
+            # belief; i.e., mental_model.get_belief_facet() will access a WhereaboutsBelief.date
+            # dictionary with a key for the timestep in question, but if this person did not
+            # already hold some belief about subject's whereabouts on that timestep, then a KeyError
+            # will be raised, since there will be no entry in the dictionary associated with that
+            # key;  in this case, we can safely assert that there is no currently held belief for
+            # this attribute
             assert 'whereabouts' in self.feature_type, (
                 "A KeyError was raised outside of the context of an attempt to access a "
                 "non-existent whereabouts belief."
@@ -2641,4 +2761,98 @@ class Facet(str):
         all_evidence_supporting_belief = list(self.evidence)
         all_evidence_supporting_belief.sort(key=lambda piece: piece.event_number)
         for piece in all_evidence_supporting_belief:
-            print '--{}'.format(piece)
\ No newline at end of file
+            print '--{}'.format(piece)
+
+
+class BeliefTable(object):
+    """The belief facets held by people living in a city, stored sparsely as parallel columns.
+
+    Each row holds the numeric state of one belief facet, i.e., of what one person believes (or
+    once believed, or is considering believing) about a single feature of some person or place.
+    Rows only exist for the facets that people actually hold, and the rows of a person's
+    facets about a given subject are indexed together. The feature types and values that facets
+    hold are interned here, so that every distinct string is stored only once. The evidence
+    attributed to the facets is kept in an append-only evidence log, in which each entry refers
+    by offset to the entry for the previous piece of evidence for the same facet; every row
+    holds the offset of the most recent piece of evidence for its facet.
+
+    Facet objects are handles onto their rows (see BeliefColumn), and MentalModel objects hold
+    the facets, so the interfaces to beliefs are unchanged.
+    """
+
+    FLOAT_COLUMNS = ('strength',)
+    INT_COLUMNS = ('latest_evidence_offset',)
+    BOOL_COLUMNS = ('challenger',)
+
+    def __init__(self, city, initial_capacity=64):
+        """Initialize a BeliefTable object."""
+        self.city = city
+        self.n_rows = 0
+        self.facets = []  # Maps row number to Facet
+        self.rows_about = {}  # Maps (owner, subject) to the rows of owner's belief facets about subject
+        self.interned_strings = {}  # Maps each feature type and value to its single stored copy
+        for column in self.FLOAT_COLUMNS:
+            setattr(self, column, numpy.zeros(initial_capacity, dtype=float))
+        for column in self.INT_COLUMNS:
+            setattr(self, column, numpy.zeros(initial_capacity, dtype=int))
+        for column in self.BOOL_COLUMNS:
+            setattr(self, column, numpy.zeros(initial_capacity, dtype=bool))
+        # The evidence log
+        self.evidence = []
+        self.evidence_rows = array.array('l')  # The row of the facet to which each piece of evidence was attributed
+        self.previous_evidence_offsets = array.array('l')  # -1 for a facet's first piece of evidence
+
+    def __len__(self):
+        """Return the number of rows in this table."""
+        return self.n_rows
+
+    def add_row(self, facet, owner, subject):
+        """Add a row for the given belief facet, and return its row number."""
+        if self.n_rows == len(self.strength):
+            for column in self.FLOAT_COLUMNS + self.INT_COLUMNS + self.BOOL_COLUMNS:
+                old_column = getattr(self, column)
+                new_column = numpy.zeros(2*len(old_column), dtype=old_column.dtype)
+                new_column[:self.n_rows] = old_column
+                setattr(self, column, new_column)
+        row = self.n_rows
+        self.n_rows += 1
+        self.facets.append(facet)
+        try:
+            self.rows_about[(owner, subject)].append(row)
+        except KeyError:
+            self.rows_about[(owner, subject)] = array.array('l', (row,))
+        self.latest_evidence_offset.itemset(row, -1)
+        return row
+
+    def intern(self, string):
+        """Return the single stored copy of the given string (e.g., a facet value), storing it if necessary."""
+        string = str(string)
+        return self.interned_strings.setdefault(string, string)
+
+    def attribute_evidence(self, row, evidence, strength):
+        """Append a piece of evidence for the facet in the given row to the evidence log, and add its
+        strength to that of the facet."""
+        offset = len(self.evidence)
+        self.evidence.append(evidence)
+        self.evidence_rows.append(row)
+        latest_evidence_offset = self.latest_evidence_offset
+        self.previous_evidence_offsets.append(latest_evidence_offset.item(row))
+        latest_evidence_offset.itemset(row, offset)
+        self.strength.itemset(row, self.strength.item(row) + strength)
+
+    def evidence_of(self, row):
+        """Return a list of the evidence for the facet in the given row, from most to least recent."""
+        evidence = []
+        offset = self.latest_evidence_offset.item(row)
+        while offset != -1:
+            evidence.append(self.evidence[offset])
+            offset = self.previous_evidence_offsets[offset]
+        return evidence
+
+    def facets_about(self, owner, subject, feature_type=None):
+        """Return a list of the belief facets that owner holds about subject, optionally only of the given type."""
+        rows = self.rows_about.get((owner, subject), ())
+        if feature_type is None:
+            return [self.facets[row] for row in rows]
+        facets = self.facets
+        return [facets[row] for row in rows if facets[row].feature_type == feature_type]
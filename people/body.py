@@ -199,4 +199,8 @@ class Feature(float):
 
     def __new__(cls, value, inherited_from):
         """Do float stuff."""
-        return float.__new__(cls, value)
\ No newline at end of file
+        return float.__new__(cls, value)
+
+    def __getnewargs__(self):
+        """Return the arguments that __new__() needs when this feature is unpickled."""
+        return float(self), None
\ No newline at end of file
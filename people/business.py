@@ -1,9 +1,11 @@
 import heapq
+import numpy
 from occupation import *
 from person import PersonExNihilo
 from residence import *
 from events.major_event import Demolition, BusinessConstruction, Hiring, BusinessClosure, LayOff
 from utils.errors import NoVacantTractsError
+from utils.utilities import rebuild_with_id
 from corpora import Names
 from baseball.field import Field
 
@@ -35,6 +37,7 @@ class Business(object):
         self.demise = config.business_types_advent_demise_and_minimum_population[self.__class__][1]
         # 'Services' is a tuple specifying the services offered by this business, given its type
         self.services = config.services_provided_by_business_of_type[self.__class__]
+        self.city.business_directory.add(self)
         self.founded = city.cosmos.year
         if self.city.vacant_lots or self.__class__ in config.companies_that_get_established_on_tracts:
             self.lot = self._init_choose_vacant_lot()
@@ -52,6 +55,8 @@ class Business(object):
             )
             self.lot = acquired_lot
         self.lot.building = self
+        self.city.lot_neighborhoods.note_change_in_population(self.lot)
+        self.city.note_change_in_occupancy_of_lot(self.lot)
         self.held_by = None  # Potentially gets set to holding company by self._init_holding_company()
         # First, hire employees
         self.employees = set()
@@ -106,6 +111,18 @@ class Business(object):
         self.closure = None  # BusinessClosure object itself
         self.closed = None  # Year closed
 
+    def __hash__(self):
+        """Return a hash of this business.
+
+        Hashing by ID, rather than by memory address, makes the iteration order of sets of
+        businesses deterministic, which is needed for a cosmos to be reproducible from its ID.
+        """
+        return self.id
+
+    def __reduce_ex__(self, protocol):
+        """Pickle this business such that its ID is restored before anything can try to hash it."""
+        return rebuild_with_id, (self.__class__, self.id), self.__dict__
+
     def __str__(self):
         """Return string representation."""
         if not self.out_of_business:
@@ -444,17 +461,14 @@ class Business(object):
 
     def _rate_all_occupied_lots(self):
         """Rate all lots currently occupied by homes for their desirability as business locations."""
-        lots_with_homes_on_them = (l for l in self.city.lots if l.building and l.building.type == 'residence')
-        scores = {}
-        for lot in lots_with_homes_on_them:
-            scores[lot] = self._rate_potential_lot(lot=lot)
-        return scores
+        lots_with_homes_on_them = list(self.city.lots_with_homes)
+        return dict(zip(lots_with_homes_on_them, self._rate_potential_lots(lots=lots_with_homes_on_them).tolist()))
 
     def _init_choose_vacant_lot(self):
         """Choose a vacant lot on which to build the company building.
 
-        Currently, a company scores all the vacant lots in town and then selects
-        one of the top three. TODO: Probabilistically select from all lots using
+        Currently, a company retrieves the three best-scoring vacant lots in town and then
+        selects one of them. TODO: Probabilistically select from all lots using
         the scores to derive likelihoods of selecting each.
         """
         if self.__class__ in self.city.cosmos.config.companies_that_get_established_on_tracts:
@@ -466,47 +480,36 @@ class Business(object):
                 self.owner.person.name, self.__class__.__name__, self.city.name
             )
         )
-        lot_scores = self._rate_all_vacant_lots()
-        if len(lot_scores) >= 3:
+        # The vacant lots and tracts are kept ranked by the same criterion by which we rate lots
+        # (see self._rate_potential_lots()), so we can retrieve the top three straight away
+        top_three_choices = vacant_lots_or_tracts.best(3)
+        if len(top_three_choices) >= 3:
             # Pick from top three
-            top_three_choices = heapq.nlargest(3, lot_scores, key=lot_scores.get)
             if random.random() < 0.6:
                 choice = top_three_choices[0]
             elif random.random() < 0.9:
                 choice = top_three_choices[1]
             else:
                 choice = top_three_choices[2]
-        elif lot_scores:
-            choice = max(lot_scores)
+        elif top_three_choices:
+            choice = top_three_choices[0]
         else:
             raise Exception("A company attempted to secure a lot in town when in fact none are vacant.")
         return choice
 
-    def _rate_all_vacant_lots(self):
-        """Rate all vacant lots for the desirability of their locations.
-        """
-        if self.__class__ in self.city.cosmos.config.companies_that_get_established_on_tracts:
-            vacant_lots_or_tracts = self.city.vacant_tracts
-        else:
-            vacant_lots_or_tracts = self.city.vacant_lots
-        scores = {}
-        for lot in vacant_lots_or_tracts:
-            scores[lot] = self._rate_potential_lot(lot=lot)
-        return scores
-
-    def _rate_potential_lot(self, lot):
-        """Rate a vacant lot for the desirability of its location.
+    def _rate_potential_lots(self, lots):
+        """Rate lots for the desirability of their locations, returning an array of scores.
 
-        By this method, a company appraises a vacant lot in the city for how much they
-        would like to build there, given considerations to its proximity to downtown,
-        proximity to other businesses of the same type, and to the number of people living
-        near the lot.
+        By this method, a company appraises lots in the city for how much they would like
+        to build there, given considerations to their proximity to downtown, proximity to
+        other businesses of the same type, and to the number of people living near them.
+        All the lots are scored in a single pass over arrays.
         """
-        score = 0
+        scores = numpy.zeros(len(lots))
         # As (now) the only criterion, rate lots according to their distance
         # from downtown; this causes a downtown commercial area to naturally emerge
-        score -= self.city.dist_from_downtown(lot)
-        return score
+        scores -= self.city.dists_from_downtown(lots)
+        return scores
 
     @property
     def locked(self):
@@ -809,6 +812,8 @@ class Business(object):
         wishes to operate out of it.
         """
         self.lot.building = None
+        self.city.lot_neighborhoods.note_change_in_population(self.lot)
+        self.city.note_change_in_occupancy_of_lot(self.lot)
 
     def get_held_by_holding_company(self, holding_company):
         """Get held by a holding company, usually when the owner of this company starts another company."""
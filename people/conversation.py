@@ -11,7 +11,6 @@ class Conversation(Event):
         """Initialize a Conversation object."""
         super(Conversation, self).__init__(cosmos=initiator.game)
         self.game = initiator.game
-        self.productionist = self.game.productionist  # NLG module
         self.productionist.debug = debug
         self.initiator = initiator
         self.recipient = recipient
@@ -71,6 +70,11 @@ class Conversation(Event):
                 self.goals[self.initiator] |= frame.goals[self.initiator]
                 self.goals[self.recipient] |= frame.goals[self.recipient]
 
+    @property
+    def productionist(self):
+        """Return the NLG module (looked up, rather than held, so that conversations can be pickled)."""
+        return self.game.productionist
+
     @property
     def speaker(self):
         """Return the current speaker."""
@@ -8,11 +8,11 @@ class PieceOfEvidence(object):
         """Initialize a PieceOfEvidence object."""
         self.type = self.__class__.__name__.lower()
         self.location = source.location
-        self.date = source.game.date
-        self.ordinal_date = source.game.ordinal_date
+        self.date = source.cosmos.date
+        self.ordinal_date = source.cosmos.ordinal_date
         # Also request and attribute an event number, so that we can later
         # determine the precise ordering of events that happen on the same timestep
-        self.event_number = source.game.assign_event_number(new_event=self)
+        self.event_number = source.cosmos.assign_event_number(new_event=self)
         self.subject = subject
         self.source = source
         self.recipient = None  # Will get overwritten in case of Lie, Statement, Declaration, Eavesdropping
@@ -88,7 +88,7 @@ class PieceOfEvidence(object):
         evidence and how strong the source's belief is (at this timestep, i.e., the time
         of it being conveyed to the recipient).
         """
-        config = self.source.game.config
+        config = self.source.cosmos.config
         source, recipient, subject = self.source, self.recipient, self.subject
         this_is_propagation = self.type in ('statement', 'lie', 'eavesdropping')
         if not self.base_strength:
@@ -166,7 +166,7 @@ class Implant(PieceOfEvidence):
         """Determine the strength of this piece of evidence for the given feature type (overwrites
         base-class method).
         """
-        config = self.source.game.config
+        config = self.source.cosmos.config
         if not self.base_strength:
             base_strength_given_salience_of_and_number_of_social_interactions_with_subject = (
                 config.social_and_salience_component_of_implant_strength(
@@ -21,6 +21,7 @@ class Occupation(object):
         self.company = company
         self.shift = shift
         self.company.employees.add(self)
+        self.company.city.lot_neighborhoods.note_change_in_population(self.company.lot)
         self.start_date = person.cosmos.year
         self.hiring = None  # event.Hiring object holding data about the hiring; gets set by that object's __init__()
         self.end_date = None  # Changed by self.terminate
@@ -138,6 +139,7 @@ class Occupation(object):
         self.terminus = reason
         self.company.employees.remove(self)
         self.company.former_employees.add(self)
+        self.company.city.lot_neighborhoods.note_change_in_population(self.company.lot)
         if self is self.company.owner:
             self.company.former_owners.append(self)
         # If this isn't an in-house promotion, update a bunch of attributes
@@ -257,6 +259,7 @@ class Magnate(Occupation):
         self.terminus = reason
         self.company.employees.remove(self)
         self.company.former_employees.add(self)
+        self.company.city.lot_neighborhoods.note_change_in_population(self.company.lot)
         replacement_already_hired = False
         # If this position isn't terminating as part of a company's go_out_of_business
         # procedure, then it means this person is retiring or has died, and so we need
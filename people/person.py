@@ -1,5 +1,6 @@
 # import random
 import heapq
+import numpy
 # import datetime
 # from corpora import Names
 import events.major_event
@@ -19,6 +20,7 @@ from belief import *
 import face
 from baseball.player import Player
 from baseball.fan import Fan
+from utils.utilities import rebuild_with_id
 
 
 class Person(object):
@@ -30,11 +32,13 @@ class Person(object):
         self.cosmos = cosmos
         self.id = self.cosmos.current_person_id
         self.cosmos.current_person_id += 1
+        self.cosmos.registry.register(person=self)
         self.type = "person"
         self.birth = birth
         if birth:
             self.city = self.birth.city
             if self.city:
+                self.cosmos.registry.add_resident(person=self, city=self.city)
                 self.city.residents.add(self)
             # Set parents
             self.biological_mother = birth.biological_mother
@@ -201,12 +205,15 @@ class Person(object):
         self.retirement = None
         self.departures = []  # Leaving a city
         self.death = None
+        # Whether this person's record has been evicted to the cosmos's PersonArchive, which
+        # happens to people who have been dead or departed for some time (see Person.__getattr__())
+        self.archived = False
         # Set and prepare attributes pertaining to business affairs
         self.money = self._init_money()
+        self.retired = False  # Must come before setting occupation
         self.occupation = None
         self.occupations = []
         self.former_contractors = set()
-        self.retired = False
         # Prepare attributes pertaining to education
         self.college_graduate = False
         # Prepare attributes pertaining to dynamic emotional considerations
@@ -215,13 +222,64 @@ class Person(object):
         # will always be modified by self.go_to()
         self.location = None
         # Prepare attributes pertaining to this person's knowledge
-        self.all_belief_facets = set()  # Used to make batch calls to Facet.decay_strength()
+        self.belief_tables = set()  # The belief tables in which this person's belief facets are stored
         # Miscellaneous attributes pertaining to artifacts this person is wearing
         self.wedding_ring_on_finger = None
         # Currently, whether a character is the player character is only considered by Conversation
         # objects (when deciding whether to elicit a dialogue move from the player)
         self.player_character = False
 
+    def __hash__(self):
+        """Return a hash of this person.
+
+        Hashing by ID, rather than by memory address, makes the iteration order of sets of
+        people deterministic, which is needed for a cosmos to be reproducible from its ID.
+        """
+        return self.id
+
+    def __reduce_ex__(self, protocol):
+        """Pickle this person such that its ID is restored before anything can try to hash it."""
+        return rebuild_with_id, (self.__class__, self.id), self.__dict__
+
+    @property
+    def age(self):
+        """Return this person's age."""
+        return self._age
+
+    @age.setter
+    def age(self, age):
+        """Set this person's age, keeping the cosmos's index of age bands up to date."""
+        self.cosmos.registry.record_change_in_age(person=self, old_age=self.__dict__.get('_age'), new_age=age)
+        self._age = age
+
+    @property
+    def occupation(self):
+        """Return this person's current occupation, if any."""
+        return self._occupation
+
+    @occupation.setter
+    def occupation(self, occupation):
+        """Set this person's current occupation, keeping the cosmos's index of workers up to date."""
+        old_occupation = self.__dict__.get('_occupation')
+        # Set this first, since whether this person is searching for work depends on it
+        self._occupation = occupation
+        self.cosmos.registry.record_change_in_occupation(
+            person=self, old_occupation=old_occupation, new_occupation=occupation
+        )
+
+    def __getattr__(self, attribute):
+        """Rehydrate this person from the cosmos's PersonArchive, if they have been archived.
+
+        This only gets called when an attribute can't be found in the usual way, which is
+        what happens when someone accesses an attribute of an archived person.
+        """
+        if attribute.startswith('__') or not self.__dict__.get('archived'):
+            raise AttributeError(
+                "'{}' object has no attribute '{}'".format(self.__class__.__name__, attribute)
+            )
+        self.cosmos.archive.rehydrate(person=self)
+        return getattr(self, attribute)
+
     def __str__(self):
         """Return string representation."""
         if self.alive:
@@ -845,8 +903,10 @@ class Person(object):
         """Return this person's knowledge about another person's feature of the given type."""
         if other_person not in self.mind.mental_models:
             return None
+        # Carry out any deterioration of this knowledge that has accrued (see MentalModel.settle())
+        self.mind.mental_models[other_person].settle()
         # Name
-        elif feature_type == "first name":
+        if feature_type == "first name":
             return self.mind.mental_models[other_person].name.first_name
         elif feature_type == "middle name":
             return self.mind.mental_models[other_person].name.middle_name
@@ -942,7 +1002,9 @@ class Person(object):
         """Return this person's knowledge about this place's feature of the given type."""
         if place not in self.mind.mental_models:
             return None
-        elif feature_type == "home is apartment":
+        # Carry out any deterioration of this knowledge that has accrued (see MentalModel.settle())
+        self.mind.mental_models[place].settle()
+        if feature_type == "home is apartment":
             return "yes" if self.mind.mental_models[place].apartment else "no"
         elif feature_type == "business block":
             return self.mind.mental_models[place].block
@@ -993,12 +1055,11 @@ class Person(object):
         None is passed).
         """
         all_my_sources = []
-        if feature_type:
-            all_my_relevant_beliefs = [
-                f for f in self.all_belief_facets if f.subject is entity and f.feature_type == feature_type
-            ]
-        else:  # Just collect all facets pertaining to entity
-            all_my_relevant_beliefs = [f for f in self.all_belief_facets if f.subject is entity]
+        all_my_relevant_beliefs = []
+        for belief_table in self.belief_tables:
+            all_my_relevant_beliefs += belief_table.facets_about(
+                owner=self, subject=entity, feature_type=feature_type
+            )
         for facet in all_my_relevant_beliefs:
             for piece in facet.evidence:
                 if piece.source:
@@ -1996,58 +2057,57 @@ class Person(object):
 
     def _rate_all_vacant_homes_and_vacant_lots(self, city):
         """Rate all vacant homes and vacant lots."""
-        scores = {}
-        for home in city.vacant_homes:
-            my_score = self.rate_potential_lot(lot=home.lot)
-            if self.spouse:
-                spouse_score = self.spouse.rate_potential_lot(lot=home.lot)
-            else:
-                spouse_score = 0
-            scores[home] = my_score + spouse_score
-        for lot in city.vacant_lots:
-            my_score = self.rate_potential_lot(lot=lot)
-            if self.spouse:
-                spouse_score = self.spouse.rate_potential_lot(lot=lot)
-            else:
-                spouse_score = 0
-            scores[lot] = (
-                (my_score + spouse_score) * self.cosmos.config.penalty_for_having_to_build_a_home_vs_buying_one
-            )
-        return scores
+        vacant_homes = list(city.vacant_homes)
+        vacant_lots = list(city.vacant_lots)
+        lots_being_rated = [home.lot for home in vacant_homes] + vacant_lots
+        scores = self.rate_potential_lots(city=city, lots=lots_being_rated)
+        if self.spouse:
+            scores += self.spouse.rate_potential_lots(city=city, lots=lots_being_rated)
+        scores[len(vacant_homes):] *= self.cosmos.config.penalty_for_having_to_build_a_home_vs_buying_one
+        return dict(zip(vacant_homes + vacant_lots, scores.tolist()))
 
     def rate_potential_lot(self, lot):
-        """Rate the desirability of living at the location of a lot.
+        """Rate the desirability of living at the location of a lot."""
+        return self.rate_potential_lots(city=lot.city, lots=[lot]).item(0)
+
+    def rate_potential_lots(self, city, lots):
+        """Rate the desirability of living at the location of each of the given lots, returning an array of scores.
 
-        By this method, a person appraises a vacant home or lot in the city for
-        how much they would like to move or build there, given considerations to the people
-        that live nearby it (this reasoning via self.score_potential_home_or_lot()). There is
-        a penalty that makes people less willing to build a home on a vacant lot than to move
-        into a vacant home.
+        By this method, a person appraises vacant homes or lots in a city for how much they
+        would like to move or build there, given considerations to the people that live nearby
+        them. All the lots are scored in a single pass over a matrix of the distances between
+        them and the homes of those people.
         """
         config = self.cosmos.config
         pull_to_live_near_that_relation = config.pull_to_live_near_family
         pull_to_live_near_a_friend = config.pull_to_live_near_a_friend
         desire_to_live_near_family = self._determine_desire_to_move_near_family()
-        # Score home for its proximity to family (either positively or negatively, depending); only
+        lot_distances = city.lot_distances
+        scores = numpy.zeros(len(lots))
+        if not lots:
+            return scores
+        # Score homes for their proximity to family (either positively or negatively, depending); only
         # consider family members that are alive, in town, and not living with you already (i.e., kids)
-        relatives_in_town = {f for f in self.extended_family if f.city is lot.city and f.home is not self.home}
-        score = 0
-        for relative in relatives_in_town:
-            relation_to_me = self._common_familial_relation_to_me(person=relative)
-            pull_toward_someone_of_that_relation = pull_to_live_near_that_relation.get(relation_to_me, 0.0)
-            dist = lot.city.distance_between(relative.home.lot, lot) + 1.0  # To avoid ZeroDivisionError
-            score += (desire_to_live_near_family * pull_toward_someone_of_that_relation) / dist
+        relatives_in_town = [f for f in self.extended_family if f.city is city and f.home is not self.home]
+        if relatives_in_town:
+            pulls_toward_those_relatives = numpy.array([
+                pull_to_live_near_that_relation.get(self._common_familial_relation_to_me(person=relative), 0.0)
+                for relative in relatives_in_town
+            ])
+            # Add 1 to each distance to avoid ZeroDivisionError
+            dists = lot_distances.among(lots, [relative.home.lot for relative in relatives_in_town]) + 1.0
+            scores += (desire_to_live_near_family * pulls_toward_those_relatives / dists).sum(axis=1)
         # Score for proximity to friends (only positively)
-        friends_in_town = {f for f in self.friends if f.city is lot.city and f.home is not self.home}
-        for friend in friends_in_town:
-            dist = lot.city.distance_between(friend.home.lot, lot) + 1.0
-            score += pull_to_live_near_a_friend / dist
+        friends_in_town = [f for f in self.friends if f.city is city and f.home is not self.home]
+        if friends_in_town:
+            dists = lot_distances.among(lots, [friend.home.lot for friend in friends_in_town]) + 1.0
+            scores += (pull_to_live_near_a_friend / dists).sum(axis=1)
         # Score for proximity to workplace (only positively) -- will be only criterion for person
         # who is new to the city (and thus accurate_belief no one there yet)
-        if self.occupation and self.occupation.company.city is lot.city:
-            dist = lot.city.distance_between(self.occupation.company.lot, lot) + 1.0
-            score += config.pull_to_live_near_workplace / dist
-        return score
+        if self.occupation and self.occupation.company.city is city:
+            dists = lot_distances.from_lot(self.occupation.company.lot, lots) + 1.0
+            scores += config.pull_to_live_near_workplace / dists
+        return scores
 
     def _determine_desire_to_move_near_family(self):
         """Decide how badly you want to move near/away from family.
@@ -2137,23 +2197,40 @@ class Person(object):
         else:
             self.mind.mental_models[subject].build_up(new_observation_or_reflection=observation)
 
-    def socialize(self, missing_timesteps_to_account_for=1, propagate_knowledge=False):
-        """Socialize with nearby people."""
+    def socialize(self, missing_timesteps_to_account_for=1, propagate_knowledge=False, interactions=None,
+                  engine=None):
+        """Socialize with nearby people.
+
+        @param interactions: An InteractionBatch to which any social interactions will be added, to
+                             be progressed all at once; if None, they are progressed immediately.
+        @param engine: A SocialInteractionEngine that will decide whom this person instigates
+                       interactions with; if None, this is decided person by person.
+        """
         if not self.location:
             raise Exception("{} tried to socialize, but they have no location currently.".format(self.name))
-        for person in list(self.location.people_here_now):
-            if self._decide_to_instigate_social_interaction(other_person=person):
-                if person not in self.relationships:
-                    Acquaintance(owner=self, subject=person, preceded_by=None)
-                if not self.relationships[person].interacted_this_timestep:
-                    # Make sure they didn't already interact this timestep
+        self.cosmos.instrumentation.count('person: socialize')
+        if engine is not None:
+            interaction_partners = engine.choose_interaction_partners(person=self)
+        else:
+            interaction_partners = (
+                p for p in list(self.location.people_here_now) if
+                self._decide_to_instigate_social_interaction(other_person=p)
+            )
+        for person in interaction_partners:
+            if person not in self.relationships:
+                Acquaintance(owner=self, subject=person, preceded_by=None)
+            if not self.relationships[person].interacted_this_timestep:
+                # Make sure they didn't already interact this timestep
+                if interactions is not None:
+                    interactions.add(relationship=self.relationships[person])
+                else:
                     self.relationships[person].progress_relationship(
                         missing_days_to_account_for=missing_timesteps_to_account_for
                     )
-                    # If this is being called by the full-fidelity simulation,
-                    # have these two people exchange information with each other
-                    if missing_timesteps_to_account_for == 1:
-                        self._exchange_information(interlocutor=person)
+                # If this is being called by the full-fidelity simulation,
+                # have these two people exchange information with each other
+                if missing_timesteps_to_account_for == 1:
+                    self._exchange_information(interlocutor=person)
         # Also cheat to simulate socializing between people that live together,
         # regardless of where they are truly located (otherwise have things like
         # a kid who has never met his mother, because she works the night shift)
@@ -2162,9 +2239,12 @@ class Person(object):
                 Acquaintance(owner=self, subject=person, preceded_by=None)
             if not self.relationships[person].interacted_this_timestep:
                 # Make sure they didn't already interact this timestep
-                self.relationships[person].progress_relationship(
-                    missing_days_to_account_for=missing_timesteps_to_account_for
-                )
+                if interactions is not None:
+                    interactions.add(relationship=self.relationships[person])
+                else:
+                    self.relationships[person].progress_relationship(
+                        missing_days_to_account_for=missing_timesteps_to_account_for
+                    )
                 # If this is being called by the full-fidelity simulation,
                 # have these two people exchange information with each other
                 if propagate_knowledge:
@@ -2319,6 +2399,7 @@ class Person(object):
         self.age = age = self.cosmos.true_year - self.birth_year
         if age == config.age_people_start_working(year=self.cosmos.year):
             self.ready_to_work = True
+            self.cosmos.registry.record_change_in_employment_status(person=self)
             consider_leaving_town = True
         if age == 18:
             self.adult = True
@@ -2624,6 +2705,8 @@ class PersonExNihilo(Person):
     def move_into_the_city(self, hiring_that_instigated_move):
         """Move into the city in which gameplay takes place."""
         self.city = self.cosmos.city
+        if self not in self.city.residents:
+            self.cosmos.registry.add_resident(person=self, city=self.city)
         self.city.residents.add(self)
         new_home = self.secure_home()
         if not new_home:
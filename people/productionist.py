@@ -1,7 +1,6 @@
 import sys
 import json
 import itertools
-import random
 
 
 PATH_TO_JSON_GRAMMAR_SPECIFICATION = '/Users/jamesryan/Desktop/Projects/Personal/anytown/content/talktown.json'
@@ -19,6 +18,8 @@ class Productionist(object):
         """Initialize a Productionist object."""
         self.game = game
         self.debug = debug
+        # Draw from a dedicated random stream, so that producing dialogue doesn't perturb the simulation
+        self.random = game.random_streams.stream('nlg')
         self.nonterminal_symbols = self._init_parse_json_grammar_specification()
         self._init_resolve_symbol_references_in_all_production_rule_bodies()
         self._init_attribute_backward_chaining_and_forward_chaining_rules_to_symbols()
@@ -135,7 +136,7 @@ class Productionist(object):
         # Collect all symbols that satisfice this move (see above or ctrl+f for more explanation)
         satisficing_symbols = list(self.move_satisficers[move_name])
         # Randomly shuffle this list (to promote conversational variability)
-        random.shuffle(satisficing_symbols)
+        self.random.shuffle(satisficing_symbols)
         # Iteratively attempt to successfully build a line of dialogue by backward-chaining
         # and forward-chaining from this symbol
         for symbol in satisficing_symbols:
@@ -175,7 +176,7 @@ class Productionist(object):
             satisficing_symbols |= self.topic_satisficers[topic_name]
         satisficing_symbols = list(satisficing_symbols)
         # Randomly shuffle this list (to promote conversational variability)
-        random.shuffle(satisficing_symbols)
+        self.random.shuffle(satisficing_symbols)
         # Iteratively attempt to successfully build a line of dialogue by backward-chaining
         # and forward-chaining from this symbol
         for symbol in satisficing_symbols:
@@ -401,7 +402,7 @@ class Productionist(object):
         # rule-head groups, since the application rates of rules in different groups
         # only mean anything relative to the other rules in that same group, not to
         # rules in other groups)
-        random.shuffle(rule_heads)
+        self.random.shuffle(rule_heads)
         # Probabilistically sort each head group
         for head in rule_heads:
             rules_sharing_this_head = [rule for rule in rules if rule.head is head]
@@ -424,7 +425,7 @@ class Productionist(object):
             probability_ranges = (
                 self._fit_probability_distribution_to_rules_according_to_their_application_rates(rules=remaining_rules)
             )
-            x = random.random()
+            x = self.random.random()
             probabilistically_selected_rule = next(
                 rule for rule in remaining_rules if probability_ranges[rule][0] <= x <= probability_ranges[rule][1]
             )
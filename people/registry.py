@@ -0,0 +1,187 @@
+from utils.utilities import IndexedSet
+
+
+class PopulationRegistry(object):
+    """A registry of everyone who has ever lived in a cosmos, with indexes that are kept up to date.
+
+    Rather than rebuilding listings by walking every resident of every city each time one is
+    needed, the indexes here are updated at the moments people come and go: birth (or generation
+    ex nihilo), moving to a new city, death, and departure, as well as changes in occupation,
+    age, and (for baseball players) free agency.
+    """
+
+    # The number of years spanned by each age band (see PopulationRegistry.people_aged())
+    AGE_BAND_WIDTH = 5
+
+    def __init__(self):
+        """Initialize a PopulationRegistry object."""
+        self.people = {}  # Maps person ID to person, for everyone who has ever lived in the cosmos
+        # Maps the memory address of each person to that person (see Cosmos.find_by_hex()); since
+        # addresses change whenever a cosmos is loaded, this is rebuilt upon loading, not saved
+        self.people_at_address = {}
+        # Everyone who is alive, everyone who has died, and everyone who has departed a city; people
+        # only ever depart a city by moving to another one, so the departed are among the living
+        # until they die
+        self.living = IndexedSet()
+        self.deceased = IndexedSet()
+        self.departed = IndexedSet()
+        # Maps each age band (an age divided by AGE_BAND_WIDTH) to the living people of an age in it
+        self.age_bands = {}
+        # Everyone who currently resides in any city, and in each state and country; places are used
+        # as keys here, with the cosmos-wide listing keyed by None
+        self.residents_of = {None: IndexedSet()}
+        # Because a person can be listed as a resident of multiple cities (a person who moves to a
+        # new city is added to its residents, though they are not removed from those of the old
+        # one), we keep track of how many of a place's cities list each of its residents
+        self.residence_counts = {}  # Maps (place, person) to a number of cities
+        self.places_of_residence = {}  # Maps each person to the states and countries in which they reside
+        # Maps each occupation class to everyone whose current occupation is of that class
+        self.workers = {}
+        # Living people who are ready to work, but have no occupation and are not retired; this
+        # covers everyone who is searching for work (see Person.searching_for_work), though some
+        # of them (married women, in certain eras) are not considered to be
+        self.job_seekers = IndexedSet()
+        # Baseball players of the living who are neither retired nor under contract with a team,
+        # along with those among them residing in each state and country (keyed by place)
+        self.free_agents = IndexedSet()
+        self.free_agents_of = {}
+
+    def __getstate__(self):
+        """Return the state of this registry for pickling, leaving out the memory addresses of its people."""
+        state = dict(self.__dict__)
+        del state['people_at_address']
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state of a pickled registry, mapping the new memory addresses of its people."""
+        self.__dict__.update(state)
+        self.people_at_address = {id(person): person for person in self.people.itervalues()}
+
+    def register(self, person):
+        """Register a newly born or generated person."""
+        self.people[person.id] = person
+        self.people_at_address[id(person)] = person
+        self.living.add(person)
+
+    def record_death(self, person):
+        """Record that a person has died."""
+        self._remove_from_the_living(person=person)
+        self.deceased.add(person)
+
+    def record_departure(self, person):
+        """Record that a person has departed a city (on their way to another one)."""
+        self.departed.add(person)
+
+    def _remove_from_the_living(self, person):
+        """Remove a person who has died from every index that only covers the living."""
+        self.living.remove(person)
+        if person.age is not None:
+            self.age_bands[person.age // self.AGE_BAND_WIDTH].remove(person)
+        self.job_seekers.discard(person)
+        if person.player:
+            self.record_change_in_free_agency(player=person.player)
+
+    def add_resident(self, person, city):
+        """Record that a person has been added to a city's residents."""
+        for place in (city.state, city.country, None):
+            key = (place, person)
+            if key in self.residence_counts:
+                self.residence_counts[key] += 1
+            else:
+                self.residence_counts[key] = 1
+                if place not in self.residents_of:
+                    self.residents_of[place] = IndexedSet()
+                self.residents_of[place].add(person)
+                if place is not None:
+                    self.places_of_residence.setdefault(person, set()).add(place)
+                    # A newborn is added to their city's residents before their player layer is set
+                    player = getattr(person, 'player', None)
+                    if player in self.free_agents:
+                        self.free_agents_in(place=place).add(player)
+
+    def remove_resident(self, person, city):
+        """Record that a person has been removed from a city's residents."""
+        for place in (city.state, city.country, None):
+            key = (place, person)
+            self.residence_counts[key] -= 1
+            if not self.residence_counts[key]:
+                del self.residence_counts[key]
+                self.residents_of[place].remove(person)
+                if place is not None:
+                    self.places_of_residence[person].remove(place)
+                    if person.player:
+                        self.free_agents_in(place=place).discard(person.player)
+
+    def resides_anywhere(self, person):
+        """Return whether any city lists the given person among its residents."""
+        return (None, person) in self.residence_counts
+
+    def residents(self, place=None):
+        """Return an IndexedSet of everyone residing in the given state or country, or in the cosmos."""
+        if place not in self.residents_of:
+            self.residents_of[place] = IndexedSet()
+        return self.residents_of[place]
+
+    def record_change_in_occupation(self, person, old_occupation, new_occupation):
+        """Record that a person's occupation has changed."""
+        if old_occupation:
+            self.workers[old_occupation.__class__].discard(person)
+        if new_occupation:
+            if new_occupation.__class__ not in self.workers:
+                self.workers[new_occupation.__class__] = set()
+            self.workers[new_occupation.__class__].add(person)
+        self.record_change_in_employment_status(person=person)
+
+    def record_change_in_employment_status(self, person):
+        """Record that a person's occupation, readiness to work, or retirement status has changed."""
+        if person in self.living and person.ready_to_work and not person.occupation and not person.retired:
+            self.job_seekers.add(person)
+        else:
+            self.job_seekers.discard(person)
+
+    def record_change_in_age(self, person, old_age, new_age):
+        """Record that a person's age has changed."""
+        if person not in self.living:
+            return
+        if old_age is not None:
+            self.age_bands[old_age // self.AGE_BAND_WIDTH].remove(person)
+        if new_age is not None:
+            band = new_age // self.AGE_BAND_WIDTH
+            if band not in self.age_bands:
+                self.age_bands[band] = IndexedSet()
+            self.age_bands[band].add(person)
+
+    def people_aged(self, min_age, max_age):
+        """Return a list of the living people whose ages fall between the given ones (inclusive)."""
+        people = []
+        for band in xrange(min_age // self.AGE_BAND_WIDTH, max_age // self.AGE_BAND_WIDTH + 1):
+            if band in self.age_bands:
+                people += [person for person in self.age_bands[band] if min_age <= person.age <= max_age]
+        return people
+
+    def record_change_in_free_agency(self, player):
+        """Record that a baseball player has been created, signed, released, or retired."""
+        places = self.places_of_residence.get(player.person, ())
+        if player.person in self.living and not player.career.retired and not player.career.team:
+            self.free_agents.add(player)
+            for place in places:
+                self.free_agents_in(place=place).add(player)
+        else:
+            self.free_agents.discard(player)
+            for place in places:
+                self.free_agents_in(place=place).discard(player)
+
+    def free_agents_in(self, place):
+        """Return an IndexedSet of the free agents residing in the given state or country."""
+        if place not in self.free_agents_of:
+            self.free_agents_of[place] = IndexedSet()
+        return self.free_agents_of[place]
+
+    def workers_of_trade(self, occupation):
+        """Return everyone whose current occupation is of the given class (or one of its subclasses)."""
+        workers = set()
+        for occupation_class in self.workers:
+            if issubclass(occupation_class, occupation):
+                workers |= self.workers[occupation_class]
+        return workers
+
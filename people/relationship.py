@@ -1,3 +1,5 @@
+import datetime
+import numpy
 from belief import *
 
 # TODO dating and attendant nuances (after break-up, do they go back to previous relationship
@@ -8,8 +10,50 @@ from belief import *
 # TODO NORMALIZE CHARGE, SPARK, TRUST
 
 
+class RelationshipColumn(object):
+    """An attribute of a Relationship whose value is stored in a column of its RelationshipTable."""
+
+    def __init__(self, name):
+        """Initialize a RelationshipColumn object."""
+        self.name = name
+
+    def __get__(self, relationship, relationship_class):
+        """Return the value in the relationship's row of this column."""
+        if relationship is None:
+            return self
+        # Using item() gets a plain Python number, which is much faster to work with than a NumPy scalar
+        return getattr(relationship.table, self.name).item(relationship.row)
+
+    def __set__(self, relationship, value):
+        """Set the value in the relationship's row of this column."""
+        getattr(relationship.table, self.name).itemset(relationship.row, value)
+
+
 class Relationship(object):
-    """A social and/or romantic relationship between two people."""
+    """A social and/or romantic relationship between two people.
+
+    The numeric state of a relationship (charge, spark, trust, and so forth) lives in a row of
+    the RelationshipTable of the city that its owner lived in when the two first met; this
+    object is a view onto that row, which is shared by every relationship that owner has
+    had with subject (e.g., an Acquaintance and the Friendship that succeeded it).
+    """
+
+    # The attributes of a relationship that are stored in its RelationshipTable row
+    compatibility = RelationshipColumn('compatibility')
+    charge = RelationshipColumn('charge')
+    charge_increment = RelationshipColumn('charge_increment')
+    spark = RelationshipColumn('spark')
+    spark_increment = RelationshipColumn('spark_increment')
+    trust = RelationshipColumn('trust')
+    age_difference_effect_on_charge_increment = RelationshipColumn('age_difference_effect_on_charge_increment')
+    age_difference_effect_on_spark_increment = RelationshipColumn('age_difference_effect_on_spark_increment')
+    job_level_difference_effect_on_charge_increment = RelationshipColumn(
+        'job_level_difference_effect_on_charge_increment'
+    )
+    job_level_difference_effect_on_spark_increment = RelationshipColumn(
+        'job_level_difference_effect_on_spark_increment'
+    )
+    total_interactions = RelationshipColumn('total_interactions')
 
     def __init__(self, owner, subject, preceded_by):
         """Initialize a Relationship object.
@@ -28,16 +72,12 @@ class Relationship(object):
         self.first_met_str = '{date} at {location}'.format(
             date=owner.cosmos.year, location=owner.location.name
         )
-        self.where_they_last_met = owner.location  # These change as appropriate
-        self.when_they_last_met = owner.cosmos.date
-        self.last_met_str_base = (
-            '{date} at {location}'.format(date=owner.cosmos.year, location=owner.location.name),
-            self.owner.cosmos.ordinal_date
-        )
-        self.total_interactions = 0
+        self.where_they_last_met = owner.location  # Changes as appropriate
         # Set this as the primary relationship owner has with subject
         owner.relationships[subject] = self
         if not preceded_by:
+            self.table = owner.city.relationship_table
+            self.row = self.table.add_row(owner=owner, subject=subject)
             self.compatibility = self._init_get_compatibility()
             self.charge_increment = self._init_determine_charge_increment()
             self.charge = float(self.charge_increment)
@@ -46,30 +86,16 @@ class Relationship(object):
             self.spark = float(self.spark_increment)
         elif preceded_by:
             preceded_by.succeeded_by = self
-            self.compatibility = preceded_by.compatibility
-            # Inherit the charge increment and current charge of the preceding Acquaintance
-            self.charge_increment = float(preceded_by.charge_increment)
-            self.charge = preceded_by.charge
-            self.trust = preceded_by.trust
-            # Inherit the spark increment and current spark of the preceding Acquaintance
-            self.spark_increment = float(preceded_by.spark_increment)
-            self.spark = preceded_by.spark
-        # Prepare variables that specify the effects that age and job-level differences
-        # will have on this relationship's charge and spark values; these are set immediately
-        # by update_spark_and_charge_increments_for_new_age_difference() and update_spark_and_
-        # charge_increments_for_new_job_level_difference, which will also be called whenever a
-        # member of this relationship has a birthday or gets a new occupation
-        self.age_difference_effect_on_charge_increment = None
-        self.age_difference_effect_on_spark_increment = None
-        self.job_level_difference_effect_on_charge_increment = None
-        self.job_level_difference_effect_on_spark_increment = None
+            # Inherit the row of the preceding relationship, and with it its compatibility,
+            # charge, trust, spark, and their increments
+            self.table = preceded_by.table
+            self.row = preceded_by.row
+        self.table.last_met_timestep[self.row] = owner.cosmos.timestep
+        # Set the effects that age and job-level differences will have on this relationship's
+        # charge and spark values; these will be updated whenever a member of this relationship
+        # has a birthday or gets a new occupation
         self.update_spark_and_charge_increments_for_new_age_difference()
         self.update_spark_and_charge_increments_for_job_level_difference()
-        # This attribute records whether the other person has already called the
-        # progress_relationship() method of this object on this timestep -- it gets
-        # set to True by progress_relationship() and then turned back to False by
-        # Game.enact_hi_fi_simulation()
-        self.interacted_this_timestep = False
         # Keep track of all the conversations they've had during hi-fi timesteps
         self.conversations = []
 
@@ -304,44 +330,88 @@ class Relationship(object):
             )
         )
 
+    @property
+    def interacted_this_timestep(self):
+        """Return whether these two people have already interacted on this timestep.
+
+        Rather than this being a flag that must be reset for every relationship on every
+        timestep, the table records the timestep of each pair's latest interaction.
+        """
+        return self.table.last_interaction_timestep.item(self.row) == self.owner.cosmos.timestep
+
+    @interacted_this_timestep.setter
+    def interacted_this_timestep(self, interacted):
+        """Set whether these two people have already interacted on this timestep."""
+        self.table.last_interaction_timestep.itemset(self.row, self.owner.cosmos.timestep if interacted else -1)
+
+    @property
+    def when_they_last_met(self):
+        """Return the date on which these two last met."""
+        timestep = self.table.last_met_timestep[self.row]
+        return self.owner.cosmos.get_date(
+            ordinal_date=timestep // 2, time_of_day='day' if timestep % 2 == 0 else 'night'
+        )
+
+    @property
+    def last_met_str_base(self):
+        """Return a string representing where and in what year these two last met, and the ordinal date of it."""
+        ordinal_date = self.table.last_met_timestep[self.row] // 2
+        return (
+            '{date} at {location}'.format(
+                date=datetime.date.fromordinal(ordinal_date).year, location=self.where_they_last_met.name
+            ),
+            ordinal_date
+        )
+
     def progress_relationship(self, missing_days_to_account_for):
         """Increment charge by its increment, and then potentially start a Friendship or Enmity."""
-        # Attribute accessing is expensive -- set local variables
-        config = self.owner.cosmos.config
-        owner = self.owner
-        subject = self.subject
         charge = self.charge
-        # Update data
-        self.total_interactions += 1
-        self.where_they_last_met = owner.location  # Changes as appropriate
-        self.when_they_last_met = owner.cosmos.date
-        self.last_met_str_base = (
-            '{date} at {location}'.format(date=owner.cosmos.year, location=owner.location.name),
-            self.owner.cosmos.ordinal_date
-        )
-        # Increment salience
-        self.owner.salience_of_other_people[self.subject] += config.salience_increment_for_social_interaction
-        # Progress charge, possibly leading to a Friendship or Enmity
+        # Progress charge and spark
         change_to_charge = (
             self.charge_increment * self.age_difference_effect_on_charge_increment *
             self.job_level_difference_effect_on_charge_increment
         )
         change_to_charge *= missing_days_to_account_for
         self.charge += change_to_charge
-        if self.type != "friendship" and charge > config.charge_threshold_friendship:
-            Friendship(owner=owner, subject=subject, preceded_by=self)
-        elif self.type != "enmity" and charge < config.charge_threshold_enmity:
-            Enmity(owner=owner, subject=subject, preceded_by=self)
-        # Progress trust according to new charge  TODO MAKE TRUST COMPUTATION RICHER
-        self.trust = owner.cosmos.config.function_to_determine_trust_charge_boost(charge=self.charge)
-        # Progress spark, possibly leading to a
-        self.spark_increment *= config.spark_decay_rate
+        self.spark_increment *= self.owner.cosmos.config.spark_decay_rate
         change_to_spark = (
             self.spark_increment * self.age_difference_effect_on_spark_increment *
             self.job_level_difference_effect_on_spark_increment
         )
         change_to_spark *= missing_days_to_account_for
         self.spark += change_to_spark
+        self.total_interactions += 1
+        self.interacted_this_timestep = True
+        self.table.last_met_timestep[self.row] = self.owner.cosmos.timestep
+        self._react_to_interaction(charge_before_interaction=charge)
+        # Call this method for the subject's own conception of this relationship
+        # to update its attributes according to this interaction
+        if not self.subject.relationships[self.owner].interacted_this_timestep:
+            self.subject.relationships[self.owner].progress_relationship(
+                missing_days_to_account_for=missing_days_to_account_for
+            )
+
+    def _react_to_interaction(self, charge_before_interaction):
+        """Carry out everything that follows from an interaction, once charge and spark have been progressed.
+
+        This potentially starts a Friendship or Enmity, updates trust, and updates owner's
+        social network (and potentially marital status).
+        """
+        # Attribute accessing is expensive -- set local variables
+        config = self.owner.cosmos.config
+        owner = self.owner
+        subject = self.subject
+        charge = charge_before_interaction
+        self.where_they_last_met = owner.location  # Changes as appropriate
+        # Increment salience
+        self.owner.salience_of_other_people[self.subject] += config.salience_increment_for_social_interaction
+        # Potentially start a Friendship or Enmity
+        if self.type != "friendship" and charge > config.charge_threshold_friendship:
+            Friendship(owner=owner, subject=subject, preceded_by=self)
+        elif self.type != "enmity" and charge < config.charge_threshold_enmity:
+            Enmity(owner=owner, subject=subject, preceded_by=self)
+        # Progress trust according to new charge  TODO MAKE TRUST COMPUTATION RICHER
+        self.trust = owner.cosmos.config.function_to_determine_trust_charge_boost(charge=self.charge)
         # Check if subject is now owner's new best friend, worst enemy, or love interest; if
         # so, update accordingly
         self._update_social_network()
@@ -356,13 +426,6 @@ class Relationship(object):
             elif owner.spouse in owner.relationships:
                 if self.spark > owner.relationships[owner.spouse] * 2:
                     owner.divorce(partner=owner.spouse)
-        self.interacted_this_timestep = True
-        # Call this method for the subject's own conception of this relationship
-        # to update its attributes according to this interaction
-        if not subject.relationships[owner].interacted_this_timestep:
-            subject.relationships[owner].progress_relationship(
-                missing_days_to_account_for=missing_days_to_account_for
-            )
 
     def _update_social_network(self):
         """Check if this person is your new best friend, worst enemy, or love interest; if so, update accordingly."""
@@ -516,3 +579,124 @@ class Romance(Relationship):
         # TODO AUTOMATICALLY CALL SUBJECT.ROMANCE RIGHT? ROMANCE CAN'T BE UNIDIRECTIONAL, right?
 
 
+class RelationshipTable(object):
+    """The numeric state of the relationships formed in a city, stored as parallel NumPy columns.
+
+    Each row holds the state of one person's conception of their relationship with another
+    person, and is shared by the succession of Relationship objects (Acquaintance, Friendship,
+    and so forth) that represent it.
+    """
+
+    FLOAT_COLUMNS = (
+        'compatibility', 'charge', 'charge_increment', 'spark', 'spark_increment', 'trust',
+        'age_difference_effect_on_charge_increment', 'age_difference_effect_on_spark_increment',
+        'job_level_difference_effect_on_charge_increment', 'job_level_difference_effect_on_spark_increment'
+    )
+    INT_COLUMNS = ('total_interactions', 'last_interaction_timestep', 'last_met_timestep')
+
+    def __init__(self, city, initial_capacity=64):
+        """Initialize a RelationshipTable object."""
+        self.city = city
+        self.n_rows = 0
+        self.row_of = {}  # Maps (owner ID, subject ID) to a row number
+        for column in self.FLOAT_COLUMNS:
+            setattr(self, column, numpy.zeros(initial_capacity, dtype=float))
+        for column in self.INT_COLUMNS:
+            setattr(self, column, numpy.zeros(initial_capacity, dtype=int))
+
+    def __len__(self):
+        """Return the number of rows in this table."""
+        return self.n_rows
+
+    def add_row(self, owner, subject):
+        """Add a row for owner's relationship with subject, and return its row number."""
+        if self.n_rows == len(self.charge):
+            for column in self.FLOAT_COLUMNS + self.INT_COLUMNS:
+                old_column = getattr(self, column)
+                new_column = numpy.zeros(2*len(old_column), dtype=old_column.dtype)
+                new_column[:self.n_rows] = old_column
+                setattr(self, column, new_column)
+        row = self.n_rows
+        self.n_rows += 1
+        self.row_of[(owner.id, subject.id)] = row
+        self.last_interaction_timestep[row] = -1
+        self.last_met_timestep[row] = self.city.cosmos.timestep
+        return row
+
+    def progress(self, rows, missing_days_to_account_for):
+        """Progress the charge and spark of the given rows in one pass, as for an interaction.
+
+        The given rows must be distinct. This carries out the numeric portion of
+        Relationship.progress_relationship(), and returns an array of the charges of
+        the rows prior to the interaction.
+        """
+        rows = numpy.array(rows, dtype=int)
+        charge_before_interaction = self.charge[rows]
+        change_to_charge = (
+            self.charge_increment[rows] * self.age_difference_effect_on_charge_increment[rows] *
+            self.job_level_difference_effect_on_charge_increment[rows]
+        )
+        change_to_charge *= missing_days_to_account_for
+        self.charge[rows] = charge_before_interaction + change_to_charge
+        self.spark_increment[rows] *= self.city.cosmos.config.spark_decay_rate
+        change_to_spark = (
+            self.spark_increment[rows] * self.age_difference_effect_on_spark_increment[rows] *
+            self.job_level_difference_effect_on_spark_increment[rows]
+        )
+        change_to_spark *= missing_days_to_account_for
+        self.spark[rows] += change_to_spark
+        self.total_interactions[rows] += 1
+        self.last_met_timestep[rows] = self.city.cosmos.timestep
+        return charge_before_interaction
+
+
+class InteractionBatch(object):
+    """The social interactions of a simulated city day, whose relationships get progressed all at once.
+
+    Interactions are added as people socialize; progress() then progresses the charge and spark
+    of every relationship involved in one vectorized pass per RelationshipTable, after which each
+    relationship's reactions (new Friendships and Enmities, updates to trust and to owner's social
+    network, etc.) are carried out in the order in which its interaction occurred.
+    """
+
+    def __init__(self, missing_days_to_account_for):
+        """Initialize an InteractionBatch object."""
+        self.missing_days_to_account_for = missing_days_to_account_for
+        self.relationships = []
+
+    def __len__(self):
+        """Return the number of relationships to be progressed."""
+        return len(self.relationships)
+
+    def add(self, relationship):
+        """Add an interaction between the owner and subject of the given relationship.
+
+        As with Relationship.progress_relationship(), subject's own conception of the
+        relationship is progressed too, if it hasn't been already this timestep.
+        """
+        relationship.interacted_this_timestep = True
+        self.relationships.append(relationship)
+        reciprocal_relationship = relationship.subject.relationships[relationship.owner]
+        if not reciprocal_relationship.interacted_this_timestep:
+            reciprocal_relationship.interacted_this_timestep = True
+            self.relationships.append(reciprocal_relationship)
+
+    def progress(self):
+        """Progress every relationship in this batch."""
+        rows_in_table = {}
+        for relationship in self.relationships:
+            if relationship.table not in rows_in_table:
+                rows_in_table[relationship.table] = []
+            rows_in_table[relationship.table].append(relationship.row)
+        charge_before_interaction = {}
+        for table, rows in rows_in_table.iteritems():
+            charges = table.progress(rows=rows, missing_days_to_account_for=self.missing_days_to_account_for)
+            for row, charge in zip(rows, charges):
+                charge_before_interaction[(table, row)] = charge
+        for relationship in self.relationships:
+            # An earlier reaction may have replaced this relationship (e.g., by a marriage)
+            relationship = relationship.owner.relationships[relationship.subject]
+            relationship._react_to_interaction(
+                charge_before_interaction=charge_before_interaction[(relationship.table, relationship.row)]
+            )
+        self.relationships = []
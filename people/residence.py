@@ -1,4 +1,5 @@
 import random
+from utils.utilities import rebuild_with_id
 
 
 class DwellingPlace(object):
@@ -25,6 +26,7 @@ class DwellingPlace(object):
         self.block = lot.block
         self.residents = set()
         self.former_residents = set()
+        self.city.note_change_in_occupancy_of_home(self)
         self.transactions = []
         self.move_ins = []
         self.move_outs = []
@@ -34,6 +36,18 @@ class DwellingPlace(object):
         self.people_here_now = set()  # People at home on a specific time step (either a resident or visitor)
         self.demolition = None  # Potentially gets set by event.Demolition.__init__()
 
+    def __hash__(self):
+        """Return a hash of this dwelling place.
+
+        Hashing by ID, rather than by memory address, makes the iteration order of sets of
+        dwelling places deterministic, which is needed for a cosmos to be reproducible from its ID.
+        """
+        return self.id
+
+    def __reduce_ex__(self, protocol):
+        """Pickle this dwelling place such that its ID is restored before anything can try to hash it."""
+        return rebuild_with_id, (self.__class__, self.id), self.__dict__
+
     def __str__(self):
         """Return string representation."""
         if self.demolition or self.apartment and self.complex.demolition:
@@ -120,9 +134,13 @@ class House(DwellingPlace):
         super(House, self).__init__(lot, owners=construction.subjects)
         self.construction = construction
         self.lot.building = self
+        self.city.lot_neighborhoods.note_change_in_population(self.lot)
+        self.city.note_change_in_occupancy_of_lot(self.lot)
 
     def get_bulldozed(self):
         """Raze this house (likely for the purpose of building an ApartmentComplex on its lot to spur population)."""
         self.lot.building = None
+        self.city.lot_neighborhoods.note_change_in_population(self.lot)
+        self.city.note_change_in_occupancy_of_lot(self.lot)
         self.city.dwelling_places.remove(self)
         self.city.former_dwelling_places.add(self)
\ No newline at end of file
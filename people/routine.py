@@ -118,28 +118,23 @@ class Routine(object):
             # See config.py to understand what's going on here
             e for e in service_type_probs if service_type_probs[e][0] <= x <= service_type_probs[e][1]
         )
-        businesses_in_town_providing_that_service = [
-            b for b in self.person.city.companies if service_type_of_errand in b.services
-        ]
+        city = self.person.city
+        businesses_in_town_providing_that_service = city.business_directory.providing(service_type_of_errand)
         if businesses_in_town_providing_that_service:
             if random.random() < config.chance_someone_goes_to_closest_business_of_type:
                 # Choose between the one closest to your house and the one closest to your work
-                closest_to_home = min(
-                    businesses_in_town_providing_that_service,
-                    key=lambda business: self.person.city.distance_between(self.person.home.lot, business.lot)
+                closest_to_home = city.nearest_business_providing_service(
+                    lot=self.person.home.lot, service=service_type_of_errand
                 )
                 if self.person.occupation:
-                    closest_to_work = min(
-                        businesses_in_town_providing_that_service,
-                        key=lambda business: self.person.city.distance_between(
-                            self.person.occupation.company.lot, business.lot
-                        )
+                    closest_to_work = city.nearest_business_providing_service(
+                        lot=self.person.occupation.company.lot, service=service_type_of_errand
                     )
                     one_i_will_go_to = closest_to_home if random.random() < 0.5 else closest_to_work
                 else:
                     one_i_will_go_to = closest_to_home
             else:
-                one_i_will_go_to = random.choice(businesses_in_town_providing_that_service)
+                one_i_will_go_to = businesses_in_town_providing_that_service.random_member()
         else:
             one_i_will_go_to = None
         # Determine whether the occasion is an errand or just leisure -- in the case of location
@@ -193,10 +188,9 @@ class Routine(object):
             max_number_of_miles_to_travel_a_town_over = (
                 config.max_number_of_miles_to_travel_a_town_over(person.cosmos.year)
             )
-            towns_within_short_distance = [
-                c for c in city.nearest_cities if
-                city.distance_to(c) < max_number_of_miles_to_travel_a_town_over
-            ]
+            towns_within_short_distance = person.cosmos.city_index.within(
+                city.coordinates, radius=max_number_of_miles_to_travel_a_town_over, exclude=city
+            )
             try:
                 town_they_will_go_to = random.choice(towns_within_short_distance)
                 person_they_will_visit = random.choice(
@@ -0,0 +1,94 @@
+import random
+import numpy
+
+
+class SocialInteractionEngine(object):
+    """Decides, for everyone socializing on a timestep, whom they will instigate social interactions with.
+
+    Rather than each person rolling for every other person at their location, one at a time,
+    the people at a location have their personality components gathered into arrays once per
+    timestep, and each socializer's chances of instigating interactions with everyone there
+    are computed (and rolled against) in a single vectorized pass. The chances are those of
+    Person._decide_to_instigate_social_interaction().
+    """
+
+    def __init__(self, config):
+        """Initialize a SocialInteractionEngine object.
+
+        An engine holds onto the arrays it prepares for each location, so a new one should be
+        used for each timestep.
+        """
+        self.config = config
+        self.locations = {}  # Maps location to a LocationArrays object
+
+    def choose_interaction_partners(self, person):
+        """Return a list of the people at this person's location with whom they will instigate interactions."""
+        config = self.config
+        location = person.location
+        if location not in self.locations:
+            self.locations[location] = LocationArrays(location=location, config=config)
+        arrays = self.locations[location]
+        index_of_person = arrays.index.get(person)
+        if index_of_person is not None:
+            extroversion_component = arrays.extroversion_components[index_of_person]
+            openness_component = arrays.openness_components[index_of_person]
+        else:
+            extroversion_component = person._get_extroversion_component_to_chance_of_social_interaction()
+            openness_component = person._get_openness_component_to_chance_of_social_interaction()
+        # Start from the chance for strangers, and then overwrite that for the people this person
+        # knows, walking over whichever is smaller of their relationships and the people here
+        chances = numpy.empty(len(arrays.people))
+        chances.fill(extroversion_component + openness_component)
+        if len(person.relationships) < len(arrays.people):
+            for other_person in person.relationships:
+                index_of_other_person = arrays.index.get(other_person)
+                if index_of_other_person is not None:
+                    chances[index_of_other_person] = (
+                        extroversion_component +
+                        person._get_friendship_component_to_chance_of_social_interaction(other_person=other_person)
+                    )
+        else:
+            for index_of_other_person, other_person in enumerate(arrays.people):
+                if other_person in person.relationships:
+                    chances[index_of_other_person] = (
+                        extroversion_component +
+                        person._get_friendship_component_to_chance_of_social_interaction(other_person=other_person)
+                    )
+        numpy.clip(
+            chances, config.chance_someone_instigates_interaction_with_other_person_floor,
+            config.chance_someone_instigates_interaction_with_other_person_cap, out=chances
+        )
+        chances[arrays.too_young_to_socialize] = 0.0
+        if index_of_person is not None:
+            chances[index_of_person] = 0.0
+        # In a large crowd (e.g., at a ballpark), potentially only consider a random sample of the
+        # people there, rather than everyone
+        crowd_size = config.max_people_someone_considers_socializing_with_in_a_crowd
+        if crowd_size is not None and len(arrays.people) > crowd_size:
+            considered = numpy.zeros(len(arrays.people), dtype=bool)
+            considered[arrays.random_state.choice(len(arrays.people), size=crowd_size, replace=False)] = True
+            chances[~considered] = 0.0
+        rolls = arrays.random_state.random_sample(len(arrays.people))
+        return [arrays.people[i] for i in numpy.flatnonzero(rolls < chances)]
+
+
+class LocationArrays(object):
+    """The people at a location on a timestep, along with arrays of the attributes that bear on socializing."""
+
+    def __init__(self, location, config):
+        """Initialize a LocationArrays object."""
+        self.people = list(location.people_here_now)
+        self.index = {person: i for i, person in enumerate(self.people)}
+        personalities = [person.personality for person in self.people]
+        self.extroversion_components = numpy.clip(
+            [p.extroversion for p in personalities], config.chance_of_interaction_extroversion_component_floor,
+            config.chance_of_interaction_extroversion_component_cap
+        )
+        self.openness_components = numpy.clip(
+            [p.openness_to_experience for p in personalities], config.chance_of_interaction_openness_component_floor,
+            config.chance_of_interaction_openness_component_cap
+        )
+        self.too_young_to_socialize = numpy.array([person.age < 5 for person in self.people], dtype=bool)
+        # Rolls are made with a NumPy random state, which is seeded from the random stream that is
+        # active when the location is first prepared, so as to keep cosmoses reproducible
+        self.random_state = numpy.random.RandomState(random.getrandbits(32))
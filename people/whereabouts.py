@@ -1,13 +1,26 @@
+import bisect
+import datetime
+from array import array
+
+
 class Whereabouts(object):
-    """A collection of a character's true whereabouts on each timestep of his or her life."""
+    """A collection of a character's true whereabouts on each timestep of his or her life.
+
+    The whereabouts themselves are recorded in the WhereaboutsLog of the city in which each
+    location lies; this object only keeps track of which rows of those logs are theirs, and
+    Whereabout objects are only instantiated when someone asks for them.
+    """
 
     def __init__(self, person):
         """Initialize a Whereabouts object."""
         self.person = person
-        # This dictionary maps individual timesteps to a person's whereabouts then;
-        # keys will be tuples of the form (ordinal_date, day_or_night_bit), where
-        # day_or_night_bit == 0 if a day timestep else 1
-        self.date = {}
+        # The numbers of the log rows that record this person's whereabouts, in chronological order
+        self.rows = array('l')
+        # Because a person may go to other cities, their rows may span multiple logs; these
+        # two listings are parallel, with each log being paired with the index into self.rows
+        # at which its rows begin
+        self.logs = []
+        self.log_starts = []
 
     def __str__(self):
         """Return string representation."""
@@ -15,25 +28,90 @@ class Whereabouts(object):
             self.person.name, self.person.possessive_pronoun
         )
 
+    def __len__(self):
+        """Return the number of timesteps for which this person's whereabouts are recorded."""
+        return len(self.rows)
+
+    @property
+    def date(self):
+        """Return a dictionary-like view mapping timesteps to this person's whereabouts then.
+
+        Keys are tuples of the form (ordinal_date, day_or_night_bit), where day_or_night_bit == 0
+        if a day timestep else 1.
+        """
+        return WhereaboutsView(whereabouts=self)
+
     def record(self, occasion):
-        """Record this character's current whereabouts by instantiating a Whereabout object."""
+        """Record this character's current whereabouts in the log of the city their location is in."""
+        log = self.person.location.city.whereabouts_log
         cosmos = self.person.cosmos
         ordinal_date = cosmos.ordinal_date
         day_or_night_bit = 0 if cosmos.time_of_day == 'day' else 1
-        timestep_key = (ordinal_date, day_or_night_bit)
-        self.date[timestep_key] = Whereabout(person=self.person, occasion=occasion)
+        # If this person has already gone somewhere this timestep, overwrite where they went
+        if self.rows:
+            last_log, row = self.logs[-1], self.rows[-1]
+            if last_log.ordinal_dates[row] == ordinal_date and last_log.day_or_night_bits[row] == day_or_night_bit:
+                if last_log is log:
+                    log.overwrite(row=row, location=self.person.location, occasion=occasion)
+                    return
+                # They went there in another city, whose log can only retract the row
+                last_log.retract(row=row)
+                self.rows.pop()
+                if self.log_starts[-1] == len(self.rows):
+                    self.logs.pop()
+                    self.log_starts.pop()
+        if not self.logs or self.logs[-1] is not log:
+            self.logs.append(log)
+            self.log_starts.append(len(self.rows))
+        self.rows.append(
+            log.append(
+                ordinal_date=ordinal_date, day_or_night_bit=day_or_night_bit, person=self.person,
+                location=self.person.location, occasion=occasion
+            )
+        )
 
     def recount(self):
         """Pretty-print this person's entire whereabouts."""
-        timesteps = self.date.keys()
-        timesteps.sort(key=lambda step: (step[0], step[1]))
-        for timestep in timesteps:
-            whereabout = self.date[timestep]
+        for whereabout in self.between(start=None, end=None):
             print '{},\t{}:\t{}\t({})'.format(
                 whereabout.date[7:] if whereabout.time_of_day == 'day' else whereabout.date[9:],
                 whereabout.time_of_day, whereabout.location.name, whereabout.occasion
             )
 
+    def between(self, start, end):
+        """Return this person's whereabouts from the start ordinal date up to (but not including) the end one.
+
+        Either bound may be None, in which case the range is open on that end.
+        """
+        first = 0 if start is None else self._position_of_timestep(timestep=start*2)
+        last = len(self.rows) if end is None else self._position_of_timestep(timestep=end*2)
+        return [self._whereabout_at_position(position=position) for position in xrange(first, last)]
+
+    def in_year(self, year):
+        """Return this person's whereabouts over the course of the given year."""
+        start = datetime.date(year=year, month=1, day=1).toordinal()
+        end = datetime.date(year=year+1, month=1, day=1).toordinal()
+        return self.between(start=start, end=end)
+
+    def people_with_them(self, start, end):
+        """Return everyone who was at the same location as this person, from the start ordinal
+        date up to (but not including) the end one.
+
+        @return: A dictionary mapping timesteps, as (ordinal_date, day_or_night_bit) tuples, to
+                 lists of the other people who were where this person was then.
+        """
+        first = self._position_of_timestep(timestep=start*2)
+        last = self._position_of_timestep(timestep=end*2)
+        people_with_them = {}
+        for position in xrange(first, last):
+            log = self._log_at_position(position=position)
+            row = self.rows[position]
+            timestep_key = (log.ordinal_dates[row], log.day_or_night_bits[row])
+            location = log.locations[log.location_codes[row]]
+            people_there = log.people_here_when(location=location, timestep_key=timestep_key)
+            people_with_them[timestep_key] = [p for p in people_there if p is not self.person]
+        return people_with_them
+
     @property
     def current_occasion(self):
         """Return the occasion for this person's current whereabouts."""
@@ -43,21 +121,231 @@ class Whereabouts(object):
         timestep_key = (ordinal_date, day_or_night_bit)
         return self.date[timestep_key].occasion
 
+    def _log_at_position(self, position):
+        """Return the log that holds the row at the given position in self.rows."""
+        return self.logs[bisect.bisect_right(self.log_starts, position)-1]
+
+    def _timestep_at_position(self, position):
+        """Return the timestep recorded by the row at the given position in self.rows."""
+        log = self._log_at_position(position=position)
+        row = self.rows[position]
+        return log.ordinal_dates[row]*2 + log.day_or_night_bits[row]
+
+    def _position_of_timestep(self, timestep):
+        """Return the position of the earliest row in self.rows recording the given timestep or a later one."""
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low+high) // 2
+            if self._timestep_at_position(position=middle) < timestep:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _whereabout_at_position(self, position):
+        """Instantiate a Whereabout object for the row at the given position in self.rows."""
+        log = self._log_at_position(position=position)
+        return log.whereabout(row=self.rows[position], person=self.person)
+
+
+class WhereaboutsView(object):
+    """A read-only, dictionary-like view of a person's whereabouts, keyed by timestep."""
+
+    def __init__(self, whereabouts):
+        """Initialize a WhereaboutsView object."""
+        self.whereabouts = whereabouts
+
+    def __len__(self):
+        """Return the number of timesteps for which whereabouts are recorded."""
+        return len(self.whereabouts)
+
+    def __iter__(self):
+        """Iterate over the recorded timesteps, in chronological order."""
+        return iter(self.keys())
+
+    def __contains__(self, timestep_key):
+        """Return whether the person's whereabouts are recorded for the given timestep."""
+        return self._position(timestep_key=timestep_key) is not None
+
+    def __getitem__(self, timestep_key):
+        """Return the person's whereabouts on the given timestep."""
+        position = self._position(timestep_key=timestep_key)
+        if position is None:
+            raise KeyError(timestep_key)
+        return self.whereabouts._whereabout_at_position(position=position)
+
+    def get(self, timestep_key, default=None):
+        """Return the person's whereabouts on the given timestep, or the default if they aren't recorded."""
+        position = self._position(timestep_key=timestep_key)
+        if position is None:
+            return default
+        return self.whereabouts._whereabout_at_position(position=position)
+
+    def keys(self):
+        """Return a list of the recorded timesteps, in chronological order."""
+        keys = []
+        for position in xrange(len(self.whereabouts)):
+            timestep = self.whereabouts._timestep_at_position(position=position)
+            keys.append((timestep // 2, timestep % 2))
+        return keys
+
+    def _position(self, timestep_key):
+        """Return the position in the person's rows of the given timestep, or None if it isn't recorded."""
+        ordinal_date, day_or_night_bit = timestep_key
+        timestep = ordinal_date*2 + day_or_night_bit
+        position = self.whereabouts._position_of_timestep(timestep=timestep)
+        if position < len(self.whereabouts) and self.whereabouts._timestep_at_position(position) == timestep:
+            return position
+        return None
+
+
+class WhereaboutsLog(object):
+    """An append-only, columnar log of the whereabouts of everyone who has been in a city.
+
+    Each row records one person's whereabouts on one timestep, spread across parallel arrays;
+    locations and occasions are interned, with the log's rows holding small integer codes
+    for them. The log also maintains an inverted index from each location to the rows that
+    record someone being there, which answers "who was here when" without scanning anyone's
+    whereabouts.
+    """
+
+    def __init__(self, city):
+        """Initialize a WhereaboutsLog object."""
+        self.city = city
+        self.ordinal_dates = array('l')
+        self.day_or_night_bits = array('B')
+        self.person_ids = array('l')
+        self.location_codes = array('l')
+        self.occasion_codes = array('B')
+        # Interned locations and occasions, each listed at the index of its code
+        self.locations = []
+        self.occasions = []
+        self.location_code = {}  # Maps location to its code
+        self.occasion_code = {}  # Maps occasion to its code
+        # The occupancy index: for each location code, the numbers of the rows recording someone
+        # being at that location, in chronological order
+        self.rows_at_location = []
+
+    def __len__(self):
+        """Return the number of rows in this log."""
+        return len(self.ordinal_dates)
+
+    def append(self, ordinal_date, day_or_night_bit, person, location, occasion):
+        """Append a row to this log, and return its row number."""
+        self.ordinal_dates.append(ordinal_date)
+        self.day_or_night_bits.append(day_or_night_bit)
+        self.person_ids.append(person.id)
+        location_code = self._intern_location(location=location)
+        self.location_codes.append(location_code)
+        self.occasion_codes.append(self._intern_occasion(occasion=occasion))
+        row = len(self.ordinal_dates) - 1
+        self.rows_at_location[location_code].append(row)
+        return row
+
+    def overwrite(self, row, location, occasion):
+        """Overwrite the location and occasion of an existing row."""
+        old_location_code = self.location_codes[row]
+        new_location_code = self._intern_location(location=location)
+        if new_location_code != old_location_code:
+            self._unindex(row=row)
+            self.rows_at_location[new_location_code].append(row)
+            self.location_codes[row] = new_location_code
+        self.occasion_codes[row] = self._intern_occasion(occasion=occasion)
+
+    def retract(self, row):
+        """Retract an existing row, which is left in place, but no longer records anyone being anywhere."""
+        self._unindex(row=row)
+
+    def _unindex(self, row):
+        """Remove the given row from the occupancy index."""
+        # The row is among the most recent ones at its location, so search from the end
+        rows_at_location = self.rows_at_location[self.location_codes[row]]
+        index = len(rows_at_location) - 1
+        while rows_at_location[index] != row:
+            index -= 1
+        del rows_at_location[index]
+
+    def occupancy(self, location, start, end):
+        """Return who was at the given location from the start ordinal date up to (but not including) the end one.
+
+        @return: A dictionary mapping timesteps, as (ordinal_date, day_or_night_bit) tuples, to
+                 arrays of the IDs of the people who were at the location then.
+        """
+        occupancy = {}
+        for row in self._rows_at(location=location, start_timestep=start*2, end_timestep=end*2):
+            timestep_key = (self.ordinal_dates[row], self.day_or_night_bits[row])
+            if timestep_key not in occupancy:
+                occupancy[timestep_key] = array('l')
+            occupancy[timestep_key].append(self.person_ids[row])
+        return occupancy
+
+    def people_here_when(self, location, timestep_key):
+        """Return a list of the people who were at the given location on the given timestep."""
+        ordinal_date, day_or_night_bit = timestep_key
+        timestep = ordinal_date*2 + day_or_night_bit
+        find_by_id = self.city.cosmos.find_by_id
+        return [
+            find_by_id(self.person_ids[row]) for row in
+            self._rows_at(location=location, start_timestep=timestep, end_timestep=timestep+1)
+        ]
+
+    def _rows_at(self, location, start_timestep, end_timestep):
+        """Return the rows recording someone being at the given location during the given range of timesteps."""
+        if location not in self.location_code:
+            return array('l')
+        rows = self.rows_at_location[self.location_code[location]]
+        return rows[self._bisect(rows, start_timestep):self._bisect(rows, end_timestep)]
+
+    def _bisect(self, rows, timestep):
+        """Return the index of the earliest of the given rows recording the given timestep or a later one."""
+        low, high = 0, len(rows)
+        while low < high:
+            middle = (low+high) // 2
+            row = rows[middle]
+            if self.ordinal_dates[row]*2 + self.day_or_night_bits[row] < timestep:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def whereabout(self, row, person):
+        """Instantiate a Whereabout object for the given row, which must record the given person."""
+        return Whereabout(
+            person=person, location=self.locations[self.location_codes[row]],
+            occasion=self.occasions[self.occasion_codes[row]], ordinal_date=self.ordinal_dates[row],
+            time_of_day='day' if self.day_or_night_bits[row] == 0 else 'night'
+        )
+
+    def _intern_location(self, location):
+        """Return the code for the given location, assigning it one if it doesn't have one yet."""
+        if location not in self.location_code:
+            self.location_code[location] = len(self.locations)
+            self.locations.append(location)
+            self.rows_at_location.append(array('l'))
+        return self.location_code[location]
+
+    def _intern_occasion(self, occasion):
+        """Return the code for the given occasion, assigning it one if it doesn't have one yet."""
+        if occasion not in self.occasion_code:
+            self.occasion_code[occasion] = len(self.occasions)
+            self.occasions.append(occasion)
+        return self.occasion_code[occasion]
+
 
 class Whereabout(object):
     """A character's true location on a single timestep, with associated metadata."""
 
-    def __init__(self, person, occasion):
+    def __init__(self, person, location, occasion, ordinal_date, time_of_day):
         """Initialize a Whereabout object."""
         self.person = person
-        self.location = person.location
+        self.location = location
         # Attribute the occasion for this character being at the location on
         # this timestep; will either be 'work', 'school', 'home', 'errand', or 'leisure'
         self.occasion = occasion
         # Attribute metadata about the timestep of this whereabout
-        self.date = person.cosmos.date
-        self.ordinal_date = person.cosmos.ordinal_date
-        self.time_of_day = person.cosmos.time_of_day
+        self.date = person.cosmos.get_date(ordinal_date=ordinal_date, time_of_day=time_of_day)
+        self.ordinal_date = ordinal_date
+        self.time_of_day = time_of_day
 
     def __str__(self):
         """Return string representation."""
@@ -86,6 +374,3 @@ class Whereabout(object):
                 self.location.name, self.location.address,
                 self.date[0].lower()+self.date[1:]
             )
-
-
-
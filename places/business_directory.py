@@ -0,0 +1,63 @@
+from utils.utilities import IndexedSet
+
+
+class BusinessDirectory(object):
+    """A directory of the businesses currently operating in a city, indexed by type and by service.
+
+    Rather than filtering every company in the city each time businesses of a given type, or
+    those providing a given service, are needed, the indexes here are updated at the moments
+    businesses open (Business.__init__()) and close (BusinessClosure). For each service, a
+    table of the business nearest to each lot in the city is also kept; it is built upon being
+    needed and thrown out whenever a business providing that service opens or closes.
+    """
+
+    def __init__(self, city):
+        """Initialize a BusinessDirectory object."""
+        self.city = city
+        self.businesses_of_type = {}  # Maps business-type name to an IndexedSet of businesses
+        self.businesses_providing = {}  # Maps service to an IndexedSet of businesses
+        # Maps service to a list holding, for each lot (in the order of city.lot_distances), the
+        # nearest business providing that service
+        self.nearest_business_providing = {}
+
+    def add(self, business):
+        """Record that a business has opened."""
+        business_type = business.__class__.__name__
+        if business_type not in self.businesses_of_type:
+            self.businesses_of_type[business_type] = IndexedSet()
+        self.businesses_of_type[business_type].add(business)
+        for service in business.services:
+            if service not in self.businesses_providing:
+                self.businesses_providing[service] = IndexedSet()
+            self.businesses_providing[service].add(business)
+            self.nearest_business_providing.pop(service, None)
+
+    def remove(self, business):
+        """Record that a business has closed."""
+        self.businesses_of_type[business.__class__.__name__].remove(business)
+        for service in business.services:
+            self.businesses_providing[service].remove(business)
+            self.nearest_business_providing.pop(service, None)
+
+    def of_type(self, business_type):
+        """Return an IndexedSet of the businesses of the given type (a class name)."""
+        if business_type not in self.businesses_of_type:
+            self.businesses_of_type[business_type] = IndexedSet()
+        return self.businesses_of_type[business_type]
+
+    def providing(self, service):
+        """Return an IndexedSet of the businesses providing the given service."""
+        if service not in self.businesses_providing:
+            self.businesses_providing[service] = IndexedSet()
+        return self.businesses_providing[service]
+
+    def nearest_providing(self, lot, service):
+        """Return the business providing the given service that is nearest to the given lot, if any."""
+        if service not in self.nearest_business_providing:
+            businesses = self.providing(service).members
+            if not businesses:
+                return None
+            lot_distances = self.city.lot_distances
+            distances = lot_distances.among(lot_distances.lots, [business.lot for business in businesses])
+            self.nearest_business_providing[service] = [businesses[i] for i in distances.argmin(axis=1)]
+        return self.nearest_business_providing[service][self.city.lot_distances.index[lot]]
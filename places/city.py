@@ -1,11 +1,16 @@
 import math
 import heapq
 import random
-from scipy import spatial
-from city_planning import CityPlan
+from city_planning import CityPlan, LotNeighborhoods
+from city_index import MILES_PER_EUCLIDEAN_DEGREE
+from business_directory import BusinessDirectory
 from people.business import *
 from people.person import PersonExNihilo
+from people.whereabouts import WhereaboutsLog
+from people.relationship import RelationshipTable
+from people.belief import BeliefTable
 from utils import utilities
+from utils.utilities import IndexedSet, RankedSet
 from events import Fate
 from baseball.field import Field
 
@@ -23,7 +28,6 @@ class City(object):
         print "Establishing {}".format(self.full_name)
         self.founded = self.cosmos.year
         # Set various data
-        specification.city = self
         self.latitude = specification.latitude
         self.longitude = -specification.longitude  # Convert to a positive float (makes distance calculation easier)
         self.coordinates = self.latitude, self.longitude
@@ -32,13 +36,21 @@ class City(object):
         self.state.cities.append(self)
         self.country.cities.append(self)
         self.cosmos.cities.append(self)
+        self.cosmos.city_index.add(self)
         # Prepare various listings
         self.settlers = set()  # First people to live in this city
         self.residents = set()
         self.departed = set()  # People who left the city (i.e., left the simulation)
         self.deceased = set()  # People who died in in the city
+        # The whereabouts, on every timestep, of everyone who has been somewhere in the city (see Person.whereabouts)
+        self.whereabouts_log = WhereaboutsLog(city=self)
+        # The numeric state of the relationships formed by people living in the city (see Relationship)
+        self.relationship_table = RelationshipTable(city=self)
+        # The belief facets held by people living in the city (see Facet)
+        self.belief_table = BeliefTable(city=self)
         self.companies = set()
         self.former_companies = set()
+        self.business_directory = BusinessDirectory(city=self)  # Indexes current companies by type and service
         self.dwelling_places = set()  # Both houses and apartment units (not complexes)
         self.former_dwelling_places = set()
         # Prepare baseball-related attributes
@@ -54,17 +66,31 @@ class City(object):
             print "Re-rolling on a city plan for {} (not enough tracts)".format(self.full_name)
             city_plan = CityPlan(city=self)
         print "\t...establishing a city infrastructure..."
-        self.distances_between_lots = {}  # Maps (lot1, lot2) tuples to distance between them; built up lazily
         self.streets = city_plan.streets
         self.parcels = city_plan.parcels
         self.lots = city_plan.lots
         self.tracts = city_plan.tracts
+        # Precompute the distances between every pair of lots, since the lots never change
+        self.lot_distances = city_plan.survey_lot_distances(
+            along_streets=self.cosmos.config.lot_distances_follow_streets
+        )
         for lot in self.lots | self.tracts:
             lot.set_neighboring_lots()
             lot.init_generate_address()
+        # Keep aggregates over the neighborhood of every lot, which are updated as lot populations change
+        self.lot_neighborhoods = LotNeighborhoods(lot_distances=self.lot_distances)
         city_plan.determine_conventional_city_blocks()
         self.blocks = city_plan.blocks
         self.downtown = self._init_determine_downtown_lot()
+        # Prepare listings of vacancies, which are updated as buildings are constructed and demolished
+        # and as people move in and out of homes; vacant lots and tracts are ranked by their proximity
+        # to downtown, which is how businesses appraise them (see Business._rate_potential_lots())
+        self._vacant_lots = RankedSet()
+        self._vacant_tracts = RankedSet()
+        self._vacant_homes = IndexedSet()
+        self.lots_with_homes = IndexedSet()  # Lots that have a house on them
+        for lot in self.lot_distances.lots:  # Lots and tracts, in order of ID
+            self.note_change_in_occupancy_of_lot(lot)
         self.mayor = None  # Currently being set by _init_get_established()
         self.last_simulated_day = self.cosmos.ordinal_date
         # These get set when these businesses get established (by their __init__() magic methods)
@@ -75,9 +101,10 @@ class City(object):
         self.police_station = None
         self.school = None
         self.university = None
-        # This gets set by a call to set_ten_nearest_cities() upon new cities getting established
-        self.nearest_cities = []
-        self.set_nearest_cities()  # Necessary to do now so that people from other cities may start businesses here
+        # The nearest cities to this one are looked up in the cosmos's city index, and held onto
+        # until another city is established (see City.nearest_cities)
+        self._nearest_cities = []
+        self._nearest_cities_version = None
         # This represents whether a city has redundant businesses that could be shut down
         # to reduce the population of the city
         self.minimal_infrastructure = False
@@ -88,14 +115,7 @@ class City(object):
 
     def _init_determine_downtown_lot(self):
         """Return the lot located among the greatest density of lots."""
-        downtown = None
-        highest_density = float("-inf")
-        for lot in self.lots:
-            density = self.tertiary_density(lot)
-            if density > highest_density:
-                highest_density = density
-                downtown = lot
-        return downtown
+        return self.lot_neighborhoods.densest(lots=self.lots)
 
     def _init_get_established(self):
         """Establish the city in which this gameplay instance will take place."""
@@ -118,22 +138,16 @@ class City(object):
         """Return the number of a blocks between a given lot and the center of downtown."""
         return self.distance_between(lot, self.downtown)
 
+    def dists_from_downtown(self, lots):
+        """Return an array of the number of blocks between each of the given lots and the center of downtown."""
+        return self.lot_distances.from_lot(self.downtown, lots)
+
     def distance_between(self, lot1, lot2):
         """Return travel distance in blocks (given street layouts) between the given lots."""
         assert lot1.city is lot2.city, "Trying to find distance between a lot in {} and one in {} -- lol?".format(
             lot1.city, lot2.city
         )
-        lot_distances_dict_key = tuple(sorted([lot1.id, lot2.id]))
-        if lot_distances_dict_key in self.distances_between_lots:
-            return self.distances_between_lots[lot_distances_dict_key]
-        min_dist = float("inf")
-        for parcel in lot1.parcels:
-            for other_parcel in lot2.parcels:
-                distance = spatial.distance.euclidean(parcel.coordinates, other_parcel.coordinates)
-                if distance < min_dist:
-                    min_dist = distance
-        self.distances_between_lots[lot_distances_dict_key] = min_dist
-        return min_dist
+        return self.lot_distances.between(lot1, lot2)
 
     def nearest_business_of_type(self, lot, business_type):
         """Return the Manhattan distance between a given lot and the nearest company of the given type.
@@ -143,7 +157,8 @@ class City(object):
         """
         businesses_of_this_type = self.businesses_of_type(business_type)
         if businesses_of_this_type:
-            return min(businesses_of_this_type, key=lambda b: self.distance_between(lot, b.lot))
+            distances = self.lot_distances.from_lot(lot, [b.lot for b in businesses_of_this_type])
+            return businesses_of_this_type[distances.argmin()]
         else:
             return None
 
@@ -156,62 +171,38 @@ class City(object):
                           are the ones making the call to this method, as they try to decide where
                           to put their lot.
         """
-        distances = [
-            self.distance_between(lot, company.lot) for company in self.companies if isinstance(company, business_type)
+        lots_of_companies_of_this_type = [
+            company.lot for company in self.companies if isinstance(company, business_type)
             and company is not exclusion
         ]
-        if distances:
-            return max(99, min(distances))  # Elsewhere, a max of 99 is relied on
+        if lots_of_companies_of_this_type:
+            distances = self.lot_distances.from_lot(lot, lots_of_companies_of_this_type)
+            return max(99, distances.min())  # Elsewhere, a max of 99 is relied on
         else:
             return None
 
-    @staticmethod
-    def secondary_population(lot):
+    def secondary_population(self, lot):
         """Return the total population of this lot and its neighbors."""
-        secondary_population = 0
-        for neighbor in {lot} | lot.neighboring_lots:
-            secondary_population += neighbor.population
-        return secondary_population
-
-    @staticmethod
-    def tertiary_population(lot):
-        lots_already_considered = set()
-        tertiary_population = 0
-        for neighbor in {lot} | lot.neighboring_lots:
-            if neighbor not in lots_already_considered:
-                lots_already_considered.add(neighbor)
-                tertiary_population += neighbor.population
-                for neighbor_to_that_lot in neighbor.neighboring_lots:
-                    if neighbor_to_that_lot not in lots_already_considered:
-                        lots_already_considered.add(neighbor_to_that_lot)
-                        tertiary_population += neighbor.population
-        return tertiary_population
-
-    @staticmethod
-    def tertiary_density(lot):
-        lots_already_considered = set()
-        tertiary_density = 0
-        for neighbor in {lot} | lot.neighboring_lots:
-            if neighbor not in lots_already_considered:
-                lots_already_considered.add(neighbor)
-                tertiary_density += 1
-                for neighbor_to_that_lot in neighbor.neighboring_lots:
-                    if neighbor_to_that_lot not in lots_already_considered:
-                        lots_already_considered.add(neighbor_to_that_lot)
-                        tertiary_density += 1
-        return tertiary_density
-
-    def set_nearest_cities(self):
-        """Get the ten nearest cities to this one."""
-        # TODO PRECOMPUTE
-        # nearest_cities = heapq.nsmallest(
-        #     # 21, self.state.country.cities, key=lambda city: self.distance_to(city)
-        #     21, self.state.cities, key=lambda city: self.distance_to(city)
-        # )
-        nearest_cities = list(self.state.cities)[:21]
-        if self in nearest_cities:
-            nearest_cities.remove(self)
-        self.nearest_cities = nearest_cities
+        return self.lot_neighborhoods.secondary_population_of(lot)
+
+    def tertiary_population(self, lot):
+        """Return the total population of this lot, its neighbors, and their neighbors."""
+        return self.lot_neighborhoods.tertiary_population_of(lot)
+
+    def tertiary_density(self, lot):
+        """Return the number of lots among this lot, its neighbors, and their neighbors."""
+        return self.lot_neighborhoods.tertiary_density_of(lot)
+
+    @property
+    def nearest_cities(self):
+        """Return a list of the cities nearest to this one, nearest first."""
+        city_index = self.cosmos.city_index
+        if self._nearest_cities_version != city_index.version:
+            self._nearest_cities = city_index.nearest(
+                self.coordinates, k=self.cosmos.config.number_of_nearest_cities, exclude=self
+            )
+            self._nearest_cities_version = city_index.version
+        return self._nearest_cities
 
     @property
     def random_person(self):
@@ -230,21 +221,42 @@ class City(object):
 
     @property
     def vacant_lots(self):
-        """Return all vacant lots in the city."""
-        vacant_lots = [lot for lot in self.lots if not lot.building]
-        return vacant_lots
+        """Return a RankedSet of all vacant lots in the city."""
+        return self._vacant_lots
 
     @property
     def vacant_tracts(self):
-        """Return all vacant tracts in the city."""
-        vacant_tracts = [tract for tract in self.tracts if not tract.landmark]
-        return vacant_tracts
+        """Return a RankedSet of all vacant tracts in the city."""
+        return self._vacant_tracts
 
     @property
     def vacant_homes(self):
-        """Return all vacant homes in the city."""
-        vacant_homes = [home for home in self.dwelling_places if not home.residents]
-        return vacant_homes
+        """Return an IndexedSet of all vacant homes in the city."""
+        return self._vacant_homes
+
+    def note_change_in_occupancy_of_lot(self, lot):
+        """Update the vacancy listings to reflect whatever is (or isn't) now on the given lot."""
+        if lot in self.tracts:
+            if not lot.landmark:
+                self._vacant_tracts.add(lot, score=-self.dist_from_downtown(lot))
+            else:
+                self._vacant_tracts.discard(lot)
+            return
+        if not lot.building:
+            self._vacant_lots.add(lot, score=-self.dist_from_downtown(lot))
+        else:
+            self._vacant_lots.discard(lot)
+        if lot.building and lot.building.type == 'residence':
+            self.lots_with_homes.add(lot)
+        else:
+            self.lots_with_homes.discard(lot)
+
+    def note_change_in_occupancy_of_home(self, home):
+        """Update the listing of vacant homes to reflect whether anyone now lives in the given home."""
+        if home in self.dwelling_places and not home.residents:
+            self._vacant_homes.add(home)
+        else:
+            self._vacant_homes.discard(home)
 
     @property
     def all_time_residents(self):
@@ -254,32 +266,23 @@ class City(object):
     @property
     def unemployed(self):
         """Return unemployed (mostly young) people, excluding retirees."""
-        unemployed_people = set()
-        for resident in self.residents:
-            if resident.searching_for_work:
-                unemployed_people.add(resident)
-        return unemployed_people
+        return {
+            person for person in self.cosmos.registry.job_seekers if person in self.residents and
+            person.searching_for_work
+        }
 
     @property
     def free_agents(self):
         """Return all the baseball players in this city that are not under contract."""
-        free_agents = {
-            resident.player for resident in self.residents if resident.player and
-            not resident.player.career.retired and
-            not resident.player.career.team
-        }
-        for player in free_agents:
-            if player.career.retired:
-                free_agents.remove(player)
-            elif player.career.team and player in player.career.team.players:
-                free_agents.remove(player)
-        return free_agents
+        free_agents_in_the_state = self.cosmos.registry.free_agents_in(place=self.state)
+        return {player for player in free_agents_in_the_state if player.person in self.residents}
 
     def distance_to(self, city):
         """Return the (approximate) Euclidean distance between another city and this one, in miles."""
-        distance_in_euclidean_degrees = spatial.distance.euclidean(self.coordinates, city.coordinates)
-        number_of_miles_per_euclidean_degree = 68.7
-        distance_in_miles = distance_in_euclidean_degrees*number_of_miles_per_euclidean_degree
+        distance_in_euclidean_degrees = math.hypot(
+            self.latitude-city.latitude, self.longitude-city.longitude
+        )
+        distance_in_miles = distance_in_euclidean_degrees*MILES_PER_EUCLIDEAN_DEGREE
         return distance_in_miles
 
     def workers_of_trade(self, occupation):
@@ -287,17 +290,22 @@ class City(object):
 
         @param occupation: The class pertaining to the occupation in question.
         """
-        return [resident for resident in self.residents if isinstance(resident.occupation, occupation)]
+        return [worker for worker in self.cosmos.registry.workers_of_trade(occupation) if worker in self.residents]
 
     def businesses_of_type(self, business_type):
         """Return all business in this city of the given type.
 
         @param business_type: A string of the Class name representing the type of business in question.
         """
-        businesses_of_this_type = [
-            company for company in self.companies if company.__class__.__name__ == business_type
-        ]
-        return businesses_of_this_type
+        return list(self.business_directory.of_type(business_type).members)
+
+    def businesses_providing_service(self, service):
+        """Return all businesses in this city that provide the given service."""
+        return list(self.business_directory.providing(service).members)
+
+    def nearest_business_providing_service(self, lot, service):
+        """Return the business in this city providing the given service that is nearest the given lot, if any."""
+        return self.business_directory.nearest_providing(lot=lot, service=service)
 
     def manipulate_population(self):
         """Attempt to manipulate the population of this city to reflect its true population this year."""
@@ -388,9 +396,7 @@ class City(object):
         # demolished to make room for a new company (this also creates a natural progression in
         # a place like Manhattan, where actual houses are eventually totally replaced by businesses,
         # causing apartment units to become the only type of residences)
-        lot_can_be_made_available = (
-            self.vacant_lots or any(l for l in self.lots if l.building and l.building.type == 'residence')
-        )
+        lot_can_be_made_available = self.vacant_lots or self.lots_with_homes
         if lot_can_be_made_available:
             self._have_a_new_business_start_up()
 
@@ -416,8 +422,7 @@ class City(object):
                 if advent < self.cosmos.year < demise and self.population >= min_pop:
                     # Check if there aren't already too many businesses of this type in town
                     max_number_for_this_type = config.max_number_of_business_types_at_one_time[business_type]
-                    if (len(self.businesses_of_type(business_type.__name__)) <
-                            max_number_for_this_type):
+                    if len(self.business_directory.of_type(business_type.__name__)) < max_number_for_this_type:
                         # Lastly, if this is a business that only forms on a tract, make sure
                         # there is a vacant tract for it to be established upon
                         need_tract = business_type in config.companies_that_get_established_on_tracts
@@ -440,8 +445,9 @@ class City(object):
             )
         ]
         # Remove from this list companies that are the only business of their type in this city
+        business_directory = self.business_directory
         possible_shutdowns = [
-            co for co in possible_shutdowns if len(self.businesses_of_type(co.__class__.__name__)) > 1
+            co for co in possible_shutdowns if len(business_directory.of_type(co.__class__.__name__)) > 1
         ]
         if not possible_shutdowns:
             self.minimal_infrastructure = True
@@ -449,7 +455,7 @@ class City(object):
             # Sort by how redundant the company is, i.e., how many other companies in this city
             # are of the same type
             possible_shutdowns.sort(
-                key=lambda company: len(self.businesses_of_type(company.__class__.__name__)), reverse=True
+                key=lambda company: len(business_directory.of_type(company.__class__.__name__)), reverse=True
             )
             shutdown = utilities.pick_from_sorted_list(possible_shutdowns)
             shutdown.go_out_of_business(reason=Fate(cosmos=self.cosmos))
@@ -0,0 +1,99 @@
+import math
+import numpy
+from scipy import spatial
+
+# Coordinates are in degrees of latitude and longitude, which we treat as Euclidean
+MILES_PER_EUCLIDEAN_DEGREE = 68.7
+
+
+class CityIndex(object):
+    """A spatial index of every city in a cosmos, supporting nearest-city and within-radius queries.
+
+    The cities are held in a KD-tree over their coordinates. A KD-tree can't take insertions,
+    so cities that are established after the tree was last built are held in a buffer that is
+    searched by brute force; once the buffer grows past the square root of the number of cities,
+    the tree is rebuilt (upon the next query) to cover every city. Distances are in miles.
+    """
+
+    def __init__(self):
+        """Initialize a CityIndex object."""
+        self.cities = []  # In the order in which they were indexed
+        self.coordinates = []
+        self.tree = None  # Covers the first self.number_of_cities_in_tree cities
+        self.number_of_cities_in_tree = 0
+        # Incremented each time a city is indexed, so that query results that are held onto
+        # elsewhere (e.g., City.nearest_cities) may be invalidated
+        self.version = 0
+
+    def __getstate__(self):
+        """Return the state of this index to be pickled, which leaves out the tree (it gets rebuilt on demand)."""
+        state = dict(self.__dict__)
+        state['tree'] = None
+        state['number_of_cities_in_tree'] = 0
+        return state
+
+    def __len__(self):
+        """Return the number of cities in this index."""
+        return len(self.cities)
+
+    def add(self, city):
+        """Index a newly established city."""
+        self.cities.append(city)
+        self.coordinates.append(city.coordinates)
+        self.version += 1
+
+    def nearest(self, coordinates, k, exclude=None):
+        """Return a list of the k cities nearest to the given coordinates, nearest first.
+
+        @param coordinates: A (latitude, longitude) tuple.
+        @param k: The number of cities to return (fewer are returned if there aren't that many).
+        @param exclude: A city that is to be left out of the results (typically the one being queried from).
+        """
+        self._rebuild_tree_if_needed()
+        number_to_retrieve = k + 1 if exclude is not None else k
+        candidates = []  # (distance, index of city) tuples
+        if self.number_of_cities_in_tree:
+            distances, indices = self.tree.query(coordinates, k=min(number_to_retrieve, self.number_of_cities_in_tree))
+            candidates += zip(numpy.atleast_1d(distances).tolist(), numpy.atleast_1d(indices).tolist())
+        for i in xrange(self.number_of_cities_in_tree, len(self.cities)):
+            candidates.append((self._euclidean_distance(coordinates, self.coordinates[i]), i))
+        candidates.sort()
+        nearest_cities = [self.cities[i] for _, i in candidates if self.cities[i] is not exclude]
+        return nearest_cities[:k]
+
+    def within(self, coordinates, radius, exclude=None):
+        """Return a list of all the cities within the given radius of the given coordinates, in the order they were indexed.
+
+        @param coordinates: A (latitude, longitude) tuple.
+        @param radius: A distance in miles.
+        @param exclude: A city that is to be left out of the results (typically the one being queried from).
+        """
+        self._rebuild_tree_if_needed()
+        radius_in_degrees = float(radius) / MILES_PER_EUCLIDEAN_DEGREE
+        indices = []
+        if self.number_of_cities_in_tree:
+            indices += sorted(self.tree.query_ball_point(coordinates, r=radius_in_degrees))
+        for i in xrange(self.number_of_cities_in_tree, len(self.cities)):
+            if self._euclidean_distance(coordinates, self.coordinates[i]) <= radius_in_degrees:
+                indices.append(i)
+        return [self.cities[i] for i in indices if self.cities[i] is not exclude]
+
+    @staticmethod
+    def distances_from(coordinates, cities):
+        """Return an array of the distances between the given coordinates and each of the given cities, in order."""
+        if not cities:
+            return numpy.empty(0)
+        differences = numpy.array([city.coordinates for city in cities], dtype=float) - coordinates
+        return numpy.sqrt((differences**2).sum(axis=1)) * MILES_PER_EUCLIDEAN_DEGREE
+
+    @staticmethod
+    def _euclidean_distance(coordinates, other_coordinates):
+        """Return the Euclidean distance, in degrees, between two pairs of coordinates."""
+        return math.hypot(coordinates[0]-other_coordinates[0], coordinates[1]-other_coordinates[1])
+
+    def _rebuild_tree_if_needed(self):
+        """Rebuild the KD-tree over all cities, if the buffer of cities not yet in it has grown too large."""
+        number_of_cities_in_buffer = len(self.cities) - self.number_of_cities_in_tree
+        if number_of_cities_in_buffer > max(16, math.sqrt(len(self.cities))):
+            self.tree = spatial.cKDTree(numpy.array(self.coordinates, dtype=float))
+            self.number_of_cities_in_tree = len(self.cities)
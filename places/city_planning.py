@@ -1,6 +1,9 @@
 import random
+import numpy
 import pyqtree
-from utils.utilities import PriorityQueue, clamp, insert_into, insert_once
+from scipy import sparse
+from scipy.sparse import csgraph
+from utils.utilities import PriorityQueue, clamp, insert_into, insert_once, rebuild_with_id
 from utils.config import Config
 from corpora import Names
 
@@ -401,6 +404,15 @@ class CityPlan(object):
                 self._parcels_listing[(corner[0], corner[1], corner[2])]
             )
 
+    def survey_lot_distances(self, along_streets=False):
+        """Return a LotDistances object holding the distances between every pair of lots and tracts in this plan.
+
+        @param along_streets: Whether distances are to be measured along the streets of this plan.
+        """
+        return LotDistances(
+            lots=self.lots | self.tracts, street_connections=self._street_connections if along_streets else None
+        )
+
     def determine_conventional_city_blocks(self):
         """Survey all city lots to instantiate conventional city blocks."""
         for lot in self.lots | self.tracts:
@@ -446,6 +458,18 @@ class Street(object):
         self.ending_parcel = ending_parcel
         self.blocks = []  # Gets appended to by Block.__init__()
 
+    def __hash__(self):
+        """Return a hash of this street.
+
+        Hashing by ID, rather than by memory address, makes the iteration order of sets of
+        streets deterministic, which is needed for a cosmos to be reproducible from its ID.
+        """
+        return self.id
+
+    def __reduce_ex__(self, protocol):
+        """Pickle this street such that its ID is restored before anything can try to hash it."""
+        return rebuild_with_id, (self.__class__, self.id), self.__dict__
+
     @staticmethod
     def generate_name(number, direction):
         """Generate a street name."""
@@ -495,6 +519,18 @@ class Parcel(object):
         self.neighbors = []
         self.coordinates = coordinates
 
+    def __hash__(self):
+        """Return a hash of this parcel.
+
+        Hashing by ID, rather than by memory address, makes the iteration order of sets of
+        parcels deterministic, which is needed for a cosmos to be reproducible from its ID.
+        """
+        return self.id
+
+    def __reduce_ex__(self, protocol):
+        """Pickle this parcel such that its ID is restored before anything can try to hash it."""
+        return rebuild_with_id, (self.__class__, self.id), self.__dict__
+
     @staticmethod
     def determine_house_numbering(parcel_number, side_of_street):
         """Devise an appropriate house numbering scheme given the number of buildings on the parcel."""
@@ -563,6 +599,18 @@ class Lot(object):
         self.index_of_street_address_will_be_on = None
         self.former_buildings = []
 
+    def __hash__(self):
+        """Return a hash of this lot.
+
+        Hashing by ID, rather than by memory address, makes the iteration order of sets of
+        lots deterministic, which is needed for a cosmos to be reproducible from its ID.
+        """
+        return self.id
+
+    def __reduce_ex__(self, protocol):
+        """Pickle this lot such that its ID is restored before anything can try to hash it."""
+        return rebuild_with_id, (self.__class__, self.id), self.__dict__
+
     @property
     def population(self):
         """Return the number of people living/working on the lot."""
@@ -607,4 +655,171 @@ class Tract(Lot):
 
     def __init__(self, lot_id, city):
         """Initialize a Lot object."""
-        super(Tract, self).__init__(lot_id, city)
\ No newline at end of file
+        super(Tract, self).__init__(lot_id, city)
+
+
+class LotDistances(object):
+    """The distances between every pair of lots (including tracts) in a city, stored as a dense matrix.
+
+    The distance between two lots is the distance between their nearest parcels, which is
+    measured either as the crow flies or, given the connections between the city's streets,
+    as the length of the shortest path along those streets. The matrix is computed once, when
+    the city is established, since its lots never change thereafter.
+    """
+
+    def __init__(self, lots, street_connections=None):
+        """Initialize a LotDistances object.
+
+        @param lots: The lots and tracts of a city.
+        @param street_connections: A dictionary mapping the coordinates of each point along a
+                                   street to the coordinates of the points along streets that
+                                   it is directly connected to, or None to measure distances
+                                   as the crow flies.
+        """
+        self.lots = sorted(lots, key=lambda lot: lot.id)
+        self.index = {lot: i for i, lot in enumerate(self.lots)}  # Maps lot to its row in the matrix
+        parcels = sorted({parcel for lot in self.lots for parcel in lot.parcels}, key=lambda parcel: parcel.id)
+        index_of_parcel = {parcel: i for i, parcel in enumerate(parcels)}
+        distances_between_parcels = self._compute_distances_between_parcels(
+            parcels=parcels, street_connections=street_connections
+        )
+        # A lot is as far from another lot as its nearest parcel is from that lot's nearest
+        # parcel, so reduce the parcel distances to lot distances by taking minimums over the
+        # parcels of each lot, first along rows and then along columns
+        parcels_of_lots = []
+        first_parcel_of_each_lot = []
+        for lot in self.lots:
+            assert lot.parcels, "{} has no parcels.".format(lot.address)
+            first_parcel_of_each_lot.append(len(parcels_of_lots))
+            parcels_of_lots += [index_of_parcel[parcel] for parcel in lot.parcels]
+        distances_from_lots_to_parcels = numpy.minimum.reduceat(
+            distances_between_parcels[parcels_of_lots], first_parcel_of_each_lot, axis=0
+        )
+        self.matrix = numpy.minimum.reduceat(
+            distances_from_lots_to_parcels[:, parcels_of_lots], first_parcel_of_each_lot, axis=1
+        )
+
+    @staticmethod
+    def _compute_distances_between_parcels(parcels, street_connections):
+        """Return a matrix of the distances between every pair of the given parcels."""
+        coordinates = numpy.array([parcel.coordinates for parcel in parcels], dtype=float)
+        differences = coordinates[:, numpy.newaxis, :] - coordinates[numpy.newaxis, :, :]
+        euclidean_distances = numpy.sqrt((differences**2).sum(axis=2))
+        if street_connections is None:
+            return euclidean_distances
+        points = sorted(street_connections)
+        index_of_point = {point: i for i, point in enumerate(points)}
+        rows, columns = [], []
+        for point, connected_points in street_connections.iteritems():
+            for connected_point in connected_points:
+                rows.append(index_of_point[point])
+                columns.append(index_of_point[connected_point])
+        street_network = sparse.csr_matrix(
+            (numpy.ones(len(rows)), (rows, columns)), shape=(len(points), len(points))
+        )
+        # A parcel may sit at a point that is off the street network (or that cannot be reached
+        # from another parcel along it), in which case fall back to the distance as the crow flies
+        parcels_on_the_network = [i for i, parcel in enumerate(parcels) if parcel.coordinates in index_of_point]
+        points_of_those_parcels = [index_of_point[parcels[i].coordinates] for i in parcels_on_the_network]
+        distances_along_streets = csgraph.shortest_path(
+            street_network, directed=False, unweighted=True, indices=points_of_those_parcels
+        )[:, points_of_those_parcels]
+        distances = euclidean_distances.copy()
+        on_the_network = numpy.ix_(parcels_on_the_network, parcels_on_the_network)
+        distances[on_the_network] = numpy.where(
+            numpy.isinf(distances_along_streets), euclidean_distances[on_the_network], distances_along_streets
+        )
+        return distances
+
+    def between(self, lot, other_lot):
+        """Return the distance between two lots."""
+        return self.matrix.item(self.index[lot], self.index[other_lot])
+
+    def from_lot(self, lot, other_lots):
+        """Return an array of the distances between a lot and each of the given lots, in order."""
+        return self.matrix[self.index[lot], [self.index[other_lot] for other_lot in other_lots]]
+
+    def among(self, lots, other_lots):
+        """Return a matrix of the distances between the given lots (rows) and the other lots (columns)."""
+        return self.matrix[numpy.ix_(
+            [self.index[lot] for lot in lots], [self.index[other_lot] for other_lot in other_lots]
+        )]
+
+
+class LotNeighborhoods(object):
+    """Aggregates over the neighborhood of every lot (including tracts) in a city, kept up to date incrementally.
+
+    A lot's secondary neighborhood comprises the lot itself and its neighboring lots, and its
+    tertiary neighborhood additionally comprises the neighbors of those lots. The neighborhoods
+    are computed once, when the city is established; the population of each neighborhood is
+    then updated as the population of each lot changes. Events that change a lot's population
+    (construction and demolition, moving in and out, hiring and termination, and death) call
+    note_change_in_population(), and the changes are brought to bear upon the next query.
+    """
+
+    def __init__(self, lot_distances):
+        """Initialize a LotNeighborhoods object.
+
+        @param lot_distances: The city's LotDistances object, whose ordering of lots is adopted here.
+        """
+        self.lots = lot_distances.lots
+        self.index = lot_distances.index
+        number_of_lots = len(self.lots)
+        rows, columns = [], []
+        for lot in self.lots:
+            for neighbor in {lot} | lot.neighboring_lots:
+                rows.append(self.index[lot])
+                columns.append(self.index[neighbor])
+        adjacency = sparse.csr_matrix(
+            (numpy.ones(len(rows), dtype=int), (rows, columns)), shape=(number_of_lots, number_of_lots)
+        )
+        two_hop_adjacency = (adjacency * adjacency).tocsr()
+        self.tertiary_density = numpy.diff(two_hop_adjacency.indptr)
+        # Neighboring isn't quite symmetric (a tract neighbors the lots on its parcels, but those
+        # lots don't list the tract as a neighbor), so for each lot we hold the lots whose
+        # neighborhoods include it, which are found by transposing the adjacency matrices
+        adjacency = adjacency.transpose().tocsr()
+        two_hop_adjacency = two_hop_adjacency.transpose().tocsr()
+        self.neighborhoods_including = numpy.split(adjacency.indices, adjacency.indptr[1:-1])
+        self.tertiary_neighborhoods_including = numpy.split(two_hop_adjacency.indices, two_hop_adjacency.indptr[1:-1])
+        self.population = numpy.zeros(number_of_lots, dtype=int)
+        self.secondary_population = numpy.zeros(number_of_lots, dtype=int)
+        self.tertiary_population = numpy.zeros(number_of_lots, dtype=int)
+        self.lots_with_changed_population = {lot for lot in self.lots if lot.population}
+
+    def note_change_in_population(self, lot):
+        """Note that the population of the given lot may have changed."""
+        self.lots_with_changed_population.add(lot)
+
+    def _bring_up_to_date(self):
+        """Propagate any changes in the populations of lots to the populations of their neighborhoods."""
+        for lot in self.lots_with_changed_population:
+            i = self.index[lot]
+            change_in_population = lot.population - self.population.item(i)
+            if change_in_population:
+                self.population.itemset(i, lot.population)
+                self.secondary_population[self.neighborhoods_including[i]] += change_in_population
+                self.tertiary_population[self.tertiary_neighborhoods_including[i]] += change_in_population
+        self.lots_with_changed_population.clear()
+
+    def secondary_population_of(self, lot):
+        """Return the total population of the given lot and its neighbors."""
+        if self.lots_with_changed_population:
+            self._bring_up_to_date()
+        return self.secondary_population.item(self.index[lot])
+
+    def tertiary_population_of(self, lot):
+        """Return the total population of the given lot, its neighbors, and their neighbors."""
+        if self.lots_with_changed_population:
+            self._bring_up_to_date()
+        return self.tertiary_population.item(self.index[lot])
+
+    def tertiary_density_of(self, lot):
+        """Return the number of lots among the given lot, its neighbors, and their neighbors."""
+        return self.tertiary_density.item(self.index[lot])
+
+    def densest(self, lots):
+        """Return the lot, among the given ones, whose tertiary neighborhood has the most lots."""
+        lots = sorted(lots, key=lambda lot: self.index[lot])
+        densities = self.tertiary_density[[self.index[lot] for lot in lots]]
+        return lots[densities.argmax()]
@@ -54,10 +54,7 @@ class Country(object):
     @property
     def residents(self):
         """Return all residents of this country."""
-        residents = []
-        for state in self.states+[self.federal_district]:
-            residents += state.residents
-        return residents
+        return list(self.cosmos.registry.residents(place=self))
 
     @property
     def deceased(self):
@@ -81,22 +78,12 @@ class Country(object):
     @property
     def random_person(self):
         """Return a random person living in this country."""
-        return random.choice(list(self.residents))
+        return self.cosmos.registry.residents(place=self).random_member()
 
     @property
     def free_agents(self):
         """Return all the baseball players in this country that are not under contract."""
-        free_agents = {
-            resident.player for resident in self.residents if resident.player and
-            not resident.player.career.retired and
-            not resident.player.career.team
-        }
-        for player in free_agents:
-            if player.career.retired:
-                free_agents.remove(player)
-            elif player.career.team and player in player.career.team.players:
-                free_agents.remove(player)
-        return free_agents
+        return set(self.cosmos.registry.free_agents_in(place=self))
 
 
 class State(object):
@@ -124,10 +111,7 @@ class State(object):
     @property
     def residents(self):
         """Return all residents of this state."""
-        residents = []
-        for city in self.cities:
-            residents += city.residents
-        return residents
+        return list(self.cosmos.registry.residents(place=self))
 
     @property
     def deceased(self):
@@ -151,22 +135,12 @@ class State(object):
     @property
     def random_person(self):
         """Return a random person living in this state."""
-        return random.choice(list(self.residents))
+        return self.cosmos.registry.residents(place=self).random_member()
 
     @property
     def free_agents(self):
         """Return all the baseball players in this state that are not under contract."""
-        free_agents = {
-            resident.player for resident in self.residents if resident.player and
-            not resident.player.career.retired and
-            not resident.player.career.team
-        }
-        for player in free_agents:
-            if player.career.retired:
-                free_agents.remove(player)
-            elif player.career.team and player in player.career.team.players:
-                free_agents.remove(player)
-        return free_agents
+        return set(self.cosmos.registry.free_agents_in(place=self))
 
 
 class FederalDistrict(State):
@@ -0,0 +1,277 @@
+"""Reading and writing snapshots of a cosmos (see Cosmos.save() and Cosmos.load()).
+
+A snapshot is a header line, giving the format version, followed by a sequence of chunks.
+Each chunk holds the state of a single entity: the cosmos itself, the city data (which never
+changes), a city or its belief table (keyed by the city's position in Cosmos.cities), a person
+(keyed by person ID), or a business or dwelling place (keyed by place ID). A chunk is written as a line giving its kind, key,
+and length in bytes, followed by that many bytes of compressed pickle. Within a chunk, any
+reference to an entity is written as its kind and key, rather than as the entity itself,
+so that no chunk pulls in the state of any other entity, and a chunk may be compared with
+the chunk for the same entity in some other snapshot.
+
+Objects that aren't entities (a person's mind, an event, a relationship, and so forth) are
+written into the first chunk that refers to them; any later chunk that refers to such an
+object refers to it by the key of that chunk and the object's position in that chunk's
+pickle, which ensures that everything that shares an object still shares it once the
+snapshot has been loaded. As such, chunks have to be loaded in the order they were written.
+
+Pickling still recurses through chains of linked objects within a chunk (e.g., from one
+belief facet to the evidence for it to another facet), and so snapshots are still written
+and read by way of call_with_deep_recursion().
+
+Checkpoints (see Checkpointer) are written in the same way, except that the header is
+followed by a manifest chunk listing the key of every chunk in the snapshot, in order,
+along with the name of the checkpoint file that holds it. A base checkpoint holds every
+chunk itself, while a delta checkpoint only holds the chunks that changed since the one
+before it, referring to earlier checkpoints (in the same directory) for the rest.
+"""
+
+import os
+import zlib
+import heapq
+import types
+import cPickle
+import cStringIO
+from utils.utilities import call_with_deep_recursion, rebuild_with_id
+from people.person import Person
+from people.business import Business
+from people.residence import DwellingPlace
+from people.belief import BeliefTable
+from places.city import City
+from data import CityData
+
+# Written at the head of every snapshot file; bump the version whenever the snapshot
+# format changes in a way that would break the loading of older snapshots
+SNAPSHOT_HEADER = 'BASEBALL-COSMOS-SNAPSHOT'
+SNAPSHOT_FORMAT_VERSION = 19
+# The kinds of entities, in the order their chunks are written in; the city data comes first,
+# since it never changes and the cities share parts of it
+ENTITY_KINDS = ('cosmos', 'city-data', 'city', 'belief-table', 'place', 'person')
+# The types of objects that are never referred to across chunks, since it doesn't matter
+# whether two chunks share them (classes and functions are pickled by name anyway)
+UNSHARED_TYPES = frozenset((
+    int, long, float, str, unicode, bool, type(None), tuple, frozenset, type, types.ClassType,
+    types.FunctionType, types.BuiltinFunctionType
+))
+
+
+def write_snapshot(cosmos, snapshot_file):
+    """Write a snapshot of the given cosmos to the given file."""
+    snapshot_file.write('{} {}\n'.format(SNAPSHOT_HEADER, SNAPSHOT_FORMAT_VERSION))
+    for key, chunk in snapshot_chunks(cosmos=cosmos):
+        write_chunk(snapshot_file=snapshot_file, key=key, chunk=chunk)
+
+
+def read_snapshot(snapshot_file, path):
+    """Read and return the cosmos in the snapshot in the given file.
+
+    @param path: The path to the snapshot file, which is only used in error messages.
+    """
+    read_header(snapshot_file=snapshot_file, path=path)
+    return assemble_cosmos(chunks=read_chunks(snapshot_file=snapshot_file))
+
+
+def read_header(snapshot_file, path):
+    """Read the header of the snapshot in the given file, checking that it's in the current format."""
+    header = snapshot_file.readline().split()
+    assert header and header[0] == SNAPSHOT_HEADER, "{} is not a cosmos snapshot.".format(path)
+    assert int(header[1]) == SNAPSHOT_FORMAT_VERSION, (
+        "{path} is a version-{version} snapshot, but only version-{current_version} "
+        "snapshots can be loaded.".format(path=path, version=header[1], current_version=SNAPSHOT_FORMAT_VERSION)
+    )
+
+
+def write_chunk(snapshot_file, key, chunk):
+    """Write a chunk, which has been compressed already, to the given file."""
+    kind, entity_key = key
+    snapshot_file.write('{} {} {}\n'.format(kind, entity_key, len(chunk)))
+    snapshot_file.write(chunk)
+
+
+def read_chunks(snapshot_file):
+    """Yield the (key, chunk) pairs that remain in the given file, in the order they were written."""
+    while True:
+        line = snapshot_file.readline()
+        if not line:
+            return
+        kind, entity_key, length = line.split()
+        yield (kind, int(entity_key)), snapshot_file.read(int(length))
+
+
+def write_checkpoint(checkpoint_file, manifest, chunks):
+    """Write a checkpoint to the given file.
+
+    @param manifest: A list of (key, filename) pairs giving, for every chunk in the snapshot,
+                     in order, the name of the checkpoint file that holds it.
+    @param chunks: The (key, chunk) pairs that are to be held by this checkpoint file itself.
+    """
+    checkpoint_file.write('{} {}\n'.format(SNAPSHOT_HEADER, SNAPSHOT_FORMAT_VERSION))
+    write_chunk(
+        snapshot_file=checkpoint_file, key=('manifest', 0),
+        chunk=zlib.compress(cPickle.dumps(manifest, cPickle.HIGHEST_PROTOCOL), 1)
+    )
+    for key, chunk in chunks:
+        write_chunk(snapshot_file=checkpoint_file, key=key, chunk=chunk)
+
+
+def read_checkpoint(path):
+    """Read and return the cosmos in the checkpoint at the given path, along with any it is a delta of."""
+    directory = os.path.dirname(path)
+    with open(path, 'rb') as checkpoint_file:
+        read_header(snapshot_file=checkpoint_file, path=path)
+        (kind, _), manifest_chunk = next(read_chunks(snapshot_file=checkpoint_file))
+        assert kind == 'manifest', "{} is a snapshot, not a checkpoint.".format(path)
+    manifest = cPickle.loads(zlib.decompress(manifest_chunk))
+    keys_by_filename = {}
+    for key, holder in manifest:
+        keys_by_filename.setdefault(holder, set()).add(key)
+    chunks_by_key = {}
+    for holder, keys in keys_by_filename.iteritems():
+        holder_path = os.path.join(directory, holder)
+        with open(holder_path, 'rb') as checkpoint_file:
+            read_header(snapshot_file=checkpoint_file, path=holder_path)
+            for key, chunk in read_chunks(snapshot_file=checkpoint_file):
+                if key in keys:
+                    chunks_by_key[key] = chunk
+    return assemble_cosmos(chunks=((key, chunks_by_key[key]) for key, _ in manifest))
+
+
+def snapshot_chunks(cosmos):
+    """Return a list of the (key, chunk) pairs making up a snapshot of the given cosmos, in order.
+
+    The cosmos comes first, followed by every entity that it refers to, directly or indirectly.
+    Of the entities that have been referred to by the chunks written so far, the next to be written
+    is always the first by kind (in the order of ENTITY_KINDS) and then by key, rather than the
+    first to have been referred to, so that an unchanged entity yields an unchanged chunk even if
+    the entities that refer to it have changed (which is what makes delta checkpoints small).
+    """
+    return call_with_deep_recursion(lambda: _SnapshotWriter(cosmos=cosmos).chunks())
+
+
+def assemble_cosmos(chunks):
+    """Return the cosmos whose snapshot is made up of the given (key, chunk) pairs, which must be in order."""
+    return call_with_deep_recursion(lambda: _SnapshotReader().assemble(chunks=chunks))
+
+
+class _SnapshotWriter(object):
+    """Pickles each of the entities of a cosmos into a chunk of its own."""
+
+    def __init__(self, cosmos):
+        """Initialize a _SnapshotWriter object."""
+        self.cosmos = cosmos
+        self.city_numbers = {id(city): i for i, city in enumerate(cosmos.cities)}
+        self.keys = {id(cosmos): ('cosmos', 0)}  # Maps the memory address of each entity to its key
+        self.kinds = {}  # Maps each class that has been encountered to the kind of entity it is, if any
+        # A heap of (rank of kind, key, entity) tuples for the entities that have been referred to
+        # but not yet written
+        self.pending = [(0, ('cosmos', 0), cosmos)]
+        # Maps the memory address of each object that has been written into some chunk already to the
+        # key of that chunk, its position in that chunk's pickle, and the object itself (which keeps
+        # the address from being reused by some other object while the snapshot is being written)
+        self.written = {}
+
+    def chunks(self):
+        """Return a list of the (key, chunk) pairs making up the snapshot."""
+        chunks = []
+        while self.pending:
+            _, key, entity = heapq.heappop(self.pending)
+            # The cosmos chunk also names the class of the cosmos, which nothing else may refer to
+            state = (type(entity), entity.__getstate__()) if entity is self.cosmos else entity.__dict__
+            buffer = cStringIO.StringIO()
+            pickler = cPickle.Pickler(buffer, cPickle.HIGHEST_PROTOCOL)
+            pickler.persistent_id = self._refer_to
+            pickler.dump(state)
+            for position, obj in pickler.memo.itervalues():
+                if type(obj) not in UNSHARED_TYPES:
+                    self.written[id(obj)] = (key, position, obj)
+            chunks.append((key, zlib.compress(buffer.getvalue(), 1)))
+        return chunks
+
+    def _refer_to(self, obj):
+        """Return a reference to the given object, or None if it is to be written into the chunk at hand."""
+        # This gets called for every object that gets pickled, so the common cases come first
+        cls = type(obj)
+        if cls in UNSHARED_TYPES:
+            return None
+        address = id(obj)
+        if address in self.written:
+            key, position, _ = self.written[address]
+            return 'object', key, position
+        if address in self.keys:
+            return 'entity', self.keys[address], cls
+        if cls not in self.kinds:
+            self.kinds[cls] = self._kind(cls=cls)
+        kind = self.kinds[cls]
+        if kind is None:
+            return None
+        if kind == 'city':
+            key = (kind, self.city_numbers[address])
+        elif kind == 'belief-table':
+            key = (kind, self.city_numbers[id(obj.city)])
+        elif kind == 'city-data':
+            key = (kind, 0)
+        else:
+            key = (kind, obj.id)
+        self.keys[address] = key
+        heapq.heappush(self.pending, (ENTITY_KINDS.index(kind), key, obj))
+        return 'entity', key, cls
+
+    @staticmethod
+    def _kind(cls):
+        """Return the kind of entity that instances of the given class are, or None if they aren't entities."""
+        if issubclass(cls, Person):
+            return 'person'
+        if issubclass(cls, (Business, DwellingPlace)):
+            return 'place'
+        if issubclass(cls, City):
+            return 'city'
+        if issubclass(cls, BeliefTable):
+            return 'belief-table'
+        if issubclass(cls, CityData):
+            return 'city-data'
+        return None
+
+
+class _SnapshotReader(object):
+    """Restores the entities of a cosmos from their chunks."""
+
+    def __init__(self):
+        """Initialize a _SnapshotReader object."""
+        self.entities = {}  # Maps key to entity, which may be a bare instance whose state has yet to be restored
+        self.memos = {}  # Maps the key of each chunk that has been read to the objects in its pickle, by position
+
+    def assemble(self, chunks):
+        """Return the cosmos whose snapshot is made up of the given (key, chunk) pairs."""
+        cosmos_class, cosmos_state = None, None
+        for key, chunk in chunks:
+            unpickler = cPickle.Unpickler(cStringIO.StringIO(zlib.decompress(chunk)))
+            unpickler.persistent_load = self._resolve
+            state = unpickler.load()
+            self.memos[key] = unpickler.memo
+            if key[0] == 'cosmos':
+                # The cosmos is restored last, since restoring it prepares its config and NLG module anew
+                cosmos_class, cosmos_state = state
+            else:
+                self._entity(key=key, cls=None).__dict__.update(state)
+        cosmos = self._entity(key=('cosmos', 0), cls=cosmos_class)
+        cosmos.__setstate__(cosmos_state)
+        return cosmos
+
+    def _resolve(self, reference):
+        """Return the object that the given reference refers to."""
+        if reference[0] == 'object':
+            _, key, position = reference
+            return self.memos[key][position]
+        _, key, cls = reference
+        return self._entity(key=key, cls=cls)
+
+    def _entity(self, key, cls):
+        """Return the entity with the given key, preparing a bare instance of the given class if need be."""
+        if key not in self.entities:
+            kind, entity_key = key
+            if kind in ('person', 'place'):
+                # These hash by ID, and so need their IDs before they can be added to any set
+                self.entities[key] = rebuild_with_id(cls, entity_key)
+            else:
+                self.entities[key] = cls.__new__(cls)
+        return self.entities[key]
@@ -0,0 +1,44 @@
+import os
+import sys
+
+# The simulation's modules import one another relative to the root of the repository, and
+# its data files (e.g., the name corpora) are opened relative to the working directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pytest
+from cosmos import Cosmos
+from baseball.league import League
+from baseball.season import LeagueSeason
+
+
+@pytest.fixture(scope='session')
+def league_snapshot(tmpdir_factory):
+    """Return the path to a snapshot of a young cosmos with a league whose first season is about to begin."""
+    for _ in xrange(5):
+        try:
+            cosmos = _cosmos_with_a_league()
+            break
+        except AttributeError:
+            # A player signed by a charter team may leave town (along with a moving family
+            # member) before the league has a history to retire him into (see League.__init__()),
+            # in which case we simulate another cosmos
+            continue
+    path = str(tmpdir_factory.mktemp('league').join('league.snapshot'))
+    cosmos.save(path)
+    return path
+
+
+def _cosmos_with_a_league():
+    """Return a young cosmos with a league whose first season is about to begin."""
+    cosmos = Cosmos(cosmos_id='3')
+    cosmos.progress(until=1628)
+    # Found the league in the biggest city that can field an even number of teams
+    for city in sorted(cosmos.cities, key=lambda c: -len(c.residents)):
+        league = League(city, cosmos.baseball_classifications[0])
+        if len(league.teams) >= 4 and len(league.teams) % 2 == 0:
+            break
+        cosmos.leagues.remove(league)
+    LeagueSeason(league=league)
+    return cosmos
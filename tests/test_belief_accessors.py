@@ -0,0 +1,126 @@
+import pytest
+from people.belief import BusinessMentalModel, DwellingPlaceModel, PersonMentalModel
+
+# The commands that mental models used to build up to access their belief facets, which were
+# run with eval() and exec, keyed by mental-model class and then by feature type
+LEGACY_COMMANDS = {
+    BusinessMentalModel: {
+        "business name": "self.name",
+        "business block": "self.block",
+        "business address": "self.address",
+    },
+    DwellingPlaceModel: {
+        "home is apartment": "self.apartment",
+        "home block": "self.block",
+        "home address": "self.address",
+    },
+    PersonMentalModel: {
+        # Status
+        "status": "self.status.status",
+        "marital status": "self.status.marital_status",
+        "departure year": "self.status.departure_year",
+        # Age
+        "birth year": "self.age.birth_year",
+        "death year": "self.age.death_year",
+        "approximate age": "self.age.approximate",
+        # Name
+        "first name": "self.name.first_name",
+        "middle name": "self.name.middle_name",
+        "last name": "self.name.last_name",
+        "suffix": "self.name.suffix",
+        "surname ethnicity": "self.name.surname_ethnicity",
+        "hyphenated surname": "self.name.hyphenated_surname",
+        # Occupation
+        "workplace": "self.occupation.company",
+        "job title": "self.occupation.job_title",
+        "job shift": "self.occupation.shift",
+        "job status": "self.occupation.status",
+        # Home
+        "home": "self.home",
+        # Appearance
+        "skin color": "self.face.skin.color",
+        "head size": "self.face.head.size",
+        "head shape": "self.face.head.shape",
+        "hair length": "self.face.hair.length",
+        "hair color": "self.face.hair.color",
+        "eyebrow size": "self.face.eyebrows.size",
+        "eyebrow color": "self.face.eyebrows.color",
+        "mouth size": "self.face.mouth.size",
+        "ear size": "self.face.ears.size",
+        "ear angle": "self.face.ears.angle",
+        "nose size": "self.face.nose.size",
+        "nose shape": "self.face.nose.shape",
+        "eye size": "self.face.eyes.size",
+        "eye shape": "self.face.eyes.shape",
+        "eye color": "self.face.eyes.color",
+        "eye horizontal settedness": "self.face.eyes.horizontal_settedness",
+        "eye vertical settedness": "self.face.eyes.vertical_settedness",
+        "facial hair style": "self.face.facial_hair.style",
+        "freckles": "self.face.distinctive_features.freckles",
+        "birthmark": "self.face.distinctive_features.birthmark",
+        "scar": "self.face.distinctive_features.scar",
+        "tattoo": "self.face.distinctive_features.tattoo",
+        "glasses": "self.face.distinctive_features.glasses",
+        "sunglasses": "self.face.distinctive_features.sunglasses",
+    },
+}
+
+
+class Stand(object):
+    """A bare object to hang belief facets (or the beliefs that hold them) upon."""
+
+
+class Facet(object):
+    """A stand-in for a belief facet, which is identified by the feature type it pertains to."""
+
+    def __init__(self, feature_type):
+        self.feature_type = feature_type
+
+
+def a_mental_model(mental_model_class):
+    """Return a mental model of the given class with a distinct facet held at each of its attribute paths.
+
+    The mental model is not initialized, since only the attributes that hold belief facets matter here.
+    """
+    mental_model = object.__new__(mental_model_class)
+    for feature_type, command in LEGACY_COMMANDS[mental_model_class].iteritems():
+        holder = mental_model
+        attributes = command.split('.')[1:]
+        for attribute in attributes[:-1]:
+            if attribute not in holder.__dict__:
+                setattr(holder, attribute, Stand())
+            holder = getattr(holder, attribute)
+        setattr(holder, attributes[-1], Facet(feature_type=feature_type))
+    return mental_model
+
+
+@pytest.mark.parametrize('mental_model_class', sorted(LEGACY_COMMANDS, key=lambda cls: cls.__name__))
+def test_belief_facets_are_accessed_where_the_legacy_commands_accessed_them(mental_model_class):
+    assert set(mental_model_class.belief_facet_accessors) == set(LEGACY_COMMANDS[mental_model_class])
+    mental_model, legacy_mental_model = a_mental_model(mental_model_class), a_mental_model(mental_model_class)
+    for feature_type, command in sorted(LEGACY_COMMANDS[mental_model_class].iteritems()):
+        belief_facet = mental_model.get_belief_facet(feature_type=feature_type)
+        assert belief_facet.feature_type == feature_type
+        assert belief_facet is eval(command, {'self': mental_model})
+        new_belief_facet = Facet(feature_type=feature_type)
+        mental_model.set_belief_facet(feature_type=feature_type, belief_facet=new_belief_facet)
+        exec '{} = belief_facet'.format(command) in {'self': legacy_mental_model, 'belief_facet': new_belief_facet}
+        assert mental_model.get_belief_facet(feature_type=feature_type) is new_belief_facet
+        assert eval(command, {'self': legacy_mental_model}) is new_belief_facet
+    # Nothing else was touched along the way
+    for feature_type, command in LEGACY_COMMANDS[mental_model_class].iteritems():
+        assert eval(command, {'self': mental_model}) is eval(command, {'self': legacy_mental_model})
+
+
+def test_whereabouts_beliefs_are_accessed_by_timestep_as_the_legacy_commands_accessed_them():
+    mental_model = object.__new__(PersonMentalModel)
+    mental_model.whereabouts = Stand()
+    mental_model.whereabouts.date = {}
+    belief_facet = Facet(feature_type='whereabouts 723099-1')
+    mental_model.set_belief_facet(feature_type='whereabouts 723099-1', belief_facet=belief_facet)
+    # The legacy command for this feature type was 'self.whereabouts.date[(723099, 1)]'
+    assert mental_model.whereabouts.date == {(723099, 1): belief_facet}
+    assert mental_model.get_belief_facet(feature_type='whereabouts 723099-1') is belief_facet
+    # A missing whereabouts belief raises a KeyError, as evaluating the legacy command did
+    with pytest.raises(KeyError):
+        mental_model.get_belief_facet(feature_type='whereabouts 723099-0')
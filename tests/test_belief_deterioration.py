@@ -0,0 +1,115 @@
+import random
+import collections
+from cosmos import Cosmos
+from people.belief import MentalModel
+
+TIMESTEPS = 60
+TRIALS = 20000
+
+
+class Stand(object):
+    """A bare object to hang the attributes that a mental model consults upon."""
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+class TallyModel(MentalModel):
+    """A mental model whose belief facets are tallies of how many times they have deteriorated.
+
+    A facet's chance of deteriorating falls each time it deteriorates, as a real facet's does when
+    it is replaced by a weaker one, so that the chance changes as time passes.
+    """
+    deteriorating_feature_types = ('hair color', 'first name')
+    base_chances = {'hair color': 0.05, 'first name': 0.02}
+
+    def __init__(self, owner):
+        super(TallyModel, self).__init__(owner=owner, subject=Stand(name='subject'))
+        self.tallies = {feature_type: 0 for feature_type in self.deteriorating_feature_types}
+
+    def get_belief_facet(self, feature_type):
+        return self.tallies[feature_type]
+
+    def _get_chance_of_deterioration_on_a_given_timestep(self, feature_type, current_belief_facet):
+        return self.base_chances[feature_type] / (1+current_belief_facet)
+
+    def deteriorate_belief_facet(self, feature_type, current_belief_facet):
+        self.tallies[feature_type] = current_belief_facet + 1
+
+
+def a_tally_model(beliefs_deteriorate=True):
+    """Return a tally model whose owner lives in a cosmos that is at its first timestep."""
+    cosmos = Stand(timestep=0, config=Stand(beliefs_deteriorate=beliefs_deteriorate))
+    return TallyModel(owner=Stand(cosmos=cosmos, mind=Stand(mental_models={})))
+
+
+def deteriorate_eagerly(mental_model, timesteps):
+    """Roll against each facet's chance of deteriorating on every timestep, as the eager path used to."""
+    for _ in xrange(timesteps):
+        for feature_type in mental_model.deteriorating_feature_types:
+            current_belief_facet = mental_model.get_belief_facet(feature_type=feature_type)
+            chance = mental_model._get_chance_of_deterioration_on_a_given_timestep(
+                feature_type=feature_type, current_belief_facet=current_belief_facet
+            )
+            if random.random() < chance:
+                mental_model.deteriorate_belief_facet(
+                    feature_type=feature_type, current_belief_facet=current_belief_facet
+                )
+
+
+def settle_lazily(mental_model, timesteps, times_consulted):
+    """Let the given number of timesteps pass, settling the mental model each time it is consulted along the way."""
+    for i in xrange(1, times_consulted+1):
+        mental_model.owner.cosmos.timestep = timesteps * i // times_consulted
+        mental_model.settle()
+
+
+def distribution_of_tallies(deteriorate):
+    """Return the share of trials that ended with each combination of tallies."""
+    outcomes = collections.Counter()
+    for _ in xrange(TRIALS):
+        mental_model = a_tally_model()
+        deteriorate(mental_model)
+        outcomes[tuple(sorted(mental_model.tallies.iteritems()))] += 1
+    return {outcome: n/float(TRIALS) for outcome, n in outcomes.iteritems()}
+
+
+def total_variation_distance(p, q):
+    return 0.5 * sum(abs(p.get(outcome, 0.0)-q.get(outcome, 0.0)) for outcome in set(p) | set(q))
+
+
+def test_lazy_deterioration_is_distributed_as_eager_deterioration_is():
+    random.seed(20)
+    eager = distribution_of_tallies(lambda mental_model: deteriorate_eagerly(mental_model, TIMESTEPS))
+    for times_consulted in (1, 7):
+        lazy = distribution_of_tallies(
+            lambda mental_model: settle_lazily(mental_model, TIMESTEPS, times_consulted)
+        )
+        assert total_variation_distance(eager, lazy) < 0.03
+
+
+def test_beliefs_do_not_deteriorate_unless_the_config_says_so():
+    mental_model = a_tally_model(beliefs_deteriorate=False)
+    random_state_before = random.getstate()
+    settle_lazily(mental_model, timesteps=10000, times_consulted=3)
+    assert random.getstate() == random_state_before
+    assert set(mental_model.tallies.values()) == {0}
+    assert mental_model.last_settled_timestep == 10000
+
+
+def test_settling_all_beliefs_draws_from_a_stream_of_its_own(league_snapshot):
+    cosmos = Cosmos.load(league_snapshot)
+    cosmos.config.beliefs_deteriorate = True
+    living_people = [person for _, person in sorted(cosmos.registry.people.iteritems()) if not person.archived]
+    for person in living_people[:30]:
+        person.reflect()
+    cosmos.ordinal_date += 500  # Let deterioration accrue
+    random_state_before = random.getstate()
+    cosmos.settle_all_beliefs()
+    assert random.getstate() == random_state_before
+    assert 'belief settling' in cosmos.random_streams.streams
+    settled_timesteps = [
+        mental_model.last_settled_timestep
+        for person in living_people for mental_model in person.mind.mental_models.itervalues()
+    ]
+    assert len(settled_timesteps) >= 30 and set(settled_timesteps) == {cosmos.timestep}
@@ -0,0 +1,54 @@
+import random
+from people.belief import BeliefTable, BeliefColumn
+
+
+class Handle(object):
+    """A stand-in for a belief facet, whose numeric state is a view onto its row of a belief table."""
+    strength = BeliefColumn('strength')
+    challenger = BeliefColumn('challenger')
+
+    def __init__(self, table, owner, subject, feature_type):
+        self.table = table
+        self.feature_type = table.intern(feature_type)
+        self.row = table.add_row(facet=self, owner=owner, subject=subject)
+
+
+def test_belief_tables_hold_what_facets_holding_their_own_state_would():
+    rng = random.Random(8)
+    table = BeliefTable(city=None, initial_capacity=4)  # So that the columns have to grow
+    owners, subjects = ['Ann', 'Bo', 'Cy'], ['Dee', 'Ed']
+    feature_types = ['hair color', 'first name', 'home']
+    # The state of each facet, as it was held by the facet objects themselves before
+    handles, strengths, evidence, challengers = [], [], [], []
+    for i in xrange(300):
+        if not handles or rng.random() < 0.2:
+            owner, subject = rng.choice(owners), rng.choice(subjects)
+            handles.append(Handle(table=table, owner=owner, subject=subject, feature_type=rng.choice(feature_types)))
+            handles[-1].owner, handles[-1].subject = owner, subject
+            strengths.append(0.0)
+            evidence.append([])
+            challengers.append(False)
+        j = rng.randrange(len(handles))
+        strength = rng.uniform(0, 2)
+        table.attribute_evidence(row=handles[j].row, evidence='evidence {}'.format(i), strength=strength)
+        strengths[j] += strength
+        evidence[j].insert(0, 'evidence {}'.format(i))
+        if rng.random() < 0.1:
+            handles[j].challenger = challengers[j] = not challengers[j]
+    assert len(table) == len(handles) > 4
+    for handle, strength, its_evidence, challenger in zip(handles, strengths, evidence, challengers):
+        assert table.facets[handle.row] is handle
+        assert abs(handle.strength - strength) < 1e-9
+        assert type(handle.strength) is float and type(handle.challenger) is bool
+        assert handle.challenger == challenger
+        assert table.evidence_of(handle.row) == its_evidence
+    for owner in owners:
+        for subject in subjects:
+            its_handles = [handle for handle in handles if (handle.owner, handle.subject) == (owner, subject)]
+            assert table.facets_about(owner, subject) == its_handles
+            for feature_type in feature_types:
+                assert table.facets_about(owner, subject, feature_type=feature_type) == [
+                    handle for handle in its_handles if handle.feature_type == feature_type
+                ]
+    # Feature types are interned, and so each is stored only once
+    assert len({id(handle.feature_type) for handle in handles}) == len(feature_types)
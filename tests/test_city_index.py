@@ -0,0 +1,70 @@
+import math
+import random
+import cPickle
+from places.city_index import CityIndex, MILES_PER_EUCLIDEAN_DEGREE
+
+
+class Stand(object):
+    """A stand-in for a city, which the index only knows by its coordinates."""
+
+    def __init__(self, name, coordinates):
+        self.name = name
+        self.coordinates = coordinates
+
+
+def miles_between(coordinates, other_coordinates):
+    degrees = math.hypot(coordinates[0]-other_coordinates[0], coordinates[1]-other_coordinates[1])
+    return degrees * MILES_PER_EUCLIDEAN_DEGREE
+
+
+def nearest_by_brute_force(cities, coordinates, k, exclude=None):
+    others = [city for city in cities if city is not exclude]
+    return sorted(others, key=lambda city: miles_between(coordinates, city.coordinates))[:k]
+
+
+def within_by_brute_force(cities, coordinates, radius, exclude=None):
+    return [
+        city for city in cities if city is not exclude and miles_between(coordinates, city.coordinates) <= radius
+    ]
+
+
+def test_nearest_and_within_are_what_a_brute_force_search_finds():
+    rng = random.Random(11)
+    index = CityIndex()
+    cities = []
+    # Cities are established a few at a time, so that queries are answered by the tree, the
+    # buffer of cities established since it was last built, and both at once
+    for batch_size in (3, 14, 1, 40, 2, 100, 5):
+        for _ in xrange(batch_size):
+            city = Stand(name=str(len(cities)), coordinates=(rng.uniform(25, 49), rng.uniform(-124, -67)))
+            cities.append(city)
+            index.add(city)
+        for _ in xrange(20):
+            coordinates = (rng.uniform(25, 49), rng.uniform(-124, -67))
+            exclude = rng.choice(cities + [None])
+            for k in (1, 5, 30):
+                assert index.nearest(coordinates, k=k, exclude=exclude) == nearest_by_brute_force(
+                    cities, coordinates, k=k, exclude=exclude
+                )
+            for radius in (0, 50, 400, 5000):
+                assert index.within(coordinates, radius=radius, exclude=exclude) == within_by_brute_force(
+                    cities, coordinates, radius=radius, exclude=exclude
+                )
+    assert len(index) == len(cities) and index.number_of_cities_in_tree
+    distances = CityIndex.distances_from(cities[0].coordinates, cities[:10])
+    assert [round(d, 6) for d in distances] == [
+        round(miles_between(cities[0].coordinates, city.coordinates), 6) for city in cities[:10]
+    ]
+
+
+def test_an_index_answers_the_same_once_it_has_been_pickled():
+    rng = random.Random(12)
+    index = CityIndex()
+    for i in xrange(60):
+        index.add(Stand(name=str(i), coordinates=(rng.uniform(25, 49), rng.uniform(-124, -67))))
+    coordinates = (37.0, -95.0)
+    nearest, within = index.nearest(coordinates, k=7), index.within(coordinates, radius=600)
+    unpickled_index = cPickle.loads(cPickle.dumps(index, cPickle.HIGHEST_PROTOCOL))
+    assert unpickled_index.tree is None
+    assert [city.name for city in unpickled_index.nearest(coordinates, k=7)] == [city.name for city in nearest]
+    assert [city.name for city in unpickled_index.within(coordinates, radius=600)] == [city.name for city in within]
@@ -0,0 +1,26 @@
+from baseball.field import Field
+
+
+class Stand(object):
+    """A bare object to hang the attributes that a field consults upon."""
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+def a_field():
+    city = Stand(country=Stand(cosmos=Stand(date='April 1, 1900')))
+    return Field(site=Stand(city=city))
+
+
+def test_foul_poles_stand_where_they_stood_before_fields_shared_their_geometry():
+    # Fields used to look up their foul poles in the boundary dictionaries, and both poles were
+    # (and still are) placed at the leftmost x-coordinate
+    field = a_field()
+    playing_field_lower_bound, playing_field_upper_bound = Field.get_playing_field_boundaries()
+    outfield_fence_height = Field.get_outfield_fence_height()
+    leftmost_x = min(playing_field_upper_bound.keys())
+    assert field.left_foul_pole_location == (leftmost_x, playing_field_upper_bound[leftmost_x])
+    assert field.right_foul_pole_location == (leftmost_x, playing_field_upper_bound[leftmost_x])
+    assert field.left_foul_pole_height == outfield_fence_height[leftmost_x]
+    assert field.right_foul_pole_height == outfield_fence_height[leftmost_x]
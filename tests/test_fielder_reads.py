@@ -0,0 +1,139 @@
+import random
+import pytest
+from baseball.field import FieldGeometry
+from baseball.batted_ball import BattedBall
+from baseball.trajectory import compute_trajectory
+
+NUMBER_OF_PLAYS = 300
+# Where fielders stand at the start of a play, give or take a few feet
+FIELDER_ORIGINS = {
+    'P': (0, 60.5), 'C': (0, -3), '1B': (70, 95), '2B': (30, 145), 'SS': (-30, 145),
+    '3B': (-70, 95), 'LF': (-125, 250), 'CF': (0, 300), 'RF': (125, 250)
+}
+# The attributes that reading (or rereading) the ball sets on each fielder
+PLANNED_ATTRIBUTES = (
+    'time_needed_to_field_ball', 'timestep_of_planned_fielding_attempt', 'immediate_goal', 'dist_per_timestep',
+    'relative_rate_of_speed', 'attempting_fly_out'
+)
+
+
+class Struct(object):
+    """A bare object to hang attributes on."""
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+def make_fielders(rng, jitter=True):
+    """Return fielders with randomly drawn fielding abilities, standing at (or near) their usual origins."""
+    fielders = []
+    for position, (x, y) in sorted(FIELDER_ORIGINS.items()):
+        if jitter:
+            x, y = x + rng.uniform(-15, 15), y + rng.uniform(-15, 15)
+        fielders.append(Struct(
+            position=position, location=(x, y), fieldable_ball_max_height=rng.uniform(7.5, 10),
+            ball_tracking_ability=rng.uniform(0.8, 1.2), reorienting_after_fielding_miss=rng.uniform(0, 1),
+            person=Struct(body=Struct(full_speed_seconds_per_foot=rng.uniform(0.034, 0.042))),
+            time_needed_to_field_ball=None, timestep_of_planned_fielding_attempt=None, immediate_goal=None,
+            dist_per_timestep=None, relative_rate_of_speed=None, attempting_fly_out=False, playing_the_ball=False
+        ))
+    return fielders
+
+
+def make_batted_ball(fielders, exit_speed, horizontal_launch_angle, vertical_launch_angle):
+    """Return a batted ball on the stock field, bypassing the at bat that would ordinarily produce it."""
+    batted_ball = BattedBall.__new__(BattedBall)
+    batted_ball.field = Struct(geometry=FieldGeometry.stock())
+    rules = Struct(foul_ball_on_first_bounce_is_out=True, fair_ball_on_first_bounce_is_out=False)
+    batted_ball.at_bat = Struct(fielders=fielders, game=Struct(rules=rules, trace=False))
+    batted_ball.time_since_contact = 0.0
+    batted_ball.adopt_trajectory(
+        trajectories=compute_trajectory(
+            exit_speed, horizontal_launch_angle, vertical_launch_angle, 5.125, batted_ball.field.geometry
+        ),
+        i=0
+    )
+    return batted_ball
+
+
+def seeded_plays(seed, jitter=True):
+    """Yield (launch, fielders) pairs for NUMBER_OF_PLAYS seeded plays; each launch may be replayed."""
+    rng = random.Random(seed)
+    for _ in xrange(NUMBER_OF_PLAYS):
+        launch = (rng.uniform(30, 110), rng.uniform(-50, 50), rng.uniform(-15, 65))
+        fielder_seed = rng.random()
+        yield launch, lambda: make_fielders(random.Random(fielder_seed), jitter=jitter)
+
+
+def plans(fielders):
+    """Return each fielder's plan for fielding the ball."""
+    return [[getattr(fielder, attribute) for attribute in PLANNED_ATTRIBUTES] for fielder in fielders]
+
+
+def assert_same_plans(fielders, reference_fielders):
+    for plan, reference_plan in zip(plans(fielders), plans(reference_fielders)):
+        for value, reference_value in zip(plan, reference_plan):
+            if isinstance(reference_value, float):
+                assert value == pytest.approx(reference_value, rel=1e-9)
+            else:
+                assert value == reference_value
+
+
+@pytest.mark.parametrize('seed,jitter', [(0, True), (1, True), (2, False)])
+def test_read_matches_iterative_read(seed, jitter):
+    """Reading the ball all at once plans the same fielding attempts as walking each fielder through it."""
+    for launch, new_fielders in seeded_plays(seed=seed, jitter=jitter):
+        fielders, reference_fielders = new_fielders(), new_fielders()
+        make_batted_ball(fielders, *launch).get_read_by_fielders(iteratively=False)
+        reference_batted_ball = make_batted_ball(reference_fielders, *launch)
+        reference_batted_ball.get_read_by_fielders(iteratively=True)
+        assert_same_plans(fielders, reference_fielders)
+        assert [f.playing_the_ball for f in fielders] == [f.playing_the_ball for f in reference_fielders]
+
+
+@pytest.mark.parametrize('seed', [3, 4])
+def test_reread_matches_iterative_reread(seed):
+    """Rereading the ball all at once plans the same fielding reattempts as walking each fielder through it."""
+    n_compared = 0
+    for launch, new_fielders in seeded_plays(seed=seed):
+        fielders, reference_fielders = new_fielders(), new_fielders()
+        batted_ball = make_batted_ball(fielders, *launch)
+        reference_batted_ball = make_batted_ball(reference_fielders, *launch)
+        # Reread from partway through the ball's course
+        timesteps = sorted(batted_ball.position_at_timestep.keys())
+        time_since_contact = timesteps[len(timesteps)//3]
+        batted_ball.time_since_contact = reference_batted_ball.time_since_contact = time_since_contact
+        remaining_timesteps = timesteps[timesteps.index(time_since_contact)+1:]
+        max_rates_of_speed = batted_ball._reread(fielders=fielders, timesteps=remaining_timesteps)
+        if max_rates_of_speed is None:
+            continue  # Left to the iterative reread, which randomly nudges degenerate approaches
+        reference_max_rates_of_speed = reference_batted_ball._reread_iteratively(
+            fielders=reference_fielders, timesteps=remaining_timesteps
+        )
+        assert_same_plans(fielders, reference_fielders)
+        assert (
+            sorted(f.position for f in max_rates_of_speed) == sorted(f.position for f in reference_max_rates_of_speed)
+        )
+        for fielder, reference_fielder in zip(fielders, reference_fielders):
+            if fielder in max_rates_of_speed:
+                assert max_rates_of_speed[fielder] == pytest.approx(
+                    reference_max_rates_of_speed[reference_fielder], rel=1e-9
+                )
+        n_compared += 1
+    assert n_compared > NUMBER_OF_PLAYS/2
+
+
+def test_read_handles_approaches_with_no_lateral_component():
+    """A fielder straight in line with the ball's course gets a finite plan, the same on both paths."""
+    fielders = make_fielders(random.Random(5), jitter=False)
+    reference_fielders = make_fielders(random.Random(5), jitter=False)
+    launch = (95.0, 0.0, 20.0)  # Straightaway, so the ball stays on the line on which P, C, and CF stand
+    batted_ball = make_batted_ball(fielders, *launch)
+    timesteps = sorted(batted_ball.position_at_timestep.keys())
+    assert all(batted_ball.position_at_timestep[timestep][0] == 0 for timestep in timesteps)
+    batted_ball.get_read_by_fielders(iteratively=False)
+    make_batted_ball(reference_fielders, *launch).get_read_by_fielders(iteratively=True)
+    for fielder in fielders:
+        for value in (fielder.time_needed_to_field_ball, fielder.dist_per_timestep, fielder.relative_rate_of_speed):
+            assert value == value  # Not NaN
+    assert_same_plans(fielders, reference_fielders)
@@ -0,0 +1,186 @@
+import types
+import datetime
+import numpy
+from cosmos import Cosmos
+from people.person import Person
+from baseball import league as league_module
+from baseball.game import Game
+
+# The types of objects that are compared by value
+VALUE_TYPES = (int, long, float, str, unicode, bool, type(None), type, types.ClassType, types.BuiltinFunctionType)
+
+
+def play_days_of_the_season(snapshot_path, days, processes):
+    """Load the cosmos in the given snapshot and play its league's season until it has had the given number of busy days.
+
+    A busy day is one on which more than one series was played, since a day with a single series
+    is always played serially (see League._operate_during_season()). The cosmos is returned.
+    """
+    cosmos = Cosmos.load(snapshot_path)
+    cosmos.config.play_league_games_headless = True
+    cosmos.config.league_game_processes = processes
+    league = cosmos.leagues[0]
+    ordinal_date = min(
+        series.dates_scheduled[0][0] for team in league.teams for series in team.season.schedule.upcoming_series
+    )
+    busy_days = 0
+    while busy_days < days:
+        number_of_events_before = len(cosmos.events)
+        for time_of_day in ('day', 'night'):
+            date = datetime.date.fromordinal(ordinal_date)
+            cosmos.ordinal_date, cosmos.year, cosmos.month, cosmos.day = ordinal_date, date.year, date.month, date.day
+            cosmos.time_of_day = time_of_day
+            cosmos.date = cosmos.get_date()
+            league.operate()
+        series_played = {event.series for event in cosmos.events[number_of_events_before:] if isinstance(event, Game)}
+        if len(series_played) > 1:
+            busy_days += 1
+        ordinal_date += 1
+    cosmos.config.league_game_processes = 1  # So that the two cosmoses may be compared
+    return cosmos
+
+
+def differences_between(a, b, limit=10):
+    """Return a list of up to limit differences between the objects reachable from a and those reachable from b.
+
+    Sets, and dictionaries not keyed by strings, are iterated in an order that depends on memory
+    layout, so their members are paired up by a key derived from their state (see _pairing_key()).
+    """
+    differences = []
+    visited = set()
+    stack = [(a, b, None)]
+    while stack and len(differences) < limit:
+        x, y, path = stack.pop()
+        if type(x) is not type(y):
+            differences.append((_render(path), type(x), type(y)))
+            continue
+        if isinstance(x, VALUE_TYPES):
+            if x != y and not (x != x and y != y):  # NaN is the only value unequal to itself
+                differences.append((_render(path), x, y))
+            continue
+        if isinstance(x, types.FunctionType):
+            if (x.func_code.co_filename, x.func_code.co_firstlineno) != (y.func_code.co_filename, y.func_code.co_firstlineno):
+                differences.append((_render(path), x, y))
+            continue
+        if (id(x), id(y)) in visited:
+            continue
+        visited.add((id(x), id(y)))
+        if isinstance(x, numpy.ndarray):
+            if not numpy.array_equal(x, y):
+                differences.append((_render(path), 'array'))
+        elif isinstance(x, (list, tuple)):
+            if len(x) != len(y):
+                differences.append((_render(path), len(x), len(y)))
+            else:
+                stack.extend((p, q, (path, i)) for i, (p, q) in enumerate(zip(x, y)))
+        elif isinstance(x, (set, frozenset)):
+            _compare_members(sorted(x, key=_pairing_key), sorted(y, key=_pairing_key), path, stack, differences)
+        elif isinstance(x, dict):
+            if all(type(key) is str for key in x):
+                if set(x) != set(y):
+                    differences.append((_render(path), sorted(set(x) ^ set(y))))
+                    continue
+                for key in x:
+                    if key == 'box_score_lines':
+                        # The lines of a box score come in the order of a set of players
+                        stack.append((_sorted_box_score_lines(x[key]), _sorted_box_score_lines(y[key]), (path, key)))
+                    elif key == 'people_at_address':
+                        # This is keyed by memory address (see PopulationRegistry)
+                        stack.append((set(x[key].itervalues()), set(y[key].itervalues()), (path, key)))
+                    else:
+                        stack.append((x[key], y[key], (path, key)))
+            else:
+                x_keys, y_keys = sorted(x, key=_pairing_key), sorted(y, key=_pairing_key)
+                _compare_members(x_keys, y_keys, path, stack, differences)
+                stack.extend((x[p], y[q], (path, _pairing_key(p))) for p, q in zip(x_keys, y_keys))
+        elif hasattr(x, '__dict__'):
+            stack.append((x.__dict__, y.__dict__, path))
+        elif hasattr(type(x), '__slots__'):
+            for cls in type(x).__mro__:
+                for name in getattr(cls, '__slots__', ()):
+                    stack.append((getattr(x, name, None), getattr(y, name, None), (path, name)))
+    return differences
+
+
+def _compare_members(x_members, y_members, path, stack, differences):
+    """Pair up the members of two collections by their pairing keys, and queue each pair for comparison."""
+    if [_pairing_key(m) for m in x_members] != [_pairing_key(m) for m in y_members]:
+        differences.append((_render(path), 'members'))
+    else:
+        stack.extend((p, q, (path, '{}')) for p, q in zip(x_members, y_members))
+
+
+def _pairing_key(obj):
+    """Return a key for the given object that does not depend on memory layout."""
+    if isinstance(obj, VALUE_TYPES):
+        return 0, obj
+    if isinstance(obj, tuple):
+        return 1, tuple(_pairing_key(member) for member in obj)
+    attributes = getattr(obj, '__dict__', None)
+    if attributes is None:
+        return 9, type(obj).__name__
+    identity = _identity(obj)
+    if identity:
+        return 2, identity
+    return 3, type(obj).__name__, tuple(sorted(
+        (name, value if isinstance(value, VALUE_TYPES) else _identity(value))
+        for name, value in attributes.iteritems()
+        if isinstance(value, VALUE_TYPES) or _identity(value)
+    ))
+
+
+def _identity(obj):
+    """Return a key identifying the given object by an ID of its own, or of the person it embeds in, if any."""
+    attributes = getattr(obj, '__dict__', None)
+    if attributes is None:
+        return None
+    if isinstance(obj, Person):
+        return 'person', obj.id
+    if isinstance(attributes.get('person'), Person):
+        return type(obj).__name__, 'person', attributes['person'].id
+    if isinstance(attributes.get('id'), (int, long)):
+        return type(obj).__name__, attributes['id']
+    if isinstance(attributes.get('event_number'), (int, long)):
+        return type(obj).__name__, 'event', attributes['event_number']
+    return None
+
+
+def _sorted_box_score_lines(box_score_lines):
+    """Return the given box score lines, by team, in an order that doesn't depend on memory layout."""
+    return sorted((team.name, sorted(lines)) for team, lines in box_score_lines.iteritems())
+
+
+def _render(path):
+    """Return a string rendering of a path, which is a nested (parent path, step) tuple."""
+    steps = []
+    while path is not None:
+        path, step = path
+        steps.append(str(step))
+    return '.'.join(reversed(steps))
+
+
+def test_a_parallel_season_leaves_the_world_as_a_serial_one_does(league_snapshot, monkeypatch):
+    days_played_in_parallel = []
+    play_series_in_parallel = league_module.play_series_in_parallel
+    monkeypatch.setattr(
+        league_module, 'play_series_in_parallel',
+        lambda **kwargs: days_played_in_parallel.append(play_series_in_parallel(**kwargs))
+    )
+    serial_cosmos = play_days_of_the_season(snapshot_path=league_snapshot, days=2, processes=1)
+    assert not days_played_in_parallel
+    parallel_cosmos = play_days_of_the_season(snapshot_path=league_snapshot, days=2, processes=3)
+    assert days_played_in_parallel
+    # Everything that the games did in the worker processes, and only that, has been merged back
+    assert differences_between(serial_cosmos, parallel_cosmos) == []
+
+
+def test_a_change_made_by_a_game_to_anything_not_in_its_log_is_caught(league_snapshot, monkeypatch):
+    # A game that changes something that isn't carried by the logs that workers send back (see
+    # game_pool.py) makes a parallel season diverge from a serial one, which the test above catches
+    def change_the_city(game):
+        game.ballpark.city.games_hosted = getattr(game.ballpark.city, 'games_hosted', 0) + 1
+    original_transpire = Game.transpire
+    monkeypatch.setattr(Game, 'transpire', lambda game: (original_transpire(game), change_the_city(game)))
+    serial_cosmos = play_days_of_the_season(snapshot_path=league_snapshot, days=2, processes=1)
+    parallel_cosmos = play_days_of_the_season(snapshot_path=league_snapshot, days=2, processes=3)
+    assert any('games_hosted' in str(difference) for difference in differences_between(serial_cosmos, parallel_cosmos))
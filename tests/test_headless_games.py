@@ -0,0 +1,25 @@
+from cosmos import Cosmos
+from baseball.game import Game
+
+
+def play_a_game(snapshot_path, headless):
+    """Play a game between the first two teams of the league in the given snapshot, and return it."""
+    cosmos = Cosmos.load(snapshot_path)
+    home_team, away_team = sorted(cosmos.leagues[0].teams, key=lambda team: team.name)[:2]
+    with cosmos.random_streams.drawing_from('test-game', retain=False):
+        return Game(series=None, home_team=home_team, away_team=away_team, headless=headless)
+
+
+def box_score_lines_by_team(game):
+    """Return the lines of the box score of the given game, in an order that doesn't depend on memory layout."""
+    return sorted((team.name, sorted(lines)) for team, lines in game.box_score_lines.iteritems())
+
+
+def test_headless_games_play_out_as_normal_games_do(league_snapshot):
+    normal_game = play_a_game(snapshot_path=league_snapshot, headless=False)
+    headless_game = play_a_game(snapshot_path=league_snapshot, headless=True)
+    assert headless_game.score == normal_game.score
+    assert len(headless_game.innings) == len(normal_game.innings)
+    assert box_score_lines_by_team(headless_game) == box_score_lines_by_team(normal_game)
+    # A normal game attracts an audience, whose minds wander throughout the game
+    assert normal_game.audience and not headless_game.audience
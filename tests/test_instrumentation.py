@@ -0,0 +1,53 @@
+import json
+import os
+import datetime
+from cosmos import Cosmos
+
+
+def an_instrumented_cosmos(snapshot_path, report_directory):
+    cosmos = Cosmos.load(snapshot_path)
+    cosmos.debug = False
+    cosmos.instrumentation.enabled = True
+    cosmos.config.instrumentation_report_directory = report_directory
+    return cosmos
+
+
+def test_each_year_is_reported_to_a_file_of_its_own_as_it_ends(league_snapshot, tmpdir):
+    report_directory = str(tmpdir.join('instrumentation'))
+    cosmos = an_instrumented_cosmos(snapshot_path=league_snapshot, report_directory=report_directory)
+    # Play out a city day and a league game, and then ring in the new year
+    city = max(cosmos.cities, key=lambda c: len(c.residents))
+    cosmos._simulate_a_timestep_in_a_city(city)
+    league = cosmos.leagues[0]
+    cosmos.config.play_league_games_headless = True
+    series = min(
+        (series for team in league.teams for series in team.season.schedule.upcoming_series),
+        key=lambda s: s.dates_scheduled[0]
+    )
+    cosmos.ordinal_date, cosmos.time_of_day = series.dates_scheduled[0]
+    league._play_game(series=series)
+    year = cosmos.year
+    last_day_of_the_year = datetime.date(year, 12, 31)
+    cosmos.ordinal_date, cosmos.month, cosmos.day = last_day_of_the_year.toordinal(), 12, 31
+    cosmos.time_of_day = 'night'
+    cosmos._advance_time()
+    assert cosmos.year == year + 1
+    assert os.listdir(report_directory) == ['{}.json'.format(year)]
+    with open(os.path.join(report_directory, '{}.json'.format(year))) as f:
+        report = json.load(f)[str(year)]
+    # Everyone who socialized on the city day was counted
+    assert report['person: socialize']['calls'] == report['city day: socialize']['entities'] > 0
+    assert report['game: construct']['calls'] == report['league: game']['calls'] == 1
+    assert report['game: construct']['wall_time'] <= report['league: game']['wall_time']
+
+
+def test_nothing_is_reported_unless_the_simulation_is_instrumented(league_snapshot, tmpdir):
+    report_directory = str(tmpdir.join('instrumentation'))
+    cosmos = an_instrumented_cosmos(snapshot_path=league_snapshot, report_directory=report_directory)
+    cosmos.instrumentation.enabled = False
+    cosmos._simulate_a_timestep_in_a_city(max(cosmos.cities, key=lambda c: len(c.residents)))
+    cosmos.ordinal_date, cosmos.month, cosmos.day = datetime.date(cosmos.year, 12, 31).toordinal(), 12, 31
+    cosmos.time_of_day = 'night'
+    cosmos._advance_time()
+    assert not cosmos.instrumentation.years
+    assert not os.path.exists(report_directory)
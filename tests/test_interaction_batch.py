@@ -0,0 +1,64 @@
+import pytest
+from cosmos import Cosmos
+from people.relationship import InteractionBatch
+
+MISSING_DAYS_TO_ACCOUNT_FOR = 6
+
+
+def pairs_who_know_each_other(cosmos, limit=300):
+    """Return a list of (owner ID, subject ID) pairs of living people who know one another, in a fixed order."""
+    pairs = []
+    for _, person in sorted(cosmos.registry.people.iteritems()):
+        if not person.alive:
+            continue
+        for subject in sorted(person.relationships, key=lambda subject: subject.id):
+            if subject.alive and subject.id > person.id and person in subject.relationships:
+                pairs.append((person.id, subject.id))
+    return pairs[:limit]
+
+
+def relationships_in(cosmos, pairs):
+    """Return the relationships (in both directions) between the people in the given pairs."""
+    people = cosmos.registry.people
+    relationships = []
+    for owner_id, subject_id in pairs:
+        owner, subject = people[owner_id], people[subject_id]
+        relationships += [owner.relationships[subject], subject.relationships[owner]]
+    for relationship in relationships:
+        relationship.interacted_this_timestep = False
+    return relationships
+
+
+def charges_and_sparks(cosmos, pairs):
+    """Return a list of the charge and spark of each relationship between the people in the given pairs."""
+    people = cosmos.registry.people
+    state = []
+    for owner_id, subject_id in pairs:
+        owner, subject = people[owner_id], people[subject_id]
+        for relationship in (owner.relationships[subject], subject.relationships[owner]):
+            state.append((relationship.charge, relationship.spark))
+    return state
+
+
+def test_a_batch_of_interactions_progresses_relationships_as_interacting_pair_by_pair_does(league_snapshot):
+    one_by_one_cosmos, batched_cosmos = Cosmos.load(league_snapshot), Cosmos.load(league_snapshot)
+    pairs = pairs_who_know_each_other(cosmos=one_by_one_cosmos)
+    assert len(pairs) > 20 and pairs == pairs_who_know_each_other(cosmos=batched_cosmos)
+    before = charges_and_sparks(cosmos=one_by_one_cosmos, pairs=pairs)
+    # One pair at a time, as Person.socialize() used to do
+    relationships = relationships_in(cosmos=one_by_one_cosmos, pairs=pairs)
+    for relationship in relationships[::2]:
+        relationship.owner.relationships[relationship.subject].progress_relationship(
+            missing_days_to_account_for=MISSING_DAYS_TO_ACCOUNT_FOR
+        )
+    # All at once
+    interactions = InteractionBatch(missing_days_to_account_for=MISSING_DAYS_TO_ACCOUNT_FOR)
+    for relationship in relationships_in(cosmos=batched_cosmos, pairs=pairs)[::2]:
+        interactions.add(relationship=relationship)
+    interactions.progress()
+    one_by_one = charges_and_sparks(cosmos=one_by_one_cosmos, pairs=pairs)
+    batched = charges_and_sparks(cosmos=batched_cosmos, pairs=pairs)
+    assert one_by_one != before
+    for (charge, spark), (batched_charge, batched_spark) in zip(one_by_one, batched):
+        assert batched_charge == pytest.approx(charge, rel=1e-12, abs=1e-12)
+        assert batched_spark == pytest.approx(spark, rel=1e-12, abs=1e-12)
@@ -0,0 +1,91 @@
+import math
+import random
+import collections
+import numpy
+import pytest
+from cosmos import Cosmos
+from places.city_planning import LotDistances
+
+
+class Stand(object):
+    """A bare object to hang the attributes of a lot or parcel upon."""
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+def distance_between(lot, other_lot):
+    """Return the distance between two lots as City.distance_between() used to, between their nearest parcels."""
+    return min(
+        math.sqrt((x-other_x)**2 + (y-other_y)**2)
+        for (x, y) in (parcel.coordinates for parcel in lot.parcels)
+        for (other_x, other_y) in (other_parcel.coordinates for other_parcel in other_lot.parcels)
+    )
+
+
+@pytest.fixture(scope='module')
+def cosmos(league_snapshot):
+    return Cosmos.load(league_snapshot)
+
+
+def test_lot_distances_are_those_between_the_nearest_parcels_of_each_pair_of_lots(cosmos):
+    for city in sorted(cosmos.cities, key=lambda c: c.name)[:4]:
+        lot_distances = city.lot_distances
+        lots = sorted(city.lots | city.tracts, key=lambda lot: lot.id)
+        assert lot_distances.lots == lots
+        expected = numpy.array([[distance_between(lot, other_lot) for other_lot in lots] for lot in lots])
+        assert numpy.allclose(lot_distances.matrix, expected)
+        rng = random.Random(city.name)
+        for lot in rng.sample(lots, min(10, len(lots))):
+            other_lots = rng.sample(lots, min(5, len(lots)))
+            assert lot_distances.between(lot, other_lots[0]) == pytest.approx(distance_between(lot, other_lots[0]))
+            assert numpy.allclose(
+                lot_distances.from_lot(lot, other_lots), [distance_between(lot, other_lot) for other_lot in other_lots]
+            )
+        some_lots, other_lots = lots[::3], lots[1::4]
+        assert numpy.allclose(
+            lot_distances.among(some_lots, other_lots),
+            [[distance_between(lot, other_lot) for other_lot in other_lots] for lot in some_lots]
+        )
+
+
+def test_lot_distances_along_streets_are_those_that_a_breadth_first_search_finds():
+    # A 6x6 grid of street points, with every other street on the x-axis missing a segment,
+    # and a point that is off the grid altogether
+    street_connections = collections.defaultdict(set)
+    for x in xrange(6):
+        for y in xrange(6):
+            for neighbor in ((x+1, y), (x, y+1)):
+                if max(neighbor) < 6 and not (y % 2 and neighbor == (x+1, y) and x == 2):
+                    street_connections[(x, y)].add(neighbor)
+                    street_connections[neighbor].add((x, y))
+    rng = random.Random(4)
+    points = sorted(street_connections) + [(9, 9)]
+    parcels = [Stand(id=i, coordinates=point) for i, point in enumerate(points)]
+    lots = [Stand(id=i, parcels=rng.sample(parcels, rng.choice((1, 1, 2)))) for i in xrange(20)]
+
+    def distance_along_streets(point, other_point):
+        if point not in street_connections or other_point not in street_connections:
+            return None
+        distances = {point: 0}
+        queue = collections.deque([point])
+        while queue:
+            current = queue.popleft()
+            for neighbor in street_connections[current]:
+                if neighbor not in distances:
+                    distances[neighbor] = distances[current] + 1
+                    queue.append(neighbor)
+        return distances.get(other_point)
+
+    def expected_distance(lot, other_lot):
+        # Parcels off the street network are as far apart as the crow flies
+        return min(
+            distance_along_streets(parcel.coordinates, other_parcel.coordinates) if
+            distance_along_streets(parcel.coordinates, other_parcel.coordinates) is not None else
+            math.sqrt(sum((a-b)**2 for a, b in zip(parcel.coordinates, other_parcel.coordinates)))
+            for parcel in lot.parcels for other_parcel in other_lot.parcels
+        )
+    lot_distances = LotDistances(lots=lots, street_connections=dict(street_connections))
+    for lot in lots:
+        for other_lot in lots:
+            assert lot_distances.between(lot, other_lot) == pytest.approx(expected_distance(lot, other_lot))
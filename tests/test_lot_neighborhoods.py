@@ -0,0 +1,44 @@
+import random
+from cosmos import Cosmos
+
+
+def within_two_hops(lot):
+    """Return the set of lots within two hops of the given lot, walking its neighbors and theirs."""
+    lots = set()
+    for neighbor in {lot} | lot.neighboring_lots:
+        lots.add(neighbor)
+        lots |= neighbor.neighboring_lots
+    return lots
+
+
+def assert_aggregates_are_those_that_a_walk_finds(city):
+    for lot in city.lots | city.tracts:
+        assert city.secondary_population(lot) == sum(
+            neighbor.population for neighbor in {lot} | lot.neighboring_lots
+        )
+        assert city.tertiary_population(lot) == sum(nearby_lot.population for nearby_lot in within_two_hops(lot))
+        assert city.lot_neighborhoods.tertiary_density_of(lot) == len(within_two_hops(lot))
+    highest_density = max(len(within_two_hops(lot)) for lot in city.lots)
+    assert len(within_two_hops(city.lot_neighborhoods.densest(city.lots))) == highest_density
+
+
+def test_neighborhood_aggregates_are_those_that_a_two_hop_walk_finds(league_snapshot):
+    cosmos = Cosmos.load(league_snapshot)
+    cities = sorted(cosmos.cities, key=lambda city: -len(city.residents))[:3]
+    # The aggregates were kept up to date over decades of people coming and going
+    for city in cities:
+        assert_aggregates_are_those_that_a_walk_finds(city=city)
+    # ...and they are kept up to date from here on out as well, as people die and leave their homes
+    cosmos.debug = False
+    populations_before = {lot: lot.population for city in cities for lot in city.lots}
+    for city in cities:
+        rng = random.Random(city.name)
+        adults_without_kids_at_home = sorted(
+            (person for person in city.residents if person.home and not person.kids_at_home and person.age > 30),
+            key=lambda person: person.id
+        )
+        for person in rng.sample(adults_without_kids_at_home, 3):
+            person.die(cause_of_death='Natural causes')
+    assert any(lot.population != population for lot, population in populations_before.iteritems())
+    for city in cities:
+        assert_aggregates_are_those_that_a_walk_finds(city=city)
@@ -0,0 +1,71 @@
+from cosmos import Cosmos
+from people.archive import ATTRIBUTES_RETAINED_BY_ARCHIVED_PEOPLE
+from test_game_pool import differences_between
+
+
+def people_who_may_be_archived(cosmos):
+    """Return the deceased and departed people, in a fixed order.
+
+    In a young cosmos, everyone who has departed a city has only moved to another one, and so
+    wouldn't be due for archiving yet (see PersonArchive.archive_anyone_due()), but they may be
+    archived all the same.
+    """
+    registry = cosmos.registry
+    return [
+        person for _, person in sorted(registry.people.iteritems())
+        if person in registry.deceased or person in registry.departed
+    ]
+
+
+def records_of(people):
+    """Return a copy of the record of each of the given people, leaving out whether they are archived."""
+    return [{k: v for k, v in person.__dict__.iteritems() if k != 'archived'} for person in people]
+
+
+def test_archived_people_are_rehydrated_just_as_they_were(league_snapshot):
+    cosmos = Cosmos.load(league_snapshot)
+    people = people_who_may_be_archived(cosmos=cosmos)
+    assert len(people) >= 5
+    records_before = records_of(people)
+    for person in people:
+        cosmos.archive.archive(person=person)
+    assert len(cosmos.archive) == len(people)
+    for person in people:
+        assert person.archived
+        assert set(person.__dict__) == set(ATTRIBUTES_RETAINED_BY_ARCHIVED_PEOPLE) | {'archived'}
+    # Accessing any attribute that wasn't retained rehydrates a person in place
+    for person, record in zip(people, records_before):
+        assert person.first_name is record['first_name']
+        assert not person.archived
+        # The objects they shared with the rest of the world are the very same ones
+        for attribute in ('home', 'birth', 'mother', 'father', 'city'):
+            assert person.__dict__[attribute] is record[attribute]
+    assert differences_between(records_before, records_of(people)) == []
+    assert len(cosmos.archive) == 0
+
+
+def test_archived_people_are_rehydrated_just_as_they_were_after_a_save_and_load(league_snapshot, tmpdir):
+    cosmos = Cosmos.load(league_snapshot)
+    people = people_who_may_be_archived(cosmos=cosmos)
+    for person in people:
+        cosmos.archive.archive(person=person)
+    path = str(tmpdir.join('archived.snapshot'))
+    cosmos.save(path)
+    loaded_cosmos = Cosmos.load(path)
+    loaded_people = people_who_may_be_archived(cosmos=loaded_cosmos)
+    assert [person.id for person in loaded_people] == [person.id for person in people]
+    assert all(person.archived for person in loaded_people)
+    assert len(loaded_cosmos.archive) == len(people)
+    for person in people + loaded_people:
+        person.first_name
+    assert differences_between(records_of(people), records_of(loaded_people)) == []
+
+
+def test_departed_people_are_aged_for_the_birthdays_they_missed_while_archived(league_snapshot):
+    cosmos = Cosmos.load(league_snapshot)
+    person = next(person for person in people_who_may_be_archived(cosmos=cosmos) if person.alive)
+    age_before = person.age
+    cosmos.archive.archive(person=person)
+    # Two years pass, and so two birthdays, whatever the date of the person's birthday
+    cosmos.ordinal_date += 365*2 + 1
+    assert person.age == age_before + 2
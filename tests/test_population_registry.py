@@ -0,0 +1,73 @@
+import pytest
+from cosmos import Cosmos
+
+AGE_RANGES = ((0, 4), (5, 5), (17, 40), (3, 77), (61, 200))
+
+
+@pytest.fixture(scope='module')
+def cosmos(league_snapshot):
+    """Return a cosmos whose registry was kept up to date over decades of births, moves, and deaths."""
+    return Cosmos.load(league_snapshot)
+
+
+def people_who_have_ever_lived(cosmos):
+    return [person for _, person in sorted(cosmos.registry.people.iteritems())]
+
+
+def living_people(cosmos):
+    return [person for person in people_who_have_ever_lived(cosmos) if person.alive]
+
+
+def test_the_living_the_deceased_and_the_departed_are_those_that_a_scan_finds(cosmos):
+    registry = cosmos.registry
+    assert set(registry.living) == set(living_people(cosmos))
+    assert set(registry.deceased) == {person for person in people_who_have_ever_lived(cosmos) if not person.alive}
+    # People only ever depart a city by moving to another one, and so remain among the living
+    assert {person for person in registry.departed if person.alive} == {
+        person for person in living_people(cosmos) if person.departures
+    }
+    assert set(cosmos.residents) <= set(registry.living)
+
+
+def test_job_seekers_are_those_that_a_scan_finds(cosmos):
+    assert set(cosmos.registry.job_seekers) == {
+        person for person in living_people(cosmos) if
+        person.ready_to_work and not person.occupation and not person.retired
+    }
+    for city in cosmos.cities:
+        assert city.unemployed == {resident for resident in city.residents if resident.searching_for_work}
+
+
+def test_age_bands_hold_those_that_a_scan_finds(cosmos):
+    for min_age, max_age in AGE_RANGES:
+        people_aged = cosmos.registry.people_aged(min_age=min_age, max_age=max_age)
+        assert len(people_aged) == len(set(people_aged))
+        assert set(people_aged) == {person for person in living_people(cosmos) if min_age <= person.age <= max_age}
+
+
+def test_free_agents_are_those_that_a_scan_finds(cosmos):
+    def free_agents_among(residents):
+        return {
+            resident.player for resident in residents if resident.player and
+            not resident.player.career.retired and
+            not resident.player.career.team
+        }
+    assert set(cosmos.registry.free_agents) == free_agents_among(living_people(cosmos))
+    assert cosmos.registry.free_agents, "The league's founding should have left some players unsigned"
+    for city in cosmos.cities:
+        assert city.free_agents == free_agents_among(city.residents)
+    for state in {city.state for city in cosmos.cities}:
+        assert state.free_agents == free_agents_among(
+            resident for city in state.cities for resident in city.residents
+        )
+    for country in {city.country for city in cosmos.cities}:
+        assert country.free_agents == free_agents_among(
+            resident for city in country.cities for resident in city.residents
+        )
+
+
+def test_people_are_found_by_their_memory_addresses(cosmos):
+    for person in people_who_have_ever_lived(cosmos)[::25]:
+        assert cosmos.find_by_hex(hex(id(person))) is person
+    with pytest.raises(Exception):
+        cosmos.find_by_hex(hex(id(cosmos)))
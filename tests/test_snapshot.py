@@ -0,0 +1,86 @@
+import cStringIO
+from utils.utilities import rebuild_with_id
+from people.person import Person
+from snapshot import write_snapshot, read_snapshot, read_checkpoint, read_chunks, read_header, snapshot_chunks
+from cosmos import Checkpointer
+
+
+class StandInCosmos(object):
+    """A bare stand-in for a cosmos, holding a handful of people who share some state."""
+
+    def __init__(self, people):
+        """Initialize a StandInCosmos object."""
+        self.cities = []
+        self.people = people
+        self.restored = False
+        self.debug = False
+        self.year = 1630
+        self.ordinal_date = 595000
+        self.time_of_day = 'day'
+
+    def __getstate__(self):
+        """Return the state of this cosmos to be pickled."""
+        return dict(self.__dict__)
+
+    def __setstate__(self, state):
+        """Restore the state of this cosmos, noting that it was restored."""
+        self.__dict__.update(state)
+        self.restored = True
+
+
+def make_cosmos():
+    """Return a stand-in cosmos whose people refer to one another and share non-entity objects."""
+    people = [rebuild_with_id(Person, person_id) for person_id in (7, 3, 11)]
+    shared_record = {'event': 'wedding', 'year': 1630}
+    for i, person in enumerate(people):
+        person.friends = {people[(i+1) % len(people)]}
+        person.record = shared_record
+        person.history = [shared_record, ['nested', i]]
+    return StandInCosmos(people=people)
+
+
+def test_round_trip_preserves_entities_and_sharing():
+    cosmos = make_cosmos()
+    snapshot_file = cStringIO.StringIO()
+    write_snapshot(cosmos=cosmos, snapshot_file=snapshot_file)
+    snapshot_file.seek(0)
+    loaded = read_snapshot(snapshot_file=snapshot_file, path='<memory>')
+    assert loaded.restored
+    assert [person.id for person in loaded.people] == [7, 3, 11]
+    for i, person in enumerate(loaded.people):
+        # Entity references resolve to the loaded entities themselves, and sets of them still hash by ID
+        assert person.friends == {loaded.people[(i+1) % 3]}
+        assert next(iter(person.friends)) is loaded.people[(i+1) % 3]
+        # An object written into one chunk is shared by every chunk that refers to it
+        assert person.record is loaded.people[0].record
+        assert person.history[0] is person.record
+        assert person.history[1] == ['nested', i]
+    assert loaded.people[0].record == {'event': 'wedding', 'year': 1630}
+
+
+def test_chunks_are_keyed_by_entity_and_stable():
+    chunks = snapshot_chunks(cosmos=make_cosmos())
+    assert [key for key, _ in chunks] == [('cosmos', 0), ('person', 3), ('person', 7), ('person', 11)]
+    # Identical entities yield identical chunks, which is what allows checkpoints to be written as deltas
+    assert chunks == snapshot_chunks(cosmos=make_cosmos())
+
+
+def test_delta_checkpoints_hold_only_what_changed(tmpdir):
+    cosmos = make_cosmos()
+    checkpointer = Checkpointer(directory=str(tmpdir), checkpoints_between_bases=1)
+    checkpointer.checkpoint(cosmos=cosmos)
+    cosmos.people[1].nickname = 'Lefty'
+    cosmos.ordinal_date += 1
+    checkpointer.checkpoint(cosmos=cosmos)
+    cosmos.ordinal_date += 1
+    checkpointer.checkpoint(cosmos=cosmos)
+    assert [base for _, _, _, base in checkpointer.log] == [True, False, True]
+    # Only the cosmos (whose date has changed) and the person who was given a nickname are written anew
+    with open(checkpointer.log[1][0], 'rb') as checkpoint_file:
+        read_header(snapshot_file=checkpoint_file, path=checkpointer.log[1][0])
+        assert [key for key, _ in read_chunks(snapshot_file=checkpoint_file)] == [('manifest', 0), ('cosmos', 0), ('person', 3)]
+    loaded = read_checkpoint(path=checkpointer.log[1][0])
+    assert [person.id for person in loaded.people] == [7, 3, 11]
+    assert loaded.people[1].nickname == 'Lefty'
+    assert loaded.people[0].record is loaded.people[2].record
+    assert Checkpointer.latest_checkpoint(directory=str(tmpdir)) == checkpointer.log[2][0]
@@ -0,0 +1,88 @@
+import random
+import collections
+import numpy
+import pytest
+from cosmos import Cosmos
+from people.social_interaction import SocialInteractionEngine
+
+TRIALS = 3000
+
+
+class Gathering(object):
+    """A stand-in for a location, at which a given group of people are gathered."""
+
+    def __init__(self, people):
+        self.people_here_now = set(people)
+        for person in people:
+            person.location = self
+
+
+@pytest.fixture(scope='module')
+def cosmos(league_snapshot):
+    return Cosmos.load(league_snapshot)
+
+
+def a_gathering(cosmos, size):
+    """Return a gathering of living people, among whom are friends and people under five."""
+    living_people = [person for _, person in sorted(cosmos.registry.people.iteritems()) if person.alive]
+    someone_with_friends = next(person for person in living_people if person.friends)
+    people = [someone_with_friends] + sorted(someone_with_friends.friends, key=lambda friend: friend.id)[:4]
+    people += [person for person in living_people if person.age < 5][:2]
+    people += [person for person in living_people if person not in people][:size-len(people)]
+    return Gathering(people=people)
+
+
+def test_the_engine_instigates_interactions_at_the_rates_that_deciding_pair_by_pair_does(cosmos):
+    gathering = a_gathering(cosmos=cosmos, size=15)
+    people = sorted(gathering.people_here_now, key=lambda person: person.id)
+    random.seed(17)
+    pair_by_pair = collections.Counter()
+    for _ in xrange(TRIALS):
+        for person in people:
+            for other_person in people:
+                if person._decide_to_instigate_social_interaction(other_person=other_person):
+                    pair_by_pair[person.id, other_person.id] += 1
+    random.seed(17)
+    vectorized = collections.Counter()
+    for _ in xrange(TRIALS):
+        engine = SocialInteractionEngine(config=cosmos.config)
+        for person in people:
+            for other_person in engine.choose_interaction_partners(person=person):
+                vectorized[person.id, other_person.id] += 1
+    assert any(pair_by_pair[person.id, friend.id] for person in people for friend in person.friends)
+    for person in people:
+        for other_person in people:
+            rate = pair_by_pair[person.id, other_person.id] / float(TRIALS)
+            vectorized_rate = vectorized[person.id, other_person.id] / float(TRIALS)
+            if person is other_person or other_person.age < 5:
+                assert rate == vectorized_rate == 0.0
+            else:
+                assert vectorized_rate == pytest.approx(rate, abs=0.06)
+
+
+def test_crowds_are_not_sampled_unless_the_config_says_so(cosmos):
+    gathering = a_gathering(cosmos=cosmos, size=40)
+    person = min(gathering.people_here_now, key=lambda p: p.id)
+    original_crowd_size = cosmos.config.max_people_someone_considers_socializing_with_in_a_crowd
+    try:
+        partners_and_draws = []
+        for crowd_size in (None, len(gathering.people_here_now), 2):
+            cosmos.config.max_people_someone_considers_socializing_with_in_a_crowd = crowd_size
+            random.seed(5)
+            engine = SocialInteractionEngine(config=cosmos.config)
+            partners = engine.choose_interaction_partners(person=person)
+            random_state = engine.locations[gathering].random_state
+            partners_and_draws.append((partners, random_state.get_state()[1:3]))
+    finally:
+        cosmos.config.max_people_someone_considers_socializing_with_in_a_crowd = original_crowd_size
+    (unsampled, draws), (all_considered, draws_when_all_considered), (sampled, _) = partners_and_draws
+    # With no crowd size configured, the roll against each person here is the only draw made
+    random.seed(5)
+    fresh_random_state = numpy.random.RandomState(random.getrandbits(32))
+    fresh_random_state.random_sample(len(gathering.people_here_now))
+    for state in (draws, draws_when_all_considered):
+        key, position = state
+        fresh_key, fresh_position = fresh_random_state.get_state()[1:3]
+        assert numpy.array_equal(key, fresh_key) and position == fresh_position
+    assert unsampled == all_considered and unsampled
+    assert len(sampled) <= 2
@@ -0,0 +1,43 @@
+import random
+from utils.config import Config
+from baseball.field import FieldGeometry
+from baseball.batted_ball import TrajectoryCache
+
+NUMBER_OF_LAUNCHES = 500
+
+
+def seeded_launches(seed, n):
+    """Return n (exit_speed, horizontal_launch_angle, vertical_launch_angle, ball_weight) tuples."""
+    rng = random.Random(seed)
+    return [
+        (rng.uniform(40, 115), rng.uniform(-50, 50), rng.uniform(-20, 70), rng.uniform(5.0, 5.25))
+        for _ in xrange(n)
+    ]
+
+
+def test_interpolation_error_is_within_configured_bound():
+    """The cache's greatest in-flight error stays within config.trajectory_cache_max_flight_error."""
+    config = Config()
+    cache = TrajectoryCache(
+        max_entries=config.trajectory_cache_max_entries,
+        exit_speed_quantum=config.trajectory_cache_exit_speed_quantum,
+        launch_angle_quantum=config.trajectory_cache_launch_angle_quantum,
+        ball_weight_quantum=config.trajectory_cache_ball_weight_quantum
+    )
+    for seed in (0, 1, 2):
+        error = cache.measure_error(launches=seeded_launches(seed, NUMBER_OF_LAUNCHES), geometry=FieldGeometry.stock())
+        assert error <= config.trajectory_cache_max_flight_error, (
+            "Seed {}: in-flight error of {} ft".format(seed, error)
+        )
+
+
+def test_cache_hits_return_the_same_trajectory():
+    """A second lookup of the same launch is served from the cache."""
+    cache = TrajectoryCache(
+        max_entries=10, exit_speed_quantum=0.5, launch_angle_quantum=0.5, ball_weight_quantum=0.25
+    )
+    geometry = FieldGeometry.stock()
+    first = cache.trajectory(90.0, 10.0, 25.0, 5.125, geometry)
+    second = cache.trajectory(90.1, 10.1, 24.9, 5.125, geometry)
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
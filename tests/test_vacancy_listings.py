@@ -0,0 +1,74 @@
+import heapq
+import random
+from cosmos import Cosmos
+from utils.utilities import RankedSet
+
+
+def test_the_best_of_a_ranked_set_are_what_heapq_nlargest_finds():
+    rng = random.Random(25)
+    ranked_set = RankedSet()
+    scores = {}  # The members and their scores, as a plain dictionary would hold them
+    for i in xrange(3000):
+        if scores and rng.random() < 0.45:
+            member = rng.choice(sorted(scores))
+            ranked_set.remove(member)
+            del scores[member]
+        else:
+            # Scores are drawn from a small range, so that there are plenty of ties
+            member = 'member {}'.format(i)
+            scores[member] = rng.randint(-20, 20)
+            ranked_set.add(member, score=scores[member])
+            # Adding a member again does nothing, even with a different score
+            ranked_set.add(member, score=100)
+        if i % 10 == 0:
+            for n in (1, 3, 25, len(scores)+5):
+                best = ranked_set.best(n)
+                assert [scores[member] for member in best] == heapq.nlargest(n, scores.values())
+                # Ties may be broken either way, but the best members include every member
+                # that is strictly better than the last of them
+                if best:
+                    assert set(best) >= {member for member in scores if scores[member] > scores[best[-1]]}
+        assert len(ranked_set) == len(scores) and set(ranked_set) == set(scores)
+        # Entries for removed members are left in the heap, but not for long
+        assert len(ranked_set.heap) <= 2 * len(scores) + 17
+    for member in sorted(scores):
+        ranked_set.remove(member)
+    assert ranked_set.best(5) == [] and len(ranked_set.heap) <= 17
+
+
+def assert_listings_are_what_a_scan_finds(city):
+    vacant_lots = {lot for lot in city.lots if not lot.building}
+    vacant_tracts = {tract for tract in city.tracts if not tract.landmark}
+    vacant_homes = {home for home in city.dwelling_places if not home.residents}
+    lots_with_homes = {lot for lot in city.lots if lot.building and lot.building.type == 'residence'}
+    assert set(city.vacant_lots) == vacant_lots and len(city.vacant_lots) == len(vacant_lots)
+    assert set(city.vacant_tracts) == vacant_tracts and len(city.vacant_tracts) == len(vacant_tracts)
+    assert set(city.vacant_homes) == vacant_homes and len(city.vacant_homes) == len(vacant_homes)
+    assert set(city.lots_with_homes) == lots_with_homes
+    # Vacant lots and tracts are ranked by their proximity to downtown
+    for listing, vacancies in ((city.vacant_lots, vacant_lots), (city.vacant_tracts, vacant_tracts)):
+        assert [-city.dist_from_downtown(lot) for lot in listing.best(3)] == heapq.nlargest(
+            3, (-city.dist_from_downtown(lot) for lot in vacancies)
+        )
+
+
+def test_vacancy_listings_are_what_a_scan_of_the_city_finds(league_snapshot):
+    cosmos = Cosmos.load(league_snapshot)
+    cities = sorted(cosmos.cities, key=lambda city: -len(city.residents))[:3]
+    # The listings were kept up to date over decades of construction, demolition, and moving
+    for city in cities:
+        assert_listings_are_what_a_scan_finds(city=city)
+    # ...and they are kept up to date as people die and leave their homes vacant
+    cosmos.debug = False
+    for city in cities:
+        rng = random.Random(city.name)
+        people_living_alone = sorted(
+            (person for person in city.residents if person.home and person.home.residents == {person}),
+            key=lambda person: person.id
+        )
+        homes_before = set(city.vacant_homes)
+        for person in rng.sample(people_living_alone, min(3, len(people_living_alone))):
+            person.die(cause_of_death='Natural causes')
+        if people_living_alone:
+            assert set(city.vacant_homes) != homes_before
+        assert_listings_are_what_a_scan_finds(city=city)
@@ -0,0 +1,112 @@
+import random
+import datetime
+from people.whereabouts import Whereabouts, WhereaboutsLog
+
+START = datetime.date(1700, 12, 20).toordinal()
+DAYS = 30
+OCCASIONS = ('home', 'work', 'school', 'errand', 'leisure')
+
+
+class Stand(object):
+    """A bare object to hang the attributes that whereabouts consult upon."""
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+def a_world(seed):
+    """Return (cosmos, people, locations) for a small world of two cities whose whereabouts have been recorded.
+
+    Alongside, return a reference record of everyone's whereabouts, as the old dictionaries kept
+    them: a dictionary mapping each person to a dictionary mapping timesteps, as (ordinal_date,
+    day_or_night_bit) tuples, to (location, occasion) tuples.
+    """
+    rng = random.Random(seed)
+    cosmos = Stand(ordinal_date=None, time_of_day=None, people={})
+    cosmos.get_date = lambda ordinal_date, time_of_day: '{} of {}'.format(time_of_day, ordinal_date)
+    cosmos.find_by_id = cosmos.people.__getitem__
+    cities = [Stand(cosmos=cosmos) for _ in xrange(2)]
+    for city in cities:
+        city.whereabouts_log = WhereaboutsLog(city=city)
+    locations = [Stand(name='Location {}'.format(i), city=cities[i % 2]) for i in xrange(8)]
+    people = []
+    for person_id in xrange(10):
+        person = Stand(id=person_id, cosmos=cosmos, location=None)
+        person.whereabouts = Whereabouts(person=person)
+        cosmos.people[person_id] = person
+        people.append(person)
+    reference = {person: {} for person in people}
+    for ordinal_date in xrange(START, START+DAYS):
+        for day_or_night_bit, time_of_day in enumerate(('day', 'night')):
+            cosmos.ordinal_date, cosmos.time_of_day = ordinal_date, time_of_day
+            for person in people:
+                # Some people stay out of the record on some timesteps, and some go somewhere
+                # else later in the timestep, which overwrites where they went first
+                for _ in xrange(rng.choice((0, 1, 1, 1, 2))):
+                    person.location = rng.choice(locations)
+                    occasion = rng.choice(OCCASIONS)
+                    person.whereabouts.record(occasion=occasion)
+                    reference[person][(ordinal_date, day_or_night_bit)] = (person.location, occasion)
+    return cosmos, people, locations, reference
+
+
+def test_whereabouts_are_recorded_as_the_old_dictionaries_recorded_them():
+    for seed in xrange(3):
+        _, people, _, reference = a_world(seed=seed)
+        for person in people:
+            recorded = reference[person]
+            view = person.whereabouts.date
+            assert len(person.whereabouts) == len(view) == len(recorded)
+            assert view.keys() == sorted(recorded)
+            for timestep_key, (location, occasion) in recorded.iteritems():
+                assert timestep_key in view
+                whereabout = view[timestep_key]
+                assert (whereabout.location, whereabout.occasion) == (location, occasion)
+                assert (whereabout.ordinal_date, whereabout.time_of_day) == (
+                    timestep_key[0], ('day', 'night')[timestep_key[1]]
+                )
+            assert (START-1, 0) not in view and view.get((START+DAYS, 1), 'absent') == 'absent'
+            # Ranges of dates, which are half-open
+            for start, end in ((START+3, START+9), (None, START+5), (START+20, None), (START+4, START+4)):
+                expected = [
+                    recorded[timestep_key] for timestep_key in sorted(recorded) if
+                    (start is None or timestep_key[0] >= start) and (end is None or timestep_key[0] < end)
+                ]
+                assert [(w.location, w.occasion) for w in person.whereabouts.between(start, end)] == expected
+            assert [(w.location, w.occasion) for w in person.whereabouts.in_year(1701)] == [
+                recorded[timestep_key] for timestep_key in sorted(recorded)
+                if datetime.date.fromordinal(timestep_key[0]).year == 1701
+            ]
+
+
+def test_occupancy_is_what_a_scan_of_everyones_whereabouts_finds():
+    for seed in xrange(3):
+        _, people, locations, reference = a_world(seed=seed)
+        for location in locations:
+            log = location.city.whereabouts_log
+            for start, end in ((START, START+DAYS), (START+3, START+9), (START+4, START+5), (START+7, START+7)):
+                expected = {}
+                for person in people:
+                    for timestep_key, (location_then, _) in reference[person].iteritems():
+                        if location_then is location and start <= timestep_key[0] < end:
+                            expected.setdefault(timestep_key, []).append(person.id)
+                occupancy = log.occupancy(location=location, start=start, end=end)
+                assert {key: sorted(ids) for key, ids in occupancy.iteritems()} == expected
+                for timestep_key, ids in expected.iteritems():
+                    assert sorted(p.id for p in log.people_here_when(location, timestep_key)) == ids
+        # A location that is unknown to a log was never occupied, as far as the log knows
+        assert locations[0].city.whereabouts_log.occupancy(location=locations[1], start=START, end=START+DAYS) == {}
+
+
+def test_the_people_someone_was_with_are_those_that_a_scan_finds():
+    _, people, _, reference = a_world(seed=3)
+    for person in people:
+        people_with_them = person.whereabouts.people_with_them(start=START+2, end=START+12)
+        expected = {}
+        for timestep_key, (location, _) in reference[person].iteritems():
+            if START+2 <= timestep_key[0] < START+12:
+                expected[timestep_key] = sorted(
+                    other_person.id for other_person in people if other_person is not person and
+                    reference[other_person].get(timestep_key, (None,))[0] is location
+                )
+        assert {key: sorted(p.id for p in others) for key, others in people_with_them.iteritems()} == expected
@@ -1,3 +1,4 @@
+import os
 from events.major_event import *
 from people.occupation import *
 from people.business import *
@@ -23,6 +24,21 @@ class Config(object):
         self.date_worldgen_begins = (1599, 8, 19)  # Date world gen begins
         self.year_worldgen_begins = self.date_worldgen_begins[0]
         self.date_of_epilogue = (2009, 8, 19)  # Date of epilogue 40 years after gameplay
+        # The chances, on any given timestep (each day and each night), that a city has its population
+        # manipulated, and that a day of its life is simulated (births, deaths, retirements, routines,
+        # sex, and socializing); rather than rolling for every city on every timestep, the number of
+        # timesteps until each next happens is sampled and put on the cosmos's calendar, and the
+        # tick only touches cities with work due (see Cosmos._advance_n_timesteps()). The rest of
+        # the tick is not driven by the calendar, and still happens on every timestep: advancing
+        # the date and drawing the weather; aging anyone whose birthday it is; establishing any
+        # cities due to be founded that day (a lookup by date); having every league and team
+        # operate (teams check their schedules for a game, and, in the off-season, sign players to
+        # fill their rosters and reassemble them); archiving anyone due; and checkpointing. A
+        # pregnancy is resolved on the first simulated day of the mother's city on or after her
+        # due date, rather than being scheduled for the due date itself, and no stretch of
+        # timesteps is fast-forwarded, since the weather draw and birthdays make work on each one.
+        self.chance_of_a_city_population_manipulation_on_a_timestep = 0.03
+        self.chance_of_a_day_being_simulated_in_a_city = 0.005
         # City generation (in a topological sense)
         self.quadtree_loci = 3
         self.quadtree_samples = 32
@@ -34,6 +50,26 @@ class Config(object):
         self.chance_city_gets_named_for_founder = 0.3
         self.chance_avenue_gets_numbered_name = 0.0
         self.chance_street_gets_numbered_name = 0.8
+        # Whether the distance between two lots is measured along the city's streets, rather than as
+        # the crow flies between their nearest parcels (see LotDistances)
+        self.lot_distances_follow_streets = False
+        # Whether to record, for each simulated year, the wall time, call counts, and entities
+        # touched of each phase of the simulation (see Cosmos.instrumentation)
+        self.instrument_simulation = False
+        # When instrumenting, each simulated year's report is written as JSON to a file named for
+        # the year in this directory once the year is over; it will be created if need be
+        self.instrumentation_report_directory = 'instrumentation'
+        # Whether to evict the records of people who have been dead or departed for some number
+        # of years to a disk-backed archive, from which they are restored as soon as anyone needs
+        # them (see Cosmos.archive, and PersonArchive for what isn't evicted); if the directory is
+        # None, the system's default location for temporary files is used
+        self.archive_deceased_and_departed_people = False
+        self.years_before_archiving_deceased_and_departed_people = 1
+        self.person_archive_directory = None
+        # Rehydrated records are left behind in the archive's segment file as dead space; once
+        # dead space makes up more than this fraction of the file, the live records are copied
+        # into a fresh file and the old one is discarded
+        self.person_archive_max_dead_space_fraction = 0.5
 
                 #################
                 ##  BASEBALL   ##
@@ -136,6 +172,33 @@ class Config(object):
         self.chance_of_a_doubleheader = lambda year: 0.1  # TODO GREAT ARTICLES EXIST ABOUT THIS
         #       BASEBALL FANDOM
         self.chance_someone_goes_to_a_local_game = 0.1
+        #       FAST-SIM GAMES
+        # If this is True, league games are played headless: the same at-bats are resolved
+        # and the same statistics recorded, but no audience is attracted to the ballpark
+        # and no box score is composed unless one is asked for (the audience of a normal
+        # game is drawn, and its minds wander, by way of random streams of their own, which
+        # is why the at-bats are the same; see benchmark_games.py for games/second)
+        self.play_league_games_headless = False
+        #       PARALLEL LEAGUE GAMES
+        # If this is greater than 1, and league games are played headless, each day's league
+        # games are played across a pool of up to this many worker processes, with the same
+        # outcome as if they had been played one after another (see baseball/game_pool.py)
+        self.league_game_processes = 1
+        #       BATTED-BALL TRAJECTORY CACHE
+        # If this is True, batted balls adopt the trajectory of the nearest point on a grid
+        # of launch parameters, rather than simulating their own; the grid spacing below bounds
+        # how far a ball may stray from where the exact physics simulation would put it
+        self.use_trajectory_cache = False
+        self.trajectory_cache_max_entries = 200000
+        self.trajectory_cache_exit_speed_quantum = 0.5  # In mph
+        self.trajectory_cache_launch_angle_quantum = 0.5  # In degrees
+        self.trajectory_cache_ball_weight_quantum = 0.25  # In ounces
+        # At the above grid spacing, TrajectoryCache.measure_error() stays under this many feet
+        # (enforced by tests/test_trajectory_cache.py)
+        self.trajectory_cache_max_flight_error = 6.0
+        # A table of trajectories that is loaded at startup, if it exists; such a table
+        # can be prebuilt for the stock playing field and saved here
+        self.path_to_trajectory_table = os.getcwd()+'/data/stock_field_trajectories.dat'
         #       ATTRIBUTES (this jazz was determined empirically)
         self.set_percentage_above_or_below_average = lambda diff_from_avg: abs(normal(0, diff_from_avg))
         # Intangibles
@@ -208,6 +271,7 @@ class Config(object):
         self.desired_maximum_number_of_npcs_in_minor_cities = 15
         self.number_of_neighbors_needed_to_never_leave_town = 50
         self.max_number_of_miles_to_travel_a_town_over = lambda year: 15 if year < 1915 else 70
+        self.number_of_nearest_cities = 20  # Number of cities listed in City.nearest_cities
         self.year_air_travel_becomes_prominent = 1955
 
                 #####################################
@@ -380,6 +444,9 @@ class Config(object):
         self.chance_of_interaction_best_friend_component = 0.2  # Boost to chance if person is a best friend
         self.chance_someone_instigates_interaction_with_other_person_floor = 0.05
         self.chance_someone_instigates_interaction_with_other_person_cap = 0.95
+        # If not None, the number of people at a location beyond which someone will only consider
+        # socializing with a random sample of this many of the people there (e.g., at a ballpark)
+        self.max_people_someone_considers_socializing_with_in_a_crowd = None
         # Marriage
         self.min_mutual_spark_value_for_someone_to_propose_marriage = 5
         self.chance_one_newlywed_takes_others_name = lambda year: (
@@ -2521,6 +2588,11 @@ class Config(object):
             "birth year":                   (0.20,  0.10,   0.35),
             "middle name":                  (0.01,  0.05,   0.30),
         }
+        # Whether belief facets deteriorate (by mutation, transference, forgetting, or confabulation)
+        # as time passes (see MentalModel.settle()); in the simulation as originally written,
+        # nothing ever called the deterioration routines, so beliefs held fast, and turning this
+        # on changes how a given cosmos unfolds, since deterioration draws random numbers
+        self.beliefs_deteriorate = False
         # Chance of memory deterioration happening on a given timestep -- the chance
         # for each belief facet of it deteriorating on a given timestep (can be thought
         # of as representing the expected number of days a belief facet will remain intact
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import contextlib
+
+
+class Instrumentation(object):
+    """Named timers and counters that record where the simulation spends its time, year by year.
+
+    When disabled, timer() hands back a shared do-nothing context and count() returns
+    immediately, so instrumented code pays only for a method call.
+    """
+
+    def __init__(self, cosmos, enabled=False):
+        """Initialize an Instrumentation object."""
+        self.cosmos = cosmos
+        self.enabled = enabled
+        # Maps each simulated year to a dictionary mapping instrument name to a list
+        # of the form [wall time in seconds, number of calls, number of entities touched]
+        self.years = {}
+
+    def _record(self, name, wall_time, calls, entities):
+        """Add to the running totals for the named instrument in the current simulated year."""
+        if self.cosmos.year not in self.years:
+            self.years[self.cosmos.year] = {}
+        if name not in self.years[self.cosmos.year]:
+            self.years[self.cosmos.year][name] = [0.0, 0, 0]
+        totals = self.years[self.cosmos.year][name]
+        totals[0] += wall_time
+        totals[1] += calls
+        totals[2] += entities
+
+    def timer(self, name, entities=0):
+        """Return a context that times the enclosed block under the given name.
+
+        @param entities: The number of entities (people, cities, etc.) that the block touches.
+        """
+        if not self.enabled:
+            return NULL_CONTEXT
+        return self._timer(name=name, entities=entities)
+
+    @contextlib.contextmanager
+    def _timer(self, name, entities):
+        """Time the enclosed block under the given name."""
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self._record(name=name, wall_time=time.time()-start_time, calls=1, entities=entities)
+
+    def count(self, name, entities=1):
+        """Count a call under the given name, without timing it."""
+        if self.enabled:
+            self._record(name=name, wall_time=0.0, calls=1, entities=entities)
+
+    def report(self, year=None):
+        """Return a report of the instruments' totals for the given simulated year, or for all years.
+
+        @return: A dictionary mapping each year to a dictionary mapping instrument name to a
+                 dictionary with 'wall_time', 'calls', and 'entities' entries.
+        """
+        years = [year] if year is not None else sorted(self.years)
+        return {
+            y: {
+                name: {'wall_time': totals[0], 'calls': totals[1], 'entities': totals[2]}
+                for name, totals in self.years.get(y, {}).iteritems()
+            }
+            for y in years
+        }
+
+    def report_json(self, year=None):
+        """Return a report of the instruments' totals, as JSON."""
+        return json.dumps(self.report(year=year), indent=2, sort_keys=True)
+
+    def write_report(self, year):
+        """Write the report of the instruments' totals for the given simulated year to a JSON file.
+
+        The file is named for the year, and is written to the directory named by the config
+        (see Config.instrumentation_report_directory).
+
+        @return: The path to the file.
+        """
+        directory = self.cosmos.config.instrumentation_report_directory
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        path = os.path.join(directory, '{}.json'.format(year))
+        with open(path, 'w') as f:
+            f.write(self.report_json(year=year))
+        return path
+
+    def report_table(self, year=None):
+        """Return a report of the instruments' totals, as a human-readable table."""
+        table = ''
+        for y, instruments in sorted(self.report(year=year).iteritems()):
+            table += '\n\n\t\t{}\n'.format(y)
+            table += '\n{:<40}{:>12}{:>12}{:>12}{:>12}'.format('', 'WALL (S)', 'CALLS', 'ENTITIES', 'MS/CALL')
+            for name in sorted(instruments, key=lambda n: instruments[n]['wall_time'], reverse=True):
+                totals = instruments[name]
+                table += '\n{:<40}{:>12.3f}{:>12}{:>12}{:>12.3f}'.format(
+                    name, totals['wall_time'], totals['calls'], totals['entities'],
+                    1000 * totals['wall_time'] / max(totals['calls'], 1)
+                )
+        return table
+
+
+class NullContext(object):
+    """A context that does nothing, used by a disabled Instrumentation object."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NULL_CONTEXT = NullContext()
@@ -1,5 +1,10 @@
+import sys
+import math
 import random
 import heapq
+import hashlib
+import threading
+import contextlib
 
 
 class PriorityQueue:
@@ -16,6 +21,205 @@ class PriorityQueue:
         return heapq.heappop(self.elements)[1]
 
 
+class IndexedSet(object):
+    """A set that also supports drawing a random member in constant time."""
+
+    def __init__(self, members=()):
+        """Initialize an IndexedSet object."""
+        self.members = []
+        self.positions = {}  # Maps each member to its index in self.members
+        for member in members:
+            self.add(member)
+
+    def __contains__(self, member):
+        return member in self.positions
+
+    def __iter__(self):
+        return iter(self.members)
+
+    def __len__(self):
+        return len(self.members)
+
+    def add(self, member):
+        """Add a member, if it isn't already one."""
+        if member not in self.positions:
+            self.positions[member] = len(self.members)
+            self.members.append(member)
+
+    def remove(self, member):
+        """Remove a member, raising a KeyError if it isn't one."""
+        position = self.positions.pop(member)
+        # Fill the vacated position with the last member, so that no members need be shifted
+        last_member = self.members.pop()
+        if position < len(self.members):
+            self.members[position] = last_member
+            self.positions[last_member] = position
+
+    def discard(self, member):
+        """Remove a member, if it is one."""
+        if member in self.positions:
+            self.remove(member)
+
+    def random_member(self):
+        """Return a random member."""
+        return random.choice(self.members)
+
+
+class RankedSet(IndexedSet):
+    """An indexed set whose members each have a score, which supports retrieving the best-scoring members.
+
+    The members are also held in a heap, keyed by their scores. Rather than being dug out of
+    the heap, a removed member's entry is left there and skipped over once it surfaces; if the
+    heap comes to be mostly made up of such stale entries, it is rebuilt from the members.
+    """
+
+    def __init__(self):
+        """Initialize a RankedSet object."""
+        super(RankedSet, self).__init__()
+        self.heap = []  # Holds (negated score, entry number, member) tuples
+        self.entries = {}  # Maps each member to the number of its live entry in the heap
+        self.scores = {}  # Maps each member to its score
+        self.number_of_entries_made = 0
+
+    def add(self, member, score=0.0):
+        """Add a member with the given score, if it isn't already one."""
+        if member not in self.positions:
+            super(RankedSet, self).add(member)
+            self.scores[member] = score
+            self._push(member)
+
+    def remove(self, member):
+        """Remove a member, raising a KeyError if it isn't one."""
+        super(RankedSet, self).remove(member)
+        del self.entries[member]
+        del self.scores[member]
+        if len(self.heap) > 2 * len(self.members) + 16:
+            self.heap = []
+            for remaining_member in self.members:
+                self._push(remaining_member)
+
+    def _push(self, member):
+        """Push an entry for the given member onto the heap."""
+        self.number_of_entries_made += 1
+        self.entries[member] = self.number_of_entries_made
+        heapq.heappush(self.heap, (-self.scores[member], self.number_of_entries_made, member))
+
+    def best(self, n=1):
+        """Return a list of the n best-scoring members, best first (fewer, if there aren't that many)."""
+        best = []
+        while self.heap and len(best) < n:
+            entry = heapq.heappop(self.heap)
+            if self.entries.get(entry[2]) == entry[1]:
+                best.append(entry)
+        for entry in best:
+            heapq.heappush(self.heap, entry)
+        return [entry[2] for entry in best]
+
+
+class Calendar(object):
+    """A priority queue of future work, keyed by the timestep at which the work is due.
+
+    Work is recorded as (task name, subject) pairs, rather than as callables, so that a
+    calendar can be pickled along with everything else.
+    """
+
+    def __init__(self):
+        """Initialize a Calendar object."""
+        self.entries = []  # A heap of (timestep, sequence number, task name, subject) tuples
+        # Used to break ties between work due on the same timestep, such that work
+        # is always carried out in the order that it was scheduled
+        self.sequence_number = 0
+
+    def __len__(self):
+        """Return the number of pieces of work on the calendar."""
+        return len(self.entries)
+
+    def schedule(self, timestep, task, subject):
+        """Schedule the given task to be carried out on the given subject at the given timestep."""
+        heapq.heappush(self.entries, (timestep, self.sequence_number, task, subject))
+        self.sequence_number += 1
+
+    def due(self, timestep):
+        """Remove and yield, in order, each (task name, subject) pair that is due by the given timestep.
+
+        Work that is scheduled while this generator is being consumed will itself be yielded,
+        if it is also due by the given timestep.
+        """
+        while self.entries and self.entries[0][0] <= timestep:
+            _, _, task, subject = heapq.heappop(self.entries)
+            yield task, subject
+
+    @property
+    def next_timestep(self):
+        """Return the timestep at which the next piece of work is due, or None if there is none."""
+        return self.entries[0][0] if self.entries else None
+
+
+def timesteps_until_next_occurrence(chance_per_timestep):
+    """Return how many timesteps from now something will next happen, given its chance of happening on each.
+
+    This samples the geometric distribution, which makes a single draw equivalent to rolling
+    for the occurrence on every timestep; a return value of 0 means it happens this timestep.
+    """
+    return int(math.log(1.0-random.random()) / math.log(1.0-chance_per_timestep))
+
+
+class RandomStreams(object):
+    """A family of independent random streams, each derived from a single root seed.
+
+    Each subsystem draws from its own named stream, so that the draws it makes are not
+    perturbed by changes to the order or number of draws made by any other subsystem.
+    """
+
+    def __init__(self, root_seed):
+        """Initialize a RandomStreams object."""
+        self.root_seed = root_seed
+        self.streams = {}  # Maps stream name to random.Random instance
+
+    def seed_for(self, name):
+        """Return the seed for the stream with the given name."""
+        return int(hashlib.sha1("{}:{}".format(self.root_seed, name)).hexdigest(), 16)
+
+    def stream(self, name, retain=True):
+        """Return the stream with the given name, creating it if it doesn't exist yet.
+
+        @param retain: Whether to hold onto a newly created stream, so that later requests for the
+                       same name pick up where it left off; one-off streams need not be retained.
+        """
+        if name in self.streams:
+            return self.streams[name]
+        stream = random.Random(self.seed_for(name))
+        if retain:
+            self.streams[name] = stream
+        return stream
+
+    @contextlib.contextmanager
+    def drawing_from(self, name, retain=True):
+        """Have calls to the global random module draw from the named stream within this context.
+
+        The global random state is swapped out for the stream's state on entry, and swapped back
+        in on exit, so code that draws from the random module need not be threaded a stream.
+        """
+        with drawing_from_stream(stream=self.stream(name=name, retain=retain)) as stream:
+            yield stream
+
+
+@contextlib.contextmanager
+def drawing_from_stream(stream):
+    """Have calls to the global random module draw from the given stream within this context.
+
+    This is for streams that are held onto by whatever draws from them (rather than by a
+    RandomStreams object), e.g., a stream that lasts only as long as a single game does.
+    """
+    outer_state = random.getstate()
+    random.setstate(stream.getstate())
+    try:
+        yield stream
+    finally:
+        stream.setstate(random.getstate())
+        random.setstate(outer_state)
+
+
 def clamp(val, minimum, maximum):
     return max(minimum, min(val, maximum))
 
@@ -45,4 +249,44 @@ def pick_from_sorted_list(sorted_list):
         choice = list(sorted_list)[0]
     else:
         choice = None
-    return choice
\ No newline at end of file
+    return choice
+
+
+def rebuild_with_id(cls, id_number):
+    """Return a bare instance of the given class with only its ID set.
+
+    This is used when unpickling objects that hash by ID, since, in a cyclic object
+    graph, such an object may be added to a set before the rest of its state is restored.
+    """
+    obj = cls.__new__(cls)
+    obj.id = id_number
+    return obj
+
+
+def call_with_deep_recursion(function, stack_size=512*1024*1024, recursion_limit=1000000):
+    """Call the given function on a thread whose stack is large enough to recurse very deeply.
+
+    Pickling a cosmos recurses through chains of linked objects (parent to child, person to
+    relationship to person, and so on) far deeper than the default stack allows.
+    """
+    result = {}
+
+    def call():
+        try:
+            result['value'] = function()
+        except BaseException:
+            result['error'] = sys.exc_info()
+    original_recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(recursion_limit)
+    original_stack_size = threading.stack_size(stack_size)
+    try:
+        thread = threading.Thread(target=call)
+        thread.start()
+        thread.join()
+    finally:
+        threading.stack_size(original_stack_size)
+        sys.setrecursionlimit(original_recursion_limit)
+    if 'error' in result:
+        error_type, error, traceback = result['error']
+        raise error_type, error, traceback
+    return result.get('value')